@@ -33,7 +33,8 @@ BEGIN
         CreatedDate DATETIME2 DEFAULT GETDATE(),
         ModifiedDate DATETIME2 DEFAULT GETDATE(),
         LastValidatedDate DATETIME2 NULL,
-        IsActive BIT DEFAULT 1
+        IsActive BIT DEFAULT 1,
+        RowHash VARBINARY(32) NULL -- Content hash of the last loaded source row
     );
     PRINT 'Table cred.Providers created successfully';
 END
@@ -60,6 +61,7 @@ BEGIN
         VerifiedBy NVARCHAR(100) NULL,
         CreatedDate DATETIME2 DEFAULT GETDATE(),
         ModifiedDate DATETIME2 DEFAULT GETDATE(),
+        RowHash VARBINARY(32) NULL, -- Content hash of the last loaded source row
         FOREIGN KEY (ProviderID) REFERENCES cred.Providers(ProviderID) ON DELETE CASCADE
     );
     PRINT 'Table cred.Credentials created successfully';
@@ -89,7 +91,8 @@ BEGIN
         AccreditationStatus NVARCHAR(100) NULL,
         CreatedDate DATETIME2 DEFAULT GETDATE(),
         ModifiedDate DATETIME2 DEFAULT GETDATE(),
-        IsActive BIT DEFAULT 1
+        IsActive BIT DEFAULT 1,
+        RowHash VARBINARY(32) NULL -- Content hash of the last loaded source row
     );
     PRINT 'Table cred.Entities created successfully';
 END
@@ -105,6 +108,28 @@ BEGIN
 END
 GO
 
+-- Add RowHash to core tables created before ingestion change detection
+IF COL_LENGTH('cred.Providers', 'RowHash') IS NULL
+BEGIN
+    ALTER TABLE cred.Providers ADD RowHash VARBINARY(32) NULL;
+    PRINT 'RowHash column added to cred.Providers';
+END
+GO
+
+IF COL_LENGTH('cred.Credentials', 'RowHash') IS NULL
+BEGIN
+    ALTER TABLE cred.Credentials ADD RowHash VARBINARY(32) NULL;
+    PRINT 'RowHash column added to cred.Credentials';
+END
+GO
+
+IF COL_LENGTH('cred.Entities', 'RowHash') IS NULL
+BEGIN
+    ALTER TABLE cred.Entities ADD RowHash VARBINARY(32) NULL;
+    PRINT 'RowHash column added to cred.Entities';
+END
+GO
+
 -- =============================================
 -- Table: ValidationRules
 -- Purpose: Metadata about validation rules
@@ -120,6 +145,19 @@ BEGIN
         RuleType NVARCHAR(50) NULL, -- Data Quality, Business Logic, Compliance
         Severity NVARCHAR(20) DEFAULT 'Medium', -- Low, Medium, High, Critical
         IsActive BIT DEFAULT 1,
+        SourceName NVARCHAR(50) NULL, -- Row source in cred.ValidationRuleSources the rule is evaluated against
+        AppliesWhen NVARCHAR(MAX) NULL, -- Predicate selecting the records the rule evaluates (NULL = all records)
+        FailWhen NVARCHAR(MAX) NULL, -- Predicate marking records that do not pass
+        FailStatus NVARCHAR(20) NULL, -- Fail, Warning
+        ErrorMessage NVARCHAR(500) NULL,
+        FieldName NVARCHAR(100) NULL,
+        FieldValueExpression NVARCHAR(500) NULL,
+        ResultEntityType NVARCHAR(50) NULL, -- Overrides the source EntityType on results
+        EntityIDExpression NVARCHAR(200) NULL, -- Overrides the source EntityID expression on results
+        Cadence NVARCHAR(20) NULL, -- Daily (date-relative, every run), OnChange (when a DependsOnTables table changes); NULL = Daily
+        DependsOnTables NVARCHAR(500) NULL, -- Base tables the outcome reads, comma-separated (e.g. Providers,Entities)
+        DependsOnColumns NVARCHAR(MAX) NULL, -- Table.Column list the rule's expressions read
+        EstimatedCostMs INT NULL, -- Average time per run, refreshed from ValidationRuleTiming
         CreatedDate DATETIME2 DEFAULT GETDATE(),
         ModifiedDate DATETIME2 DEFAULT GETDATE()
     );
@@ -127,6 +165,65 @@ BEGIN
 END
 GO
 
+-- Add rule definition columns to ValidationRules tables created before rules were compiled from metadata
+IF COL_LENGTH('cred.ValidationRules', 'SourceName') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRules
+    ADD SourceName NVARCHAR(50) NULL,
+        AppliesWhen NVARCHAR(MAX) NULL,
+        FailWhen NVARCHAR(MAX) NULL,
+        FailStatus NVARCHAR(20) NULL,
+        ErrorMessage NVARCHAR(500) NULL,
+        FieldName NVARCHAR(100) NULL,
+        FieldValueExpression NVARCHAR(500) NULL,
+        ResultEntityType NVARCHAR(50) NULL,
+        EntityIDExpression NVARCHAR(200) NULL;
+    PRINT 'Rule definition columns added to cred.ValidationRules';
+END
+GO
+
+-- Add schedule columns to ValidationRules tables created before rule scheduling
+IF COL_LENGTH('cred.ValidationRules', 'Cadence') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRules
+    ADD Cadence NVARCHAR(20) NULL,
+        DependsOnTables NVARCHAR(500) NULL,
+        DependsOnColumns NVARCHAR(MAX) NULL,
+        EstimatedCostMs INT NULL;
+    PRINT 'Schedule columns added to cred.ValidationRules';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRuleSources
+-- Purpose: Row sources the rule categories are compiled against
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRuleSources') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRuleSources (
+        SourceName NVARCHAR(50) PRIMARY KEY, -- Provider, Credential, Entity
+        EntityType NVARCHAR(50) NOT NULL,
+        EntityIDExpression NVARCHAR(200) NOT NULL, -- Unique per row of FromClause
+        RecordIDExpression NVARCHAR(200) NOT NULL,
+        FromClause NVARCHAR(MAX) NOT NULL, -- One row per scoped record, lookups joined at most once
+        ShardTable NVARCHAR(128) NULL, -- Base table split into key ranges for parallel runs (NULL = not shardable)
+        ShardKeyColumn NVARCHAR(128) NULL, -- Key column of ShardTable that EntityIDExpression evaluates to
+        ModifiedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.ValidationRuleSources created successfully';
+END
+GO
+
+-- Add shard columns to ValidationRuleSources tables created before parallel runs
+IF COL_LENGTH('cred.ValidationRuleSources', 'ShardTable') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRuleSources
+    ADD ShardTable NVARCHAR(128) NULL,
+        ShardKeyColumn NVARCHAR(128) NULL;
+    PRINT 'Shard columns added to cred.ValidationRuleSources';
+END
+GO
+
 -- =============================================
 -- Table: ValidationResults
 -- Purpose: Store validation check results
@@ -152,12 +249,26 @@ BEGIN
         ResolvedDate DATETIME2 NULL,
         ResolvedBy NVARCHAR(100) NULL,
         ResolutionNotes NVARCHAR(MAX) NULL,
+        -- Hash of (RuleCode, EntityType, EntityID) identifying the same issue across runs;
+        -- rows without an EntityID (provider-level credential rules) use the RecordID
+        IssueKey AS CAST(HASHBYTES('SHA2_256', CONCAT(RuleCode, N'|', EntityType, N'|',
+                      ISNULL(CAST(EntityID AS NVARCHAR(20)), N'#' + RecordID))) AS BINARY(32)) PERSISTED,
         FOREIGN KEY (RuleID) REFERENCES cred.ValidationRules(RuleID)
     );
     PRINT 'Table cred.ValidationResults created successfully';
 END
 GO
 
+-- Add IssueKey to ValidationResults tables created before run-over-run diffs
+IF COL_LENGTH('cred.ValidationResults', 'IssueKey') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationResults
+    ADD IssueKey AS CAST(HASHBYTES('SHA2_256', CONCAT(RuleCode, N'|', EntityType, N'|',
+                      ISNULL(CAST(EntityID AS NVARCHAR(20)), N'#' + RecordID))) AS BINARY(32)) PERSISTED;
+    PRINT 'IssueKey column added to cred.ValidationResults';
+END
+GO
+
 -- =============================================
 -- Table: ValidationRunLog
 -- Purpose: Track validation execution runs
@@ -176,12 +287,410 @@ BEGIN
         TotalPasses INT DEFAULT 0,
         ExecutionTimeSeconds INT NULL,
         ErrorMessage NVARCHAR(MAX) NULL,
-        RunType NVARCHAR(50) DEFAULT 'Scheduled' -- Scheduled, Manual, OnDemand
+        RunType NVARCHAR(50) DEFAULT 'Scheduled', -- Scheduled, Manual, OnDemand, Incremental
+        ResultMode NVARCHAR(20) DEFAULT 'Full', -- Full, ExceptionsOnly
+        IncrementalSince DATETIME2 NULL, -- Set for incremental runs: changes since this time were revalidated
+        PreviousRunID INT NULL, -- Run whose outcomes were carried forward for unchanged records
+        ResumeCount INT DEFAULT 0, -- Times a failed run was resumed from its checkpoints
+        LastResumedTime DATETIME2 NULL,
+        DeltaBaseRunID INT NULL, -- Run this run's issues were compared with (see ValidationRunDelta)
+        NewIssues INT NULL,
+        PersistingIssues INT NULL,
+        ClearedIssues INT NULL,
+        AutoResolvedIssues INT NULL, -- Cleared issues of the base run resolved by the diff
+        ScheduleBaseRunID INT NULL, -- Run whose outcomes were carried forward for the rules the schedule skipped
+        RulesSkipped INT NULL, -- Active rules the schedule skipped (see ValidationRunRuleSchedule)
+        ResultsVersion INT NOT NULL DEFAULT 0 -- Bumped whenever the run's results are resolved (stamps cached summaries)
     );
     PRINT 'Table cred.ValidationRunLog created successfully';
 END
 GO
 
+-- Add ResultMode to ValidationRunLog tables created before result modes existed
+IF COL_LENGTH('cred.ValidationRunLog', 'ResultMode') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD ResultMode NVARCHAR(20) NULL CONSTRAINT DF_ValidationRunLog_ResultMode DEFAULT 'Full';
+    PRINT 'Column cred.ValidationRunLog.ResultMode added';
+END
+GO
+
+-- Add incremental run columns to ValidationRunLog tables created before incremental runs existed
+IF COL_LENGTH('cred.ValidationRunLog', 'IncrementalSince') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD IncrementalSince DATETIME2 NULL,
+        PreviousRunID INT NULL;
+    PRINT 'Incremental run columns added to cred.ValidationRunLog';
+END
+GO
+
+-- Add resume columns to ValidationRunLog tables created before resumable runs existed
+IF COL_LENGTH('cred.ValidationRunLog', 'ResumeCount') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD ResumeCount INT NULL CONSTRAINT DF_ValidationRunLog_ResumeCount DEFAULT 0,
+        LastResumedTime DATETIME2 NULL;
+    PRINT 'Resume columns added to cred.ValidationRunLog';
+END
+GO
+
+-- Add delta columns to ValidationRunLog tables created before run-over-run diffs
+IF COL_LENGTH('cred.ValidationRunLog', 'DeltaBaseRunID') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD DeltaBaseRunID INT NULL,
+        NewIssues INT NULL,
+        PersistingIssues INT NULL,
+        ClearedIssues INT NULL,
+        AutoResolvedIssues INT NULL;
+    PRINT 'Delta columns added to cred.ValidationRunLog';
+END
+GO
+
+-- Add schedule columns to ValidationRunLog tables created before rule scheduling
+IF COL_LENGTH('cred.ValidationRunLog', 'ScheduleBaseRunID') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD ScheduleBaseRunID INT NULL,
+        RulesSkipped INT NULL;
+    PRINT 'Schedule columns added to cred.ValidationRunLog';
+END
+GO
+
+-- Add ResultsVersion to ValidationRunLog tables created before summary cache versions
+IF COL_LENGTH('cred.ValidationRunLog', 'ResultsVersion') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunLog
+    ADD ResultsVersion INT NOT NULL CONSTRAINT DF_ValidationRunLog_ResultsVersion DEFAULT 0;
+    PRINT 'Column cred.ValidationRunLog.ResultsVersion added';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRunCheckpoint
+-- Purpose: Work units of a validation run (one rule category on one source,
+-- or one key-range shard of it). Each unit's results commit together with its
+-- Completed checkpoint, so a failed run resumes from its Pending units
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRunCheckpoint') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRunCheckpoint (
+        CheckpointID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        ValidationRunID INT NOT NULL,
+        RuleCategory NVARCHAR(100) NOT NULL,
+        SourceName NVARCHAR(50) NOT NULL,
+        LowKey INT NULL, -- Shard key range (NULL = whole source)
+        HighKey INT NULL,
+        CheckpointStatus NVARCHAR(20) NOT NULL DEFAULT 'Pending', -- Pending, Completed
+        RulesRun INT NULL,
+        ElapsedMs INT NULL, -- Time the unit took to run
+        CompletedDate DATETIME2 NULL,
+        CreatedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.ValidationRunCheckpoint created successfully';
+END
+GO
+
+-- Add ElapsedMs to ValidationRunCheckpoint tables created before unit timing
+IF COL_LENGTH('cred.ValidationRunCheckpoint', 'ElapsedMs') IS NULL
+BEGIN
+    ALTER TABLE cred.ValidationRunCheckpoint ADD ElapsedMs INT NULL;
+    PRINT 'ElapsedMs column added to cred.ValidationRunCheckpoint';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRunScope
+-- Purpose: Records revalidated by an incremental validation run
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRunScope') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRunScope (
+        ValidationRunID INT NOT NULL,
+        EntityType NVARCHAR(50) NOT NULL, -- Provider, Credential, Entity
+        EntityID INT NOT NULL,
+        ParentID INT NULL, -- Providers.EntityID or Credentials.ProviderID when the scope was built
+        RecordDeleted BIT NOT NULL DEFAULT 0, -- Deleted since the previous run (scoped only to update ValidationParentLink)
+        PRIMARY KEY (ValidationRunID, EntityType, EntityID)
+    );
+    PRINT 'Table cred.ValidationRunScope created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationParentLink
+-- Purpose: Parent keys of every provider (EntityID) and credential (ProviderID),
+-- and the keys of every entity, as of the start of the last completed run of
+-- each result mode, so the next incremental run can rescope the former
+-- parents of moved and deleted records. Incremental runs update only the rows
+-- of the records they revalidated
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationParentLink') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationParentLink (
+        ResultMode NVARCHAR(20) NOT NULL, -- Full, ExceptionsOnly
+        EntityType NVARCHAR(50) NOT NULL, -- Provider, Credential, Entity
+        EntityID INT NOT NULL,
+        ParentID INT NULL, -- Providers.EntityID or Credentials.ProviderID (NULL for entities)
+        PRIMARY KEY (ResultMode, EntityType, EntityID)
+    );
+    PRINT 'Table cred.ValidationParentLink created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRunRuleSchedule
+-- Purpose: Whether each active rule was evaluated or skipped by a validation
+-- run, and why; written by cred.sp_ScheduleValidationRules
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRunRuleSchedule') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRunRuleSchedule (
+        ValidationRunID INT NOT NULL,
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        IsScheduled BIT NOT NULL, -- 0 = outcomes carried forward from ValidationRunLog.ScheduleBaseRunID
+        ScheduleReason NVARCHAR(200) NOT NULL, -- All rules, No base run, Daily, Rule changed, Not in base run, Changed: <tables>, Overdue, Unchanged
+        EstimatedCostMs INT NULL,
+        LastEvaluatedTime DATETIME2 NULL, -- Start of the last run that evaluated the rule
+        PRIMARY KEY (ValidationRunID, RuleID)
+    );
+    PRINT 'Table cred.ValidationRunRuleSchedule created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRuleRunStats
+-- Purpose: Per-rule Pass/Fail/Warning tallies for each validation run
+-- A run may write several rows per rule; readers should SUM the counts
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRuleRunStats') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRuleRunStats (
+        RuleRunStatID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        ValidationRunID INT NOT NULL,
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        EntityType NVARCHAR(50) NULL, -- Provider, Credential, Entity
+        PassCount INT NOT NULL DEFAULT 0,
+        FailCount INT NOT NULL DEFAULT 0,
+        WarningCount INT NOT NULL DEFAULT 0,
+        CreatedDate DATETIME2 DEFAULT GETDATE(),
+        FOREIGN KEY (RuleID) REFERENCES cred.ValidationRules(RuleID)
+    );
+    PRINT 'Table cred.ValidationRuleRunStats created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRuleTiming
+-- Purpose: Per-rule execution profile for each validation run (one row per
+-- rule per compiled statement; sharded runs write one row per shard)
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRuleTiming') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRuleTiming (
+        RuleTimingID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        ValidationRunID INT NOT NULL,
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        RuleCategory NVARCHAR(100) NULL,
+        SourceName NVARCHAR(50) NULL,
+        LowKey INT NULL, -- Shard key range (NULL = whole source)
+        HighKey INT NULL,
+        ElapsedMs INT NOT NULL,
+        RowsScanned INT NOT NULL DEFAULT 0, -- Source records the statement evaluated
+        RowsEmitted INT NOT NULL DEFAULT 0, -- ValidationResults rows the rule wrote
+        IsolatedTiming BIT NOT NULL DEFAULT 0, -- 1 = rule ran alone; 0 = ElapsedMs is shared by the rules of one compiled statement
+        CreatedDate DATETIME2 DEFAULT GETDATE(),
+        FOREIGN KEY (RuleID) REFERENCES cred.ValidationRules(RuleID)
+    );
+    PRINT 'Table cred.ValidationRuleTiming created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationDailyRollup
+-- Purpose: Outcome counts per run date, rule, severity and status for the Power BI
+-- model. Each date holds the latest completed run of that day; refreshed by
+-- cred.sp_RefreshValidationRollups at the end of every run
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationDailyRollup') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationDailyRollup (
+        RunDate DATE NOT NULL,
+        RuleID INT NOT NULL,
+        ValidationStatus NVARCHAR(20) NOT NULL, -- Pass, Fail, Warning
+        ValidationRunID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        RuleCategory NVARCHAR(100) NOT NULL,
+        Severity NVARCHAR(20) NULL,
+        EntityType NVARCHAR(50) NULL,
+        OutcomeCount INT NOT NULL DEFAULT 0,
+        UnresolvedCount INT NOT NULL DEFAULT 0, -- Fail/Warning results not yet resolved
+        RefreshedDate DATETIME2 DEFAULT GETDATE(),
+        PRIMARY KEY (RunDate, RuleID, ValidationStatus),
+        FOREIGN KEY (RuleID) REFERENCES cred.ValidationRules(RuleID)
+    );
+    PRINT 'Table cred.ValidationDailyRollup created successfully';
+END
+GO
+
+-- =============================================
+-- Table: EntityQualityDaily
+-- Purpose: Per-record issue counts and quality score per run date for records
+-- with at least one Fail or Warning (records without a row score 100)
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.EntityQualityDaily') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.EntityQualityDaily (
+        RunDate DATE NOT NULL,
+        EntityType NVARCHAR(50) NOT NULL, -- Provider, Credential, Entity
+        EntityID INT NOT NULL,
+        ValidationRunID INT NOT NULL,
+        FailCount INT NOT NULL DEFAULT 0,
+        WarningCount INT NOT NULL DEFAULT 0,
+        CriticalCount INT NOT NULL DEFAULT 0,
+        HighCount INT NOT NULL DEFAULT 0,
+        UnresolvedCount INT NOT NULL DEFAULT 0,
+        RulesEvaluated INT NOT NULL DEFAULT 0, -- Active rules reporting on the entity type
+        QualityScore DECIMAL(5,2) NOT NULL DEFAULT 100, -- 100 - failed rules as a percentage of RulesEvaluated
+        RefreshedDate DATETIME2 DEFAULT GETDATE(),
+        PRIMARY KEY (RunDate, EntityType, EntityID)
+    );
+    PRINT 'Table cred.EntityQualityDaily created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationRunDelta
+-- Purpose: Fail/Warning issues of a completed run compared with the previous
+-- completed run by IssueKey: New (not open last run), Persisting (open in
+-- both) and Cleared (open last run, not reported by this one). New and
+-- Persisting rows point to this run's result, Cleared rows to the base run's.
+-- Written by cred.sp_DiffValidationRun
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationRunDelta') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationRunDelta (
+        ValidationRunDeltaID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        ValidationRunID INT NOT NULL,
+        BaseRunID INT NULL, -- NULL when the run had no earlier completed run
+        DeltaStatus NVARCHAR(20) NOT NULL, -- New, Persisting, Cleared
+        IssueKey BINARY(32) NOT NULL,
+        ValidationResultID BIGINT NULL, -- This run's result (New, Persisting)
+        BaseResultID BIGINT NULL, -- The base run's result (Persisting, Cleared)
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        EntityType NVARCHAR(50) NULL,
+        EntityID INT NULL,
+        RecordID NVARCHAR(100) NULL,
+        ValidationStatus NVARCHAR(20) NOT NULL, -- Fail, Warning
+        Severity NVARCHAR(20) NULL,
+        CreatedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.ValidationRunDelta created successfully';
+END
+GO
+
+-- =============================================
+-- Table: DuplicateCandidates
+-- Purpose: Scored pairs of providers, or of entities, that are probably the same
+-- real-world record under different identifiers. Written by
+-- cred.sp_RefreshDuplicateCandidates at the start of each validation run, once
+-- per direction, and read by the duplicate detection rules (DUP001 - DUP004)
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.DuplicateCandidates') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.DuplicateCandidates (
+        DuplicateCandidateID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        ValidationRunID INT NOT NULL,
+        EntityType NVARCHAR(50) NOT NULL, -- Provider, Entity
+        EntityID INT NOT NULL,
+        CandidateEntityID INT NOT NULL, -- The other record of the pair
+        MatchScore INT NOT NULL, -- 0-100 from the agreeing fields
+        MatchedOn NVARCHAR(200) NULL, -- Fields that agree, e.g. 'LastName, FirstName, DateOfBirth'
+        CreatedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.DuplicateCandidates created successfully';
+END
+GO
+
+-- =============================================
+-- Table: CredentialExpirationIndex
+-- Purpose: Credentials with an expiration date in ExpirationDate order, with
+-- the dimensions expiry is reported by. Maintained incrementally by
+-- cred.sp_RefreshCredentialExpirationIndex from Credentials and Providers
+-- ModifiedDate. A credential that is deleted or loses its expiration date
+-- stays as an IsRemoved row for a while, so readers refreshing from
+-- IndexedDate see the removal
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.CredentialExpirationIndex') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.CredentialExpirationIndex (
+        ExpirationDate DATE NOT NULL,
+        CredentialID INT NOT NULL,
+        ProviderID INT NULL,
+        EntityID INT NULL, -- The provider's entity
+        StateIssued NVARCHAR(2) NULL,
+        CredentialType NVARCHAR(100) NULL,
+        Status NVARCHAR(50) NULL,
+        IsPrimary BIT NULL,
+        IsRemoved BIT NOT NULL DEFAULT 0,
+        IndexedDate DATETIME2 NOT NULL DEFAULT GETDATE(), -- Last time the row changed
+        PRIMARY KEY CLUSTERED (ExpirationDate, CredentialID)
+    );
+    PRINT 'Table cred.CredentialExpirationIndex created successfully';
+END
+GO
+
+-- =============================================
+-- Table: CredentialExpiryCalendar
+-- Purpose: Forward expiry calendar for capacity planning: credentials expiring
+-- per day over the next @CalendarDays days, plus past-due credentials whose
+-- Status is not Expired, by entity, state, type and status. Rebuilt from
+-- CredentialExpirationIndex on every index refresh
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.CredentialExpiryCalendar') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.CredentialExpiryCalendar (
+        ExpirationDate DATE NOT NULL,
+        EntityID INT NULL,
+        StateIssued NVARCHAR(2) NULL,
+        CredentialType NVARCHAR(100) NULL,
+        Status NVARCHAR(50) NULL,
+        CredentialCount INT NOT NULL,
+        PrimaryCount INT NOT NULL,
+        CalendarDate DATE NOT NULL, -- Day the calendar was built
+        CreatedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.CredentialExpiryCalendar created successfully';
+END
+GO
+
+-- =============================================
+-- Table: ValidationResultArchive
+-- Purpose: Runs whose ValidationResults rows were moved to Parquet archive files
+-- (ArchivePath is relative to the archive root). Archived runs are read from
+-- the file; Purged runs no longer have rows in ValidationResults
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ValidationResultArchive') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ValidationResultArchive (
+        ValidationRunID INT PRIMARY KEY,
+        RunDate DATE NOT NULL,
+        ArchiveStatus NVARCHAR(20) NOT NULL DEFAULT 'Archiving', -- Archiving, Archived, Purged
+        ArchivePath NVARCHAR(500) NULL,
+        ArchivedRowCount BIGINT NULL,
+        ArchivedDate DATETIME2 NULL,
+        PurgedDate DATETIME2 NULL,
+        CreatedDate DATETIME2 DEFAULT GETDATE()
+    );
+    PRINT 'Table cred.ValidationResultArchive created successfully';
+END
+GO
+
 -- =============================================
 -- Table: DataRefreshLog
 -- Purpose: Track data refresh operations
@@ -194,10 +703,13 @@ BEGIN
         RefreshEndTime DATETIME2 NULL,
         RefreshStatus NVARCHAR(20) NULL, -- Running, Completed, Failed
         SourceSystem NVARCHAR(100) NULL,
+        TargetTable NVARCHAR(128) NULL, -- Base table the refresh wrote to (e.g. cred.Providers)
         RecordsProcessed INT DEFAULT 0,
         RecordsInserted INT DEFAULT 0,
         RecordsUpdated INT DEFAULT 0,
         RecordsDeleted INT DEFAULT 0,
+        RecordsUnchanged INT DEFAULT 0, -- Rows whose content hash matched the stored RowHash
+        RecordsQuarantined INT DEFAULT 0, -- Rows written to IngestionQuarantine instead of loaded
         ExecutionTimeSeconds INT NULL,
         ErrorMessage NVARCHAR(MAX) NULL
     );
@@ -205,6 +717,212 @@ BEGIN
 END
 GO
 
+-- Add RecordsUnchanged to DataRefreshLog tables created before ingestion change detection
+IF COL_LENGTH('cred.DataRefreshLog', 'RecordsUnchanged') IS NULL
+BEGIN
+    ALTER TABLE cred.DataRefreshLog ADD RecordsUnchanged INT DEFAULT 0;
+    PRINT 'RecordsUnchanged column added to cred.DataRefreshLog';
+END
+GO
+
+-- Add RecordsQuarantined to DataRefreshLog tables created before ingestion quarantine
+IF COL_LENGTH('cred.DataRefreshLog', 'RecordsQuarantined') IS NULL
+BEGIN
+    ALTER TABLE cred.DataRefreshLog ADD RecordsQuarantined INT DEFAULT 0;
+    PRINT 'RecordsQuarantined column added to cred.DataRefreshLog';
+END
+GO
+
+-- Add TargetTable to DataRefreshLog tables created before rule scheduling
+IF COL_LENGTH('cred.DataRefreshLog', 'TargetTable') IS NULL
+BEGIN
+    ALTER TABLE cred.DataRefreshLog ADD TargetTable NVARCHAR(128) NULL;
+    PRINT 'TargetTable column added to cred.DataRefreshLog';
+END
+GO
+
+-- =============================================
+-- Table: IngestionQuarantine
+-- Purpose: Source rows held back by a data refresh because a reference
+-- (Provider NPI, Entity NPI/TaxID, ProviderID, EntityID) did not resolve
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.IngestionQuarantine') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.IngestionQuarantine (
+        QuarantineID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        RefreshID INT NOT NULL,
+        TargetTable NVARCHAR(50) NOT NULL, -- Providers, Credentials, Entities
+        SourceFile NVARCHAR(500) NULL,
+        SourceRowNumber BIGINT NULL, -- 1-based data row in the source file (header excluded)
+        Reason NVARCHAR(500) NOT NULL,
+        RowData NVARCHAR(MAX) NULL, -- Source row as JSON
+        QuarantinedDate DATETIME2 DEFAULT GETDATE(),
+        Resolved BIT DEFAULT 0,
+        INDEX IX_IngestionQuarantine_RefreshID (RefreshID),
+        FOREIGN KEY (RefreshID) REFERENCES cred.DataRefreshLog(RefreshID)
+    );
+    PRINT 'Table cred.IngestionQuarantine created successfully';
+END
+GO
+
+-- =============================================
+-- Table: SourceExtractWatermark
+-- Purpose: High-watermark of each incremental source database extract
+-- (DataIngestion.load_from_source_database). Updated in the transaction that
+-- merges each batch, so a failed extract resumes after its last merged row
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.SourceExtractWatermark') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.SourceExtractWatermark (
+        SourceName NVARCHAR(100) PRIMARY KEY, -- Name of the extract in SOURCE_EXTRACTS
+        TargetTable NVARCHAR(50) NOT NULL, -- Providers, Credentials, Entities
+        SourceTable NVARCHAR(256) NOT NULL,
+        WatermarkColumn NVARCHAR(128) NOT NULL,
+        KeyColumn NVARCHAR(128) NOT NULL, -- Orders rows sharing a watermark value
+        WatermarkType NVARCHAR(20) NULL, -- int, decimal, datetime, date, binary, str
+        WatermarkValue NVARCHAR(200) NULL, -- Watermark of the last merged row (NULL = extract everything)
+        KeyType NVARCHAR(20) NULL,
+        KeyValue NVARCHAR(200) NULL, -- Key of the last merged row
+        ExtractStatus NVARCHAR(20) NULL, -- Running, Completed, Failed
+        LastRefreshID INT NULL,
+        RowsExtracted BIGINT DEFAULT 0, -- Rows merged by the latest extract so far
+        LastExtractStart DATETIME2 NULL,
+        LastExtractEnd DATETIME2 NULL,
+        ModifiedDate DATETIME2 DEFAULT GETDATE(),
+        FOREIGN KEY (LastRefreshID) REFERENCES cred.DataRefreshLog(RefreshID)
+    );
+    PRINT 'Table cred.SourceExtractWatermark created successfully';
+END
+GO
+
+-- =============================================
+-- Table: RefreshRunLog
+-- Purpose: One row per orchestrated daily refresh (refresh_orchestrator.py)
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.RefreshRunLog') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.RefreshRunLog (
+        RefreshRunID INT IDENTITY(1,1) PRIMARY KEY,
+        RunStartTime DATETIME2 DEFAULT GETDATE(),
+        RunEndTime DATETIME2 NULL,
+        RunStatus NVARCHAR(20) NULL, -- Running, Completed, Failed
+        StepsSucceeded INT NULL,
+        StepsFailed INT NULL,
+        StepsSkipped INT NULL,
+        ExecutionTimeSeconds DECIMAL(10,3) NULL,
+        ErrorMessage NVARCHAR(MAX) NULL
+    );
+    PRINT 'Table cred.RefreshRunLog created successfully';
+END
+GO
+
+-- =============================================
+-- Table: RefreshStepLog
+-- Purpose: State and timing of each step of an orchestrated refresh. Offsets are
+-- seconds from the refresh start, so the steps can be charted as a timeline
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.RefreshStepLog') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.RefreshStepLog (
+        RefreshStepID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        RefreshRunID INT NOT NULL,
+        StepName NVARCHAR(100) NOT NULL,
+        DependsOn NVARCHAR(1000) NULL, -- Comma-separated step names
+        StepStatus NVARCHAR(20) NOT NULL DEFAULT 'Pending', -- Pending, Running, Succeeded, Failed, Skipped
+        Attempts INT NOT NULL DEFAULT 0,
+        ReadyOffsetSeconds DECIMAL(10,3) NULL, -- Dependencies finished
+        StartOffsetSeconds DECIMAL(10,3) NULL, -- Concurrency slot acquired
+        EndOffsetSeconds DECIMAL(10,3) NULL,
+        DurationSeconds DECIMAL(10,3) NULL,
+        ErrorMessage NVARCHAR(MAX) NULL,
+        INDEX IX_RefreshStepLog_RefreshRunID (RefreshRunID),
+        FOREIGN KEY (RefreshRunID) REFERENCES cred.RefreshRunLog(RefreshRunID)
+    );
+    PRINT 'Table cred.RefreshStepLog created successfully';
+END
+GO
+
+-- =============================================
+-- Tables: ProviderStaging, CredentialStaging, EntityStaging
+-- Purpose: Persistent staging for chunked file loads. Each chunk is bulk-copied
+-- under its DataRefreshLog RefreshID, merged into the base table and removed.
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.ProviderStaging') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.ProviderStaging (
+        StagingRowID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        RefreshID INT NOT NULL,
+        NPI NVARCHAR(10) NULL,
+        FirstName NVARCHAR(100) NULL,
+        LastName NVARCHAR(100) NULL,
+        MiddleName NVARCHAR(100) NULL,
+        DateOfBirth DATE NULL,
+        SSN NVARCHAR(11) NULL,
+        Specialty NVARCHAR(200) NULL,
+        SubSpecialty NVARCHAR(200) NULL,
+        PhoneNumber NVARCHAR(20) NULL,
+        EmailAddress NVARCHAR(255) NULL,
+        AddressLine1 NVARCHAR(255) NULL,
+        AddressLine2 NVARCHAR(255) NULL,
+        City NVARCHAR(100) NULL,
+        State NVARCHAR(2) NULL,
+        ZipCode NVARCHAR(10) NULL,
+        EntityID INT NULL,
+        Status NVARCHAR(50) NULL,
+        IsActive BIT NULL,
+        INDEX IX_ProviderStaging_RefreshID (RefreshID)
+    );
+    PRINT 'Table cred.ProviderStaging created successfully';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.CredentialStaging') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.CredentialStaging (
+        StagingRowID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        RefreshID INT NOT NULL,
+        ProviderID INT NULL,
+        CredentialType NVARCHAR(100) NULL,
+        CredentialNumber NVARCHAR(100) NULL,
+        IssuingOrganization NVARCHAR(200) NULL,
+        IssueDate DATE NULL,
+        ExpirationDate DATE NULL,
+        StateIssued NVARCHAR(2) NULL,
+        Status NVARCHAR(50) NULL,
+        IsPrimary BIT NULL,
+        VerificationDate DATETIME2 NULL,
+        VerifiedBy NVARCHAR(100) NULL,
+        INDEX IX_CredentialStaging_RefreshID (RefreshID)
+    );
+    PRINT 'Table cred.CredentialStaging created successfully';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.EntityStaging') AND type in (N'U'))
+BEGIN
+    CREATE TABLE cred.EntityStaging (
+        StagingRowID BIGINT IDENTITY(1,1) PRIMARY KEY,
+        RefreshID INT NOT NULL,
+        EntityName NVARCHAR(255) NULL,
+        EntityType NVARCHAR(100) NULL,
+        TaxID NVARCHAR(20) NULL,
+        NPI NVARCHAR(10) NULL,
+        AddressLine1 NVARCHAR(255) NULL,
+        AddressLine2 NVARCHAR(255) NULL,
+        City NVARCHAR(100) NULL,
+        State NVARCHAR(2) NULL,
+        ZipCode NVARCHAR(10) NULL,
+        PhoneNumber NVARCHAR(20) NULL,
+        EmailAddress NVARCHAR(255) NULL,
+        Status NVARCHAR(50) NULL,
+        AccreditationStatus NVARCHAR(100) NULL,
+        IsActive BIT NULL,
+        INDEX IX_EntityStaging_RefreshID (RefreshID)
+    );
+    PRINT 'Table cred.EntityStaging created successfully';
+END
+GO
+
 PRINT 'All tables created successfully';
 GO
 
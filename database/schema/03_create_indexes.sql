@@ -84,6 +84,12 @@ IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationResults_Rule
     CREATE NONCLUSTERED INDEX IX_ValidationResults_RuleCode ON cred.ValidationResults(RuleCode);
 GO
 
+-- Run-over-run diffs match one run's issues against another's by IssueKey
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationResults_RunIssueKey')
+    CREATE NONCLUSTERED INDEX IX_ValidationResults_RunIssueKey ON cred.ValidationResults(ValidationRunID, IssueKey)
+    INCLUDE (ValidationStatus, Resolved);
+GO
+
 -- =============================================
 -- Indexes on ValidationRunLog Table
 -- =============================================
@@ -91,6 +97,77 @@ IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationRunLog_RunSt
     CREATE NONCLUSTERED INDEX IX_ValidationRunLog_RunStartTime ON cred.ValidationRunLog(RunStartTime DESC);
 GO
 
+-- =============================================
+-- Indexes on ValidationRuleRunStats Table
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationRuleRunStats_RunID')
+    CREATE NONCLUSTERED INDEX IX_ValidationRuleRunStats_RunID ON cred.ValidationRuleRunStats(ValidationRunID, RuleID)
+    INCLUDE (EntityType, PassCount, FailCount, WarningCount);
+GO
+
+-- =============================================
+-- Indexes on ValidationRunCheckpoint Table
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationRunCheckpoint_RunStatus')
+    CREATE NONCLUSTERED INDEX IX_ValidationRunCheckpoint_RunStatus ON cred.ValidationRunCheckpoint(ValidationRunID, CheckpointStatus);
+GO
+
+-- =============================================
+-- Indexes on ValidationRuleTiming Table
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationRuleTiming_RuleRun')
+    CREATE NONCLUSTERED INDEX IX_ValidationRuleTiming_RuleRun ON cred.ValidationRuleTiming(RuleID, ValidationRunID)
+    INCLUDE (ElapsedMs, RowsScanned, RowsEmitted, IsolatedTiming);
+GO
+
+-- =============================================
+-- Indexes on ValidationDailyRollup and EntityQualityDaily Tables
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationDailyRollup_RunID')
+    CREATE NONCLUSTERED INDEX IX_ValidationDailyRollup_RunID ON cred.ValidationDailyRollup(ValidationRunID);
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_EntityQualityDaily_RunID')
+    CREATE NONCLUSTERED INDEX IX_EntityQualityDaily_RunID ON cred.EntityQualityDaily(ValidationRunID);
+GO
+
+-- =============================================
+-- Indexes on ValidationRunDelta Table
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_ValidationRunDelta_RunStatus')
+    CREATE NONCLUSTERED INDEX IX_ValidationRunDelta_RunStatus ON cred.ValidationRunDelta(ValidationRunID, DeltaStatus)
+    INCLUDE (RuleCode, EntityType, EntityID, Severity);
+GO
+
+-- =============================================
+-- Indexes on DuplicateCandidates Table
+-- =============================================
+-- Best candidate of a record, read by the ProviderDuplicate and EntityDuplicate rule sources
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_DuplicateCandidates_RunEntity')
+    CREATE NONCLUSTERED INDEX IX_DuplicateCandidates_RunEntity ON cred.DuplicateCandidates(ValidationRunID, EntityType, EntityID, MatchScore DESC)
+    INCLUDE (CandidateEntityID, MatchedOn);
+GO
+
+-- =============================================
+-- Indexes on CredentialExpirationIndex Table
+-- =============================================
+-- Keyed lookups of the incremental refresh
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_CredentialExpirationIndex_CredentialID')
+    CREATE UNIQUE NONCLUSTERED INDEX IX_CredentialExpirationIndex_CredentialID ON cred.CredentialExpirationIndex(CredentialID);
+GO
+
+-- Rows changed since a reader's last refresh (expiration_index.py)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_CredentialExpirationIndex_IndexedDate')
+    CREATE NONCLUSTERED INDEX IX_CredentialExpirationIndex_IndexedDate ON cred.CredentialExpirationIndex(IndexedDate);
+GO
+
+-- =============================================
+-- Indexes on CredentialExpiryCalendar Table
+-- =============================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_CredentialExpiryCalendar_Date')
+    CREATE CLUSTERED INDEX IX_CredentialExpiryCalendar_Date ON cred.CredentialExpiryCalendar(ExpirationDate);
+GO
+
 -- =============================================
 -- Indexes on DataRefreshLog Table
 -- =============================================
@@ -98,6 +175,12 @@ IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_DataRefreshLog_Refresh
     CREATE NONCLUSTERED INDEX IX_DataRefreshLog_RefreshStartTime ON cred.DataRefreshLog(RefreshStartTime DESC);
 GO
 
+-- Tables changed since a run, read by cred.sp_ScheduleValidationRules
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_DataRefreshLog_TargetTable')
+    CREATE NONCLUSTERED INDEX IX_DataRefreshLog_TargetTable ON cred.DataRefreshLog(TargetTable, RefreshEndTime)
+    INCLUDE (RefreshStartTime, RefreshStatus, RecordsInserted, RecordsUpdated, RecordsDeleted);
+GO
+
 PRINT 'All indexes created successfully';
 GO
 
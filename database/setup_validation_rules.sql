@@ -15,28 +15,68 @@ PRINT 'Step 1: Populating Validation Rules...';
 :r database/validation_rules/populate_validation_rules.sql
 GO
 
--- Step 2: Create Provider Validation Stored Procedure
-PRINT 'Step 2: Creating Provider Validation Stored Procedure...';
+-- Step 2: Create Result Storage Stored Procedure
+PRINT 'Step 2: Creating Result Storage Stored Procedure...';
+:r database/validation_rules/result_storage.sql
+GO
+
+-- Step 3: Create Rule Scheduler Functions and Stored Procedures
+PRINT 'Step 3: Creating Rule Scheduler Functions and Stored Procedures...';
+:r database/validation_rules/rule_scheduler.sql
+GO
+
+-- Step 4: Create Rule Compiler Stored Procedures
+PRINT 'Step 4: Creating Rule Compiler Stored Procedures...';
+:r database/validation_rules/rule_compiler.sql
+GO
+
+-- Step 5: Create Credential Expiration Index Stored Procedures
+PRINT 'Step 5: Creating Credential Expiration Index Stored Procedures...';
+:r database/validation_rules/credential_expiration.sql
+GO
+
+-- Step 6: Create Incremental Validation Functions and Stored Procedures
+PRINT 'Step 6: Creating Incremental Validation Functions and Stored Procedures...';
+:r database/validation_rules/incremental_validation.sql
+GO
+
+-- Step 7: Create Provider Validation Stored Procedure
+PRINT 'Step 7: Creating Provider Validation Stored Procedure...';
 :r database/validation_rules/provider_validations.sql
 GO
 
--- Step 3: Create Credential Validation Stored Procedure
-PRINT 'Step 3: Creating Credential Validation Stored Procedure...';
+-- Step 8: Create Credential Validation Stored Procedure
+PRINT 'Step 8: Creating Credential Validation Stored Procedure...';
 :r database/validation_rules/credential_validations.sql
 GO
 
--- Step 4: Create Entity Validation Stored Procedure
-PRINT 'Step 4: Creating Entity Validation Stored Procedure...';
+-- Step 9: Create Entity Validation Stored Procedure
+PRINT 'Step 9: Creating Entity Validation Stored Procedure...';
 :r database/validation_rules/entity_validations.sql
 GO
 
--- Step 5: Create Cross-Entity Validation Stored Procedure
-PRINT 'Step 5: Creating Cross-Entity Validation Stored Procedure...';
+-- Step 10: Create Cross-Entity Validation Stored Procedure
+PRINT 'Step 10: Creating Cross-Entity Validation Stored Procedure...';
 :r database/validation_rules/cross_entity_validations.sql
 GO
 
--- Step 6: Create Master Validation Runner Stored Procedure
-PRINT 'Step 6: Creating Master Validation Runner Stored Procedure...';
+-- Step 11: Create Duplicate Detection Stored Procedures
+PRINT 'Step 11: Creating Duplicate Detection Stored Procedures...';
+:r database/validation_rules/duplicate_detection.sql
+GO
+
+-- Step 12: Create Validation Rollup Stored Procedure
+PRINT 'Step 12: Creating Validation Rollup Stored Procedure...';
+:r database/validation_rules/validation_rollups.sql
+GO
+
+-- Step 13: Create Run Diff Stored Procedure
+PRINT 'Step 13: Creating Run Diff Stored Procedure...';
+:r database/validation_rules/run_diff.sql
+GO
+
+-- Step 14: Create Master Validation Runner Stored Procedure
+PRINT 'Step 14: Creating Master Validation Runner Stored Procedure...';
 :r database/validation_rules/master_validation_runner.sql
 GO
 
@@ -0,0 +1,216 @@
+-- Credential Expiration Index
+-- Keeps credentials in expiration date order so expiry questions are answered
+-- with a range seek instead of a scan of cred.Credentials, and publishes the
+-- forward expiry calendar
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Function: Credentials Expiring
+-- Indexed credentials expiring between @FromDate and @ToDate (inclusive): a
+-- range seek on the index's clustered key. Reflects the last index refresh.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.fn_CredentialsExpiring') AND type in (N'IF'))
+    DROP FUNCTION cred.fn_CredentialsExpiring;
+GO
+
+CREATE FUNCTION cred.fn_CredentialsExpiring (@FromDate DATE, @ToDate DATE)
+RETURNS TABLE
+AS
+RETURN
+    SELECT x.CredentialID, x.ExpirationDate, x.ProviderID, x.EntityID, x.StateIssued,
+           x.CredentialType, x.Status, x.IsPrimary
+    FROM cred.CredentialExpirationIndex x
+    WHERE x.ExpirationDate BETWEEN @FromDate AND @ToDate
+      AND x.IsRemoved = 0;
+GO
+
+PRINT 'Function cred.fn_CredentialsExpiring created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Refresh Credential Expiration Index
+-- Brings cred.CredentialExpirationIndex up to date with the credentials, and
+-- the providers, modified since the last completed refresh (all of them with
+-- @Full = 1 or on the first refresh), then rebuilds cred.CredentialExpiryCalendar.
+-- Only rows whose values changed are written, with a new IndexedDate. Deleted
+-- credentials are found by a key anti-join and kept as IsRemoved rows for
+-- @RetainRemovedDays. Each refresh is logged to DataRefreshLog, whose last
+-- Completed entry is the next refresh's starting point. Joins the caller's
+-- transaction when there is one.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RefreshCredentialExpirationIndex') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RefreshCredentialExpirationIndex;
+GO
+
+CREATE PROCEDURE cred.sp_RefreshCredentialExpirationIndex
+    @Full BIT = 0,
+    @CalendarDays INT = 365,
+    @RetainRemovedDays INT = 30
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @RefreshID INT;
+    DECLARE @RefreshStartTime DATETIME2 = GETDATE();
+    DECLARE @Since DATETIME2 = NULL;
+    DECLARE @Today DATE = CAST(GETDATE() AS DATE);
+    DECLARE @Processed INT = 0;
+    DECLARE @Inserted INT = 0;
+    DECLARE @Updated INT = 0;
+    DECLARE @Removed INT = 0;
+    DECLARE @OwnTransaction BIT = 0;
+    DECLARE @ErrorMessage NVARCHAR(MAX);
+
+    IF @Full = 0
+        SELECT @Since = MAX(RefreshStartTime)
+        FROM cred.DataRefreshLog
+        WHERE SourceSystem = 'CredentialExpirationIndex' AND RefreshStatus = 'Completed';
+
+    INSERT INTO cred.DataRefreshLog (RefreshStartTime, RefreshStatus, SourceSystem)
+    VALUES (@RefreshStartTime, 'Running', 'CredentialExpirationIndex');
+
+    SET @RefreshID = SCOPE_IDENTITY();
+
+    BEGIN TRY
+        IF @@TRANCOUNT = 0
+        BEGIN
+            BEGIN TRANSACTION;
+            SET @OwnTransaction = 1;
+        END
+
+        -- Current values of the credentials that may have changed
+        SELECT
+            c.CredentialID,
+            c.ExpirationDate,
+            c.ProviderID,
+            p.EntityID,
+            c.StateIssued,
+            c.CredentialType,
+            c.Status,
+            c.IsPrimary
+        INTO #Changed
+        FROM cred.Credentials c
+        LEFT JOIN cred.Providers p ON c.ProviderID = p.ProviderID
+        WHERE @Since IS NULL
+           OR c.ModifiedDate >= @Since
+           OR c.CreatedDate >= @Since
+           OR p.ModifiedDate >= @Since; -- The provider may have moved to another entity
+
+        SET @Processed = @@ROWCOUNT;
+
+        CREATE UNIQUE CLUSTERED INDEX IX_Changed ON #Changed (CredentialID);
+
+        UPDATE x
+        SET ExpirationDate = ch.ExpirationDate,
+            ProviderID = ch.ProviderID,
+            EntityID = ch.EntityID,
+            StateIssued = ch.StateIssued,
+            CredentialType = ch.CredentialType,
+            Status = ch.Status,
+            IsPrimary = ch.IsPrimary,
+            IsRemoved = 0,
+            IndexedDate = @RefreshStartTime
+        FROM cred.CredentialExpirationIndex x
+        INNER JOIN #Changed ch ON ch.CredentialID = x.CredentialID
+        WHERE ch.ExpirationDate IS NOT NULL
+          AND (x.IsRemoved = 1
+               OR EXISTS (SELECT x.ExpirationDate, x.ProviderID, x.EntityID, x.StateIssued, x.CredentialType, x.Status, x.IsPrimary
+                          EXCEPT
+                          SELECT ch.ExpirationDate, ch.ProviderID, ch.EntityID, ch.StateIssued, ch.CredentialType, ch.Status, ch.IsPrimary));
+
+        SET @Updated = @@ROWCOUNT;
+
+        INSERT INTO cred.CredentialExpirationIndex (
+            ExpirationDate, CredentialID, ProviderID, EntityID, StateIssued, CredentialType, Status, IsPrimary,
+            IsRemoved, IndexedDate
+        )
+        SELECT ch.ExpirationDate, ch.CredentialID, ch.ProviderID, ch.EntityID, ch.StateIssued, ch.CredentialType,
+               ch.Status, ch.IsPrimary, 0, @RefreshStartTime
+        FROM #Changed ch
+        WHERE ch.ExpirationDate IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM cred.CredentialExpirationIndex x WHERE x.CredentialID = ch.CredentialID);
+
+        SET @Inserted = @@ROWCOUNT;
+
+        -- Credentials whose expiration date was cleared, and deleted credentials
+        UPDATE x
+        SET IsRemoved = 1,
+            IndexedDate = @RefreshStartTime
+        FROM cred.CredentialExpirationIndex x
+        WHERE x.IsRemoved = 0
+          AND (EXISTS (SELECT 1 FROM #Changed ch WHERE ch.CredentialID = x.CredentialID AND ch.ExpirationDate IS NULL)
+               OR NOT EXISTS (SELECT 1 FROM cred.Credentials c WHERE c.CredentialID = x.CredentialID));
+
+        SET @Removed = @@ROWCOUNT;
+
+        DELETE FROM cred.CredentialExpirationIndex
+        WHERE IsRemoved = 1
+          AND IndexedDate < DATEADD(DAY, -@RetainRemovedDays, @RefreshStartTime);
+
+        -- Forward calendar, with the past-due credentials not yet marked Expired
+        DELETE FROM cred.CredentialExpiryCalendar;
+
+        INSERT INTO cred.CredentialExpiryCalendar (
+            ExpirationDate, EntityID, StateIssued, CredentialType, Status, CredentialCount, PrimaryCount, CalendarDate
+        )
+        SELECT
+            ExpirationDate,
+            EntityID,
+            StateIssued,
+            CredentialType,
+            Status,
+            COUNT(*),
+            SUM(CASE WHEN IsPrimary = 1 THEN 1 ELSE 0 END),
+            @Today
+        FROM cred.CredentialExpirationIndex
+        WHERE IsRemoved = 0
+          AND ExpirationDate <= DATEADD(DAY, @CalendarDays, @Today)
+          AND (ExpirationDate >= @Today OR ISNULL(Status, '') <> 'Expired')
+        GROUP BY ExpirationDate, EntityID, StateIssued, CredentialType, Status;
+
+        IF @OwnTransaction = 1
+            COMMIT TRANSACTION;
+
+        UPDATE cred.DataRefreshLog
+        SET RefreshEndTime = GETDATE(),
+            RefreshStatus = 'Completed',
+            RecordsProcessed = @Processed,
+            RecordsInserted = @Inserted,
+            RecordsUpdated = @Updated,
+            RecordsDeleted = @Removed,
+            RecordsUnchanged = @Processed - @Inserted - @Updated,
+            ExecutionTimeSeconds = DATEDIFF(SECOND, @RefreshStartTime, GETDATE())
+        WHERE RefreshID = @RefreshID;
+    END TRY
+    BEGIN CATCH
+        SET @ErrorMessage = ERROR_MESSAGE();
+
+        IF @OwnTransaction = 1 AND @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        -- Inside the caller's transaction the log entry is rolled back with it
+        IF @@TRANCOUNT = 0
+            UPDATE cred.DataRefreshLog
+            SET RefreshEndTime = GETDATE(),
+                RefreshStatus = 'Failed',
+                ExecutionTimeSeconds = DATEDIFF(SECOND, @RefreshStartTime, GETDATE()),
+                ErrorMessage = @ErrorMessage
+            WHERE RefreshID = @RefreshID;
+
+        THROW;
+    END CATCH
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RefreshCredentialExpirationIndex created successfully';
+GO
+
+-- Example usage (the index is refreshed by cred.sp_BeginValidationRun):
+-- EXEC cred.sp_RefreshCredentialExpirationIndex;
+-- EXEC cred.sp_RefreshCredentialExpirationIndex @Full = 1; -- Recheck every credential
+-- SELECT StateIssued, COUNT(*) AS Expiring
+-- FROM cred.fn_CredentialsExpiring('2026-01-01', '2026-03-31')
+-- WHERE Status = 'Active'
+-- GROUP BY StateIssued;
@@ -0,0 +1,239 @@
+-- Duplicate Detection
+-- Finds providers and entities that are probably the same real-world record
+-- loaded under different identifiers, without comparing every pair of records
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Stored Procedure: Pair Duplicate Blocks
+-- Reads the caller's #Blocks (BlockKey, EntityID) table and writes every pair
+-- of records sharing a block to the caller's #Pairs table once, lower ID
+-- first. Blocks of a single record or of more than @MaxBlockSize records are
+-- dropped first.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_PairDuplicateBlocks') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_PairDuplicateBlocks;
+GO
+
+CREATE PROCEDURE cred.sp_PairDuplicateBlocks
+    @MaxBlockSize INT = 100
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DELETE FROM #Blocks
+    WHERE BlockKey IN (SELECT BlockKey
+                       FROM #Blocks
+                       GROUP BY BlockKey
+                       HAVING COUNT(*) = 1 OR COUNT(*) > @MaxBlockSize);
+
+    INSERT INTO #Pairs (EntityID1, EntityID2)
+    SELECT DISTINCT a.EntityID, b.EntityID
+    FROM #Blocks a
+    INNER JOIN #Blocks b ON b.BlockKey = a.BlockKey AND b.EntityID > a.EntityID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_PairDuplicateBlocks created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Refresh Duplicate Candidates
+-- Writes the run's scored candidate pairs to cred.DuplicateCandidates.
+-- Active records are grouped by blocking keys and only records sharing a key
+-- are compared, so the work follows the block sizes rather than the square of
+-- the table size:
+--   Providers - SOUNDEX(last name) + date of birth, ZIP + last name + first
+--               initial, date of birth + first name, SSN
+--   Entities  - ZIP + SOUNDEX(name), name, ZIP + address line 1, phone number
+-- Names and addresses are compared upper-cased without spaces or punctuation.
+-- Blocks of more than @MaxBlockSize records (placeholder values shared by many
+-- records) are skipped. Each pair is scored 0-100 from the fields that agree
+-- and kept from @MinScore. Pairs the exact uniqueness rules already report
+-- (same provider NPI: PRV013; same entity TaxID or NPI: ENT002, ENT004) are
+-- left out. Candidates of earlier runs are removed unless the run can still
+-- be resumed. rule_engine.py (duplicate_detection.py) mirrors these keys and
+-- weights.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RefreshDuplicateCandidates') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RefreshDuplicateCandidates;
+GO
+
+CREATE PROCEDURE cred.sp_RefreshDuplicateCandidates
+    @ValidationRunID INT,
+    @MaxBlockSize INT = 100,
+    @MinScore INT = 65 -- Lowest score reported (DUP002, DUP004)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DELETE dc
+    FROM cred.DuplicateCandidates dc
+    WHERE dc.ValidationRunID = @ValidationRunID
+       OR NOT EXISTS (SELECT 1 FROM cred.ValidationRunCheckpoint cp
+                      WHERE cp.ValidationRunID = dc.ValidationRunID AND cp.CheckpointStatus = 'Pending');
+
+    CREATE TABLE #Blocks (BlockKey NVARCHAR(400) NOT NULL, EntityID INT NOT NULL);
+    CREATE CLUSTERED INDEX IX_Blocks ON #Blocks (BlockKey, EntityID);
+    CREATE TABLE #Pairs (EntityID1 INT NOT NULL, EntityID2 INT NOT NULL);
+
+    -- Providers
+    SELECT
+        p.ProviderID AS EntityID,
+        UPPER(LTRIM(RTRIM(p.NPI))) AS NPI,
+        n.LastKey,
+        SOUNDEX(n.LastKey) AS LastSound,
+        n.FirstKey,
+        SOUNDEX(n.FirstKey) AS FirstSound,
+        p.DateOfBirth,
+        NULLIF(NULLIF(REPLACE(p.SSN, '-', ''), ''), '000000000') AS SSNKey,
+        NULLIF(LEFT(REPLACE(p.ZipCode, '-', ''), 5), '') AS Zip5,
+        NULLIF(REPLACE(TRANSLATE(p.PhoneNumber, '()-.+', '     '), ' ', ''), '') AS PhoneKey,
+        NULLIF(LOWER(LTRIM(RTRIM(p.EmailAddress))), '') AS EmailKey
+    INTO #Providers
+    FROM cred.Providers p
+    CROSS APPLY (SELECT
+        NULLIF(REPLACE(TRANSLATE(UPPER(p.LastName), '.,''-&/#', '       '), ' ', ''), '') AS LastKey,
+        NULLIF(REPLACE(TRANSLATE(UPPER(p.FirstName), '.,''-&/#', '       '), ' ', ''), '') AS FirstKey
+    ) n
+    WHERE p.IsActive = 1;
+
+    CREATE UNIQUE CLUSTERED INDEX IX_Providers ON #Providers (EntityID);
+
+    INSERT INTO #Blocks (BlockKey, EntityID)
+    SELECT LEFT(k.BlockKey, 400), p.EntityID
+    FROM #Providers p
+    CROSS APPLY (VALUES
+        (N'S|' + p.LastSound + N'|' + CONVERT(NCHAR(8), p.DateOfBirth, 112)),
+        (N'Z|' + p.Zip5 + N'|' + p.LastKey + N'|' + LEFT(p.FirstKey, 1)),
+        (N'D|' + CONVERT(NCHAR(8), p.DateOfBirth, 112) + N'|' + p.FirstKey),
+        (N'N|' + p.SSNKey)
+    ) k (BlockKey)
+    WHERE k.BlockKey IS NOT NULL;
+
+    EXEC cred.sp_PairDuplicateBlocks @MaxBlockSize = @MaxBlockSize;
+
+    INSERT INTO cred.DuplicateCandidates (ValidationRunID, EntityType, EntityID, CandidateEntityID, MatchScore, MatchedOn)
+    SELECT @ValidationRunID, 'Provider', d.EntityID, d.CandidateEntityID, s.MatchScore, f.MatchedOn
+    FROM #Pairs pr
+    INNER JOIN #Providers a ON a.EntityID = pr.EntityID1
+    INNER JOIN #Providers b ON b.EntityID = pr.EntityID2
+    CROSS APPLY (SELECT
+        CASE WHEN a.LastKey = b.LastKey THEN 30 WHEN a.LastSound = b.LastSound THEN 20 ELSE 0 END
+        + CASE WHEN a.FirstKey = b.FirstKey THEN 20 WHEN a.FirstSound = b.FirstSound THEN 10 ELSE 0 END
+        + CASE WHEN a.DateOfBirth = b.DateOfBirth THEN 30 ELSE 0 END
+        + CASE WHEN a.SSNKey = b.SSNKey THEN 40 ELSE 0 END
+        + CASE WHEN a.Zip5 = b.Zip5 THEN 10 ELSE 0 END
+        + CASE WHEN a.PhoneKey = b.PhoneKey THEN 10 ELSE 0 END
+        + CASE WHEN a.EmailKey = b.EmailKey THEN 15 ELSE 0 END AS Points,
+        CONCAT_WS(', ',
+            CASE WHEN a.LastKey = b.LastKey THEN 'LastName' WHEN a.LastSound = b.LastSound THEN 'LastName (phonetic)' END,
+            CASE WHEN a.FirstKey = b.FirstKey THEN 'FirstName' WHEN a.FirstSound = b.FirstSound THEN 'FirstName (phonetic)' END,
+            CASE WHEN a.DateOfBirth = b.DateOfBirth THEN 'DateOfBirth' END,
+            CASE WHEN a.SSNKey = b.SSNKey THEN 'SSN' END,
+            CASE WHEN a.Zip5 = b.Zip5 THEN 'ZipCode' END,
+            CASE WHEN a.PhoneKey = b.PhoneKey THEN 'PhoneNumber' END,
+            CASE WHEN a.EmailKey = b.EmailKey THEN 'EmailAddress' END) AS MatchedOn
+    ) f
+    CROSS APPLY (SELECT CASE WHEN f.Points > 100 THEN 100 ELSE f.Points END AS MatchScore) s
+    CROSS APPLY (VALUES (pr.EntityID1, pr.EntityID2), (pr.EntityID2, pr.EntityID1)) d (EntityID, CandidateEntityID)
+    WHERE s.MatchScore >= @MinScore
+      AND (a.NPI IS NULL OR b.NPI IS NULL OR a.NPI <> b.NPI);
+
+    TRUNCATE TABLE #Blocks;
+    TRUNCATE TABLE #Pairs;
+
+    -- Entities
+    SELECT
+        e.EntityID,
+        UPPER(LTRIM(RTRIM(e.NPI))) AS NPI,
+        UPPER(LTRIM(RTRIM(e.TaxID))) AS TaxID,
+        n.NameKey,
+        SOUNDEX(n.NameKey) AS NameSound,
+        NULLIF(LEFT(REPLACE(e.ZipCode, '-', ''), 5), '') AS Zip5,
+        NULLIF(REPLACE(TRANSLATE(UPPER(e.AddressLine1), '.,''-&/#', '       '), ' ', ''), '') AS AddressKey,
+        NULLIF(REPLACE(TRANSLATE(e.PhoneNumber, '()-.+', '     '), ' ', ''), '') AS PhoneKey,
+        NULLIF(LOWER(LTRIM(RTRIM(e.EmailAddress))), '') AS EmailKey
+    INTO #Entities
+    FROM cred.Entities e
+    CROSS APPLY (SELECT
+        NULLIF(REPLACE(TRANSLATE(UPPER(e.EntityName), '.,''-&/#', '       '), ' ', ''), '') AS NameKey
+    ) n
+    WHERE e.IsActive = 1;
+
+    CREATE UNIQUE CLUSTERED INDEX IX_Entities ON #Entities (EntityID);
+
+    INSERT INTO #Blocks (BlockKey, EntityID)
+    SELECT LEFT(k.BlockKey, 400), e.EntityID
+    FROM #Entities e
+    CROSS APPLY (VALUES
+        (N'Z|' + e.Zip5 + N'|' + e.NameSound),
+        (N'N|' + e.NameKey),
+        (N'A|' + e.Zip5 + N'|' + e.AddressKey),
+        (N'P|' + e.PhoneKey)
+    ) k (BlockKey)
+    WHERE k.BlockKey IS NOT NULL;
+
+    EXEC cred.sp_PairDuplicateBlocks @MaxBlockSize = @MaxBlockSize;
+
+    INSERT INTO cred.DuplicateCandidates (ValidationRunID, EntityType, EntityID, CandidateEntityID, MatchScore, MatchedOn)
+    SELECT @ValidationRunID, 'Entity', d.EntityID, d.CandidateEntityID, s.MatchScore, f.MatchedOn
+    FROM #Pairs pr
+    INNER JOIN #Entities a ON a.EntityID = pr.EntityID1
+    INNER JOIN #Entities b ON b.EntityID = pr.EntityID2
+    CROSS APPLY (SELECT
+        CASE WHEN a.NameKey = b.NameKey THEN 40 WHEN a.NameSound = b.NameSound THEN 20 ELSE 0 END
+        + CASE WHEN a.Zip5 = b.Zip5 THEN 15 ELSE 0 END
+        + CASE WHEN a.AddressKey = b.AddressKey THEN 25 ELSE 0 END
+        + CASE WHEN a.PhoneKey = b.PhoneKey THEN 20 ELSE 0 END
+        + CASE WHEN a.EmailKey = b.EmailKey THEN 10 ELSE 0 END AS Points,
+        CONCAT_WS(', ',
+            CASE WHEN a.NameKey = b.NameKey THEN 'EntityName' WHEN a.NameSound = b.NameSound THEN 'EntityName (phonetic)' END,
+            CASE WHEN a.Zip5 = b.Zip5 THEN 'ZipCode' END,
+            CASE WHEN a.AddressKey = b.AddressKey THEN 'AddressLine1' END,
+            CASE WHEN a.PhoneKey = b.PhoneKey THEN 'PhoneNumber' END,
+            CASE WHEN a.EmailKey = b.EmailKey THEN 'EmailAddress' END) AS MatchedOn
+    ) f
+    CROSS APPLY (SELECT CASE WHEN f.Points > 100 THEN 100 ELSE f.Points END AS MatchScore) s
+    CROSS APPLY (VALUES (pr.EntityID1, pr.EntityID2), (pr.EntityID2, pr.EntityID1)) d (EntityID, CandidateEntityID)
+    WHERE s.MatchScore >= @MinScore
+      AND (a.TaxID IS NULL OR b.TaxID IS NULL OR a.TaxID <> b.TaxID)
+      AND (a.NPI IS NULL OR b.NPI IS NULL OR a.NPI <> b.NPI);
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RefreshDuplicateCandidates created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Run Duplicate Validations
+-- Reports each record's best candidate (DUP001 - DUP004); the run's
+-- candidates must have been refreshed first
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunDuplicateValidations') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RunDuplicateValidations;
+GO
+
+CREATE PROCEDURE cred.sp_RunDuplicateValidations
+    @ValidationRunID INT,
+    @ResultMode NVARCHAR(20) = 'Full',
+    @ProfileRules BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    EXEC cred.sp_RunRuleCategory
+        @RuleCategory = 'Duplicate',
+        @ValidationRunID = @ValidationRunID,
+        @ResultMode = @ResultMode,
+        @ProfileRules = @ProfileRules;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RunDuplicateValidations created successfully';
+GO
+
+-- Example usage (candidates are refreshed by cred.sp_BeginValidationRun):
+-- EXEC cred.sp_RefreshDuplicateCandidates @ValidationRunID = 42;
+-- SELECT TOP 100 * FROM cred.DuplicateCandidates WHERE ValidationRunID = 42 ORDER BY MatchScore DESC;
@@ -0,0 +1,413 @@
+-- Incremental Validation
+-- Scopes a validation run to records changed since the previous completed run
+-- and carries forward the previous outcomes of everything else
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Functions: Scoped Providers / Credentials / Entities
+-- Base row sources for the validation rules. A full run sees every row;
+-- an incremental run (ValidationRunLog.IncrementalSince set) sees only the
+-- rows listed in ValidationRunScope for that run.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.fn_ScopedProviders') AND type in (N'IF'))
+    DROP FUNCTION cred.fn_ScopedProviders;
+GO
+
+CREATE FUNCTION cred.fn_ScopedProviders (@ValidationRunID INT)
+RETURNS TABLE
+AS
+RETURN
+    SELECT p.*
+    FROM cred.Providers p
+    WHERE NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog r
+                      WHERE r.RunID = @ValidationRunID AND r.IncrementalSince IS NOT NULL)
+       OR EXISTS (SELECT 1 FROM cred.ValidationRunScope s
+                  WHERE s.ValidationRunID = @ValidationRunID AND s.EntityType = 'Provider' AND s.EntityID = p.ProviderID);
+GO
+
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.fn_ScopedCredentials') AND type in (N'IF'))
+    DROP FUNCTION cred.fn_ScopedCredentials;
+GO
+
+CREATE FUNCTION cred.fn_ScopedCredentials (@ValidationRunID INT)
+RETURNS TABLE
+AS
+RETURN
+    SELECT c.*
+    FROM cred.Credentials c
+    WHERE NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog r
+                      WHERE r.RunID = @ValidationRunID AND r.IncrementalSince IS NOT NULL)
+       OR EXISTS (SELECT 1 FROM cred.ValidationRunScope s
+                  WHERE s.ValidationRunID = @ValidationRunID AND s.EntityType = 'Credential' AND s.EntityID = c.CredentialID);
+GO
+
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.fn_ScopedEntities') AND type in (N'IF'))
+    DROP FUNCTION cred.fn_ScopedEntities;
+GO
+
+CREATE FUNCTION cred.fn_ScopedEntities (@ValidationRunID INT)
+RETURNS TABLE
+AS
+RETURN
+    SELECT e.*
+    FROM cred.Entities e
+    WHERE NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog r
+                      WHERE r.RunID = @ValidationRunID AND r.IncrementalSince IS NOT NULL)
+       OR EXISTS (SELECT 1 FROM cred.ValidationRunScope s
+                  WHERE s.ValidationRunID = @ValidationRunID AND s.EntityType = 'Entity' AND s.EntityID = e.EntityID);
+GO
+
+PRINT 'Scoped validation functions created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Build Incremental Scope
+-- Fills ValidationRunScope with every record whose outcome may differ from
+-- the previous run:
+--   1. records created or modified since @Since
+--   2. unchanged records whose date-relative rules crossed a threshold
+--      between @Since and @AsOf (expiry windows, future dates, stale checks)
+--   3. records that cross-entity, duplicate and reference rules read
+--      alongside the records from steps 1 and 2, including the fuzzy
+--      duplicate candidates scored for this run, and the former parents of
+--      records moved or deleted since the previous run (from the
+--      ValidationParentLink keys of @ResultMode)
+--   4. records holding a previous uniqueness exception, so a duplicate
+--      partner that changed clears the exception on both sides
+-- Each scoped record is stored with its current parent key, and deleted
+-- records are stored flagged, so sp_CompleteValidationRun can bring
+-- ValidationParentLink forward without rereading the base tables.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_BuildIncrementalScope') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_BuildIncrementalScope;
+GO
+
+CREATE PROCEDURE cred.sp_BuildIncrementalScope
+    @ValidationRunID INT,
+    @PreviousRunID INT,
+    @Since DATETIME2,
+    @AsOf DATETIME2,
+    @ResultMode NVARCHAR(20) = 'Full'
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    CREATE TABLE #Direct (EntityType NVARCHAR(50) NOT NULL, EntityID INT NOT NULL);
+    CREATE TABLE #Scope (EntityType NVARCHAR(50) NOT NULL, EntityID INT NOT NULL);
+
+    -- Records in the previous run's parent keys that no longer exist
+    SELECT l.EntityType, l.EntityID, l.ParentID
+    INTO #Deleted
+    FROM cred.ValidationParentLink l
+    WHERE l.ResultMode = @ResultMode
+      AND NOT EXISTS (SELECT 1 FROM cred.Providers p WHERE l.EntityType = 'Provider' AND p.ProviderID = l.EntityID)
+      AND NOT EXISTS (SELECT 1 FROM cred.Credentials c WHERE l.EntityType = 'Credential' AND c.CredentialID = l.EntityID)
+      AND NOT EXISTS (SELECT 1 FROM cred.Entities e WHERE l.EntityType = 'Entity' AND e.EntityID = l.EntityID);
+
+    -- 1. Records created or modified since the previous run
+    INSERT INTO #Direct (EntityType, EntityID)
+    SELECT 'Provider', ProviderID FROM cred.Providers WHERE ModifiedDate >= @Since OR CreatedDate >= @Since
+    UNION ALL
+    SELECT 'Credential', CredentialID FROM cred.Credentials WHERE ModifiedDate >= @Since OR CreatedDate >= @Since
+    UNION ALL
+    SELECT 'Entity', EntityID FROM cred.Entities WHERE ModifiedDate >= @Since OR CreatedDate >= @Since;
+
+    -- 2. Date thresholds crossed since the previous run
+    -- Credentials: expired / expiring within 30, 60, 90 days (CRED006, CRED012, CRED013,
+    -- CRED031, CRED032, CROSS007, CROSS013, CROSS016), expiry beyond 20 years (CRED007),
+    -- future issue date (CRED008), issued over 50 years ago (CRED009),
+    -- future verification date (CRED017). Expiry windows are range seeks on
+    -- the credential expiration index, which sp_BeginValidationRun refreshes
+    -- first; credentials changed since @Since are already in step 1
+    INSERT INTO #Direct (EntityType, EntityID)
+    SELECT 'Credential', x.CredentialID
+    FROM (VALUES (0), (30), (60), (90)) w(Days)
+    CROSS APPLY cred.fn_CredentialsExpiring(CAST(DATEADD(DAY, w.Days, @Since) AS DATE),
+                                            CAST(DATEADD(DAY, w.Days, @AsOf) AS DATE)) x
+    UNION ALL
+    SELECT 'Credential', x.CredentialID
+    FROM cred.fn_CredentialsExpiring(CAST(DATEADD(YEAR, 20, @Since) AS DATE),
+                                     CAST(DATEADD(YEAR, 20, @AsOf) AS DATE)) x
+    UNION ALL
+    SELECT 'Credential', CredentialID FROM cred.Credentials
+    WHERE IssueDate BETWEEN CAST(@Since AS DATE) AND @AsOf
+       OR IssueDate BETWEEN CAST(DATEADD(YEAR, -50, @Since) AS DATE) AND DATEADD(YEAR, -50, @AsOf)
+    UNION ALL
+    SELECT 'Credential', CredentialID FROM cred.Credentials
+    WHERE VerificationDate BETWEEN @Since AND @AsOf;
+
+    -- Providers: future date of birth (PRV005), not validated in 90 days (PRV032)
+    INSERT INTO #Direct (EntityType, EntityID)
+    SELECT 'Provider', ProviderID FROM cred.Providers
+    WHERE DateOfBirth BETWEEN CAST(@Since AS DATE) AND @AsOf
+       OR LastValidatedDate BETWEEN DATEADD(DAY, -92, @Since) AND DATEADD(DAY, -90, @AsOf);
+
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT EntityType, EntityID FROM #Direct;
+
+    -- 3. Dependent records
+    -- Entity -> providers linked to it or sharing its NPI (PRV022, CROSS001-003, CROSS009, CROSS014, CROSS015)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Provider', p.ProviderID
+    FROM cred.Providers p
+    INNER JOIN #Direct d ON d.EntityType = 'Entity' AND d.EntityID = p.EntityID
+    UNION ALL
+    SELECT 'Provider', p.ProviderID
+    FROM cred.Providers p
+    INNER JOIN cred.Entities e ON p.NPI = e.NPI
+    INNER JOIN #Direct d ON d.EntityType = 'Entity' AND d.EntityID = e.EntityID;
+
+    -- Entity -> entities sharing its Tax ID or NPI (ENT002, ENT004)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Entity', other.EntityID
+    FROM cred.Entities e
+    INNER JOIN #Direct d ON d.EntityType = 'Entity' AND d.EntityID = e.EntityID
+    INNER JOIN cred.Entities other ON other.TaxID = e.TaxID
+    UNION ALL
+    SELECT 'Entity', other.EntityID
+    FROM cred.Entities e
+    INNER JOIN #Direct d ON d.EntityType = 'Entity' AND d.EntityID = e.EntityID
+    INNER JOIN cred.Entities other ON other.NPI = e.NPI;
+
+    -- Provider -> its credentials (CRED004, CROSS005, CROSS007, CROSS010, CROSS013),
+    -- its entity (CROSS008, CROSS017) and providers sharing its NPI (PRV013)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Credential', c.CredentialID
+    FROM cred.Credentials c
+    INNER JOIN #Direct d ON d.EntityType = 'Provider' AND d.EntityID = c.ProviderID
+    UNION ALL
+    SELECT 'Entity', p.EntityID
+    FROM cred.Providers p
+    INNER JOIN #Direct d ON d.EntityType = 'Provider' AND d.EntityID = p.ProviderID
+    WHERE p.EntityID IS NOT NULL
+    UNION ALL
+    SELECT 'Provider', other.ProviderID
+    FROM cred.Providers p
+    INNER JOIN #Direct d ON d.EntityType = 'Provider' AND d.EntityID = p.ProviderID
+    INNER JOIN cred.Providers other ON other.NPI = p.NPI;
+
+    -- Provider / Entity -> its duplicate candidates this run (DUP001-DUP004)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT dc.EntityType, dc.CandidateEntityID
+    FROM cred.DuplicateCandidates dc
+    INNER JOIN #Direct d ON d.EntityType = dc.EntityType AND d.EntityID = dc.EntityID
+    WHERE dc.ValidationRunID = @ValidationRunID;
+
+    -- Credential -> its provider (PRV035, CRED035, CROSS004, CROSS006, CROSS011, CROSS012, CROSS016)
+    -- and the provider's other credentials (CRED011, CRED022)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Provider', c.ProviderID
+    FROM cred.Credentials c
+    INNER JOIN #Direct d ON d.EntityType = 'Credential' AND d.EntityID = c.CredentialID
+    WHERE c.ProviderID IS NOT NULL
+    UNION ALL
+    SELECT 'Credential', other.CredentialID
+    FROM cred.Credentials c
+    INNER JOIN #Direct d ON d.EntityType = 'Credential' AND d.EntityID = c.CredentialID
+    INNER JOIN cred.Credentials other ON other.ProviderID = c.ProviderID;
+
+    -- Provider moved to another entity or deleted -> its previous entity (CROSS008, CROSS017)
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Entity', l.ParentID
+    FROM cred.ValidationParentLink l
+    INNER JOIN #Direct d ON d.EntityType = 'Provider' AND d.EntityID = l.EntityID
+    INNER JOIN cred.Providers p ON p.ProviderID = l.EntityID
+    WHERE l.ResultMode = @ResultMode
+      AND l.EntityType = 'Provider'
+      AND l.ParentID IS NOT NULL
+      AND (p.EntityID IS NULL OR p.EntityID <> l.ParentID)
+    UNION ALL
+    SELECT 'Entity', ParentID
+    FROM #Deleted
+    WHERE EntityType = 'Provider' AND ParentID IS NOT NULL;
+
+    -- Credential moved to another provider or deleted -> its previous provider (PRV035, CRED035,
+    -- CROSS004, CROSS006, CROSS011, CROSS012, CROSS016) and that provider's credentials (CRED011, CRED022)
+    SELECT l.ParentID AS ProviderID
+    INTO #PreviousProviders
+    FROM cred.ValidationParentLink l
+    INNER JOIN #Direct d ON d.EntityType = 'Credential' AND d.EntityID = l.EntityID
+    INNER JOIN cred.Credentials c ON c.CredentialID = l.EntityID
+    WHERE l.ResultMode = @ResultMode
+      AND l.EntityType = 'Credential'
+      AND l.ParentID IS NOT NULL
+      AND (c.ProviderID IS NULL OR c.ProviderID <> l.ParentID)
+    UNION
+    SELECT ParentID
+    FROM #Deleted
+    WHERE EntityType = 'Credential' AND ParentID IS NOT NULL;
+
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT 'Provider', pp.ProviderID
+    FROM #PreviousProviders pp
+    UNION ALL
+    SELECT 'Credential', c.CredentialID
+    FROM cred.Credentials c
+    INNER JOIN #PreviousProviders pp ON pp.ProviderID = c.ProviderID;
+
+    -- 4. Previous uniqueness exceptions
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT EntityType, EntityID
+    FROM cred.ValidationResults
+    WHERE ValidationRunID = @PreviousRunID
+      AND RuleCode IN ('PRV013', 'ENT002', 'ENT004', 'CRED011', 'CRED022',
+                       'DUP001', 'DUP002', 'DUP003', 'DUP004')
+      AND ValidationStatus <> 'Pass'
+      AND EntityID IS NOT NULL;
+
+    INSERT INTO #Scope (EntityType, EntityID)
+    SELECT EntityType, EntityID FROM #Deleted;
+
+    INSERT INTO cred.ValidationRunScope (ValidationRunID, EntityType, EntityID, ParentID, RecordDeleted)
+    SELECT @ValidationRunID, s.EntityType, s.EntityID,
+           CASE s.EntityType WHEN 'Provider' THEN p.EntityID WHEN 'Credential' THEN c.ProviderID END,
+           CASE WHEN p.ProviderID IS NULL AND c.CredentialID IS NULL AND e.EntityID IS NULL THEN 1 ELSE 0 END
+    FROM (SELECT DISTINCT EntityType, EntityID FROM #Scope) s
+    LEFT JOIN cred.Providers p ON s.EntityType = 'Provider' AND p.ProviderID = s.EntityID
+    LEFT JOIN cred.Credentials c ON s.EntityType = 'Credential' AND c.CredentialID = s.EntityID
+    LEFT JOIN cred.Entities e ON s.EntityType = 'Entity' AND e.EntityID = s.EntityID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_BuildIncrementalScope created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Carry Forward Validation Results
+-- Copies the previous run's detail rows for records outside this run's
+-- scope and adds their counts to ValidationRuleRunStats, so an incremental
+-- run reports the same totals a full run would.
+-- In ExceptionsOnly mode, where the previous passes are only tallies, the
+-- carried passes are worked out from the previous run's tallies: its
+-- outcomes, less those of the in-scope records, less the carried exceptions.
+-- The in-scope records' previous outcomes are taken as the rules that apply
+-- to them now (one AppliesWhen-only scan of the scope per rule source), so a
+-- revalidated record whose applicability changed shifts the carried passes
+-- until the next full run. Deleted records force a full run instead (see
+-- cred.sp_BeginValidationRun).
+-- Rules the run's schedule skipped are carried whole by
+-- cred.sp_CarryForwardSkippedRules instead.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_CarryForwardValidationResults') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_CarryForwardValidationResults;
+GO
+
+CREATE PROCEDURE cred.sp_CarryForwardValidationResults
+    @ValidationRunID INT,
+    @PreviousRunID INT,
+    @ResultMode NVARCHAR(20) = 'Full'
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @RuleCategory NVARCHAR(100);
+    DECLARE @SourceName NVARCHAR(50);
+    DECLARE @Sql NVARCHAR(MAX);
+
+    CREATE TABLE #Carried (
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        EntityType NVARCHAR(50) NULL,
+        ValidationStatus NVARCHAR(20) NOT NULL
+    );
+
+    CREATE TABLE #PreviousInScopeCounts (
+        RuleID INT NOT NULL,
+        EntityType NVARCHAR(50) NULL,
+        ApplicableCount INT NOT NULL
+    );
+
+    IF @ResultMode <> 'Full'
+    BEGIN
+        DECLARE source_cursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT DISTINCT RuleCategory, SourceName
+            FROM cred.fn_ScheduledRules(@ValidationRunID);
+
+        OPEN source_cursor;
+        FETCH NEXT FROM source_cursor INTO @RuleCategory, @SourceName;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            EXEC cred.sp_CompileRuleCategory
+                @RuleCategory = @RuleCategory,
+                @SourceName = @SourceName,
+                @ValidationRunID = @ValidationRunID,
+                @CountPreviousInScope = 1,
+                @Sql = @Sql OUTPUT;
+
+            IF @Sql IS NOT NULL
+                EXEC sp_executesql @Sql, N'@ValidationRunID INT', @ValidationRunID = @ValidationRunID;
+
+            FETCH NEXT FROM source_cursor INTO @RuleCategory, @SourceName;
+        END
+
+        CLOSE source_cursor;
+        DEALLOCATE source_cursor;
+    END
+
+    INSERT INTO cred.ValidationResults (RuleID, RuleCode, ValidationRunID, EntityType, EntityID, RecordID, ValidationStatus,
+                                        ErrorMessage, ErrorDetails, FieldName, FieldValue, Severity,
+                                        Resolved, ResolvedDate, ResolvedBy, ResolutionNotes)
+    OUTPUT INSERTED.RuleID, INSERTED.RuleCode, INSERTED.EntityType, INSERTED.ValidationStatus
+    INTO #Carried (RuleID, RuleCode, EntityType, ValidationStatus)
+    SELECT prev.RuleID, prev.RuleCode, @ValidationRunID, prev.EntityType, prev.EntityID, prev.RecordID, prev.ValidationStatus,
+           prev.ErrorMessage, prev.ErrorDetails, prev.FieldName, prev.FieldValue, prev.Severity,
+           prev.Resolved, prev.ResolvedDate, prev.ResolvedBy, prev.ResolutionNotes
+    FROM cred.ValidationResults prev
+    WHERE prev.ValidationRunID = @PreviousRunID
+      AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunRuleSchedule rs
+                      WHERE rs.ValidationRunID = @ValidationRunID AND rs.RuleID = prev.RuleID AND rs.IsScheduled = 0)
+      -- Outside this run's scope
+      AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunScope s
+                      WHERE s.ValidationRunID = @ValidationRunID
+                        AND s.EntityType = prev.EntityType
+                        AND s.EntityID = prev.EntityID)
+      -- Provider-level credential rules (CRED035) key the row by NPI
+      AND NOT (prev.EntityID IS NULL
+               AND EXISTS (SELECT 1 FROM cred.ValidationRunScope s
+                           INNER JOIN cred.Providers p ON s.EntityID = p.ProviderID
+                           WHERE s.ValidationRunID = @ValidationRunID
+                             AND s.EntityType = 'Provider'
+                             AND p.NPI = prev.RecordID))
+      -- Record still exists
+      AND (   (prev.EntityType = 'Provider' AND EXISTS (SELECT 1 FROM cred.Providers p WHERE p.ProviderID = prev.EntityID))
+           OR (prev.EntityType = 'Credential' AND (prev.EntityID IS NULL
+                                                   OR EXISTS (SELECT 1 FROM cred.Credentials c WHERE c.CredentialID = prev.EntityID)))
+           OR (prev.EntityType = 'Entity' AND EXISTS (SELECT 1 FROM cred.Entities e WHERE e.EntityID = prev.EntityID)));
+
+    INSERT INTO cred.ValidationRuleRunStats (ValidationRunID, RuleID, RuleCode, EntityType, PassCount, FailCount, WarningCount)
+    SELECT @ValidationRunID, ps.RuleID, ps.RuleCode, ps.EntityType,
+           CASE WHEN @ResultMode = 'Full' THEN ISNULL(cf.PassCount, 0)
+                WHEN est.CarriedPasses < 0 THEN 0
+                ELSE est.CarriedPasses
+           END,
+           ISNULL(cf.FailCount, 0),
+           ISNULL(cf.WarningCount, 0)
+    FROM (SELECT stats.RuleID, stats.RuleCode, stats.EntityType,
+                 SUM(stats.PassCount + stats.FailCount + stats.WarningCount) AS OutcomeCount
+          FROM cred.ValidationRuleRunStats stats
+          WHERE stats.ValidationRunID = @PreviousRunID
+            AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunRuleSchedule rs
+                            WHERE rs.ValidationRunID = @ValidationRunID AND rs.RuleID = stats.RuleID AND rs.IsScheduled = 0)
+          GROUP BY stats.RuleID, stats.RuleCode, stats.EntityType) ps
+    LEFT JOIN (SELECT RuleID, EntityType,
+                      SUM(CASE WHEN ValidationStatus = 'Pass' THEN 1 ELSE 0 END) AS PassCount,
+                      SUM(CASE WHEN ValidationStatus = 'Fail' THEN 1 ELSE 0 END) AS FailCount,
+                      SUM(CASE WHEN ValidationStatus = 'Warning' THEN 1 ELSE 0 END) AS WarningCount
+               FROM #Carried
+               GROUP BY RuleID, EntityType) cf
+        ON cf.RuleID = ps.RuleID AND cf.EntityType = ps.EntityType
+    LEFT JOIN (SELECT RuleID, EntityType, SUM(ApplicableCount) AS ApplicableCount
+               FROM #PreviousInScopeCounts
+               GROUP BY RuleID, EntityType) app
+        ON app.RuleID = ps.RuleID AND app.EntityType = ps.EntityType
+    -- Out-of-scope records kept their outcome, so those that are not carried exceptions passed
+    CROSS APPLY (SELECT ps.OutcomeCount - ISNULL(app.ApplicableCount, 0)
+                        - ISNULL(cf.FailCount, 0) - ISNULL(cf.WarningCount, 0) AS CarriedPasses) est;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_CarryForwardValidationResults created successfully';
+GO
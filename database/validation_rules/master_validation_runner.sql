@@ -1,101 +1,511 @@
 -- Master Validation Runner
 -- Executes all validation stored procedures and logs results
+-- Runs are split into units (a rule category on one source, or a shard of it)
+-- checkpointed in cred.ValidationRunCheckpoint. Parallel runners call
+-- sp_BeginValidationRun, plan the units, run them with sp_RunValidationUnit on
+-- their own connections and finish with sp_CompleteValidationRun or sp_FailValidationRun
 
 USE CredentialingDB;
 GO
 
 -- =============================================
--- Stored Procedure: Run All Validations
+-- Stored Procedure: Begin Validation Run
+-- Logs a Running entry, schedules the run's rules, brings the credential
+-- expiration index up to date, scores the run's duplicate candidates and, for
+-- incremental runs, builds the run's scope.
+-- Incremental runs revalidate changes since the last completed run in the
+-- same result mode and fall back to a full run when there is no such run,
+-- when no parent keys were recorded for the mode (ValidationParentLink), or,
+-- in ExceptionsOnly mode, when records were deleted since then.
+-- With @ScheduleRules = 1 only the rules whose outcome can have changed are
+-- evaluated (see cred.sp_ScheduleValidationRules).
 -- =============================================
-IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunAllValidations') AND type in (N'P', N'PC'))
-    DROP PROCEDURE cred.sp_RunAllValidations;
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_BeginValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_BeginValidationRun;
 GO
 
-CREATE PROCEDURE cred.sp_RunAllValidations
-    @RunType NVARCHAR(50) = 'Scheduled'
+CREATE PROCEDURE cred.sp_BeginValidationRun
+    @RunType NVARCHAR(50) = 'Scheduled',
+    @ResultMode NVARCHAR(20) = 'Full',
+    @RunStartTime DATETIME2 = NULL,
+    @ScheduleRules BIT = 0,
+    @MaxSkipDays INT = 7,
+    @CostBudgetMs INT = NULL,
+    @ValidationRunID INT OUTPUT
 AS
 BEGIN
     SET NOCOUNT ON;
     
-    DECLARE @ValidationRunID INT;
-    DECLARE @RunStartTime DATETIME2 = GETDATE();
+    DECLARE @PreviousRunID INT = NULL;
+    DECLARE @IncrementalSince DATETIME2 = NULL;
+    
+    IF @ResultMode NOT IN ('Full', 'ExceptionsOnly')
+        THROW 50001, 'ResultMode must be Full or ExceptionsOnly', 1;
+    
+    SET @RunStartTime = ISNULL(@RunStartTime, GETDATE());
+    
+    IF @RunType = 'Incremental'
+    BEGIN
+        SELECT TOP 1
+            @PreviousRunID = RunID,
+            @IncrementalSince = RunStartTime
+        FROM cred.ValidationRunLog
+        WHERE RunStatus = 'Completed' AND ResultMode = @ResultMode AND RunType <> 'OnDemand'
+        ORDER BY RunStartTime DESC;
+        
+        -- Age rules (PRV006, CRED040) use DATEDIFF(YEAR, ...) and can change for every record at year end;
+        -- moved and deleted records are found from the parent keys. ExceptionsOnly runs keep passes only
+        -- as tallies, so a deleted record's passes cannot be taken off the carried counts
+        IF YEAR(@IncrementalSince) <> YEAR(@RunStartTime)
+           OR NOT EXISTS (SELECT 1 FROM cred.ValidationParentLink WHERE ResultMode = @ResultMode)
+           OR (@ResultMode = 'ExceptionsOnly'
+               AND EXISTS (SELECT 1 FROM cred.ValidationParentLink l
+                           WHERE l.ResultMode = @ResultMode
+                             AND NOT EXISTS (SELECT 1 FROM cred.Providers p WHERE l.EntityType = 'Provider' AND p.ProviderID = l.EntityID)
+                             AND NOT EXISTS (SELECT 1 FROM cred.Credentials c WHERE l.EntityType = 'Credential' AND c.CredentialID = l.EntityID)
+                             AND NOT EXISTS (SELECT 1 FROM cred.Entities e WHERE l.EntityType = 'Entity' AND e.EntityID = l.EntityID)))
+        BEGIN
+            SET @PreviousRunID = NULL;
+            SET @IncrementalSince = NULL;
+        END
+    END
+    
+    INSERT INTO cred.ValidationRunLog (RunStartTime, RunStatus, RunType, ResultMode, IncrementalSince, PreviousRunID)
+    VALUES (@RunStartTime, 'Running', @RunType, @ResultMode, @IncrementalSince, @PreviousRunID);
+    
+    SET @ValidationRunID = SCOPE_IDENTITY();
+    
+    EXEC cred.sp_ScheduleValidationRules
+        @ValidationRunID = @ValidationRunID,
+        @ScheduleRules = @ScheduleRules,
+        @MaxSkipDays = @MaxSkipDays,
+        @CostBudgetMs = @CostBudgetMs;
+    
+    -- Read by the incremental scope's expiry thresholds
+    EXEC cred.sp_RefreshCredentialExpirationIndex;
+    
+    -- Read by the Duplicate rules and by the incremental scope
+    IF EXISTS (SELECT 1 FROM cred.fn_ScheduledRules(@ValidationRunID) WHERE RuleCategory = 'Duplicate')
+        EXEC cred.sp_RefreshDuplicateCandidates @ValidationRunID = @ValidationRunID;
+    
+    -- Limit the rule procedures to changed and dependent records
+    IF @IncrementalSince IS NOT NULL
+        EXEC cred.sp_BuildIncrementalScope
+            @ValidationRunID = @ValidationRunID,
+            @PreviousRunID = @PreviousRunID,
+            @Since = @IncrementalSince,
+            @AsOf = @RunStartTime,
+            @ResultMode = @ResultMode;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_BeginValidationRun created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Complete Validation Run
+-- Carries forward out-of-scope outcomes for incremental runs and the outcomes
+-- of the rules the schedule skipped, reconciles the per-rule tallies written
+-- by every worker into ValidationRunLog, brings the parent keys of the run's
+-- result mode forward, compares the run's issues with the previous run's,
+-- refreshes the rule cost estimates and returns the run summary
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_CompleteValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_CompleteValidationRun;
+GO
+
+CREATE PROCEDURE cred.sp_CompleteValidationRun
+    @ValidationRunID INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @RunStartTime DATETIME2;
     DECLARE @RunEndTime DATETIME2;
+    DECLARE @RunType NVARCHAR(50);
+    DECLARE @ResultMode NVARCHAR(20);
+    DECLARE @PreviousRunID INT;
+    DECLARE @IncrementalSince DATETIME2;
+    DECLARE @ScheduleBaseRunID INT;
+    DECLARE @RulesSkipped INT;
     DECLARE @TotalRulesRun INT = 0;
     DECLARE @TotalFailures INT = 0;
     DECLARE @TotalWarnings INT = 0;
     DECLARE @TotalPasses INT = 0;
     DECLARE @ExecutionTimeSeconds INT;
-    DECLARE @ErrorMessage NVARCHAR(MAX) = NULL;
+    DECLARE @TotalRecordsValidated INT;
     
-    BEGIN TRY
-        BEGIN TRANSACTION;
+    SELECT
+        @RunStartTime = RunStartTime,
+        @RunType = RunType,
+        @ResultMode = ResultMode,
+        @PreviousRunID = PreviousRunID,
+        @IncrementalSince = IncrementalSince,
+        @ScheduleBaseRunID = ScheduleBaseRunID,
+        @RulesSkipped = ISNULL(RulesSkipped, 0)
+    FROM cred.ValidationRunLog
+    WHERE RunID = @ValidationRunID AND RunStatus = 'Running';
+    
+    IF @RunStartTime IS NULL
+        THROW 50001, 'Validation run is not running', 1;
+    
+    IF EXISTS (SELECT 1 FROM cred.ValidationRunCheckpoint
+               WHERE ValidationRunID = @ValidationRunID AND CheckpointStatus = 'Pending')
+        THROW 50001, 'Validation run has unfinished units', 1;
+    
+    -- Every scheduled rule is compiled into its category's scan
+    SELECT @TotalRulesRun = COUNT(*)
+    FROM cred.fn_ScheduledRules(@ValidationRunID);
+    
+    -- Carry forward previous outcomes for records outside the incremental scope
+    IF @IncrementalSince IS NOT NULL
+    BEGIN
+        SELECT @TotalRecordsValidated = COUNT(*)
+        FROM cred.ValidationRunScope
+        WHERE ValidationRunID = @ValidationRunID AND RecordDeleted = 0;
         
-        -- Create validation run log entry
-        INSERT INTO cred.ValidationRunLog (RunStartTime, RunStatus, RunType)
-        VALUES (@RunStartTime, 'Running', @RunType);
+        EXEC cred.sp_CarryForwardValidationResults
+            @ValidationRunID = @ValidationRunID,
+            @PreviousRunID = @PreviousRunID,
+            @ResultMode = @ResultMode;
         
-        SET @ValidationRunID = SCOPE_IDENTITY();
+        -- Parent keys: only the records this run revalidated can have moved or been deleted
+        MERGE cred.ValidationParentLink AS target
+        USING (SELECT EntityType, EntityID, ParentID, RecordDeleted
+               FROM cred.ValidationRunScope
+               WHERE ValidationRunID = @ValidationRunID) AS source
+        ON target.ResultMode = @ResultMode
+           AND target.EntityType = source.EntityType
+           AND target.EntityID = source.EntityID
+        WHEN MATCHED AND source.RecordDeleted = 1 THEN
+            DELETE
+        WHEN MATCHED AND EXISTS (SELECT target.ParentID EXCEPT SELECT source.ParentID) THEN
+            UPDATE SET ParentID = source.ParentID
+        WHEN NOT MATCHED BY TARGET AND source.RecordDeleted = 0 THEN
+            INSERT (ResultMode, EntityType, EntityID, ParentID)
+            VALUES (@ResultMode, source.EntityType, source.EntityID, source.ParentID);
         
-        -- Run Provider Validations
-        EXEC cred.sp_RunProviderValidations @ValidationRunID = @ValidationRunID;
-        SET @TotalRulesRun = @TotalRulesRun + 35;
+        DELETE FROM cred.ValidationRunScope WHERE ValidationRunID = @ValidationRunID;
+    END
+    ELSE
+    BEGIN
+        SET @TotalRecordsValidated = (SELECT COUNT(*) FROM cred.Providers WHERE IsActive = 1)
+                                   + (SELECT COUNT(*) FROM cred.Credentials)
+                                   + (SELECT COUNT(*) FROM cred.Entities WHERE IsActive = 1);
+    END
+    
+    IF @IncrementalSince IS NULL AND @RunType <> 'OnDemand'
+    BEGIN
+        -- Parent keys as of the run's start (OnDemand runs are never an incremental run's previous run).
+        -- Only differences are written; records changed since the start keep their keys for the next run
+        WITH links AS (
+            SELECT ResultMode, EntityType, EntityID, ParentID
+            FROM cred.ValidationParentLink
+            WHERE ResultMode = @ResultMode
+        )
+        MERGE links AS target
+        USING (SELECT 'Provider' AS EntityType, ProviderID AS EntityID, EntityID AS ParentID, CreatedDate, ModifiedDate
+               FROM cred.Providers
+               UNION ALL
+               SELECT 'Credential', CredentialID, ProviderID, CreatedDate, ModifiedDate
+               FROM cred.Credentials
+               UNION ALL
+               SELECT 'Entity', EntityID, NULL, CreatedDate, ModifiedDate
+               FROM cred.Entities) AS source
+        ON target.EntityType = source.EntityType
+           AND target.EntityID = source.EntityID
+        WHEN MATCHED AND (source.ModifiedDate IS NULL OR source.ModifiedDate < @RunStartTime)
+                     AND EXISTS (SELECT target.ParentID EXCEPT SELECT source.ParentID) THEN
+            UPDATE SET ParentID = source.ParentID
+        WHEN NOT MATCHED BY TARGET AND (source.CreatedDate IS NULL OR source.CreatedDate < @RunStartTime) THEN
+            INSERT (ResultMode, EntityType, EntityID, ParentID)
+            VALUES (@ResultMode, source.EntityType, source.EntityID, source.ParentID)
+        WHEN NOT MATCHED BY SOURCE THEN
+            DELETE;
+    END
+    
+    -- Carry forward the base run's outcomes for the rules the schedule skipped
+    IF @ScheduleBaseRunID IS NOT NULL AND @RulesSkipped > 0
+        EXEC cred.sp_CarryForwardSkippedRules
+            @ValidationRunID = @ValidationRunID,
+            @BaseRunID = @ScheduleBaseRunID,
+            @ResultMode = @ResultMode;
+    
+    SET @RunEndTime = GETDATE();
+    SET @ExecutionTimeSeconds = DATEDIFF(SECOND, @RunStartTime, @RunEndTime);
+    
+    -- Calculate summary statistics from the per-rule tallies (valid in both result modes)
+    SELECT 
+        @TotalFailures = ISNULL(SUM(FailCount), 0),
+        @TotalWarnings = ISNULL(SUM(WarningCount), 0),
+        @TotalPasses = ISNULL(SUM(PassCount), 0)
+    FROM cred.ValidationRuleRunStats
+    WHERE ValidationRunID = @ValidationRunID;
+    
+    -- Update validation run log
+    UPDATE cred.ValidationRunLog
+    SET RunEndTime = @RunEndTime,
+        RunStatus = 'Completed',
+        TotalRulesRun = @TotalRulesRun,
+        TotalRecordsValidated = @TotalRecordsValidated,
+        TotalFailures = @TotalFailures,
+        TotalWarnings = @TotalWarnings,
+        TotalPasses = @TotalPasses,
+        ExecutionTimeSeconds = @ExecutionTimeSeconds
+    WHERE RunID = @ValidationRunID;
+    
+    -- New, persisting and cleared issues; resolves the previous run's cleared issues
+    EXEC cred.sp_DiffValidationRun @ValidationRunID = @ValidationRunID;
+    
+    -- Fold the run into the daily Power BI rollups
+    EXEC cred.sp_RefreshValidationRollups @ValidationRunID = @ValidationRunID;
+    
+    -- Read by the next run's schedule
+    EXEC cred.sp_RefreshRuleCostEstimates;
+    
+    -- Return summary
+    SELECT 
+        @ValidationRunID AS ValidationRunID,
+        @RunStartTime AS RunStartTime,
+        @RunEndTime AS RunEndTime,
+        @TotalRulesRun AS TotalRulesRun,
+        @TotalFailures AS TotalFailures,
+        @TotalWarnings AS TotalWarnings,
+        @TotalPasses AS TotalPasses,
+        @ExecutionTimeSeconds AS ExecutionTimeSeconds,
+        'Completed' AS RunStatus,
+        @RulesSkipped AS RulesSkipped;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_CompleteValidationRun created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Fail Validation Run
+-- Marks a run started with cred.sp_BeginValidationRun as Failed. The results of
+-- its completed units, its checkpoints and its incremental scope are kept so
+-- the run can be resumed; @DiscardResults = 1 removes them instead.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_FailValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_FailValidationRun;
+GO
+
+CREATE PROCEDURE cred.sp_FailValidationRun
+    @ValidationRunID INT,
+    @ErrorMessage NVARCHAR(MAX) = NULL,
+    @DiscardResults BIT = 0 -- 1 = delete the partial results (the run can no longer be resumed)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @RunEndTime DATETIME2 = GETDATE();
+    
+    IF @DiscardResults = 1
+    BEGIN
+        DELETE FROM cred.ValidationResults WHERE ValidationRunID = @ValidationRunID;
+        DELETE FROM cred.ValidationRuleRunStats WHERE ValidationRunID = @ValidationRunID;
+        DELETE FROM cred.ValidationRuleTiming WHERE ValidationRunID = @ValidationRunID;
+        DELETE FROM cred.ValidationRunScope WHERE ValidationRunID = @ValidationRunID;
+        DELETE FROM cred.ValidationRunRuleSchedule WHERE ValidationRunID = @ValidationRunID;
+        DELETE FROM cred.ValidationRunCheckpoint WHERE ValidationRunID = @ValidationRunID;
+    END
+    
+    UPDATE cred.ValidationRunLog
+    SET RunEndTime = @RunEndTime,
+        RunStatus = 'Failed',
+        ExecutionTimeSeconds = DATEDIFF(SECOND, RunStartTime, @RunEndTime),
+        ErrorMessage = @ErrorMessage
+    WHERE RunID = @ValidationRunID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_FailValidationRun created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Run Validation Unit
+-- Runs one Pending unit of cred.ValidationRunCheckpoint and marks it Completed
+-- in the same transaction as its results, so a unit is either fully written
+-- and checkpointed or not written at all. Completed units are skipped.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunValidationUnit') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RunValidationUnit;
+GO
+
+CREATE PROCEDURE cred.sp_RunValidationUnit
+    @CheckpointID BIGINT,
+    @ProfileRules BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @ValidationRunID INT = NULL;
+    DECLARE @ResultMode NVARCHAR(20);
+    DECLARE @RuleCategory NVARCHAR(100);
+    DECLARE @SourceName NVARCHAR(50);
+    DECLARE @LowKey INT;
+    DECLARE @HighKey INT;
+    DECLARE @UnitStartTime DATETIME2 = SYSDATETIME();
+    
+    BEGIN TRY
+        BEGIN TRANSACTION;
         
-        -- Run Credential Validations
-        EXEC cred.sp_RunCredentialValidations @ValidationRunID = @ValidationRunID;
-        SET @TotalRulesRun = @TotalRulesRun + 40;
+        -- The update lock keeps a unit from running twice at the same time
+        SELECT
+            @ValidationRunID = cp.ValidationRunID,
+            @ResultMode = runs.ResultMode,
+            @RuleCategory = cp.RuleCategory,
+            @SourceName = cp.SourceName,
+            @LowKey = cp.LowKey,
+            @HighKey = cp.HighKey
+        FROM cred.ValidationRunCheckpoint cp WITH (UPDLOCK, ROWLOCK)
+        INNER JOIN cred.ValidationRunLog runs ON cp.ValidationRunID = runs.RunID
+        WHERE cp.CheckpointID = @CheckpointID
+          AND cp.CheckpointStatus = 'Pending'
+          AND runs.RunStatus = 'Running';
         
-        -- Run Entity Validations
-        EXEC cred.sp_RunEntityValidations @ValidationRunID = @ValidationRunID;
-        SET @TotalRulesRun = @TotalRulesRun + 25;
+        IF @ValidationRunID IS NOT NULL
+        BEGIN
+            EXEC cred.sp_RunRuleCategory
+                @RuleCategory = @RuleCategory,
+                @ValidationRunID = @ValidationRunID,
+                @ResultMode = @ResultMode,
+                @SourceName = @SourceName,
+                @LowKey = @LowKey,
+                @HighKey = @HighKey,
+                @ProfileRules = @ProfileRules;
+            
+            UPDATE cred.ValidationRunCheckpoint
+            SET CheckpointStatus = 'Completed',
+                RulesRun = (SELECT COUNT(*) FROM cred.fn_ScheduledRules(@ValidationRunID)
+                            WHERE RuleCategory = @RuleCategory AND SourceName = @SourceName),
+                ElapsedMs = DATEDIFF(MILLISECOND, @UnitStartTime, SYSDATETIME()),
+                CompletedDate = GETDATE()
+            WHERE CheckpointID = @CheckpointID;
+        END
         
-        -- Run Cross-Entity Validations
-        EXEC cred.sp_RunCrossEntityValidations @ValidationRunID = @ValidationRunID;
-        SET @TotalRulesRun = @TotalRulesRun + 17;
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        THROW;
+    END CATCH
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RunValidationUnit created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Run Pending Validation Units
+-- Runs a run's Pending units in order, each committing on its own, then
+-- completes the run. Shared by cred.sp_RunAllValidations and
+-- cred.sp_ResumeValidationRun.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunPendingValidationUnits') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RunPendingValidationUnits;
+GO
+
+CREATE PROCEDURE cred.sp_RunPendingValidationUnits
+    @ValidationRunID INT,
+    @ProfileRules BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @CheckpointID BIGINT;
+    
+    DECLARE unit_cursor CURSOR LOCAL FAST_FORWARD FOR
+        SELECT CheckpointID
+        FROM cred.ValidationRunCheckpoint
+        WHERE ValidationRunID = @ValidationRunID AND CheckpointStatus = 'Pending'
+        ORDER BY CheckpointID;
+    
+    OPEN unit_cursor;
+    FETCH NEXT FROM unit_cursor INTO @CheckpointID;
+    
+    WHILE @@FETCH_STATUS = 0
+    BEGIN
+        EXEC cred.sp_RunValidationUnit @CheckpointID = @CheckpointID, @ProfileRules = @ProfileRules;
+        FETCH NEXT FROM unit_cursor INTO @CheckpointID;
+    END
+    
+    CLOSE unit_cursor;
+    DEALLOCATE unit_cursor;
+    
+    -- Reconcile totals into the run log and return the summary
+    BEGIN TRANSACTION;
+    EXEC cred.sp_CompleteValidationRun @ValidationRunID = @ValidationRunID;
+    COMMIT TRANSACTION;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RunPendingValidationUnits created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Run All Validations
+-- Logs a run, plans one unit per rule category and source with scheduled
+-- rules, and runs the units on this connection. Each unit commits with its checkpoint, so a failure
+-- only loses the unit in progress and the run can be resumed with
+-- cred.sp_ResumeValidationRun.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunAllValidations') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RunAllValidations;
+GO
+
+CREATE PROCEDURE cred.sp_RunAllValidations
+    @RunType NVARCHAR(50) = 'Scheduled', -- Scheduled, Manual, Incremental
+    @ResultMode NVARCHAR(20) = 'Full', -- Full, ExceptionsOnly
+    @ProfileRules BIT = 0, -- 1 = time each rule on its own (slower, see cred.ValidationRuleTiming)
+    @ScheduleRules BIT = 0, -- 1 = skip rules whose outcome cannot have changed (see cred.sp_ScheduleValidationRules)
+    @MaxSkipDays INT = 7,
+    @CostBudgetMs INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @ValidationRunID INT;
+    DECLARE @RunStartTime DATETIME2 = GETDATE();
+    DECLARE @RunEndTime DATETIME2;
+    DECLARE @ExecutionTimeSeconds INT;
+    DECLARE @ErrorMessage NVARCHAR(MAX) = NULL;
+    
+    IF @ResultMode NOT IN ('Full', 'ExceptionsOnly')
+        THROW 50001, 'ResultMode must be Full or ExceptionsOnly', 1;
+    
+    BEGIN TRY
+        BEGIN TRANSACTION;
         
-        SET @RunEndTime = GETDATE();
-        SET @ExecutionTimeSeconds = DATEDIFF(SECOND, @RunStartTime, @RunEndTime);
+        -- Create validation run log entry
+        EXEC cred.sp_BeginValidationRun
+            @RunType = @RunType,
+            @ResultMode = @ResultMode,
+            @RunStartTime = @RunStartTime,
+            @ScheduleRules = @ScheduleRules,
+            @MaxSkipDays = @MaxSkipDays,
+            @CostBudgetMs = @CostBudgetMs,
+            @ValidationRunID = @ValidationRunID OUTPUT;
         
-        -- Calculate summary statistics
-        SELECT 
-            @TotalFailures = COUNT(*)
-        FROM cred.ValidationResults
-        WHERE ValidationRunID = @ValidationRunID AND ValidationStatus = 'Fail';
-        
-        SELECT 
-            @TotalWarnings = COUNT(*)
-        FROM cred.ValidationResults
-        WHERE ValidationRunID = @ValidationRunID AND ValidationStatus = 'Warning';
-        
-        SELECT 
-            @TotalPasses = COUNT(*)
-        FROM cred.ValidationResults
-        WHERE ValidationRunID = @ValidationRunID AND ValidationStatus = 'Pass';
-        
-        -- Update validation run log
-        UPDATE cred.ValidationRunLog
-        SET RunEndTime = @RunEndTime,
-            RunStatus = 'Completed',
-            TotalRulesRun = @TotalRulesRun,
-            TotalRecordsValidated = (SELECT COUNT(DISTINCT EntityID) FROM cred.ValidationResults WHERE ValidationRunID = @ValidationRunID),
-            TotalFailures = @TotalFailures,
-            TotalWarnings = @TotalWarnings,
-            TotalPasses = @TotalPasses,
-            ExecutionTimeSeconds = @ExecutionTimeSeconds
-        WHERE RunID = @ValidationRunID;
+        -- Plan the units: Provider, Credential, Entity, then Cross-Entity rules
+        INSERT INTO cred.ValidationRunCheckpoint (ValidationRunID, RuleCategory, SourceName)
+        SELECT @ValidationRunID, RuleCategory, SourceName
+        FROM cred.fn_ScheduledRules(@ValidationRunID)
+        GROUP BY RuleCategory, SourceName
+        ORDER BY CASE RuleCategory
+                     WHEN 'Provider' THEN 1
+                     WHEN 'Credential' THEN 2
+                     WHEN 'Entity' THEN 3
+                     ELSE 4
+                 END, RuleCategory, SourceName;
         
         COMMIT TRANSACTION;
         
-        -- Return summary
-        SELECT 
-            @ValidationRunID AS ValidationRunID,
-            @RunStartTime AS RunStartTime,
-            @RunEndTime AS RunEndTime,
-            @TotalRulesRun AS TotalRulesRun,
-            @TotalFailures AS TotalFailures,
-            @TotalWarnings AS TotalWarnings,
-            @TotalPasses AS TotalPasses,
-            @ExecutionTimeSeconds AS ExecutionTimeSeconds,
-            'Completed' AS RunStatus;
+        EXEC cred.sp_RunPendingValidationUnits
+            @ValidationRunID = @ValidationRunID,
+            @ProfileRules = @ProfileRules;
         
     END TRY
     BEGIN CATCH
@@ -106,20 +516,17 @@ BEGIN
         SET @ExecutionTimeSeconds = DATEDIFF(SECOND, @RunStartTime, @RunEndTime);
         SET @ErrorMessage = ERROR_MESSAGE();
         
-        -- Update validation run log with error
-        IF @ValidationRunID IS NOT NULL
+        -- Mark the run Failed, keeping its completed units for a resume
+        IF @ValidationRunID IS NOT NULL AND EXISTS (SELECT 1 FROM cred.ValidationRunLog WHERE RunID = @ValidationRunID)
         BEGIN
-            UPDATE cred.ValidationRunLog
-            SET RunEndTime = @RunEndTime,
-                RunStatus = 'Failed',
-                ExecutionTimeSeconds = @ExecutionTimeSeconds,
-                ErrorMessage = @ErrorMessage
-            WHERE RunID = @ValidationRunID;
+            EXEC cred.sp_FailValidationRun
+                @ValidationRunID = @ValidationRunID,
+                @ErrorMessage = @ErrorMessage;
         END
         ELSE
         BEGIN
-            INSERT INTO cred.ValidationRunLog (RunStartTime, RunEndTime, RunStatus, ExecutionTimeSeconds, ErrorMessage, RunType)
-            VALUES (@RunStartTime, @RunEndTime, 'Failed', @ExecutionTimeSeconds, @ErrorMessage, @RunType);
+            INSERT INTO cred.ValidationRunLog (RunStartTime, RunEndTime, RunStatus, ExecutionTimeSeconds, ErrorMessage, RunType, ResultMode)
+            VALUES (@RunStartTime, @RunEndTime, 'Failed', @ExecutionTimeSeconds, @ErrorMessage, @RunType, @ResultMode);
         END
         
         -- Re-throw error
@@ -131,7 +538,89 @@ GO
 PRINT 'Stored procedure cred.sp_RunAllValidations created successfully';
 GO
 
+-- =============================================
+-- Stored Procedure: Reopen Validation Run
+-- Sets a Failed run that still has its checkpoints back to Running so its
+-- Pending units can be run. The run keeps its ID, start time and, for
+-- incremental runs, its scope.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_ReopenValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_ReopenValidationRun;
+GO
+
+CREATE PROCEDURE cred.sp_ReopenValidationRun
+    @ValidationRunID INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    IF NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog WHERE RunID = @ValidationRunID AND RunStatus = 'Failed')
+        THROW 50001, 'Only failed validation runs can be resumed', 1;
+    
+    IF NOT EXISTS (SELECT 1 FROM cred.ValidationRunCheckpoint WHERE ValidationRunID = @ValidationRunID)
+        THROW 50001, 'Validation run has no checkpoints to resume from', 1;
+    
+    UPDATE cred.ValidationRunLog
+    SET RunStatus = 'Running',
+        RunEndTime = NULL,
+        ErrorMessage = NULL,
+        ResumeCount = ISNULL(ResumeCount, 0) + 1,
+        LastResumedTime = GETDATE()
+    WHERE RunID = @ValidationRunID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_ReopenValidationRun created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Resume Validation Run
+-- Runs the Pending units of a failed run on this connection and completes it
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_ResumeValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_ResumeValidationRun;
+GO
+
+CREATE PROCEDURE cred.sp_ResumeValidationRun
+    @ValidationRunID INT,
+    @ProfileRules BIT = 0
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @ErrorMessage NVARCHAR(MAX);
+    
+    EXEC cred.sp_ReopenValidationRun @ValidationRunID = @ValidationRunID;
+    
+    BEGIN TRY
+        EXEC cred.sp_RunPendingValidationUnits
+            @ValidationRunID = @ValidationRunID,
+            @ProfileRules = @ProfileRules;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        
+        SET @ErrorMessage = ERROR_MESSAGE();
+        EXEC cred.sp_FailValidationRun
+            @ValidationRunID = @ValidationRunID,
+            @ErrorMessage = @ErrorMessage;
+        
+        THROW;
+    END CATCH
+END
+GO
+
+PRINT 'Stored procedure cred.sp_ResumeValidationRun created successfully';
+GO
+
 -- Example usage:
 -- EXEC cred.sp_RunAllValidations @RunType = 'Manual';
 -- EXEC cred.sp_RunAllValidations @RunType = 'Scheduled';
+-- EXEC cred.sp_RunAllValidations @RunType = 'Scheduled', @ResultMode = 'ExceptionsOnly';
+-- EXEC cred.sp_RunAllValidations @RunType = 'Incremental', @ResultMode = 'ExceptionsOnly';
+-- EXEC cred.sp_RunAllValidations @RunType = 'Manual', @ProfileRules = 1;
+-- EXEC cred.sp_RunAllValidations @RunType = 'Scheduled', @ScheduleRules = 1, @CostBudgetMs = 600000;
+-- EXEC cred.sp_ResumeValidationRun @ValidationRunID = 42;
+-- EXEC cred.sp_FailValidationRun @ValidationRunID = 42, @DiscardResults = 1; -- Abandon a failed run
 
@@ -141,10 +141,383 @@ VALUES
 ('CROSS016', 'Active Provider Valid Credential', 'Provider should have at least one credential with expiration date more than 30 days away if Active', 'Cross-Entity', 'Business Logic', 'Medium', 1),
 ('CROSS017', 'Inactive Entity Active Provider', 'Entity with Inactive status should not have Active providers', 'Cross-Entity', 'Business Logic', 'Medium', 1);
 
+-- Duplicate Detection Rules (DUP001 - DUP004)
+INSERT INTO cred.ValidationRules (RuleCode, RuleName, RuleDescription, RuleCategory, RuleType, Severity, IsActive)
+VALUES
+('DUP001', 'Provider Probable Duplicate', 'Provider should not closely match another active provider on name, date of birth, SSN and contact details (score 80 or more)', 'Duplicate', 'Data Quality', 'High', 1),
+('DUP002', 'Provider Possible Duplicate', 'Provider partially matching another active provider (score 65 to 79) should be reviewed', 'Duplicate', 'Data Quality', 'Medium', 1),
+('DUP003', 'Entity Probable Duplicate', 'Entity should not closely match another active entity on name, address and contact details (score 80 or more)', 'Duplicate', 'Data Quality', 'High', 1),
+('DUP004', 'Entity Possible Duplicate', 'Entity partially matching another active entity (score 65 to 79) should be reviewed', 'Duplicate', 'Data Quality', 'Medium', 1);
+
 PRINT 'Validation rules populated successfully';
 PRINT 'Total rules inserted: ' + CAST(@@ROWCOUNT AS NVARCHAR(10));
 GO
 
+-- =============================================
+-- Rule Definitions
+-- cred.sp_RunRuleCategory compiles these into one statement per category and source.
+-- AppliesWhen selects the records a rule evaluates (NULL = every scoped record) and
+-- FailWhen marks the ones reported with FailStatus; everything else passes.
+-- Expressions use the aliases of the source FromClause in cred.ValidationRuleSources.
+-- =============================================
+
+-- Provider Rule Definitions (PRV001 - PRV035)
+UPDATE vr
+SET SourceName = d.SourceName,
+    AppliesWhen = d.AppliesWhen,
+    FailWhen = d.FailWhen,
+    FailStatus = d.FailStatus,
+    ErrorMessage = d.ErrorMessage,
+    FieldName = d.FieldName,
+    FieldValueExpression = d.FieldValueExpression,
+    ResultEntityType = d.ResultEntityType,
+    EntityIDExpression = d.EntityIDExpression,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('PRV001', 'Provider', 'p.IsActive = 1', 'LEN(LTRIM(RTRIM(p.NPI))) != 10 OR p.NPI LIKE ''%[^0-9]%''', 'Fail', 'NPI must be exactly 10 digits', 'NPI', 'p.NPI', NULL, NULL),
+    ('PRV002', 'Provider', 'p.IsActive = 1', 'p.NPI IS NULL', 'Fail', 'NPI is required', 'NPI', NULL, NULL, NULL),
+    ('PRV003', 'Provider', 'p.IsActive = 1', 'p.FirstName IS NULL OR LTRIM(RTRIM(p.FirstName)) = ''''', 'Fail', 'First Name is required', 'FirstName', 'p.FirstName', NULL, NULL),
+    ('PRV004', 'Provider', 'p.IsActive = 1', 'p.LastName IS NULL OR LTRIM(RTRIM(p.LastName)) = ''''', 'Fail', 'Last Name is required', 'LastName', 'p.LastName', NULL, NULL),
+    ('PRV005', 'Provider', 'p.IsActive = 1 AND p.DateOfBirth IS NOT NULL', 'p.DateOfBirth IS NOT NULL AND p.DateOfBirth > GETDATE()', 'Fail', 'Date of Birth cannot be in the future', 'DateOfBirth', 'CAST(p.DateOfBirth AS NVARCHAR(10))', NULL, NULL),
+    ('PRV006', 'Provider', 'p.IsActive = 1 AND p.DateOfBirth IS NOT NULL', 'p.DateOfBirth IS NOT NULL AND (DATEDIFF(YEAR, p.DateOfBirth, GETDATE()) < 18 OR DATEDIFF(YEAR, p.DateOfBirth, GETDATE()) > 100)', 'Fail', 'Date of Birth indicates invalid age (must be 18-100 years)', 'DateOfBirth', 'CAST(p.DateOfBirth AS NVARCHAR(10))', NULL, NULL),
+    ('PRV007', 'Provider', 'p.IsActive = 1 AND p.SSN IS NOT NULL', 'p.SSN IS NOT NULL AND (LEN(p.SSN) != 11 OR p.SSN NOT LIKE ''[0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9][0-9][0-9]'')', 'Fail', 'SSN must be in format XXX-XX-XXXX', 'SSN', 'LEFT(p.SSN, 3) + ''-XX-XXXX''', NULL, NULL),
+    ('PRV008', 'Provider', 'p.IsActive = 1 AND p.EmailAddress IS NOT NULL', 'p.EmailAddress IS NOT NULL AND (p.EmailAddress NOT LIKE ''%@%.%'' OR p.EmailAddress LIKE ''@%'' OR p.EmailAddress LIKE ''%@'' OR CHARINDEX(''..'', p.EmailAddress) > 0)', 'Fail', 'Email address format is invalid', 'EmailAddress', 'p.EmailAddress', NULL, NULL),
+    ('PRV009', 'Provider', 'p.IsActive = 1 AND p.PhoneNumber IS NOT NULL', 'p.PhoneNumber IS NOT NULL AND (LEN(REPLACE(REPLACE(REPLACE(REPLACE(p.PhoneNumber, ''('', ''''), '')'', ''''), ''-'', ''''), '' '', '''')) < 10)', 'Fail', 'Phone number must contain at least 10 digits', 'PhoneNumber', 'p.PhoneNumber', NULL, NULL),
+    ('PRV010', 'Provider', 'p.IsActive = 1 AND p.State IS NOT NULL', 'p.State IS NOT NULL AND LEN(p.State) != 2', 'Fail', 'State must be 2 characters', 'State', 'p.State', NULL, NULL),
+    ('PRV011', 'Provider', 'p.IsActive = 1 AND p.ZipCode IS NOT NULL', 'p.ZipCode IS NOT NULL AND (LEN(REPLACE(p.ZipCode, ''-'', '''')) NOT IN (5, 9) OR REPLACE(p.ZipCode, ''-'', '''') LIKE ''%[^0-9]%'')', 'Fail', 'ZIP code must be 5 or 9 digits', 'ZipCode', 'p.ZipCode', NULL, NULL),
+    ('PRV012', 'Provider', 'p.IsActive = 1', 'p.Status NOT IN (''Active'', ''Inactive'', ''Pending'', ''Suspended'', ''Terminated'')', 'Fail', 'Status must be one of: Active, Inactive, Pending, Suspended, Terminated', 'Status', 'p.Status', NULL, NULL),
+    ('PRV013', 'Provider', 'p.IsActive = 1 AND npi_dup.NPI IS NOT NULL', 'npi_dup.DuplicateCount > 1', 'Fail', 'Duplicate NPI found', 'NPI', 'p.NPI', NULL, NULL),
+    ('PRV014', 'Provider', 'p.IsActive = 1', 'p.Status = ''Active'' AND (p.Specialty IS NULL OR LTRIM(RTRIM(p.Specialty)) = '''')', 'Fail', 'Specialty is required for active providers', 'Specialty', 'p.Specialty', NULL, NULL),
+    ('PRV015', 'Provider', 'p.IsActive = 1 AND p.FirstName IS NOT NULL', 'p.FirstName LIKE ''%[0-9]%''', 'Fail', 'First Name should not contain numbers', 'FirstName', 'p.FirstName', NULL, NULL),
+    ('PRV016', 'Provider', 'p.IsActive = 1 AND p.LastName IS NOT NULL', 'p.LastName LIKE ''%[0-9]%''', 'Fail', 'Last Name should not contain numbers', 'LastName', 'p.LastName', NULL, NULL),
+    ('PRV017', 'Provider', 'p.IsActive = 1', '(p.City IS NOT NULL OR p.State IS NOT NULL OR p.ZipCode IS NOT NULL) AND (p.AddressLine1 IS NULL OR LTRIM(RTRIM(p.AddressLine1)) = '''')', 'Fail', 'Address Line 1 is required when other address fields are present', 'AddressLine1', NULL, NULL, NULL),
+    ('PRV018', 'Provider', 'p.IsActive = 1', '(p.State IS NOT NULL OR p.ZipCode IS NOT NULL) AND (p.City IS NULL OR LTRIM(RTRIM(p.City)) = '''')', 'Fail', 'City is required when State or ZipCode is provided', 'City', NULL, NULL, NULL),
+    ('PRV019', 'Provider', 'p.IsActive = 1', '(p.City IS NOT NULL OR p.ZipCode IS NOT NULL) AND (p.State IS NULL OR LTRIM(RTRIM(p.State)) = '''')', 'Fail', 'State is required when City or ZipCode is provided', 'State', NULL, NULL, NULL),
+    ('PRV020', 'Provider', 'p.IsActive = 1', 'p.ModifiedDate < p.CreatedDate', 'Fail', 'ModifiedDate cannot be before CreatedDate', NULL, NULL, NULL, NULL),
+    ('PRV021', 'Provider', 'p.IsActive = 1', 'p.Status = ''Active'' AND p.EntityID IS NULL', 'Warning', 'Active provider should be associated with an Entity', 'EntityID', NULL, NULL, NULL),
+    ('PRV022', 'Provider', 'p.IsActive = 1 AND p.EntityID IS NOT NULL', 'p.EntityID IS NOT NULL AND e.EntityID IS NULL', 'Fail', 'EntityID does not reference a valid Entity', 'EntityID', 'CAST(p.EntityID AS NVARCHAR(10))', NULL, NULL),
+    ('PRV023', 'Provider', 'p.IsActive = 1 AND p.EmailAddress IS NOT NULL AND p.EmailAddress LIKE ''%@%''', 'p.EmailAddress IS NOT NULL AND CHARINDEX(''.'', SUBSTRING(p.EmailAddress, CHARINDEX(''@'', p.EmailAddress) + 1, LEN(p.EmailAddress))) = 0', 'Fail', 'Email domain must contain at least one dot', 'EmailAddress', 'p.EmailAddress', NULL, NULL),
+    ('PRV024', 'Provider', 'p.IsActive = 1 AND p.PhoneNumber IS NOT NULL', 'p.PhoneNumber IS NOT NULL AND p.PhoneNumber LIKE ''%[A-Za-z]%''', 'Fail', 'Phone number should not contain letters', 'PhoneNumber', 'p.PhoneNumber', NULL, NULL),
+    ('PRV025', 'Provider', 'p.IsActive = 1 AND p.State IS NOT NULL', 'p.State IS NOT NULL AND p.State COLLATE Latin1_General_CS_AS != UPPER(p.State)', 'Warning', 'State code should be uppercase', 'State', 'p.State', NULL, NULL),
+    ('PRV026', 'Provider', 'p.IsActive = 1', '(p.FirstName LIKE ''%  %'' OR p.LastName LIKE ''%  %'')', 'Warning', 'Name fields contain excessive whitespace', 'FirstName/LastName', NULL, NULL, NULL),
+    ('PRV027', 'Provider', 'p.IsActive = 1 AND p.FirstName IS NOT NULL', 'LEN(LTRIM(RTRIM(p.FirstName))) < 2 OR LEN(LTRIM(RTRIM(p.FirstName))) > 50', 'Warning', 'First Name length should be between 2 and 50 characters', 'FirstName', 'p.FirstName', NULL, NULL),
+    ('PRV028', 'Provider', 'p.IsActive = 1 AND p.LastName IS NOT NULL', 'LEN(LTRIM(RTRIM(p.LastName))) < 2 OR LEN(LTRIM(RTRIM(p.LastName))) > 50', 'Warning', 'Last Name length should be between 2 and 50 characters', 'LastName', 'p.LastName', NULL, NULL),
+    ('PRV029', 'Provider', 'p.IsActive = 1 AND p.EmailAddress IS NOT NULL', 'p.EmailAddress IS NOT NULL AND p.EmailAddress COLLATE Latin1_General_CS_AS != LOWER(p.EmailAddress)', 'Warning', 'Email address should be lowercase', 'EmailAddress', NULL, NULL, NULL),
+    ('PRV030', 'Provider', 'p.IsActive = 1 AND p.SSN IS NOT NULL', 'p.SSN IS NOT NULL AND LEFT(REPLACE(p.SSN, ''-'', ''''), 3) = ''000''', 'Fail', 'SSN should not start with 000', 'SSN', NULL, NULL, NULL),
+    ('PRV031', 'Provider', 'p.IsActive = 1 AND p.SSN IS NOT NULL', 'p.SSN IS NOT NULL AND REPLACE(p.SSN, ''-'', '''') = ''000000000''', 'Fail', 'SSN should not be all zeros', 'SSN', NULL, NULL, NULL),
+    ('PRV032', 'Provider', 'p.IsActive = 1', 'p.Status = ''Active'' AND (p.LastValidatedDate IS NULL OR DATEDIFF(DAY, p.LastValidatedDate, GETDATE()) > 90)', 'Warning', 'Active provider should be validated within last 90 days', NULL, NULL, NULL, NULL),
+    ('PRV033', 'Provider', 'p.IsActive = 1', 'p.CreatedDate > GETDATE()', 'Fail', 'CreatedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('PRV034', 'Provider', 'p.IsActive = 1', 'p.ModifiedDate > GETDATE()', 'Fail', 'ModifiedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('PRV035', 'Provider', 'p.IsActive = 1', 'p.Status = ''Active'' AND ISNULL(pc.HasActiveCredential, 0) = 0', 'Warning', 'Active provider should have at least one credential', NULL, NULL, NULL, NULL)
+) d (RuleCode, SourceName, AppliesWhen, FailWhen, FailStatus, ErrorMessage, FieldName, FieldValueExpression, ResultEntityType, EntityIDExpression)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+-- Credential Rule Definitions (CRED001 - CRED040)
+UPDATE vr
+SET SourceName = d.SourceName,
+    AppliesWhen = d.AppliesWhen,
+    FailWhen = d.FailWhen,
+    FailStatus = d.FailStatus,
+    ErrorMessage = d.ErrorMessage,
+    FieldName = d.FieldName,
+    FieldValueExpression = d.FieldValueExpression,
+    ResultEntityType = d.ResultEntityType,
+    EntityIDExpression = d.EntityIDExpression,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('CRED001', 'Credential', NULL, 'c.ProviderID IS NULL', 'Fail', 'ProviderID is required', 'ProviderID', NULL, NULL, NULL),
+    ('CRED002', 'Credential', NULL, 'c.CredentialType IS NULL OR LTRIM(RTRIM(c.CredentialType)) = ''''', 'Fail', 'CredentialType is required', 'CredentialType', 'c.CredentialType', NULL, NULL),
+    ('CRED003', 'Credential', NULL, 'c.CredentialNumber IS NULL OR LTRIM(RTRIM(c.CredentialNumber)) = ''''', 'Fail', 'CredentialNumber is required', 'CredentialNumber', 'c.CredentialNumber', NULL, NULL),
+    ('CRED004', 'Credential', 'c.ProviderID IS NOT NULL', 'p.ProviderID IS NULL', 'Fail', 'ProviderID does not reference a valid Provider', 'ProviderID', 'CAST(c.ProviderID AS NVARCHAR(10))', NULL, NULL),
+    ('CRED005', 'Credential', 'c.IssueDate IS NOT NULL AND c.ExpirationDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.ExpirationDate IS NOT NULL AND c.ExpirationDate <= c.IssueDate', 'Fail', 'ExpirationDate must be after IssueDate', NULL, NULL, NULL, NULL),
+    ('CRED006', 'Credential', 'c.ExpirationDate IS NOT NULL', 'c.ExpirationDate IS NOT NULL AND c.ExpirationDate < GETDATE() AND c.Status != ''Expired''', 'Fail', 'Expired credentials should have Status = Expired', 'Status', 'c.Status', NULL, NULL),
+    ('CRED007', 'Credential', 'c.ExpirationDate IS NOT NULL', 'c.ExpirationDate IS NOT NULL AND c.ExpirationDate > DATEADD(YEAR, 20, GETDATE())', 'Fail', 'ExpirationDate cannot be more than 20 years in the future', 'ExpirationDate', NULL, NULL, NULL),
+    ('CRED008', 'Credential', 'c.IssueDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.IssueDate > GETDATE()', 'Fail', 'IssueDate cannot be in the future', 'IssueDate', NULL, NULL, NULL),
+    ('CRED009', 'Credential', 'c.IssueDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.IssueDate < DATEADD(YEAR, -50, GETDATE())', 'Fail', 'IssueDate cannot be more than 50 years in the past', 'IssueDate', NULL, NULL, NULL),
+    ('CRED010', 'Credential', NULL, 'c.Status NOT IN (''Active'', ''Inactive'', ''Expired'', ''Suspended'', ''Revoked'', ''Pending'')', 'Fail', 'Status must be one of: Active, Inactive, Expired, Suspended, Revoked, Pending', 'Status', 'c.Status', NULL, NULL),
+    ('CRED011', 'Credential', 'c.IsPrimary = 1 AND primary_dup.ProviderID IS NOT NULL', 'c.IsPrimary = 1 AND primary_dup.DuplicateCount > 1', 'Fail', 'Only one credential per Provider can be Primary for the same CredentialType', NULL, NULL, NULL, NULL),
+    ('CRED012', 'Credential', 'c.ExpirationDate IS NOT NULL AND c.Status = ''Active''', 'c.ExpirationDate IS NOT NULL AND c.ExpirationDate BETWEEN GETDATE() AND DATEADD(DAY, 30, GETDATE()) AND c.Status = ''Active''', 'Warning', 'Credential expires within 30 days', NULL, NULL, NULL, NULL),
+    ('CRED013', 'Credential', 'c.ExpirationDate IS NOT NULL AND c.Status = ''Active''', 'c.ExpirationDate IS NOT NULL AND c.ExpirationDate BETWEEN DATEADD(DAY, 30, GETDATE()) AND DATEADD(DAY, 90, GETDATE()) AND c.Status = ''Active''', 'Warning', 'Credential expires within 90 days', NULL, NULL, NULL, NULL),
+    ('CRED014', 'Credential', NULL, 'c.CredentialType IN (''License'', ''Certification'', ''Board Certification'') AND (c.IssuingOrganization IS NULL OR LTRIM(RTRIM(c.IssuingOrganization)) = '''')', 'Warning', 'IssuingOrganization should be provided for this CredentialType', 'IssuingOrganization', NULL, NULL, NULL),
+    ('CRED015', 'Credential', 'c.StateIssued IS NOT NULL', 'c.StateIssued IS NOT NULL AND LEN(c.StateIssued) != 2', 'Fail', 'StateIssued must be 2 characters', 'StateIssued', 'c.StateIssued', NULL, NULL),
+    ('CRED016', 'Credential', 'c.StateIssued IS NOT NULL', 'c.StateIssued IS NOT NULL AND c.StateIssued COLLATE Latin1_General_CS_AS != UPPER(c.StateIssued)', 'Warning', 'StateIssued should be uppercase', 'StateIssued', 'c.StateIssued', NULL, NULL),
+    ('CRED017', 'Credential', 'c.VerificationDate IS NOT NULL', 'c.VerificationDate IS NOT NULL AND c.VerificationDate > GETDATE()', 'Fail', 'VerificationDate cannot be in the future', 'VerificationDate', NULL, NULL, NULL),
+    ('CRED018', 'Credential', 'c.VerificationDate IS NOT NULL', 'c.VerificationDate IS NOT NULL AND (c.VerifiedBy IS NULL OR LTRIM(RTRIM(c.VerifiedBy)) = '''')', 'Warning', 'VerifiedBy should be provided when VerificationDate is present', 'VerifiedBy', NULL, NULL, NULL),
+    ('CRED019', 'Credential', NULL, 'c.ModifiedDate < c.CreatedDate', 'Fail', 'ModifiedDate cannot be before CreatedDate', NULL, NULL, NULL, NULL),
+    ('CRED020', 'Credential', NULL, 'c.CreatedDate > GETDATE()', 'Fail', 'CreatedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('CRED021', 'Credential', NULL, 'c.ModifiedDate > GETDATE()', 'Fail', 'ModifiedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('CRED022', 'Credential', 'number_dup.ProviderID IS NOT NULL', 'number_dup.DuplicateCount > 1', 'Fail', 'CredentialNumber should be unique per Provider and CredentialType', NULL, NULL, NULL, NULL),
+    ('CRED023', 'Credential', 'c.Status = ''Active''', 'c.Status = ''Active'' AND c.ExpirationDate IS NULL', 'Warning', 'Active credentials should have an ExpirationDate', NULL, NULL, NULL, NULL),
+    ('CRED024', 'Credential', NULL, 'c.CredentialNumber IS NOT NULL AND LTRIM(RTRIM(c.CredentialNumber)) = ''''', 'Fail', 'CredentialNumber cannot contain only spaces', 'CredentialNumber', NULL, NULL, NULL),
+    ('CRED025', 'Credential', NULL, 'c.CredentialType IS NOT NULL AND LTRIM(RTRIM(c.CredentialType)) = ''''', 'Fail', 'CredentialType cannot contain only spaces', 'CredentialType', NULL, NULL, NULL),
+    ('CRED026', 'Credential', NULL, 'c.CredentialType LIKE ''%License%'' AND (c.StateIssued IS NULL OR LTRIM(RTRIM(c.StateIssued)) = '''')', 'Fail', 'License credentials should have StateIssued', 'StateIssued', NULL, NULL, NULL),
+    ('CRED027', 'Credential', 'c.IssueDate IS NOT NULL AND c.ExpirationDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.ExpirationDate IS NOT NULL AND DATEDIFF(DAY, c.IssueDate, c.ExpirationDate) < 1', 'Fail', 'ExpirationDate must be at least 1 day after IssueDate', NULL, NULL, NULL, NULL),
+    ('CRED028', 'Credential', 'c.CredentialNumber IS NOT NULL', 'LEN(LTRIM(RTRIM(c.CredentialNumber))) < 1 OR LEN(LTRIM(RTRIM(c.CredentialNumber))) > 50', 'Warning', 'CredentialNumber length should be between 1 and 50 characters', 'CredentialNumber', NULL, NULL, NULL),
+    ('CRED029', 'Credential', 'c.IssuingOrganization IS NOT NULL', 'c.IssuingOrganization IS NOT NULL AND LEN(LTRIM(RTRIM(c.IssuingOrganization))) > 200', 'Warning', 'IssuingOrganization length exceeds maximum (200 characters)', 'IssuingOrganization', NULL, NULL, NULL),
+    ('CRED030', 'Credential', 'c.IssueDate IS NOT NULL AND c.VerificationDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.VerificationDate IS NOT NULL AND c.VerificationDate < c.IssueDate', 'Warning', 'VerificationDate should be after IssueDate', NULL, NULL, NULL, NULL),
+    ('CRED031', 'Credential', 'c.Status = ''Active'' AND c.ExpirationDate IS NOT NULL', 'c.Status = ''Active'' AND c.ExpirationDate IS NOT NULL AND c.ExpirationDate < GETDATE()', 'Fail', 'Active credentials cannot be expired', NULL, NULL, NULL, NULL),
+    ('CRED032', 'Credential', 'c.Status = ''Suspended'' AND c.ExpirationDate IS NOT NULL', 'c.Status = ''Suspended'' AND c.ExpirationDate > GETDATE()', 'Warning', 'Suspended credentials may need review', NULL, NULL, NULL, NULL),
+    ('CRED033', 'Credential', 'c.VerifiedBy IS NOT NULL', 'c.Status != ''Revoked'' AND c.VerifiedBy LIKE ''%Revoked%''', 'Warning', 'Credential appears to be revoked but Status is not Revoked', NULL, NULL, NULL, NULL),
+    ('CRED034', 'Credential', NULL, 'c.CredentialType NOT IN (''License'', ''Medical License'', ''DEA License'', ''State License'', ''Certification'', ''Board Certification'', ''Specialty Certification'', ''Other'')', 'Warning', 'CredentialType should be from standard list', 'CredentialType', 'c.CredentialType', NULL, NULL),
+    ('CRED035', 'Provider', 'p.IsActive = 1 AND p.Status = ''Active''', 'ISNULL(pc.HasActiveCredential, 0) = 0', 'Warning', 'Active provider should have at least one Active credential', NULL, NULL, 'Credential', 'NULL'),
+    ('CRED036', 'Credential', 'c.CredentialNumber IS NOT NULL', 'c.CredentialNumber LIKE ''%[^A-Za-z0-9\-]%''', 'Warning', 'CredentialNumber contains unexpected special characters', 'CredentialNumber', NULL, NULL, NULL),
+    ('CRED037', 'Credential', 'c.ExpirationDate IS NOT NULL', 'c.ExpirationDate IS NOT NULL AND c.ExpirationDate < CAST(c.CreatedDate AS DATE)', 'Fail', 'ExpirationDate cannot be before record CreatedDate', NULL, NULL, NULL, NULL),
+    ('CRED038', 'Credential', 'c.IssueDate IS NOT NULL', 'c.IssueDate IS NOT NULL AND DATEDIFF(YEAR, c.IssueDate, c.CreatedDate) > 10', 'Warning', 'IssueDate is more than 10 years before record creation date', NULL, NULL, NULL, NULL),
+    ('CRED039', 'Credential', 'c.IsPrimary = 1', 'c.IsPrimary = 1 AND c.Status != ''Active''', 'Warning', 'Primary credential should typically be Active', NULL, NULL, NULL, NULL),
+    ('CRED040', 'Credential', 'c.Status = ''Active''', 'c.Status = ''Active'' AND (c.VerificationDate IS NULL OR DATEDIFF(YEAR, c.VerificationDate, GETDATE()) > 5)', 'Warning', 'Active credentials should be verified within last 5 years', NULL, NULL, NULL, NULL)
+) d (RuleCode, SourceName, AppliesWhen, FailWhen, FailStatus, ErrorMessage, FieldName, FieldValueExpression, ResultEntityType, EntityIDExpression)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+-- Entity Rule Definitions (ENT001 - ENT025)
+UPDATE vr
+SET SourceName = d.SourceName,
+    AppliesWhen = d.AppliesWhen,
+    FailWhen = d.FailWhen,
+    FailStatus = d.FailStatus,
+    ErrorMessage = d.ErrorMessage,
+    FieldName = d.FieldName,
+    FieldValueExpression = d.FieldValueExpression,
+    ResultEntityType = d.ResultEntityType,
+    EntityIDExpression = d.EntityIDExpression,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('ENT001', 'Entity', 'e.IsActive = 1', 'e.EntityName IS NULL OR LTRIM(RTRIM(e.EntityName)) = ''''', 'Fail', 'EntityName is required', 'EntityName', 'e.EntityName', NULL, NULL),
+    ('ENT002', 'Entity', 'e.IsActive = 1 AND taxid_dup.TaxID IS NOT NULL', 'e.TaxID IS NOT NULL AND taxid_dup.DuplicateCount > 1', 'Fail', 'TaxID must be unique', 'TaxID', 'e.TaxID', NULL, NULL),
+    ('ENT003', 'Entity', 'e.IsActive = 1 AND e.NPI IS NOT NULL', 'e.NPI IS NOT NULL AND (LEN(LTRIM(RTRIM(e.NPI))) != 10 OR e.NPI LIKE ''%[^0-9]%'')', 'Fail', 'NPI must be exactly 10 digits', 'NPI', 'e.NPI', NULL, NULL),
+    ('ENT004', 'Entity', 'e.IsActive = 1 AND npi_dup.NPI IS NOT NULL', 'e.NPI IS NOT NULL AND npi_dup.DuplicateCount > 1', 'Fail', 'NPI must be unique', 'NPI', 'e.NPI', NULL, NULL),
+    ('ENT005', 'Entity', 'e.IsActive = 1 AND e.EmailAddress IS NOT NULL', 'e.EmailAddress IS NOT NULL AND (e.EmailAddress NOT LIKE ''%@%.%'' OR e.EmailAddress LIKE ''@%'' OR e.EmailAddress LIKE ''%@'' OR CHARINDEX(''..'', e.EmailAddress) > 0)', 'Fail', 'Email address format is invalid', 'EmailAddress', 'e.EmailAddress', NULL, NULL),
+    ('ENT006', 'Entity', 'e.IsActive = 1 AND e.PhoneNumber IS NOT NULL', 'e.PhoneNumber IS NOT NULL AND (LEN(REPLACE(REPLACE(REPLACE(REPLACE(e.PhoneNumber, ''('', ''''), '')'', ''''), ''-'', ''''), '' '', '''')) < 10)', 'Fail', 'Phone number must contain at least 10 digits', 'PhoneNumber', 'e.PhoneNumber', NULL, NULL),
+    ('ENT007', 'Entity', 'e.IsActive = 1 AND e.State IS NOT NULL', 'e.State IS NOT NULL AND LEN(e.State) != 2', 'Fail', 'State must be 2 characters', 'State', 'e.State', NULL, NULL),
+    ('ENT008', 'Entity', 'e.IsActive = 1 AND e.ZipCode IS NOT NULL', 'e.ZipCode IS NOT NULL AND (LEN(REPLACE(e.ZipCode, ''-'', '''')) NOT IN (5, 9) OR REPLACE(e.ZipCode, ''-'', '''') LIKE ''%[^0-9]%'')', 'Fail', 'ZIP code must be 5 or 9 digits', 'ZipCode', 'e.ZipCode', NULL, NULL),
+    ('ENT009', 'Entity', 'e.IsActive = 1', 'e.Status NOT IN (''Active'', ''Inactive'', ''Pending'', ''Suspended'', ''Terminated'')', 'Fail', 'Status must be one of: Active, Inactive, Pending, Suspended, Terminated', 'Status', 'e.Status', NULL, NULL),
+    ('ENT010', 'Entity', 'e.IsActive = 1', '(e.City IS NOT NULL OR e.State IS NOT NULL OR e.ZipCode IS NOT NULL) AND (e.AddressLine1 IS NULL OR LTRIM(RTRIM(e.AddressLine1)) = '''')', 'Fail', 'Address Line 1 is required when other address fields are present', 'AddressLine1', NULL, NULL, NULL),
+    ('ENT011', 'Entity', 'e.IsActive = 1', '(e.State IS NOT NULL OR e.ZipCode IS NOT NULL) AND (e.City IS NULL OR LTRIM(RTRIM(e.City)) = '''')', 'Fail', 'City is required when State or ZipCode is provided', 'City', NULL, NULL, NULL),
+    ('ENT012', 'Entity', 'e.IsActive = 1', '(e.City IS NOT NULL OR e.ZipCode IS NOT NULL) AND (e.State IS NULL OR LTRIM(RTRIM(e.State)) = '''')', 'Fail', 'State is required when City or ZipCode is provided', 'State', NULL, NULL, NULL),
+    ('ENT013', 'Entity', 'e.IsActive = 1', 'e.ModifiedDate < e.CreatedDate', 'Fail', 'ModifiedDate cannot be before CreatedDate', NULL, NULL, NULL, NULL),
+    ('ENT014', 'Entity', 'e.IsActive = 1', 'e.CreatedDate > GETDATE()', 'Fail', 'CreatedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('ENT015', 'Entity', 'e.IsActive = 1', 'e.ModifiedDate > GETDATE()', 'Fail', 'ModifiedDate cannot be in the future', NULL, NULL, NULL, NULL),
+    ('ENT016', 'Entity', 'e.IsActive = 1 AND e.EntityName IS NOT NULL', 'LEN(LTRIM(RTRIM(e.EntityName))) < 2 OR LEN(LTRIM(RTRIM(e.EntityName))) > 255', 'Warning', 'EntityName length should be between 2 and 255 characters', 'EntityName', 'e.EntityName', NULL, NULL),
+    ('ENT017', 'Entity', 'e.IsActive = 1 AND e.TaxID IS NOT NULL', 'e.TaxID IS NOT NULL AND LEN(REPLACE(e.TaxID, ''-'', '''')) != 9', 'Fail', 'TaxID must be 9 digits (format: XX-XXXXXXX or XXXXXXXXX)', 'TaxID', 'e.TaxID', NULL, NULL),
+    ('ENT018', 'Entity', 'e.IsActive = 1 AND e.EntityType IS NOT NULL', 'e.EntityType IS NOT NULL AND e.EntityType NOT IN (''Hospital'', ''Clinic'', ''Group Practice'', ''Individual Practice'', ''Urgent Care'', ''Surgery Center'', ''Other'')', 'Warning', 'EntityType should be from standard list', 'EntityType', 'e.EntityType', NULL, NULL),
+    ('ENT019', 'Entity', 'e.IsActive = 1 AND e.State IS NOT NULL', 'e.State IS NOT NULL AND e.State COLLATE Latin1_General_CS_AS != UPPER(e.State)', 'Warning', 'State code should be uppercase', 'State', 'e.State', NULL, NULL),
+    ('ENT020', 'Entity', 'e.IsActive = 1 AND e.EmailAddress IS NOT NULL AND e.EmailAddress LIKE ''%@%''', 'e.EmailAddress IS NOT NULL AND CHARINDEX(''.'', SUBSTRING(e.EmailAddress, CHARINDEX(''@'', e.EmailAddress) + 1, LEN(e.EmailAddress))) = 0', 'Fail', 'Email domain must contain at least one dot', 'EmailAddress', 'e.EmailAddress', NULL, NULL),
+    ('ENT021', 'Entity', 'e.IsActive = 1 AND e.PhoneNumber IS NOT NULL', 'e.PhoneNumber IS NOT NULL AND e.PhoneNumber LIKE ''%[A-Za-z]%''', 'Fail', 'Phone number should not contain letters', 'PhoneNumber', 'e.PhoneNumber', NULL, NULL),
+    ('ENT022', 'Entity', 'e.IsActive = 1 AND e.EmailAddress IS NOT NULL', 'e.EmailAddress IS NOT NULL AND e.EmailAddress COLLATE Latin1_General_CS_AS != LOWER(e.EmailAddress)', 'Warning', 'Email address should be lowercase', 'EmailAddress', NULL, NULL, NULL),
+    ('ENT023', 'Entity', 'e.IsActive = 1', 'e.Status = ''Active'' AND (e.AddressLine1 IS NULL OR e.City IS NULL OR e.State IS NULL OR e.ZipCode IS NULL)', 'Warning', 'Active entities should have complete address information', NULL, NULL, NULL, NULL),
+    ('ENT024', 'Entity', 'e.IsActive = 1 AND e.EntityType = ''Hospital''', 'e.EntityType = ''Hospital'' AND (e.AccreditationStatus IS NULL OR LTRIM(RTRIM(e.AccreditationStatus)) = '''')', 'Warning', 'Hospitals should have AccreditationStatus', 'AccreditationStatus', NULL, NULL, NULL),
+    ('ENT025', 'Entity', 'e.IsActive = 1 AND e.EntityName IS NOT NULL', 'e.EntityName IS NOT NULL AND e.EntityName NOT LIKE ''%[A-Za-z]%''', 'Warning', 'EntityName should contain at least one letter', 'EntityName', 'e.EntityName', NULL, NULL)
+) d (RuleCode, SourceName, AppliesWhen, FailWhen, FailStatus, ErrorMessage, FieldName, FieldValueExpression, ResultEntityType, EntityIDExpression)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+-- Cross-Entity Rule Definitions (CROSS001 - CROSS017)
+UPDATE vr
+SET SourceName = d.SourceName,
+    AppliesWhen = d.AppliesWhen,
+    FailWhen = d.FailWhen,
+    FailStatus = d.FailStatus,
+    ErrorMessage = d.ErrorMessage,
+    FieldName = d.FieldName,
+    FieldValueExpression = d.FieldValueExpression,
+    ResultEntityType = d.ResultEntityType,
+    EntityIDExpression = d.EntityIDExpression,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('CROSS001', 'Provider', 'p.IsActive = 1 AND p.NPI IS NOT NULL', 'npi_entity.EntityID IS NOT NULL', 'Fail', 'Provider NPI should not match an Entity NPI', NULL, NULL, NULL, NULL),
+    ('CROSS002', 'Provider', 'p.IsActive = 1 AND p.EntityID IS NOT NULL', 'p.EntityID IS NOT NULL AND (e.EntityID IS NULL OR e.IsActive = 0 OR e.Status != ''Active'')', 'Fail', 'Provider EntityID must reference an Active Entity', 'EntityID', NULL, NULL, NULL),
+    ('CROSS003', 'Provider', 'p.IsActive = 1 AND p.State IS NOT NULL AND e.State IS NOT NULL', 'p.State IS NOT NULL AND e.State IS NOT NULL AND p.State != e.State', 'Warning', 'Provider State does not match Entity State', NULL, NULL, NULL, NULL),
+    ('CROSS004', 'Provider', 'p.IsActive = 1 AND p.Status = ''Active''', 'p.Status = ''Active'' AND ISNULL(pc.HasActiveCredential, 0) = 0', 'Fail', 'Active Provider must have at least one Active credential', NULL, NULL, NULL, NULL),
+    ('CROSS005', 'Credential', 'c.CredentialType LIKE ''%License%'' AND c.StateIssued IS NOT NULL AND p.State IS NOT NULL', 'c.CredentialType LIKE ''%License%'' AND c.StateIssued IS NOT NULL AND p.State IS NOT NULL AND c.StateIssued != p.State', 'Warning', 'Credential StateIssued does not match Provider State for License type', NULL, NULL, NULL, NULL),
+    ('CROSS006', 'Provider', 'p.IsActive = 1 AND p.Status = ''Active''', 'p.Status = ''Active'' AND ISNULL(pc.HasPrimaryCredential, 0) = 0', 'Warning', 'Active Provider should have at least one Primary credential', NULL, NULL, NULL, NULL),
+    ('CROSS007', 'Credential', 'p.Status = ''Active'' AND c.ExpirationDate IS NOT NULL', 'p.Status = ''Active'' AND c.ExpirationDate IS NOT NULL AND c.ExpirationDate < GETDATE() AND c.Status != ''Expired''', 'Fail', 'Expired credentials associated with Active providers should have Status = Expired', NULL, NULL, NULL, NULL),
+    ('CROSS008', 'Entity', 'e.IsActive = 1 AND e.Status = ''Active''', 'e.Status = ''Active'' AND ISNULL(ep.ProviderCount, 0) = 0', 'Warning', 'Active Entity should have at least one associated Provider', NULL, NULL, NULL, NULL),
+    ('CROSS009', 'Provider', 'p.IsActive = 1 AND p.EntityID IS NOT NULL AND e.EntityID IS NOT NULL', 'p.EntityID IS NOT NULL AND p.CreatedDate < e.CreatedDate', 'Warning', 'Provider CreatedDate should not be before Entity CreatedDate', NULL, NULL, NULL, NULL),
+    ('CROSS010', 'Credential', 'c.IssueDate IS NOT NULL AND p.ProviderID IS NOT NULL', 'c.IssueDate IS NOT NULL AND c.IssueDate < CAST(p.CreatedDate AS DATE)', 'Warning', 'Credential IssueDate should not be before Provider CreatedDate', NULL, NULL, NULL, NULL),
+    ('CROSS011', 'Provider', 'p.IsActive = 1 AND p.Status = ''Suspended''', 'p.Status = ''Suspended'' AND pc.HasActiveCredential = 1', 'Warning', 'Suspended Provider should not have Active credentials', NULL, NULL, NULL, NULL),
+    ('CROSS012', 'Provider', 'p.IsActive = 1 AND p.Status = ''Terminated''', 'p.Status = ''Terminated'' AND pc.HasActiveCredential = 1', 'Fail', 'Terminated Provider should not have Active credentials', NULL, NULL, NULL, NULL),
+    ('CROSS013', 'Credential', 'p.Status = ''Active'' AND c.Status = ''Active'' AND c.ExpirationDate IS NOT NULL', 'p.Status = ''Active'' AND c.Status = ''Active'' AND c.ExpirationDate IS NOT NULL AND c.ExpirationDate BETWEEN GETDATE() AND DATEADD(DAY, 60, GETDATE())', 'Warning', 'Active Provider has credential expiring within 60 days', NULL, NULL, NULL, NULL),
+    ('CROSS014', 'Provider', 'p.IsActive = 1 AND p.EmailAddress IS NOT NULL AND e.EmailAddress IS NOT NULL', 'p.EmailAddress IS NOT NULL AND e.EmailAddress IS NOT NULL AND SUBSTRING(p.EmailAddress, CHARINDEX(''@'', p.EmailAddress) + 1, LEN(p.EmailAddress)) != SUBSTRING(e.EmailAddress, CHARINDEX(''@'', e.EmailAddress) + 1, LEN(e.EmailAddress))', 'Warning', 'Provider Email domain does not match Entity Email domain', NULL, NULL, NULL, NULL),
+    ('CROSS015', 'Provider', 'p.IsActive = 1 AND p.ZipCode IS NOT NULL AND e.ZipCode IS NOT NULL', 'p.ZipCode IS NOT NULL AND e.ZipCode IS NOT NULL AND REPLACE(p.ZipCode, ''-'', '''') != REPLACE(e.ZipCode, ''-'', '''')', 'Warning', 'Provider ZipCode does not match Entity ZipCode', NULL, NULL, NULL, NULL),
+    ('CROSS016', 'Provider', 'p.IsActive = 1 AND p.Status = ''Active''', 'p.Status = ''Active'' AND ISNULL(pc.HasLongValidCredential, 0) = 0', 'Warning', 'Active Provider should have at least one credential valid for more than 30 days', NULL, NULL, NULL, NULL),
+    ('CROSS017', 'Entity', 'e.IsActive = 1 AND e.Status IN (''Inactive'', ''Suspended'', ''Terminated'')', 'e.Status IN (''Inactive'', ''Suspended'', ''Terminated'') AND ep.ActiveProviderCount > 0', 'Warning', 'Inactive Entity should not have Active providers', NULL, NULL, NULL, NULL)
+) d (RuleCode, SourceName, AppliesWhen, FailWhen, FailStatus, ErrorMessage, FieldName, FieldValueExpression, ResultEntityType, EntityIDExpression)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+-- Duplicate Rule Definitions (DUP001 - DUP004)
+-- dup is the record's best candidate in cred.DuplicateCandidates for the run
+UPDATE vr
+SET SourceName = d.SourceName,
+    AppliesWhen = d.AppliesWhen,
+    FailWhen = d.FailWhen,
+    FailStatus = d.FailStatus,
+    ErrorMessage = d.ErrorMessage,
+    FieldName = d.FieldName,
+    FieldValueExpression = d.FieldValueExpression,
+    ResultEntityType = d.ResultEntityType,
+    EntityIDExpression = d.EntityIDExpression,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('DUP001', 'ProviderDuplicate', 'p.IsActive = 1', 'dup.MatchScore >= 80', 'Fail', 'Provider is a probable duplicate of another provider', 'ProviderID', 'CONCAT(dup.CandidateEntityID, '' (score '', dup.MatchScore, '': '', dup.MatchedOn, '')'')', NULL, NULL),
+    ('DUP002', 'ProviderDuplicate', 'p.IsActive = 1', 'dup.MatchScore >= 65 AND dup.MatchScore < 80', 'Warning', 'Provider is a possible duplicate of another provider', 'ProviderID', 'CONCAT(dup.CandidateEntityID, '' (score '', dup.MatchScore, '': '', dup.MatchedOn, '')'')', NULL, NULL),
+    ('DUP003', 'EntityDuplicate', 'e.IsActive = 1', 'dup.MatchScore >= 80', 'Fail', 'Entity is a probable duplicate of another entity', 'EntityID', 'CONCAT(dup.CandidateEntityID, '' (score '', dup.MatchScore, '': '', dup.MatchedOn, '')'')', NULL, NULL),
+    ('DUP004', 'EntityDuplicate', 'e.IsActive = 1', 'dup.MatchScore >= 65 AND dup.MatchScore < 80', 'Warning', 'Entity is a possible duplicate of another entity', 'EntityID', 'CONCAT(dup.CandidateEntityID, '' (score '', dup.MatchScore, '': '', dup.MatchedOn, '')'')', NULL, NULL)
+) d (RuleCode, SourceName, AppliesWhen, FailWhen, FailStatus, ErrorMessage, FieldName, FieldValueExpression, ResultEntityType, EntityIDExpression)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+PRINT 'Validation rule definitions populated successfully';
+GO
+
+-- =============================================
+-- Rule Schedule Metadata
+-- cred.sp_ScheduleValidationRules picks each run's rules from these. Daily rules
+-- compare against GETDATE() and run every time; an OnChange rule's outcome can
+-- only change when a table in DependsOnTables changes. DependsOnColumns lists
+-- the columns its expressions read, including through the source's lookups.
+-- =============================================
+UPDATE vr
+SET Cadence = d.Cadence,
+    DependsOnTables = d.DependsOnTables,
+    DependsOnColumns = d.DependsOnColumns,
+    ModifiedDate = GETDATE()
+FROM cred.ValidationRules vr
+INNER JOIN (VALUES
+    ('PRV001', 'OnChange', 'Providers', 'Providers.IsActive, Providers.NPI'),
+    ('PRV002', 'OnChange', 'Providers', 'Providers.IsActive, Providers.NPI'),
+    ('PRV003', 'OnChange', 'Providers', 'Providers.FirstName, Providers.IsActive'),
+    ('PRV004', 'OnChange', 'Providers', 'Providers.IsActive, Providers.LastName'),
+    ('PRV005', 'Daily', 'Providers', 'Providers.DateOfBirth, Providers.IsActive'),
+    ('PRV006', 'Daily', 'Providers', 'Providers.DateOfBirth, Providers.IsActive'),
+    ('PRV007', 'OnChange', 'Providers', 'Providers.IsActive, Providers.SSN'),
+    ('PRV008', 'OnChange', 'Providers', 'Providers.EmailAddress, Providers.IsActive'),
+    ('PRV009', 'OnChange', 'Providers', 'Providers.IsActive, Providers.PhoneNumber'),
+    ('PRV010', 'OnChange', 'Providers', 'Providers.IsActive, Providers.State'),
+    ('PRV011', 'OnChange', 'Providers', 'Providers.IsActive, Providers.ZipCode'),
+    ('PRV012', 'OnChange', 'Providers', 'Providers.IsActive, Providers.Status'),
+    ('PRV013', 'OnChange', 'Providers', 'Providers.IsActive, Providers.NPI'),
+    ('PRV014', 'OnChange', 'Providers', 'Providers.IsActive, Providers.Specialty, Providers.Status'),
+    ('PRV015', 'OnChange', 'Providers', 'Providers.FirstName, Providers.IsActive'),
+    ('PRV016', 'OnChange', 'Providers', 'Providers.IsActive, Providers.LastName'),
+    ('PRV017', 'OnChange', 'Providers', 'Providers.City, Providers.IsActive, Providers.State, Providers.ZipCode'),
+    ('PRV018', 'OnChange', 'Providers', 'Providers.City, Providers.IsActive, Providers.State, Providers.ZipCode'),
+    ('PRV019', 'OnChange', 'Providers', 'Providers.City, Providers.IsActive, Providers.State, Providers.ZipCode'),
+    ('PRV020', 'OnChange', 'Providers', 'Providers.CreatedDate, Providers.IsActive, Providers.ModifiedDate'),
+    ('PRV021', 'OnChange', 'Providers', 'Providers.EntityID, Providers.IsActive, Providers.Status'),
+    ('PRV022', 'OnChange', 'Providers,Entities', 'Providers.EntityID, Providers.IsActive, Entities.EntityID'),
+    ('PRV023', 'OnChange', 'Providers', 'Providers.EmailAddress, Providers.IsActive'),
+    ('PRV024', 'OnChange', 'Providers', 'Providers.IsActive, Providers.PhoneNumber'),
+    ('PRV025', 'OnChange', 'Providers', 'Providers.IsActive, Providers.State'),
+    ('PRV026', 'OnChange', 'Providers', 'Providers.FirstName, Providers.IsActive, Providers.LastName'),
+    ('PRV027', 'OnChange', 'Providers', 'Providers.FirstName, Providers.IsActive'),
+    ('PRV028', 'OnChange', 'Providers', 'Providers.IsActive, Providers.LastName'),
+    ('PRV029', 'OnChange', 'Providers', 'Providers.EmailAddress, Providers.IsActive'),
+    ('PRV030', 'OnChange', 'Providers', 'Providers.IsActive, Providers.SSN'),
+    ('PRV031', 'OnChange', 'Providers', 'Providers.IsActive, Providers.SSN'),
+    ('PRV032', 'Daily', 'Providers', 'Providers.IsActive, Providers.LastValidatedDate, Providers.Status'),
+    ('PRV033', 'Daily', 'Providers', 'Providers.CreatedDate, Providers.IsActive'),
+    ('PRV034', 'Daily', 'Providers', 'Providers.IsActive, Providers.ModifiedDate'),
+    ('PRV035', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ProviderID, Credentials.Status'),
+    ('CRED001', 'OnChange', 'Credentials', 'Credentials.ProviderID'),
+    ('CRED002', 'OnChange', 'Credentials', 'Credentials.CredentialType'),
+    ('CRED003', 'OnChange', 'Credentials', 'Credentials.CredentialNumber'),
+    ('CRED004', 'OnChange', 'Providers,Credentials', 'Providers.ProviderID, Credentials.ProviderID'),
+    ('CRED005', 'OnChange', 'Credentials', 'Credentials.ExpirationDate, Credentials.IssueDate'),
+    ('CRED006', 'Daily', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED007', 'Daily', 'Credentials', 'Credentials.ExpirationDate'),
+    ('CRED008', 'Daily', 'Credentials', 'Credentials.IssueDate'),
+    ('CRED009', 'Daily', 'Credentials', 'Credentials.IssueDate'),
+    ('CRED010', 'OnChange', 'Credentials', 'Credentials.Status'),
+    ('CRED011', 'OnChange', 'Credentials', 'Credentials.CredentialType, Credentials.IsPrimary, Credentials.ProviderID'),
+    ('CRED012', 'Daily', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED013', 'Daily', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED014', 'OnChange', 'Credentials', 'Credentials.CredentialType, Credentials.IssuingOrganization'),
+    ('CRED015', 'OnChange', 'Credentials', 'Credentials.StateIssued'),
+    ('CRED016', 'OnChange', 'Credentials', 'Credentials.StateIssued'),
+    ('CRED017', 'Daily', 'Credentials', 'Credentials.VerificationDate'),
+    ('CRED018', 'OnChange', 'Credentials', 'Credentials.VerificationDate, Credentials.VerifiedBy'),
+    ('CRED019', 'OnChange', 'Credentials', 'Credentials.CreatedDate, Credentials.ModifiedDate'),
+    ('CRED020', 'Daily', 'Credentials', 'Credentials.CreatedDate'),
+    ('CRED021', 'Daily', 'Credentials', 'Credentials.ModifiedDate'),
+    ('CRED022', 'OnChange', 'Credentials', 'Credentials.CredentialNumber, Credentials.CredentialType, Credentials.ProviderID'),
+    ('CRED023', 'OnChange', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED024', 'OnChange', 'Credentials', 'Credentials.CredentialNumber'),
+    ('CRED025', 'OnChange', 'Credentials', 'Credentials.CredentialType'),
+    ('CRED026', 'OnChange', 'Credentials', 'Credentials.CredentialType, Credentials.StateIssued'),
+    ('CRED027', 'OnChange', 'Credentials', 'Credentials.ExpirationDate, Credentials.IssueDate'),
+    ('CRED028', 'OnChange', 'Credentials', 'Credentials.CredentialNumber'),
+    ('CRED029', 'OnChange', 'Credentials', 'Credentials.IssuingOrganization'),
+    ('CRED030', 'OnChange', 'Credentials', 'Credentials.IssueDate, Credentials.VerificationDate'),
+    ('CRED031', 'Daily', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED032', 'Daily', 'Credentials', 'Credentials.ExpirationDate, Credentials.Status'),
+    ('CRED033', 'OnChange', 'Credentials', 'Credentials.Status, Credentials.VerifiedBy'),
+    ('CRED034', 'OnChange', 'Credentials', 'Credentials.CredentialType'),
+    ('CRED035', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ProviderID, Credentials.Status'),
+    ('CRED036', 'OnChange', 'Credentials', 'Credentials.CredentialNumber'),
+    ('CRED037', 'OnChange', 'Credentials', 'Credentials.CreatedDate, Credentials.ExpirationDate'),
+    ('CRED038', 'OnChange', 'Credentials', 'Credentials.CreatedDate, Credentials.IssueDate'),
+    ('CRED039', 'OnChange', 'Credentials', 'Credentials.IsPrimary, Credentials.Status'),
+    ('CRED040', 'Daily', 'Credentials', 'Credentials.Status, Credentials.VerificationDate'),
+    ('ENT001', 'OnChange', 'Entities', 'Entities.EntityName, Entities.IsActive'),
+    ('ENT002', 'OnChange', 'Entities', 'Entities.IsActive, Entities.TaxID'),
+    ('ENT003', 'OnChange', 'Entities', 'Entities.IsActive, Entities.NPI'),
+    ('ENT004', 'OnChange', 'Entities', 'Entities.IsActive, Entities.NPI'),
+    ('ENT005', 'OnChange', 'Entities', 'Entities.EmailAddress, Entities.IsActive'),
+    ('ENT006', 'OnChange', 'Entities', 'Entities.IsActive, Entities.PhoneNumber'),
+    ('ENT007', 'OnChange', 'Entities', 'Entities.IsActive, Entities.State'),
+    ('ENT008', 'OnChange', 'Entities', 'Entities.IsActive, Entities.ZipCode'),
+    ('ENT009', 'OnChange', 'Entities', 'Entities.IsActive, Entities.Status'),
+    ('ENT010', 'OnChange', 'Entities', 'Entities.City, Entities.IsActive, Entities.State, Entities.ZipCode'),
+    ('ENT011', 'OnChange', 'Entities', 'Entities.City, Entities.IsActive, Entities.State, Entities.ZipCode'),
+    ('ENT012', 'OnChange', 'Entities', 'Entities.City, Entities.IsActive, Entities.State, Entities.ZipCode'),
+    ('ENT013', 'OnChange', 'Entities', 'Entities.CreatedDate, Entities.IsActive, Entities.ModifiedDate'),
+    ('ENT014', 'Daily', 'Entities', 'Entities.CreatedDate, Entities.IsActive'),
+    ('ENT015', 'Daily', 'Entities', 'Entities.IsActive, Entities.ModifiedDate'),
+    ('ENT016', 'OnChange', 'Entities', 'Entities.EntityName, Entities.IsActive'),
+    ('ENT017', 'OnChange', 'Entities', 'Entities.IsActive, Entities.TaxID'),
+    ('ENT018', 'OnChange', 'Entities', 'Entities.EntityType, Entities.IsActive'),
+    ('ENT019', 'OnChange', 'Entities', 'Entities.IsActive, Entities.State'),
+    ('ENT020', 'OnChange', 'Entities', 'Entities.EmailAddress, Entities.IsActive'),
+    ('ENT021', 'OnChange', 'Entities', 'Entities.IsActive, Entities.PhoneNumber'),
+    ('ENT022', 'OnChange', 'Entities', 'Entities.EmailAddress, Entities.IsActive'),
+    ('ENT023', 'OnChange', 'Entities', 'Entities.City, Entities.IsActive, Entities.State, Entities.Status, Entities.ZipCode'),
+    ('ENT024', 'OnChange', 'Entities', 'Entities.AccreditationStatus, Entities.EntityType, Entities.IsActive'),
+    ('ENT025', 'OnChange', 'Entities', 'Entities.EntityName, Entities.IsActive'),
+    ('CROSS001', 'OnChange', 'Providers,Entities', 'Providers.IsActive, Providers.NPI, Entities.NPI'),
+    ('CROSS002', 'OnChange', 'Providers,Entities', 'Providers.EntityID, Providers.IsActive, Entities.EntityID, Entities.IsActive, Entities.Status'),
+    ('CROSS003', 'OnChange', 'Providers,Entities', 'Providers.IsActive, Providers.State, Entities.State'),
+    ('CROSS004', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ProviderID, Credentials.Status'),
+    ('CROSS005', 'OnChange', 'Providers,Credentials', 'Providers.State, Credentials.CredentialType, Credentials.StateIssued'),
+    ('CROSS006', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.IsPrimary, Credentials.ProviderID'),
+    ('CROSS007', 'Daily', 'Providers,Credentials', 'Providers.Status, Credentials.ExpirationDate, Credentials.Status'),
+    ('CROSS008', 'OnChange', 'Providers,Entities', 'Providers.EntityID, Providers.IsActive, Entities.IsActive, Entities.Status'),
+    ('CROSS009', 'OnChange', 'Providers,Entities', 'Providers.CreatedDate, Providers.EntityID, Providers.IsActive, Entities.CreatedDate, Entities.EntityID'),
+    ('CROSS010', 'OnChange', 'Providers,Credentials', 'Providers.CreatedDate, Providers.ProviderID, Credentials.IssueDate'),
+    ('CROSS011', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ProviderID, Credentials.Status'),
+    ('CROSS012', 'OnChange', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ProviderID, Credentials.Status'),
+    ('CROSS013', 'Daily', 'Providers,Credentials', 'Providers.Status, Credentials.ExpirationDate, Credentials.Status'),
+    ('CROSS014', 'OnChange', 'Providers,Entities', 'Providers.EmailAddress, Providers.IsActive, Entities.EmailAddress'),
+    ('CROSS015', 'OnChange', 'Providers,Entities', 'Providers.IsActive, Providers.ZipCode, Entities.ZipCode'),
+    ('CROSS016', 'Daily', 'Providers,Credentials', 'Providers.IsActive, Providers.Status, Credentials.ExpirationDate, Credentials.ProviderID, Credentials.Status'),
+    ('CROSS017', 'OnChange', 'Providers,Entities', 'Providers.EntityID, Providers.IsActive, Providers.Status, Entities.IsActive, Entities.Status'),
+    ('DUP001', 'OnChange', 'Providers', 'Providers.DateOfBirth, Providers.EmailAddress, Providers.FirstName, Providers.IsActive, Providers.LastName, Providers.NPI, Providers.PhoneNumber, Providers.SSN, Providers.ZipCode'),
+    ('DUP002', 'OnChange', 'Providers', 'Providers.DateOfBirth, Providers.EmailAddress, Providers.FirstName, Providers.IsActive, Providers.LastName, Providers.NPI, Providers.PhoneNumber, Providers.SSN, Providers.ZipCode'),
+    ('DUP003', 'OnChange', 'Entities', 'Entities.AddressLine1, Entities.EmailAddress, Entities.EntityName, Entities.IsActive, Entities.NPI, Entities.PhoneNumber, Entities.TaxID, Entities.ZipCode'),
+    ('DUP004', 'OnChange', 'Entities', 'Entities.AddressLine1, Entities.EmailAddress, Entities.EntityName, Entities.IsActive, Entities.NPI, Entities.PhoneNumber, Entities.TaxID, Entities.ZipCode')
+) d (RuleCode, Cadence, DependsOnTables, DependsOnColumns)
+    ON vr.RuleCode = d.RuleCode;
+GO
+
+PRINT 'Validation rule schedule metadata populated successfully';
+GO
+
 -- Verify count
 SELECT RuleCategory, COUNT(*) as RuleCount
 FROM cred.ValidationRules
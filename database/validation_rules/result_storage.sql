@@ -0,0 +1,45 @@
+-- Validation Result Storage
+-- Moves staged rule outcomes into ValidationResults and ValidationRuleRunStats
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Stored Procedure: Flush Rule Results
+-- Reads the caller's #RuleResults staging table, records one tally row per
+-- rule and writes the detail rows allowed by @ResultMode:
+--   Full           - every outcome, including Pass rows
+--   ExceptionsOnly - Fail and Warning rows only; passes survive as counts
+-- A staged row stands for OutcomeCount outcomes, so Pass rows may arrive
+-- already collapsed into one counted row per rule.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_FlushRuleResults') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_FlushRuleResults;
+GO
+
+CREATE PROCEDURE cred.sp_FlushRuleResults
+    @ValidationRunID INT,
+    @ResultMode NVARCHAR(20) = 'Full'
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO cred.ValidationRuleRunStats (ValidationRunID, RuleID, RuleCode, EntityType, PassCount, FailCount, WarningCount)
+    SELECT @ValidationRunID, RuleID, RuleCode, EntityType,
+           SUM(CASE WHEN ValidationStatus = 'Pass' THEN OutcomeCount ELSE 0 END),
+           SUM(CASE WHEN ValidationStatus = 'Fail' THEN OutcomeCount ELSE 0 END),
+           SUM(CASE WHEN ValidationStatus = 'Warning' THEN OutcomeCount ELSE 0 END)
+    FROM #RuleResults
+    GROUP BY RuleID, RuleCode, EntityType;
+
+    INSERT INTO cred.ValidationResults (RuleID, RuleCode, ValidationRunID, EntityType, EntityID, RecordID, ValidationStatus, ErrorMessage, FieldName, FieldValue, Severity)
+    SELECT RuleID, RuleCode, ValidationRunID, EntityType, EntityID, RecordID, ValidationStatus, ErrorMessage, FieldName, FieldValue, Severity
+    FROM #RuleResults
+    WHERE @ResultMode = 'Full' OR ValidationStatus <> 'Pass';
+
+    TRUNCATE TABLE #RuleResults;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_FlushRuleResults created successfully';
+GO
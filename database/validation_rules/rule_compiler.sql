@@ -0,0 +1,423 @@
+-- Validation Rule Compiler
+-- Compiles the rules of a category into one set-based statement per row source
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Rule Sources
+-- Each FromClause returns exactly one row per scoped record. Lookups are joined on
+-- unique keys and aggregated per key, so joins a category's rules never reference
+-- are eliminated by the optimizer. ShardTable/ShardKeyColumn name the base table key
+-- behind EntityIDExpression, used to split a source into key ranges for parallel runs.
+-- =============================================
+DELETE FROM cred.ValidationRuleSources;
+
+INSERT INTO cred.ValidationRuleSources (SourceName, EntityType, EntityIDExpression, RecordIDExpression, FromClause, ShardTable, ShardKeyColumn)
+VALUES
+('Provider', 'Provider', 'p.ProviderID', 'p.NPI',
+'cred.fn_ScopedProviders(@ValidationRunID) p
+LEFT JOIN cred.Entities e ON p.EntityID = e.EntityID
+LEFT JOIN cred.Entities npi_entity ON p.NPI = npi_entity.NPI
+LEFT JOIN (SELECT NPI, COUNT(*) AS DuplicateCount
+           FROM cred.Providers
+           GROUP BY NPI
+           HAVING COUNT(*) > 1) npi_dup ON p.NPI = npi_dup.NPI
+LEFT JOIN (SELECT ProviderID,
+                  MAX(CASE WHEN Status = ''Active'' THEN 1 ELSE 0 END) AS HasActiveCredential,
+                  MAX(CASE WHEN IsPrimary = 1 THEN 1 ELSE 0 END) AS HasPrimaryCredential,
+                  MAX(CASE WHEN Status = ''Active'' AND ExpirationDate > DATEADD(DAY, 30, GETDATE()) THEN 1 ELSE 0 END) AS HasLongValidCredential
+           FROM cred.Credentials
+           GROUP BY ProviderID) pc ON p.ProviderID = pc.ProviderID',
+'cred.Providers', 'ProviderID'),
+('Credential', 'Credential', 'c.CredentialID', 'c.CredentialNumber',
+'cred.fn_ScopedCredentials(@ValidationRunID) c
+LEFT JOIN cred.Providers p ON c.ProviderID = p.ProviderID
+LEFT JOIN (SELECT ProviderID, CredentialType, COUNT(*) AS DuplicateCount
+           FROM cred.Credentials
+           WHERE IsPrimary = 1
+           GROUP BY ProviderID, CredentialType
+           HAVING COUNT(*) > 1) primary_dup
+    ON c.ProviderID = primary_dup.ProviderID AND c.CredentialType = primary_dup.CredentialType
+LEFT JOIN (SELECT ProviderID, CredentialType, CredentialNumber, COUNT(*) AS DuplicateCount
+           FROM cred.Credentials
+           GROUP BY ProviderID, CredentialType, CredentialNumber
+           HAVING COUNT(*) > 1) number_dup
+    ON c.ProviderID = number_dup.ProviderID AND c.CredentialType = number_dup.CredentialType AND c.CredentialNumber = number_dup.CredentialNumber',
+'cred.Credentials', 'CredentialID'),
+('Entity', 'Entity', 'e.EntityID', 'e.NPI',
+'cred.fn_ScopedEntities(@ValidationRunID) e
+LEFT JOIN (SELECT TaxID, COUNT(*) AS DuplicateCount
+           FROM cred.Entities
+           WHERE TaxID IS NOT NULL
+           GROUP BY TaxID
+           HAVING COUNT(*) > 1) taxid_dup ON e.TaxID = taxid_dup.TaxID
+LEFT JOIN (SELECT NPI, COUNT(*) AS DuplicateCount
+           FROM cred.Entities
+           WHERE NPI IS NOT NULL
+           GROUP BY NPI
+           HAVING COUNT(*) > 1) npi_dup ON e.NPI = npi_dup.NPI
+LEFT JOIN (SELECT EntityID,
+                  COUNT(*) AS ProviderCount,
+                  SUM(CASE WHEN Status = ''Active'' THEN 1 ELSE 0 END) AS ActiveProviderCount
+           FROM cred.Providers
+           WHERE IsActive = 1 AND EntityID IS NOT NULL
+           GROUP BY EntityID) ep ON e.EntityID = ep.EntityID',
+'cred.Entities', 'EntityID'),
+-- Best fuzzy duplicate candidate of each record (sp_RefreshDuplicateCandidates)
+('ProviderDuplicate', 'Provider', 'p.ProviderID', 'p.NPI',
+'cred.fn_ScopedProviders(@ValidationRunID) p
+OUTER APPLY (SELECT TOP 1 dc.CandidateEntityID, dc.MatchScore, dc.MatchedOn, COUNT(*) OVER () AS CandidateCount
+             FROM cred.DuplicateCandidates dc
+             WHERE dc.ValidationRunID = @ValidationRunID AND dc.EntityType = ''Provider'' AND dc.EntityID = p.ProviderID
+             ORDER BY dc.MatchScore DESC, dc.CandidateEntityID) dup',
+'cred.Providers', 'ProviderID'),
+('EntityDuplicate', 'Entity', 'e.EntityID', 'e.NPI',
+'cred.fn_ScopedEntities(@ValidationRunID) e
+OUTER APPLY (SELECT TOP 1 dc.CandidateEntityID, dc.MatchScore, dc.MatchedOn, COUNT(*) OVER () AS CandidateCount
+             FROM cred.DuplicateCandidates dc
+             WHERE dc.ValidationRunID = @ValidationRunID AND dc.EntityType = ''Entity'' AND dc.EntityID = e.EntityID
+             ORDER BY dc.MatchScore DESC, dc.CandidateEntityID) dup',
+'cred.Entities', 'EntityID');
+
+PRINT 'Validation rule sources populated successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Compile Rule Category
+-- Builds the statement that evaluates every active rule of @RuleCategory defined on
+-- @SourceName in a single scan. Each rule becomes one row of a CROSS APPLY (VALUES ...)
+-- unpivot, so a scanned record yields one outcome per rule that applies to it.
+-- In ExceptionsOnly mode Pass outcomes are collapsed into one counted row per rule.
+-- With @Sharded = 1 the statement only scans records whose key lies between the
+-- @LowKey and @HighKey parameters; @RuleCode compiles a single rule. With
+-- @ValidationRunID the rules the run's schedule skipped are left out.
+-- With @CountPreviousInScope = 1 the statement instead counts, per rule, the
+-- records in the run's incremental scope that already existed at the previous
+-- run and that the rule applies to (AppliesWhen), into #PreviousInScopeCounts.
+-- A sentinel row (RuleID 0, status 'Scanned') is emitted per scanned record so
+-- the caller can count the rows scanned; it must be removed before flushing.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_CompileRuleCategory') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_CompileRuleCategory;
+GO
+
+CREATE PROCEDURE cred.sp_CompileRuleCategory
+    @RuleCategory NVARCHAR(100),
+    @SourceName NVARCHAR(50),
+    @ResultMode NVARCHAR(20) = 'Full',
+    @Sharded BIT = 0,
+    @RuleCode NVARCHAR(50) = NULL,
+    @ValidationRunID INT = NULL,
+    @CountPreviousInScope BIT = 0,
+    @Sql NVARCHAR(MAX) OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @FromClause NVARCHAR(MAX);
+    DECLARE @EntityType NVARCHAR(50);
+    DECLARE @EntityIDExpression NVARCHAR(200);
+    DECLARE @RecordIDExpression NVARCHAR(200);
+    DECLARE @Values NVARCHAR(MAX);
+    DECLARE @Separator NVARCHAR(10) = N',' + CHAR(13) + CHAR(10);
+
+    SELECT
+        @FromClause = FromClause,
+        @EntityType = EntityType,
+        @EntityIDExpression = EntityIDExpression,
+        @RecordIDExpression = RecordIDExpression
+    FROM cred.ValidationRuleSources
+    WHERE SourceName = @SourceName;
+
+    IF @FromClause IS NULL
+        THROW 50001, 'Unknown validation rule source', 1;
+
+    IF EXISTS (
+        SELECT 1 FROM cred.fn_ScheduledRules(@ValidationRunID)
+        WHERE RuleCategory = @RuleCategory AND SourceName = @SourceName
+          AND (@RuleCode IS NULL OR RuleCode = @RuleCode)
+          AND (FailWhen IS NULL OR FailStatus NOT IN ('Fail', 'Warning') OR FailStatus IS NULL)
+    )
+        THROW 50001, 'Active rules must define FailWhen and a FailStatus of Fail or Warning', 1;
+
+    IF @CountPreviousInScope = 1
+    BEGIN
+        SELECT @Values = STRING_AGG(CAST(
+            '    (' + CAST(vr.RuleID AS NVARCHAR(10))
+            + ', N''' + REPLACE(COALESCE(vr.ResultEntityType, @EntityType), '''', '''''') + ''''
+            + ', ' + CASE WHEN vr.AppliesWhen IS NULL THEN '1' ELSE 'CASE WHEN ' + vr.AppliesWhen + ' THEN 1 END' END
+            + ')' AS NVARCHAR(MAX)), @Separator) WITHIN GROUP (ORDER BY vr.RuleCode)
+        FROM cred.fn_ScheduledRules(@ValidationRunID) vr
+        WHERE vr.RuleCategory = @RuleCategory AND vr.SourceName = @SourceName
+          AND (@RuleCode IS NULL OR vr.RuleCode = @RuleCode);
+
+        -- The run's scope only; records created since the previous run had no outcome in it
+        SET @Sql = N'INSERT INTO #PreviousInScopeCounts (RuleID, EntityType, ApplicableCount)
+SELECT o.RuleID, o.EntityType, COUNT(*)
+FROM ' + @FromClause + N'
+CROSS APPLY (VALUES
+' + @Values + N'
+) o (RuleID, EntityType, Applies)
+WHERE o.Applies = 1
+  AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog r
+                  WHERE r.RunID = @ValidationRunID
+                    AND ' + LEFT(@EntityIDExpression, CHARINDEX(N'.', @EntityIDExpression)) + N'CreatedDate >= r.IncrementalSince)
+GROUP BY o.RuleID, o.EntityType;';
+        RETURN;
+    END
+
+    -- One VALUES row per rule: identity, result keys, outcome and detail columns
+    SELECT @Values = STRING_AGG(CAST(
+        '    (' + CAST(vr.RuleID AS NVARCHAR(10))
+        + ', N''' + REPLACE(vr.RuleCode, '''', '''''') + ''''
+        + ', N''' + REPLACE(COALESCE(vr.ResultEntityType, @EntityType), '''', '''''') + ''''
+        + ', ' + COALESCE(vr.EntityIDExpression, @EntityIDExpression)
+        + ', ' + @RecordIDExpression
+        + ', ' + CASE WHEN vr.AppliesWhen IS NULL THEN '' ELSE 'CASE WHEN ' + vr.AppliesWhen + ' THEN ' END
+        + 'CASE WHEN ' + vr.FailWhen + ' THEN N''' + vr.FailStatus + ''' ELSE N''Pass'' END'
+        + CASE WHEN vr.AppliesWhen IS NULL THEN '' ELSE ' END' END
+        + ', ' + ISNULL('N''' + REPLACE(vr.ErrorMessage, '''', '''''') + '''', 'NULL')
+        + ', ' + ISNULL('N''' + REPLACE(vr.FieldName, '''', '''''') + '''', 'NULL')
+        + ', CAST(' + ISNULL(vr.FieldValueExpression, 'NULL') + ' AS NVARCHAR(500))'
+        + ', ' + ISNULL('N''' + REPLACE(vr.Severity, '''', '''''') + '''', 'NULL')
+        + ')' AS NVARCHAR(MAX)), @Separator) WITHIN GROUP (ORDER BY vr.RuleCode)
+    FROM cred.fn_ScheduledRules(@ValidationRunID) vr
+    WHERE vr.RuleCategory = @RuleCategory AND vr.SourceName = @SourceName
+      AND (@RuleCode IS NULL OR vr.RuleCode = @RuleCode);
+
+    IF @Values IS NULL
+    BEGIN
+        SET @Sql = NULL;
+        RETURN;
+    END
+
+    -- Sentinel outcome counting the records scanned
+    SET @Values = @Values + @Separator
+        + N'    (0, N'''', N''' + @EntityType + N''', NULL, NULL, N''Scanned'', NULL, NULL, CAST(NULL AS NVARCHAR(500)), NULL)';
+
+    SET @Sql = N'INSERT INTO #RuleResults (RuleID, RuleCode, ValidationRunID, EntityType, EntityID, RecordID, ValidationStatus, ErrorMessage, FieldName, FieldValue, Severity, OutcomeCount)
+SELECT o.RuleID, o.RuleCode, @ValidationRunID, o.EntityType, '
+        + CASE WHEN @ResultMode = 'Full' THEN N'o.EntityID, o.RecordID, o.ValidationStatus,
+       CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN o.ErrorMessage END,
+       o.FieldName, o.FieldValue, o.Severity, 1'
+          ELSE N'
+       CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN MAX(o.EntityID) END,
+       CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN MAX(o.RecordID) END,
+       o.ValidationStatus,
+       CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN o.ErrorMessage END,
+       o.FieldName,
+       CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN MAX(o.FieldValue) END,
+       o.Severity, COUNT(*)' END
+        + N'
+FROM ' + @FromClause + N'
+CROSS APPLY (VALUES
+' + @Values + N'
+) o (RuleID, RuleCode, EntityType, EntityID, RecordID, ValidationStatus, ErrorMessage, FieldName, FieldValue, Severity)
+WHERE o.ValidationStatus IS NOT NULL'
+        + CASE WHEN @Sharded = 1 THEN N'
+  AND ' + @EntityIDExpression + N' BETWEEN @LowKey AND @HighKey' ELSE N'' END
+        + CASE WHEN @ResultMode = 'Full' THEN N'' ELSE N'
+GROUP BY o.RuleID, o.RuleCode, o.EntityType, o.ValidationStatus, o.ErrorMessage, o.FieldName, o.Severity,
+         CASE WHEN o.ValidationStatus IN (''Fail'', ''Warning'') THEN ' + @EntityIDExpression + N' END' END
+        + N';';
+END
+GO
+
+PRINT 'Stored procedure cred.sp_CompileRuleCategory created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Run Rule Category
+-- Compiles and executes one statement per row source used by the category,
+-- flushing the staged outcomes after each. Parallel runners pass @SourceName and
+-- a @LowKey/@HighKey range from cred.sp_GetValidationShards to run one shard.
+-- Only the rules scheduled for the run are evaluated (cred.fn_ScheduledRules).
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RunRuleCategory') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RunRuleCategory;
+GO
+
+CREATE PROCEDURE cred.sp_RunRuleCategory
+    @RuleCategory NVARCHAR(100),
+    @ValidationRunID INT,
+    @ResultMode NVARCHAR(20) = 'Full',
+    @SourceName NVARCHAR(50) = NULL, -- NULL = every source used by the category
+    @LowKey INT = NULL,
+    @HighKey INT = NULL,
+    @ProfileRules BIT = 0 -- 1 = execute each rule on its own for isolated timings
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @CurrentSource NVARCHAR(50);
+    DECLARE @CurrentRuleCode NVARCHAR(50);
+    DECLARE @Sharded BIT = CASE WHEN @LowKey IS NOT NULL AND @HighKey IS NOT NULL THEN 1 ELSE 0 END;
+    DECLARE @Sql NVARCHAR(MAX);
+    DECLARE @StartTime DATETIME2;
+    DECLARE @ElapsedMs INT;
+    DECLARE @RowsScanned BIGINT;
+
+    -- Rule outcomes are staged per source and flushed by cred.sp_FlushRuleResults
+    CREATE TABLE #RuleResults (
+        RuleID INT NOT NULL,
+        RuleCode NVARCHAR(50) NOT NULL,
+        ValidationRunID INT NULL,
+        EntityType NVARCHAR(50) NULL,
+        EntityID INT NULL,
+        RecordID NVARCHAR(100) NULL,
+        ValidationStatus NVARCHAR(20) NOT NULL,
+        ErrorMessage NVARCHAR(MAX) NULL,
+        FieldName NVARCHAR(100) NULL,
+        FieldValue NVARCHAR(500) NULL,
+        Severity NVARCHAR(20) NULL,
+        OutcomeCount INT NOT NULL DEFAULT 1 -- Outcomes represented by the row (collapsed Pass rows > 1)
+    );
+
+    DECLARE source_cursor CURSOR LOCAL FAST_FORWARD FOR
+        SELECT DISTINCT SourceName
+        FROM cred.fn_ScheduledRules(@ValidationRunID)
+        WHERE RuleCategory = @RuleCategory
+          AND (@SourceName IS NULL OR SourceName = @SourceName);
+
+    OPEN source_cursor;
+    FETCH NEXT FROM source_cursor INTO @CurrentSource;
+
+    WHILE @@FETCH_STATUS = 0
+    BEGIN
+        -- One fused statement per source, or one statement per rule when profiling
+        DECLARE rule_cursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT CAST(NULL AS NVARCHAR(50))
+            WHERE @ProfileRules = 0
+            UNION ALL
+            SELECT RuleCode
+            FROM cred.fn_ScheduledRules(@ValidationRunID)
+            WHERE @ProfileRules = 1 AND RuleCategory = @RuleCategory
+              AND SourceName = @CurrentSource;
+
+        OPEN rule_cursor;
+        FETCH NEXT FROM rule_cursor INTO @CurrentRuleCode;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            EXEC cred.sp_CompileRuleCategory
+                @RuleCategory = @RuleCategory,
+                @SourceName = @CurrentSource,
+                @ResultMode = @ResultMode,
+                @Sharded = @Sharded,
+                @RuleCode = @CurrentRuleCode,
+                @ValidationRunID = @ValidationRunID,
+                @Sql = @Sql OUTPUT;
+
+            IF @Sql IS NOT NULL
+            BEGIN
+                SET @StartTime = SYSDATETIME();
+
+                EXEC sp_executesql @Sql,
+                    N'@ValidationRunID INT, @ResultMode NVARCHAR(20), @LowKey INT, @HighKey INT',
+                    @ValidationRunID = @ValidationRunID,
+                    @ResultMode = @ResultMode,
+                    @LowKey = @LowKey,
+                    @HighKey = @HighKey;
+
+                SET @ElapsedMs = DATEDIFF(MILLISECOND, @StartTime, SYSDATETIME());
+
+                -- Sentinel rows count the records scanned and are not results
+                SELECT @RowsScanned = ISNULL(SUM(OutcomeCount), 0) FROM #RuleResults WHERE RuleID = 0;
+                DELETE FROM #RuleResults WHERE RuleID = 0;
+
+                -- Every rule in a fused statement shares the statement's elapsed time
+                INSERT INTO cred.ValidationRuleTiming (
+                    ValidationRunID, RuleID, RuleCode, RuleCategory, SourceName, LowKey, HighKey,
+                    ElapsedMs, RowsScanned, RowsEmitted, IsolatedTiming
+                )
+                SELECT
+                    @ValidationRunID, vr.RuleID, vr.RuleCode, @RuleCategory, @CurrentSource, @LowKey, @HighKey,
+                    @ElapsedMs, @RowsScanned, ISNULL(rr.RowsEmitted, 0), @ProfileRules
+                FROM cred.fn_ScheduledRules(@ValidationRunID) vr
+                LEFT JOIN (
+                    SELECT RuleID,
+                           SUM(CASE WHEN @ResultMode = 'Full' OR ValidationStatus <> 'Pass' THEN 1 ELSE 0 END) AS RowsEmitted
+                    FROM #RuleResults
+                    GROUP BY RuleID
+                ) rr ON rr.RuleID = vr.RuleID
+                WHERE vr.RuleCategory = @RuleCategory AND vr.SourceName = @CurrentSource
+                  AND (@CurrentRuleCode IS NULL OR vr.RuleCode = @CurrentRuleCode);
+
+                EXEC cred.sp_FlushRuleResults @ValidationRunID = @ValidationRunID, @ResultMode = @ResultMode;
+            END
+
+            FETCH NEXT FROM rule_cursor INTO @CurrentRuleCode;
+        END
+
+        CLOSE rule_cursor;
+        DEALLOCATE rule_cursor;
+
+        FETCH NEXT FROM source_cursor INTO @CurrentSource;
+    END
+
+    CLOSE source_cursor;
+    DEALLOCATE source_cursor;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RunRuleCategory created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Get Validation Shards
+-- Splits a row source into @ShardCount contiguous key ranges of roughly equal
+-- row counts. The outer ranges are open-ended so records added while a run is
+-- in progress still fall into a shard.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_GetValidationShards') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_GetValidationShards;
+GO
+
+CREATE PROCEDURE cred.sp_GetValidationShards
+    @SourceName NVARCHAR(50),
+    @ShardCount INT = 4
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ShardTable NVARCHAR(128);
+    DECLARE @ShardKeyColumn NVARCHAR(128);
+    DECLARE @Sql NVARCHAR(MAX);
+
+    SELECT
+        @ShardTable = ShardTable,
+        @ShardKeyColumn = ShardKeyColumn
+    FROM cred.ValidationRuleSources
+    WHERE SourceName = @SourceName;
+
+    IF @ShardTable IS NULL OR @ShardKeyColumn IS NULL
+        THROW 50001, 'Validation rule source is not shardable', 1;
+
+    IF @ShardCount < 1
+        THROW 50001, 'ShardCount must be at least 1', 1;
+
+    SET @Sql = N'SELECT ShardNumber,
+       CASE WHEN ShardNumber = 1 THEN -2147483648 ELSE MIN(ShardKey) END AS LowKey,
+       CASE WHEN ShardNumber = MAX(MAX(ShardNumber)) OVER () THEN 2147483647 ELSE MAX(ShardKey) END AS HighKey
+FROM (SELECT ' + QUOTENAME(@ShardKeyColumn) + N' AS ShardKey,
+             NTILE(@ShardCount) OVER (ORDER BY ' + QUOTENAME(@ShardKeyColumn) + N') AS ShardNumber
+      FROM ' + QUOTENAME(PARSENAME(@ShardTable, 2)) + N'.' + QUOTENAME(PARSENAME(@ShardTable, 1)) + N') k
+GROUP BY ShardNumber
+ORDER BY ShardNumber;';
+
+    EXEC sp_executesql @Sql, N'@ShardCount INT', @ShardCount = @ShardCount;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_GetValidationShards created successfully';
+GO
+
+-- Example usage (inspect the statement compiled for a category):
+-- DECLARE @Sql NVARCHAR(MAX);
+-- EXEC cred.sp_CompileRuleCategory @RuleCategory = 'Credential', @SourceName = 'Credential', @ResultMode = 'ExceptionsOnly', @Sql = @Sql OUTPUT;
+-- SELECT @Sql;
+--
+-- Example usage (run the first Provider shard of a parallel run):
+-- EXEC cred.sp_GetValidationShards @SourceName = 'Provider', @ShardCount = 4;
+-- EXEC cred.sp_RunRuleCategory @RuleCategory = 'Provider', @ValidationRunID = 1, @SourceName = 'Provider', @LowKey = -2147483648, @HighKey = 250;
@@ -0,0 +1,314 @@
+-- Validation Rule Scheduler
+-- Picks the rules a validation run evaluates from each rule's cadence, the
+-- base tables it depends on and its estimated cost, and carries forward the
+-- outcomes of the rules it skips
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Function: Scheduled Rules
+-- Active rules with a definition that @ValidationRunID evaluates: every such
+-- rule unless cred.sp_ScheduleValidationRules skipped it for the run.
+-- A NULL @ValidationRunID returns every active rule.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.fn_ScheduledRules') AND type in (N'IF'))
+    DROP FUNCTION cred.fn_ScheduledRules;
+GO
+
+CREATE FUNCTION cred.fn_ScheduledRules (@ValidationRunID INT)
+RETURNS TABLE
+AS
+RETURN
+    SELECT vr.*
+    FROM cred.ValidationRules vr
+    WHERE vr.IsActive = 1
+      AND vr.SourceName IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunRuleSchedule s
+                      WHERE s.ValidationRunID = @ValidationRunID AND s.RuleID = vr.RuleID AND s.IsScheduled = 0);
+GO
+
+PRINT 'Function cred.fn_ScheduledRules created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Schedule Validation Rules
+-- Writes one ValidationRunRuleSchedule row per active rule of a Running run.
+-- With @ScheduleRules = 1 a rule is evaluated when:
+--   1. its Cadence is Daily (date-relative rules) or it has no DependsOnTables
+--   2. the rule was modified since the base run, or has no tallies in it
+--   3. one of its DependsOnTables changed since the base run started: a
+--      DataRefreshLog entry for the table that wrote rows, or rows created
+--      or modified since then
+--   4. it has not been evaluated for @MaxSkipDays, oldest and cheapest first
+--      while the run's EstimatedCostMs stays within @CostBudgetMs
+-- The other rules are skipped and carry the base run's outcomes. The base run
+-- is the incremental run's previous run, otherwise the latest completed run in
+-- the same result mode; without one (or when it has been archived) every rule
+-- is evaluated.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_ScheduleValidationRules') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_ScheduleValidationRules;
+GO
+
+CREATE PROCEDURE cred.sp_ScheduleValidationRules
+    @ValidationRunID INT,
+    @ScheduleRules BIT = 1, -- 0 = evaluate every active rule
+    @MaxSkipDays INT = 7,
+    @CostBudgetMs INT = NULL -- NULL = no limit on the overdue rules
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @RunStartTime DATETIME2;
+    DECLARE @ResultMode NVARCHAR(20);
+    DECLARE @PreviousRunID INT;
+    DECLARE @BaseRunID INT = NULL;
+    DECLARE @Since DATETIME2 = NULL;
+    DECLARE @ScheduledCostMs INT;
+
+    SELECT
+        @RunStartTime = RunStartTime,
+        @ResultMode = ResultMode,
+        @PreviousRunID = PreviousRunID
+    FROM cred.ValidationRunLog
+    WHERE RunID = @ValidationRunID AND RunStatus = 'Running';
+
+    IF @RunStartTime IS NULL
+        THROW 50001, 'Validation run is not running', 1;
+
+    DELETE FROM cred.ValidationRunRuleSchedule WHERE ValidationRunID = @ValidationRunID;
+
+    IF @ScheduleRules = 1
+    BEGIN
+        -- Incremental runs already carry forward from their previous run
+        SET @BaseRunID = @PreviousRunID;
+
+        IF @BaseRunID IS NULL
+            SELECT TOP 1 @BaseRunID = RunID
+            FROM cred.ValidationRunLog
+            WHERE RunID <> @ValidationRunID
+              AND RunStatus = 'Completed' AND ResultMode = @ResultMode AND RunType <> 'OnDemand'
+            ORDER BY RunStartTime DESC;
+
+        -- An archived base run's results are no longer in ValidationResults to carry
+        IF EXISTS (SELECT 1 FROM cred.ValidationResultArchive WHERE ValidationRunID = @BaseRunID)
+            SET @BaseRunID = NULL;
+
+        SELECT @Since = RunStartTime FROM cred.ValidationRunLog WHERE RunID = @BaseRunID;
+    END
+
+    -- Base tables changed since the base run started
+    CREATE TABLE #ChangedTables (TableName NVARCHAR(128) NOT NULL PRIMARY KEY);
+
+    IF @Since IS NOT NULL
+        INSERT INTO #ChangedTables (TableName)
+        SELECT t.TableName
+        FROM (VALUES ('Providers'), ('Credentials'), ('Entities')) t (TableName)
+        WHERE EXISTS (SELECT 1 FROM cred.DataRefreshLog l
+                      WHERE PARSENAME(l.TargetTable, 1) = t.TableName
+                        AND ISNULL(l.RefreshEndTime, l.RefreshStartTime) >= @Since
+                        -- Completed loads that wrote nothing changed nothing
+                        AND NOT (l.RefreshStatus = 'Completed'
+                                 AND ISNULL(l.RecordsInserted, 0) + ISNULL(l.RecordsUpdated, 0) + ISNULL(l.RecordsDeleted, 0) = 0))
+           -- Rows written outside a logged refresh
+           OR (t.TableName = 'Providers'
+               AND EXISTS (SELECT 1 FROM cred.Providers WHERE ModifiedDate >= @Since OR CreatedDate >= @Since))
+           OR (t.TableName = 'Credentials'
+               AND EXISTS (SELECT 1 FROM cred.Credentials WHERE ModifiedDate >= @Since OR CreatedDate >= @Since))
+           OR (t.TableName = 'Entities'
+               AND EXISTS (SELECT 1 FROM cred.Entities WHERE ModifiedDate >= @Since OR CreatedDate >= @Since));
+
+    INSERT INTO cred.ValidationRunRuleSchedule (
+        ValidationRunID, RuleID, RuleCode, IsScheduled, ScheduleReason, EstimatedCostMs, LastEvaluatedTime
+    )
+    SELECT
+        @ValidationRunID,
+        vr.RuleID,
+        vr.RuleCode,
+        CASE WHEN r.ScheduleReason IS NULL THEN 0 ELSE 1 END,
+        ISNULL(r.ScheduleReason, 'Unchanged'),
+        vr.EstimatedCostMs,
+        -- Base runs scheduled before rule scheduling evaluated every rule
+        ISNULL(base.LastEvaluatedTime, @Since)
+    FROM cred.ValidationRules vr
+    LEFT JOIN cred.ValidationRunRuleSchedule base
+        ON base.ValidationRunID = @BaseRunID AND base.RuleID = vr.RuleID
+    OUTER APPLY (
+        SELECT STRING_AGG(ct.TableName, ', ') AS ChangedTables
+        FROM STRING_SPLIT(vr.DependsOnTables, ',') d
+        INNER JOIN #ChangedTables ct ON ct.TableName = LTRIM(RTRIM(d.value))
+    ) changed
+    CROSS APPLY (
+        SELECT CASE
+            WHEN @ScheduleRules = 0 THEN 'All rules'
+            WHEN @Since IS NULL THEN 'No base run'
+            WHEN ISNULL(vr.Cadence, 'Daily') <> 'OnChange' OR vr.DependsOnTables IS NULL THEN 'Daily'
+            WHEN vr.ModifiedDate >= @Since THEN 'Rule changed'
+            WHEN NOT EXISTS (SELECT 1 FROM cred.ValidationRuleRunStats stats
+                             WHERE stats.ValidationRunID = @BaseRunID AND stats.RuleID = vr.RuleID) THEN 'Not in base run'
+            WHEN changed.ChangedTables IS NOT NULL THEN 'Changed: ' + changed.ChangedTables
+        END AS ScheduleReason
+    ) r
+    WHERE vr.IsActive = 1 AND vr.SourceName IS NOT NULL;
+
+    -- Overdue rules fill what the scheduled rules leave of the budget
+    SELECT @ScheduledCostMs = ISNULL(SUM(EstimatedCostMs), 0)
+    FROM cred.ValidationRunRuleSchedule
+    WHERE ValidationRunID = @ValidationRunID AND IsScheduled = 1;
+
+    UPDATE s
+    SET IsScheduled = 1,
+        ScheduleReason = 'Overdue'
+    FROM cred.ValidationRunRuleSchedule s
+    INNER JOIN (
+        SELECT RuleID,
+               SUM(ISNULL(EstimatedCostMs, 0)) OVER (ORDER BY LastEvaluatedTime, EstimatedCostMs, RuleID
+                                                     ROWS UNBOUNDED PRECEDING) AS RunningCostMs
+        FROM cred.ValidationRunRuleSchedule
+        WHERE ValidationRunID = @ValidationRunID
+          AND IsScheduled = 0
+          AND LastEvaluatedTime < DATEADD(DAY, -@MaxSkipDays, @RunStartTime)
+    ) overdue ON overdue.RuleID = s.RuleID
+    WHERE s.ValidationRunID = @ValidationRunID
+      AND (@CostBudgetMs IS NULL OR @ScheduledCostMs + overdue.RunningCostMs <= @CostBudgetMs);
+
+    UPDATE cred.ValidationRunRuleSchedule
+    SET LastEvaluatedTime = @RunStartTime
+    WHERE ValidationRunID = @ValidationRunID AND IsScheduled = 1;
+
+    UPDATE runs
+    SET ScheduleBaseRunID = CASE WHEN skipped.RulesSkipped > 0 THEN @BaseRunID END,
+        RulesSkipped = skipped.RulesSkipped
+    FROM cred.ValidationRunLog runs
+    CROSS APPLY (
+        SELECT COUNT(*) AS RulesSkipped
+        FROM cred.ValidationRunRuleSchedule
+        WHERE ValidationRunID = @ValidationRunID AND IsScheduled = 0
+    ) skipped
+    WHERE runs.RunID = @ValidationRunID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_ScheduleValidationRules created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Carry Forward Skipped Rules
+-- Copies the base run's detail rows for the rules the schedule skipped, for
+-- records that still exist, and their tallies to ValidationRuleRunStats. In
+-- ExceptionsOnly mode the base run's pass counts are carried as they were.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_CarryForwardSkippedRules') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_CarryForwardSkippedRules;
+GO
+
+CREATE PROCEDURE cred.sp_CarryForwardSkippedRules
+    @ValidationRunID INT,
+    @BaseRunID INT,
+    @ResultMode NVARCHAR(20) = 'Full'
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    CREATE TABLE #Carried (
+        RuleID INT NOT NULL,
+        EntityType NVARCHAR(50) NULL,
+        ValidationStatus NVARCHAR(20) NOT NULL
+    );
+
+    INSERT INTO cred.ValidationResults (RuleID, RuleCode, ValidationRunID, EntityType, EntityID, RecordID, ValidationStatus,
+                                        ErrorMessage, ErrorDetails, FieldName, FieldValue, Severity,
+                                        Resolved, ResolvedDate, ResolvedBy, ResolutionNotes)
+    OUTPUT INSERTED.RuleID, INSERTED.EntityType, INSERTED.ValidationStatus
+    INTO #Carried (RuleID, EntityType, ValidationStatus)
+    SELECT prev.RuleID, prev.RuleCode, @ValidationRunID, prev.EntityType, prev.EntityID, prev.RecordID, prev.ValidationStatus,
+           prev.ErrorMessage, prev.ErrorDetails, prev.FieldName, prev.FieldValue, prev.Severity,
+           prev.Resolved, prev.ResolvedDate, prev.ResolvedBy, prev.ResolutionNotes
+    FROM cred.ValidationResults prev
+    INNER JOIN cred.ValidationRunRuleSchedule s
+        ON s.ValidationRunID = @ValidationRunID AND s.RuleID = prev.RuleID AND s.IsScheduled = 0
+    WHERE prev.ValidationRunID = @BaseRunID
+      -- Record still exists
+      AND (   (prev.EntityType = 'Provider' AND EXISTS (SELECT 1 FROM cred.Providers p WHERE p.ProviderID = prev.EntityID))
+           OR (prev.EntityType = 'Credential' AND (prev.EntityID IS NULL
+                                                   OR EXISTS (SELECT 1 FROM cred.Credentials c WHERE c.CredentialID = prev.EntityID)))
+           OR (prev.EntityType = 'Entity' AND EXISTS (SELECT 1 FROM cred.Entities e WHERE e.EntityID = prev.EntityID)));
+
+    INSERT INTO cred.ValidationRuleRunStats (ValidationRunID, RuleID, RuleCode, EntityType, PassCount, FailCount, WarningCount)
+    SELECT @ValidationRunID, ps.RuleID, ps.RuleCode, ps.EntityType,
+           CASE WHEN @ResultMode = 'Full' THEN ISNULL(cf.PassCount, 0) ELSE ps.PassCount END,
+           ISNULL(cf.FailCount, 0),
+           ISNULL(cf.WarningCount, 0)
+    FROM (SELECT stats.RuleID, stats.RuleCode, stats.EntityType, SUM(stats.PassCount) AS PassCount
+          FROM cred.ValidationRuleRunStats stats
+          INNER JOIN cred.ValidationRunRuleSchedule s
+              ON s.ValidationRunID = @ValidationRunID AND s.RuleID = stats.RuleID AND s.IsScheduled = 0
+          WHERE stats.ValidationRunID = @BaseRunID
+          GROUP BY stats.RuleID, stats.RuleCode, stats.EntityType) ps
+    LEFT JOIN (SELECT RuleID, EntityType,
+                      SUM(CASE WHEN ValidationStatus = 'Pass' THEN 1 ELSE 0 END) AS PassCount,
+                      SUM(CASE WHEN ValidationStatus = 'Fail' THEN 1 ELSE 0 END) AS FailCount,
+                      SUM(CASE WHEN ValidationStatus = 'Warning' THEN 1 ELSE 0 END) AS WarningCount
+               FROM #Carried
+               GROUP BY RuleID, EntityType) cf
+        ON cf.RuleID = ps.RuleID AND cf.EntityType = ps.EntityType;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_CarryForwardSkippedRules created successfully';
+GO
+
+-- =============================================
+-- Stored Procedure: Refresh Rule Cost Estimates
+-- Sets ValidationRules.EstimatedCostMs to each rule's average time per run
+-- over the last @Runs completed runs that evaluated it, from
+-- ValidationRuleTiming. A fused statement's time is split evenly between its
+-- rules; isolated timings (@ProfileRules) are used as they are.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RefreshRuleCostEstimates') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RefreshRuleCostEstimates;
+GO
+
+CREATE PROCEDURE cred.sp_RefreshRuleCostEstimates
+    @Runs INT = 7
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE vr
+    SET EstimatedCostMs = cost.EstimatedCostMs
+    FROM cred.ValidationRules vr
+    INNER JOIN (
+        SELECT RuleID, AVG(RunCostMs) AS EstimatedCostMs
+        FROM (
+            SELECT RuleID, ValidationRunID, SUM(RuleCostMs) AS RunCostMs
+            FROM (
+                SELECT t.RuleID, t.ValidationRunID,
+                       CASE WHEN t.IsolatedTiming = 1 THEN t.ElapsedMs
+                            ELSE t.ElapsedMs / COUNT(*) OVER (PARTITION BY t.ValidationRunID, t.RuleCategory, t.SourceName,
+                                                                           t.LowKey, t.HighKey, t.IsolatedTiming)
+                       END AS RuleCostMs
+                FROM cred.ValidationRuleTiming t
+                WHERE t.ValidationRunID IN (SELECT TOP (@Runs) RunID
+                                            FROM cred.ValidationRunLog
+                                            WHERE RunStatus = 'Completed' AND RunType <> 'OnDemand'
+                                            ORDER BY RunStartTime DESC)
+            ) statement_cost
+            GROUP BY RuleID, ValidationRunID
+        ) run_cost
+        GROUP BY RuleID
+    ) cost ON cost.RuleID = vr.RuleID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RefreshRuleCostEstimates created successfully';
+GO
+
+-- Example usage (rules are scheduled by cred.sp_BeginValidationRun @ScheduleRules = 1):
+-- EXEC cred.sp_RunAllValidations @RunType = 'Scheduled', @ScheduleRules = 1;
+-- SELECT RuleCode, IsScheduled, ScheduleReason, EstimatedCostMs, LastEvaluatedTime
+-- FROM cred.ValidationRunRuleSchedule
+-- WHERE ValidationRunID = 42
+-- ORDER BY IsScheduled DESC, RuleCode;
+-- EXEC cred.sp_RefreshRuleCostEstimates @Runs = 14;
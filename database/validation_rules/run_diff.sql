@@ -0,0 +1,183 @@
+-- Run-Over-Run Diff
+-- Compares the issues of a completed validation run with those of the previous
+-- completed run and resolves the issues that have cleared
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Stored Procedure: Diff Validation Run
+-- Matches the run's Fail/Warning results against the base run's (the latest
+-- completed run before it) on ValidationResults.IssueKey and writes the New,
+-- Persisting and Cleared sets to cred.ValidationRunDelta, with their counts on
+-- ValidationRunLog. With @AutoResolve = 1 the base run's unresolved results
+-- for cleared issues are marked resolved in batches that stay below the lock
+-- escalation threshold, the base run's rollups are refreshed and its
+-- ResultsVersion is bumped.
+-- Rerunning it for a run replaces the run's delta. OnDemand runs, and runs
+-- whose base run has been archived, are not diffed.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_DiffValidationRun') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_DiffValidationRun;
+GO
+
+CREATE PROCEDURE cred.sp_DiffValidationRun
+    @ValidationRunID INT,
+    @AutoResolve BIT = 1,
+    @BatchSize INT = 4000 -- SQL Server escalates at 5000 locks
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @RunStatus NVARCHAR(20);
+    DECLARE @RunType NVARCHAR(50);
+    DECLARE @BaseRunID INT;
+    DECLARE @AutoResolved INT = 0;
+    DECLARE @BatchResolved INT;
+    DECLARE @ResolutionNotes NVARCHAR(MAX);
+
+    SELECT @RunStatus = RunStatus, @RunType = RunType
+    FROM cred.ValidationRunLog
+    WHERE RunID = @ValidationRunID;
+
+    IF @RunStatus IS NULL
+        THROW 50001, 'Validation run not found', 1;
+
+    IF @RunStatus <> 'Completed'
+        THROW 50001, 'Validation run is not completed', 1;
+
+    -- Record-level runs cover a few records and are not compared
+    IF @RunType = 'OnDemand'
+        RETURN;
+
+    SELECT @BaseRunID = MAX(RunID)
+    FROM cred.ValidationRunLog
+    WHERE RunID < @ValidationRunID
+      AND RunStatus = 'Completed'
+      AND RunType <> 'OnDemand';
+
+    -- An archived base run's results are no longer in ValidationResults to compare with
+    IF EXISTS (SELECT 1 FROM cred.ValidationResultArchive WHERE ValidationRunID = @BaseRunID)
+        RETURN;
+
+    DELETE FROM cred.ValidationRunDelta WHERE ValidationRunID = @ValidationRunID;
+
+    -- New and Persisting: this run's issues, with the base run's matching issue if any
+    INSERT INTO cred.ValidationRunDelta (
+        ValidationRunID, BaseRunID, DeltaStatus, IssueKey, ValidationResultID, BaseResultID,
+        RuleID, RuleCode, EntityType, EntityID, RecordID, ValidationStatus, Severity
+    )
+    SELECT
+        @ValidationRunID,
+        @BaseRunID,
+        CASE WHEN base.ValidationResultID IS NULL THEN 'New' ELSE 'Persisting' END,
+        cur.IssueKey,
+        cur.ValidationResultID,
+        base.ValidationResultID,
+        cur.RuleID,
+        cur.RuleCode,
+        cur.EntityType,
+        cur.EntityID,
+        cur.RecordID,
+        cur.ValidationStatus,
+        cur.Severity
+    FROM cred.ValidationResults cur
+    OUTER APPLY (
+        SELECT TOP 1 prev.ValidationResultID
+        FROM cred.ValidationResults prev
+        WHERE prev.ValidationRunID = @BaseRunID
+          AND prev.IssueKey = cur.IssueKey
+          AND prev.ValidationStatus IN ('Fail', 'Warning')
+        ORDER BY prev.ValidationResultID
+    ) base
+    WHERE cur.ValidationRunID = @ValidationRunID
+      AND cur.ValidationStatus IN ('Fail', 'Warning');
+
+    -- Cleared: the base run's issues this run no longer reports
+    INSERT INTO cred.ValidationRunDelta (
+        ValidationRunID, BaseRunID, DeltaStatus, IssueKey, ValidationResultID, BaseResultID,
+        RuleID, RuleCode, EntityType, EntityID, RecordID, ValidationStatus, Severity
+    )
+    SELECT
+        @ValidationRunID,
+        @BaseRunID,
+        'Cleared',
+        prev.IssueKey,
+        NULL,
+        prev.ValidationResultID,
+        prev.RuleID,
+        prev.RuleCode,
+        prev.EntityType,
+        prev.EntityID,
+        prev.RecordID,
+        prev.ValidationStatus,
+        prev.Severity
+    FROM cred.ValidationResults prev
+    WHERE prev.ValidationRunID = @BaseRunID
+      AND prev.ValidationStatus IN ('Fail', 'Warning')
+      AND NOT EXISTS (SELECT 1 FROM cred.ValidationResults cur
+                      WHERE cur.ValidationRunID = @ValidationRunID
+                        AND cur.IssueKey = prev.IssueKey
+                        AND cur.ValidationStatus IN ('Fail', 'Warning'));
+
+    IF @AutoResolve = 1 AND @BaseRunID IS NOT NULL
+    BEGIN
+        SET @ResolutionNotes = CONCAT('Cleared in validation run ', @ValidationRunID);
+
+        WHILE 1 = 1
+        BEGIN
+            UPDATE TOP (@BatchSize) vr
+            SET Resolved = 1,
+                ResolvedDate = GETDATE(),
+                ResolvedBy = 'System',
+                ResolutionNotes = @ResolutionNotes
+            FROM cred.ValidationResults vr
+            INNER JOIN cred.ValidationRunDelta delta ON delta.BaseResultID = vr.ValidationResultID
+            WHERE delta.ValidationRunID = @ValidationRunID
+              AND delta.DeltaStatus = 'Cleared'
+              AND vr.Resolved = 0;
+
+            SET @BatchResolved = @@ROWCOUNT;
+            SET @AutoResolved = @AutoResolved + @BatchResolved;
+            IF @BatchResolved < @BatchSize
+                BREAK;
+        END
+
+        -- The base run's unresolved counts, and its cached summaries, have changed
+        IF @AutoResolved > 0
+        BEGIN
+            EXEC cred.sp_RefreshValidationRollups @ValidationRunID = @BaseRunID;
+
+            UPDATE cred.ValidationRunLog
+            SET ResultsVersion = ResultsVersion + 1
+            WHERE RunID = @BaseRunID;
+        END
+    END
+
+    UPDATE runs
+    SET DeltaBaseRunID = @BaseRunID,
+        NewIssues = counts.NewIssues,
+        PersistingIssues = counts.PersistingIssues,
+        ClearedIssues = counts.ClearedIssues,
+        -- A rerun against the same base adds to the issues resolved the first time
+        AutoResolvedIssues = CASE WHEN runs.DeltaBaseRunID = @BaseRunID THEN ISNULL(runs.AutoResolvedIssues, 0) ELSE 0 END
+                             + @AutoResolved
+    FROM cred.ValidationRunLog runs
+    CROSS APPLY (
+        SELECT
+            COUNT(CASE WHEN DeltaStatus = 'New' THEN 1 END) AS NewIssues,
+            COUNT(CASE WHEN DeltaStatus = 'Persisting' THEN 1 END) AS PersistingIssues,
+            COUNT(CASE WHEN DeltaStatus = 'Cleared' THEN 1 END) AS ClearedIssues
+        FROM cred.ValidationRunDelta
+        WHERE ValidationRunID = @ValidationRunID
+    ) counts
+    WHERE runs.RunID = @ValidationRunID;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_DiffValidationRun created successfully';
+GO
+
+-- Example usage:
+-- EXEC cred.sp_DiffValidationRun @ValidationRunID = 42;
+-- EXEC cred.sp_DiffValidationRun @ValidationRunID = 42, @AutoResolve = 0; -- Compare only
@@ -0,0 +1,139 @@
+-- Validation Rollups
+-- Maintains the compact daily fact tables imported by the Power BI model
+
+USE CredentialingDB;
+GO
+
+-- =============================================
+-- Stored Procedure: Refresh Validation Rollups
+-- Rebuilds the ValidationDailyRollup and EntityQualityDaily rows of one run date
+-- from the latest completed run of that date. Only that date is rewritten, so
+-- the cost follows the size of one run rather than the result history.
+-- @ValidationRunID = NULL rebuilds every date (backfill). Rerun it for a run
+-- after resolving its results to refresh the unresolved counts. Dates whose
+-- latest run has been archived keep their rollups.
+-- =============================================
+IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'cred.sp_RefreshValidationRollups') AND type in (N'P', N'PC'))
+    DROP PROCEDURE cred.sp_RefreshValidationRollups;
+GO
+
+CREATE PROCEDURE cred.sp_RefreshValidationRollups
+    @ValidationRunID INT = NULL -- NULL = rebuild every run date
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @RunDate DATE = NULL;
+
+    IF @ValidationRunID IS NOT NULL
+    BEGIN
+        SELECT @RunDate = CAST(RunStartTime AS DATE)
+        FROM cred.ValidationRunLog
+        WHERE RunID = @ValidationRunID;
+
+        IF @RunDate IS NULL
+            THROW 50001, 'Validation run not found', 1;
+    END
+
+    -- Latest completed run of each date being rebuilt
+    CREATE TABLE #RollupRuns (
+        RunDate DATE PRIMARY KEY,
+        ValidationRunID INT NOT NULL
+    );
+
+    INSERT INTO #RollupRuns (RunDate, ValidationRunID)
+    SELECT CAST(RunStartTime AS DATE), MAX(RunID)
+    FROM cred.ValidationRunLog
+    WHERE RunStatus = 'Completed'
+      AND RunType <> 'OnDemand' -- Record-level runs do not represent the day
+      AND (@RunDate IS NULL OR CAST(RunStartTime AS DATE) = @RunDate)
+    GROUP BY CAST(RunStartTime AS DATE);
+
+    -- Archived results are no longer in ValidationResults to be counted
+    DELETE runs
+    FROM #RollupRuns runs
+    WHERE EXISTS (SELECT 1 FROM cred.ValidationResultArchive archive
+                  WHERE archive.ValidationRunID = runs.ValidationRunID);
+
+    DELETE FROM cred.ValidationDailyRollup WHERE RunDate IN (SELECT RunDate FROM #RollupRuns);
+    DELETE FROM cred.EntityQualityDaily WHERE RunDate IN (SELECT RunDate FROM #RollupRuns);
+
+    -- Outcome counts come from the per-rule tallies (complete in both result modes);
+    -- unresolved counts from the run's Fail and Warning rows
+    INSERT INTO cred.ValidationDailyRollup (
+        RunDate, RuleID, ValidationStatus, ValidationRunID, RuleCode, RuleCategory,
+        Severity, EntityType, OutcomeCount, UnresolvedCount
+    )
+    SELECT
+        runs.RunDate,
+        stats.RuleID,
+        counts.ValidationStatus,
+        runs.ValidationRunID,
+        vrules.RuleCode,
+        vrules.RuleCategory,
+        vrules.Severity,
+        MAX(stats.EntityType),
+        SUM(counts.StatusCount),
+        ISNULL(MAX(open_issues.UnresolvedCount), 0)
+    FROM #RollupRuns runs
+    INNER JOIN cred.ValidationRuleRunStats stats ON stats.ValidationRunID = runs.ValidationRunID
+    INNER JOIN cred.ValidationRules vrules ON stats.RuleID = vrules.RuleID
+    CROSS APPLY (VALUES ('Pass', stats.PassCount),
+                        ('Fail', stats.FailCount),
+                        ('Warning', stats.WarningCount)) counts(ValidationStatus, StatusCount)
+    LEFT JOIN (
+        SELECT vr.ValidationRunID, vr.RuleID, vr.ValidationStatus, COUNT(*) AS UnresolvedCount
+        FROM cred.ValidationResults vr
+        INNER JOIN #RollupRuns runs ON vr.ValidationRunID = runs.ValidationRunID
+        WHERE vr.ValidationStatus IN ('Fail', 'Warning') AND vr.Resolved = 0
+        GROUP BY vr.ValidationRunID, vr.RuleID, vr.ValidationStatus
+    ) open_issues ON open_issues.ValidationRunID = runs.ValidationRunID
+        AND open_issues.RuleID = stats.RuleID
+        AND open_issues.ValidationStatus = counts.ValidationStatus
+    GROUP BY runs.RunDate, stats.RuleID, counts.ValidationStatus, runs.ValidationRunID,
+             vrules.RuleCode, vrules.RuleCategory, vrules.Severity
+    HAVING SUM(counts.StatusCount) > 0;
+
+    -- One row per record with issues; the score is the share of the entity type's
+    -- active rules the record passed
+    INSERT INTO cred.EntityQualityDaily (
+        RunDate, EntityType, EntityID, ValidationRunID, FailCount, WarningCount,
+        CriticalCount, HighCount, UnresolvedCount, RulesEvaluated, QualityScore
+    )
+    SELECT
+        runs.RunDate,
+        vr.EntityType,
+        vr.EntityID,
+        runs.ValidationRunID,
+        COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Fail' THEN vr.RuleID END),
+        COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Warning' THEN vr.RuleID END),
+        COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Fail' AND vr.Severity = 'Critical' THEN vr.RuleID END),
+        COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Fail' AND vr.Severity = 'High' THEN vr.RuleID END),
+        SUM(CASE WHEN vr.Resolved = 0 THEN 1 ELSE 0 END),
+        ISNULL(rules.RulesEvaluated, 0),
+        CASE
+            WHEN ISNULL(rules.RulesEvaluated, 0) = 0 THEN 100
+            WHEN COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Fail' THEN vr.RuleID END) >= rules.RulesEvaluated THEN 0
+            ELSE CAST(100.0 - 100.0 * COUNT(DISTINCT CASE WHEN vr.ValidationStatus = 'Fail' THEN vr.RuleID END)
+                                    / rules.RulesEvaluated AS DECIMAL(5,2))
+        END
+    FROM #RollupRuns runs
+    INNER JOIN cred.ValidationResults vr ON vr.ValidationRunID = runs.ValidationRunID
+    LEFT JOIN (
+        SELECT COALESCE(vrules.ResultEntityType, src.EntityType) AS EntityType, COUNT(*) AS RulesEvaluated
+        FROM cred.ValidationRules vrules
+        INNER JOIN cred.ValidationRuleSources src ON vrules.SourceName = src.SourceName
+        WHERE vrules.IsActive = 1
+        GROUP BY COALESCE(vrules.ResultEntityType, src.EntityType)
+    ) rules ON rules.EntityType = vr.EntityType
+    WHERE vr.ValidationStatus IN ('Fail', 'Warning') AND vr.EntityID IS NOT NULL
+    GROUP BY runs.RunDate, vr.EntityType, vr.EntityID, runs.ValidationRunID, rules.RulesEvaluated;
+END
+GO
+
+PRINT 'Stored procedure cred.sp_RefreshValidationRollups created successfully';
+GO
+
+-- Example usage:
+-- EXEC cred.sp_RefreshValidationRollups @ValidationRunID = 42;
+-- EXEC cred.sp_RefreshValidationRollups; -- Backfill every run date
@@ -0,0 +1,433 @@
+"""
+Benchmark Script
+Measures ingestion and validation throughput on seeded synthetic data
+Generates Providers, Credentials and Entities CSV files with known defect rates,
+loads them with DataIngestion and runs a full validation, then reports
+rows/sec, memory and per-phase latency as JSON
+
+Run it against a scratch database (for example a local SQL Server container):
+--reset-database deletes every Provider, Credential and Entity before loading.
+The same seed and scale always generate the same files, so results from
+different commits are comparable with --compare.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    VALIDATION_RUN_TYPE_MANUAL, VALIDATION_RESULT_MODE, VALIDATION_ENGINE, VALIDATION_ENGINE_PYTHON,
+    INGESTION_CHUNK_SIZE, DATA_SOURCE_PATH
+)
+from db import connection, dispose_engine
+from telemetry import configure_logging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Configure logging
+configure_logging('benchmark.log')
+logger = logging.getLogger(__name__)
+
+# Share of generated rows given each defect:
+#   bad_npi            - provider NPI is not 10 digits (PRV001)
+#   expired_credential - Active credential past its ExpirationDate (CRED006, CRED031)
+#   orphaned_entity    - provider references an entity TaxID that does not exist
+#                        (quarantined by ingestion)
+#   duplicate_npi      - provider repeats the previous provider's NPI (collapsed by
+#                        the NPI merge key, so it exercises the update path)
+DEFAULT_DEFECT_RATES = {
+    'bad_npi': 0.01,
+    'expired_credential': 0.05,
+    'orphaned_entity': 0.005,
+    'duplicate_npi': 0.002
+}
+
+PROVIDERS_PER_ENTITY = 50
+CREDENTIALS_PER_PROVIDER = 2
+
+# Rows generated per block. Each block is seeded from (seed, file, block number),
+# so the files depend only on the seed and the scale
+GENERATE_BLOCK_SIZE = 100000
+
+FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+               'David', 'Elizabeth', 'William', 'Susan', 'Richard', 'Jessica', 'Joseph', 'Sarah']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas', 'Taylor']
+SPECIALTIES = ['Family Medicine', 'Internal Medicine', 'Pediatrics', 'Cardiology', 'Dermatology',
+               'Orthopedics', 'Psychiatry', 'Radiology', 'Neurology', 'Oncology']
+LOCATIONS = [('Boston', 'MA', '02108'), ('Chicago', 'IL', '60601'), ('Houston', 'TX', '77002'),
+             ('Phoenix', 'AZ', '85003'), ('Denver', 'CO', '80202'), ('Seattle', 'WA', '98101'),
+             ('Atlanta', 'GA', '30303'), ('Miami', 'FL', '33130')]
+ENTITY_TYPES = ['Hospital', 'Clinic', 'Group Practice', 'Urgent Care', 'Surgery Center']
+CREDENTIAL_TYPES = ['Medical License', 'DEA License', 'Board Certification']
+ISSUING_ORGANIZATIONS = ['State Medical Board', 'Drug Enforcement Administration', 'American Board of Medical Specialties']
+
+
+def generate_dataset(output_dir, providers=10000, seed=42, defect_rates=None):
+    """Write entities.csv, providers.csv and credentials.csv for a benchmark run
+
+    Returns the file paths, row counts and the number of rows given each defect.
+    """
+    rates = dict(DEFAULT_DEFECT_RATES, **(defect_rates or {}))
+    unknown = set(rates) - set(DEFAULT_DEFECT_RATES)
+    if unknown:
+        raise ValueError(f"Unknown defect types: {', '.join(sorted(unknown))}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    entities = max(1, providers // PROVIDERS_PER_ENTITY)
+    files = {
+        'Entities': os.path.join(output_dir, 'entities.csv'),
+        'Providers': os.path.join(output_dir, 'providers.csv'),
+        'Credentials': os.path.join(output_dir, 'credentials.csv')
+    }
+    defects = {name: 0 for name in rates}
+    today = date.today()
+
+    _write_blocks(files['Entities'], entities, seed, 1, _entity_block)
+
+    def provider_block(ids, rng):
+        block, block_defects = _provider_block(ids, rng, entities, rates)
+        for name, count in block_defects.items():
+            defects[name] += count
+        return block
+
+    _write_blocks(files['Providers'], providers, seed, 2, provider_block)
+
+    def credential_block(ids, rng):
+        block, expired = _credential_block(ids, rng, seed, rates, today)
+        defects['expired_credential'] += expired
+        return block
+
+    _write_blocks(files['Credentials'], providers, seed, 3, credential_block)
+
+    counts = {'Entities': entities, 'Providers': providers, 'Credentials': providers * CREDENTIALS_PER_PROVIDER}
+    logger.info(f"Generated {counts['Entities']} entities, {counts['Providers']} providers and "
+                f"{counts['Credentials']} credentials in {output_dir} (seed {seed})")
+    return {'files': files, 'rows': counts, 'defects': defects}
+
+
+def _write_blocks(file_path, rows, seed, file_number, build_block):
+    """Write a CSV file block by block from build_block(ids, rng)"""
+    for block_number, start in enumerate(range(0, rows, GENERATE_BLOCK_SIZE)):
+        ids = np.arange(start, min(start + GENERATE_BLOCK_SIZE, rows))
+        rng = np.random.default_rng([seed, file_number, block_number])
+        build_block(ids, rng).to_csv(file_path, mode='w' if start == 0 else 'a',
+                                     header=start == 0, index=False)
+
+
+def _tax_ids(ids):
+    """XX-XXXXXXX TaxIDs, unique per entity number"""
+    digits = pd.Series(ids + 100000000).astype(str)
+    return digits.str[:2] + '-' + digits.str[2:]
+
+
+def _entity_block(ids, rng):
+    """Synthetic entities; entity numbers map to unique NPIs and TaxIDs"""
+    location = rng.integers(0, len(LOCATIONS), len(ids))
+    return pd.DataFrame({
+        'EntityName': [f"Entity {i} Health" for i in ids],
+        'EntityType': np.array(ENTITY_TYPES)[rng.integers(0, len(ENTITY_TYPES), len(ids))],
+        'TaxID': _tax_ids(ids),
+        'NPI': (2000000000 + ids).astype(str),
+        'AddressLine1': [f"{100 + i % 9000} Main Street" for i in ids],
+        'City': [LOCATIONS[i][0] for i in location],
+        'State': [LOCATIONS[i][1] for i in location],
+        'ZipCode': [LOCATIONS[i][2] for i in location],
+        'PhoneNumber': [f"(555) {200 + i % 800:03d}-{i % 10000:04d}" for i in ids],
+        'EmailAddress': [f"contact@entity{i}.org" for i in ids],
+        'Status': 'Active',
+        'AccreditationStatus': 'Accredited',
+        'IsActive': True
+    })
+
+
+def _provider_npis(ids, rng, rates):
+    """Provider NPIs with the bad and duplicate NPI defects applied
+
+    Credentials are generated from the same draws, so they follow their provider's NPI.
+    """
+    npis = pd.Series(1000000000 + ids).astype(str)
+    bad = rng.random(len(ids)) < rates['bad_npi']
+    duplicate = (rng.random(len(ids)) < rates['duplicate_npi']) & (ids > 0) & ~bad
+    npis[bad] = [f"X{i:09d}" for i in ids[bad]]
+    npis[duplicate] = (1000000000 + ids[duplicate] - 1).astype(str)
+    return npis, bad, duplicate
+
+
+def _provider_block(ids, rng, entities, rates):
+    """Synthetic providers and the defect counts of the block"""
+    npis, bad, duplicate = _provider_npis(ids, rng, rates)
+    orphaned = rng.random(len(ids)) < rates['orphaned_entity']
+    entity_numbers = np.where(orphaned, entities + ids, ids % entities)
+    location = rng.integers(0, len(LOCATIONS), len(ids))
+    birth_days = rng.integers(0, 365 * 45, len(ids))
+    block = pd.DataFrame({
+        'NPI': npis,
+        'FirstName': np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), len(ids))],
+        'LastName': np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), len(ids))],
+        'DateOfBirth': pd.Timestamp('1950-01-01') + pd.to_timedelta(birth_days, unit='D'),
+        'SSN': [f"{100 + i % 800:03d}-{10 + i % 90:02d}-{i % 10000:04d}" for i in ids],
+        'Specialty': np.array(SPECIALTIES)[rng.integers(0, len(SPECIALTIES), len(ids))],
+        'PhoneNumber': [f"(555) {200 + i % 800:03d}-{i % 10000:04d}" for i in ids],
+        'EmailAddress': [f"provider{i}@entity{i % entities}.org" for i in ids],
+        'AddressLine1': [f"{100 + i % 9000} Oak Avenue" for i in ids],
+        'City': [LOCATIONS[i][0] for i in location],
+        'State': [LOCATIONS[i][1] for i in location],
+        'ZipCode': [LOCATIONS[i][2] for i in location],
+        'EntityTaxID': _tax_ids(entity_numbers),
+        'Status': 'Active',
+        'IsActive': True
+    })
+    block['DateOfBirth'] = block['DateOfBirth'].dt.date
+    return block, {'bad_npi': int(bad.sum()), 'duplicate_npi': int(duplicate.sum()),
+                   'orphaned_entity': int(orphaned.sum())}
+
+
+def _credential_block(ids, rng, seed, rates, today):
+    """CREDENTIALS_PER_PROVIDER credentials per provider and the number expired"""
+    # Replay the provider block's draws so each credential carries its provider's NPI
+    provider_rng = np.random.default_rng([seed, 2, int(ids[0]) // GENERATE_BLOCK_SIZE])
+    npis, _, _ = _provider_npis(ids, provider_rng, rates)
+
+    provider_ids = np.repeat(ids, CREDENTIALS_PER_PROVIDER)
+    number = np.tile(np.arange(CREDENTIALS_PER_PROVIDER), len(ids))
+    rows = len(provider_ids)
+    expired = rng.random(rows) < rates['expired_credential']
+    issue_days = rng.integers(365, 365 * 8, rows)
+    valid_days = np.where(expired, issue_days - rng.integers(1, 365, rows),
+                          issue_days + rng.integers(120, 365 * 3, rows))
+    issue_dates = pd.Timestamp(today) - pd.to_timedelta(issue_days, unit='D')
+    location = rng.integers(0, len(LOCATIONS), rows)
+    type_index = number % len(CREDENTIAL_TYPES)
+    return pd.DataFrame({
+        'NPI': np.repeat(npis.to_numpy(), CREDENTIALS_PER_PROVIDER),
+        'CredentialType': np.array(CREDENTIAL_TYPES)[type_index],
+        'CredentialNumber': [f"C{p:09d}-{n}" for p, n in zip(provider_ids, number)],
+        'IssuingOrganization': np.array(ISSUING_ORGANIZATIONS)[type_index],
+        'IssueDate': issue_dates.date,
+        'ExpirationDate': (issue_dates + pd.to_timedelta(valid_days, unit='D')).date,
+        'StateIssued': [LOCATIONS[i][1] for i in location],
+        'Status': 'Active',
+        'IsPrimary': number == 0,
+        'VerificationDate': (pd.Timestamp(today) - pd.to_timedelta(rng.integers(1, 365, rows), unit='D')).date,
+        'VerifiedBy': 'Credentialing Team'
+    }), int(expired.sum())
+
+
+def reset_database():
+    """Delete all providers, credentials, entities and staged rows"""
+    logger.warning("Deleting all Providers, Credentials and Entities for the benchmark")
+    with connection() as conn:
+        cursor = conn.cursor()
+        for table in ('cred.Credentials', 'cred.Providers', 'cred.Entities'):
+            cursor.execute(f"DELETE FROM {table}")
+        for table in ('cred.CredentialStaging', 'cred.ProviderStaging', 'cred.EntityStaging'):
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        conn.commit()
+
+
+class _Phase:
+    """Time one benchmark phase and record its throughput and memory"""
+
+    def __init__(self, report, name, trace_memory):
+        self.report = report
+        self.name = name
+        self.trace_memory = trace_memory
+        self.rows = 0
+        self.details = {}
+
+    def __enter__(self):
+        logger.info(f"Benchmark phase: {self.name}")
+        if self.trace_memory:
+            tracemalloc.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        seconds = time.perf_counter() - self.start
+        phase = {
+            'name': self.name,
+            'seconds': round(seconds, 3),
+            'rows': self.rows,
+            'rows_per_sec': round(self.rows / seconds, 1) if seconds > 0 else None,
+            'max_rss_mb': _max_rss_mb()
+        }
+        if self.trace_memory:
+            phase['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            tracemalloc.stop()
+        if exc_type is not None:
+            phase['error'] = str(exc_value)
+        phase.update(self.details)
+        self.report['phases'].append(phase)
+        logger.info(f"  {self.name}: {phase['seconds']} s, {phase['rows_per_sec']} rows/sec")
+
+
+def _max_rss_mb():
+    """Process peak resident memory so far (MB), where the platform reports it"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(max_rss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+
+def _git_commit():
+    """Commit of the working tree, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(data_dir, providers=10000, seed=42, defect_rates=None, chunk_size=INGESTION_CHUNK_SIZE,
+                  engine=VALIDATION_ENGINE, result_mode=VALIDATION_RESULT_MODE, reset=False,
+                  trace_memory=False):
+    """Generate, load and validate a synthetic dataset, returning the report"""
+    from data_ingestion import DataIngestion
+
+    report = {
+        'benchmark_version': 1,
+        'git_commit': _git_commit(),
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'parameters': {
+            'providers': providers,
+            'seed': seed,
+            'defect_rates': dict(DEFAULT_DEFECT_RATES, **(defect_rates or {})),
+            'chunk_size': chunk_size,
+            'engine': engine,
+            'result_mode': result_mode
+        },
+        'phases': []
+    }
+
+    with _Phase(report, 'generate', trace_memory) as phase:
+        dataset = generate_dataset(data_dir, providers=providers, seed=seed, defect_rates=defect_rates)
+        phase.rows = sum(dataset['rows'].values())
+    report['rows'] = dataset['rows']
+    report['defects'] = dataset['defects']
+
+    if reset:
+        reset_database()
+
+    with DataIngestion() as ingestion:
+        loaders = {
+            'Entities': ingestion.load_entities_from_csv,
+            'Providers': ingestion.load_providers_from_csv,
+            'Credentials': ingestion.load_credentials_from_csv
+        }
+        for target in ('Entities', 'Providers', 'Credentials'):
+            with _Phase(report, f"ingest_{target.lower()}", trace_memory) as phase:
+                result = loaders[target](dataset['files'][target], chunk_size=chunk_size)
+                phase.rows = result['records_processed']
+                phase.details = {k: v for k, v in result.items() if k != 'records_processed'}
+
+    with _Phase(report, 'validate', trace_memory) as phase:
+        if engine == VALIDATION_ENGINE_PYTHON:
+            from rule_engine import ValidationEngine
+            with ValidationEngine() as validation_engine:
+                summary = validation_engine.run(run_type=VALIDATION_RUN_TYPE_MANUAL, result_mode=result_mode)
+        else:
+            from validation_runner import ValidationRunner
+            with ValidationRunner() as runner:
+                summary = runner.run_all_validations(run_type=VALIDATION_RUN_TYPE_MANUAL, result_mode=result_mode)
+        phase.rows = sum(dataset['rows'].values())
+        phase.details = {k: summary[k] for k in ('validation_run_id', 'failures', 'warnings', 'passes')}
+
+    report['total_seconds'] = round(sum(p['seconds'] for p in report['phases']), 3)
+    return report
+
+
+def compare_results(baseline, current):
+    """Per-phase change in seconds and rows/sec between two benchmark reports"""
+    if baseline['parameters'] != current['parameters']:
+        logger.warning("Benchmark parameters differ; the results are not directly comparable")
+
+    previous = {phase['name']: phase for phase in baseline['phases']}
+    comparison = []
+    for phase in current['phases']:
+        before = previous.get(phase['name'])
+        if before is None:
+            continue
+        comparison.append({
+            'name': phase['name'],
+            'baseline_seconds': before['seconds'],
+            'seconds': phase['seconds'],
+            'seconds_ratio': round(phase['seconds'] / before['seconds'], 3) if before['seconds'] else None,
+            'baseline_rows_per_sec': before['rows_per_sec'],
+            'rows_per_sec': phase['rows_per_sec']
+        })
+    return {
+        'baseline_commit': baseline.get('git_commit'),
+        'commit': current.get('git_commit'),
+        'phases': comparison
+    }
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Benchmark ingestion and validation on synthetic data')
+    parser.add_argument('--providers', type=int, default=10000, help='Providers generated (10k to 10M)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--defect-rate', action='append', default=[], metavar='NAME=RATE',
+                        help=f"Override a defect rate ({', '.join(DEFAULT_DEFECT_RATES)})")
+    parser.add_argument('--data-dir', default=os.path.join(DATA_SOURCE_PATH, 'benchmark'),
+                        help='Directory the CSV files are generated in')
+    parser.add_argument('--chunk-size', type=int, default=INGESTION_CHUNK_SIZE)
+    parser.add_argument('--engine', default=VALIDATION_ENGINE, help='SQL or Python')
+    parser.add_argument('--result-mode', default=VALIDATION_RESULT_MODE)
+    parser.add_argument('--reset-database', action='store_true',
+                        help='Delete all providers, credentials and entities first (scratch databases only)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record each phase\'s peak Python allocations (slows the run)')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--compare', help='Earlier JSON report to compare against')
+    args = parser.parse_args()
+
+    defect_rates = {}
+    for item in args.defect_rate:
+        name, _, rate = item.partition('=')
+        defect_rates[name] = float(rate)
+
+    try:
+        report = run_benchmark(
+            args.data_dir, providers=args.providers, seed=args.seed, defect_rates=defect_rates,
+            chunk_size=args.chunk_size, engine=args.engine, result_mode=args.result_mode,
+            reset=args.reset_database, trace_memory=args.trace_memory
+        )
+        if args.compare:
+            with open(args.compare) as f:
+                report['comparison'] = compare_results(json.load(f), report)
+
+        output = json.dumps(report, indent=2, default=str)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+            logger.info(f"Benchmark report written to {args.output}")
+        else:
+            print(output)
+
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        raise
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,14 +22,133 @@ CONNECTION_STRING = f"DRIVER={SQL_DRIVER};SERVER={SQL_SERVER};DATABASE={SQL_DATA
 # Alternative connection string for SQLAlchemy
 SQLALCHEMY_CONNECTION_STRING = f"mssql+pyodbc://{SQL_USERNAME}:{SQL_PASSWORD}@{SQL_SERVER}/{SQL_DATABASE}?driver=ODBC+Driver+17+for+SQL+Server"
 
+# Connection Pool (db.py)
+# One pool per process is shared by ingestion, validation and the daily refresh.
+# Size it for VALIDATION_PARALLEL_WORKERS plus the coordinating connection.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '5'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # Seconds before a connection is replaced
+DB_LOGIN_TIMEOUT = int(os.getenv('DB_LOGIN_TIMEOUT', '15'))
+DB_QUERY_TIMEOUT = int(os.getenv('DB_QUERY_TIMEOUT', '0'))  # 0 = no limit (validation runs can be long)
+
 # Validation Configuration
 VALIDATION_RUN_TYPE_SCHEDULED = 'Scheduled'
 VALIDATION_RUN_TYPE_MANUAL = 'Manual'
-VALIDATION_RUN_TYPE_ONDEMAND = 'OnDemand'
+VALIDATION_RUN_TYPE_ONDEMAND = 'OnDemand'  # Record-level runs of ondemand_validation.py
+VALIDATION_RUN_TYPE_INCREMENTAL = 'Incremental'
+
+# Run type used by the scheduled daily refresh. Set it to Incremental to opt in to
+# revalidating only records changed since the last completed run (falling back
+# to a full run when no earlier run exists)
+DAILY_VALIDATION_RUN_TYPE = os.getenv('DAILY_VALIDATION_RUN_TYPE', VALIDATION_RUN_TYPE_SCHEDULED)
+
+# Validation Result Storage
+# Full keeps a ValidationResults row for every check; ExceptionsOnly keeps only
+# Fail/Warning rows and records passes as per-rule counts in ValidationRuleRunStats.
+# Set VALIDATION_RESULT_MODE=ExceptionsOnly to opt in once nothing reads Pass rows
+VALIDATION_RESULT_MODE_FULL = 'Full'
+VALIDATION_RESULT_MODE_EXCEPTIONS_ONLY = 'ExceptionsOnly'
+VALIDATION_RESULT_MODE = os.getenv('VALIDATION_RESULT_MODE', VALIDATION_RESULT_MODE_FULL)
+
+# Validation Engine
+# SQL runs the cred.sp_Run*Validations stored procedures; Python evaluates the
+# same rules in-process with rule_engine.ValidationEngine (always a full run)
+VALIDATION_ENGINE_SQL = 'SQL'
+VALIDATION_ENGINE_PYTHON = 'Python'
+VALIDATION_ENGINE = os.getenv('VALIDATION_ENGINE', VALIDATION_ENGINE_SQL)
+
+# Validation Execution (SQL engine)
+# Serial runs cred.sp_RunAllValidations on one connection; Parallel dispatches
+# rule categories, and key-range shards of the sharded sources, across a pool
+# of worker connections under one ValidationRunID. Both commit per unit
+VALIDATION_EXECUTION_SERIAL = 'Serial'
+VALIDATION_EXECUTION_PARALLEL = 'Parallel'
+VALIDATION_EXECUTION_MODE = os.getenv('VALIDATION_EXECUTION_MODE', VALIDATION_EXECUTION_SERIAL)
+VALIDATION_PARALLEL_WORKERS = int(os.getenv('VALIDATION_PARALLEL_WORKERS', '4'))
+VALIDATION_SHARD_COUNT = int(os.getenv('VALIDATION_SHARD_COUNT', '4'))
+VALIDATION_SHARDED_SOURCES = ('Provider', 'Credential')
+
+# Rule Profiling
+# Every run records per-rule timings in cred.ValidationRuleTiming. Rules compiled into
+# one statement share its elapsed time; profiling runs each rule on its own so
+# the timings are isolated, at the cost of one scan per rule
+VALIDATION_PROFILE_RULES = os.getenv('VALIDATION_PROFILE_RULES', 'False').lower() == 'true'
+VALIDATION_PROFILE_BASELINE_RUNS = int(os.getenv('VALIDATION_PROFILE_BASELINE_RUNS', '7'))  # Trailing runs compared against
+
+# Rule Scheduling (SQL engine, cred.sp_ScheduleValidationRules)
+# Scheduled runs evaluate the Daily rules and the OnChange rules whose
+# DependsOnTables changed since the previous run, and carry forward the other
+# rules' outcomes. A skipped rule is evaluated again once it is
+# VALIDATION_RULE_MAX_SKIP_DAYS old, as far as the cost budget allows. Set
+# DAILY_VALIDATION_SCHEDULE_RULES=True to opt in for the daily refresh
+DAILY_VALIDATION_SCHEDULE_RULES = os.getenv('DAILY_VALIDATION_SCHEDULE_RULES', 'False').lower() == 'true'
+VALIDATION_RULE_MAX_SKIP_DAYS = int(os.getenv('VALIDATION_RULE_MAX_SKIP_DAYS', '7'))
+VALIDATION_RULE_COST_BUDGET_MS = int(os.getenv('VALIDATION_RULE_COST_BUDGET_MS', '0'))  # 0 = no limit
+
+# On-Demand Validation (ondemand_validation.py)
+# Records are validated in-process against a cached copy of Providers, Credentials
+# and Entities, reloaded once it is older than ONDEMAND_REFERENCE_TTL_SECONDS
+ONDEMAND_REFERENCE_TTL_SECONDS = int(os.getenv('ONDEMAND_REFERENCE_TTL_SECONDS', '300'))
+ONDEMAND_MAX_BATCH_SIZE = int(os.getenv('ONDEMAND_MAX_BATCH_SIZE', '500'))  # Records per call
+
+# Duplicate Detection (duplicate_detection.py, DUP001 - DUP004)
+# The in-process engine's counterparts of cred.sp_RefreshDuplicateCandidates'
+# @MaxBlockSize and @MinScore; keep them equal to the procedure's defaults
+DUPLICATE_MAX_BLOCK_SIZE = int(os.getenv('DUPLICATE_MAX_BLOCK_SIZE', '100'))  # Larger blocks are skipped
+DUPLICATE_MIN_SCORE = int(os.getenv('DUPLICATE_MIN_SCORE', '65'))
+
+# Credential Expiration Index (expiration_index.py)
+# cred.sp_RefreshCredentialExpirationIndex keeps credentials in expiration date
+# order and publishes cred.CredentialExpiryCalendar. In-process copies are
+# brought up to date from the database index once older than
+# EXPIRATION_INDEX_REFRESH_SECONDS; copies older than the database keeps removed
+# rows (the procedure's @RetainRemovedDays) are reloaded in full
+EXPIRATION_INDEX_REFRESH_SECONDS = int(os.getenv('EXPIRATION_INDEX_REFRESH_SECONDS', '60'))
+EXPIRATION_INDEX_RETAIN_REMOVED_DAYS = int(os.getenv('EXPIRATION_INDEX_RETAIN_REMOVED_DAYS', '30'))
+EXPIRATION_CALENDAR_DAYS = int(os.getenv('EXPIRATION_CALENDAR_DAYS', '365'))  # Days ahead in the calendar
+
+# Failure Export (ValidationRunner.export_failures)
+# Failures are read in pages of this many rows, keyed on ValidationResultID, and
+# written straight to the export file, so memory use does not grow with the run
+FAILURE_EXPORT_PAGE_SIZE = int(os.getenv('FAILURE_EXPORT_PAGE_SIZE', '50000'))
+
+# Run Summary Cache (summary_cache.py)
+# Summaries and failure details of completed runs are cached in-process (LRU of
+# SUMMARY_CACHE_SIZE entries) and on disk under SUMMARY_CACHE_PATH as JSON. Entries
+# are stamped with ValidationRunLog.ResultsVersion, which resolving results bumps
+SUMMARY_CACHE_ENABLED = os.getenv('SUMMARY_CACHE_ENABLED', 'True').lower() == 'true'
+SUMMARY_CACHE_SIZE = int(os.getenv('SUMMARY_CACHE_SIZE', '256'))
+SUMMARY_CACHE_PATH = os.getenv('SUMMARY_CACHE_PATH', './cache/run_summaries')
+
+# Data Snapshot (data_snapshot.py)
+# The daily refresh publishes Providers, Credentials and Entities as Arrow files
+# under SNAPSHOT_PATH, keeping the latest SNAPSHOT_KEEP_VERSIONS versions.
+# Uncompressed files are memory-mapped without copying; lz4 or zstd makes them
+# smaller but readers then decompress every column they load
+SNAPSHOT_ENABLED = os.getenv('SNAPSHOT_ENABLED', 'True').lower() == 'true'
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', './snapshots/core_tables')
+SNAPSHOT_KEEP_VERSIONS = int(os.getenv('SNAPSHOT_KEEP_VERSIONS', '3'))
+SNAPSHOT_COMPRESSION = os.getenv('SNAPSHOT_COMPRESSION', '')  # '', lz4 or zstd
 
 # Data Refresh Configuration
 DATA_REFRESH_SCHEDULE_HOUR = 2  # 2 AM daily
 DATA_REFRESH_SCHEDULE_MINUTE = 0
+DATA_REFRESH_WINDOW_END_HOUR = int(os.getenv('DATA_REFRESH_WINDOW_END_HOUR', '6'))  # Warn when the refresh overruns
+
+# Refresh Orchestration (refresh_orchestrator.py)
+# daily_refresh.py runs its steps as a dependency graph: independent steps run
+# concurrently, up to REFRESH_MAX_CONCURRENT_STEPS at a time. A failed step is
+# retried REFRESH_STEP_RETRIES times with exponential backoff; a step that
+# exceeds its timeout fails without a retry (0 = no timeout)
+REFRESH_MAX_CONCURRENT_STEPS = int(os.getenv('REFRESH_MAX_CONCURRENT_STEPS', '4'))
+REFRESH_STEP_TIMEOUT_SECONDS = int(os.getenv('REFRESH_STEP_TIMEOUT_SECONDS', '3600'))
+REFRESH_STEP_RETRIES = int(os.getenv('REFRESH_STEP_RETRIES', '2'))
+REFRESH_RETRY_BACKOFF_SECONDS = int(os.getenv('REFRESH_RETRY_BACKOFF_SECONDS', '30'))
+
+# Failure export written by the daily refresh ({date} is replaced with YYYYMMDD;
+# empty = no export). The extension picks CSV, JSON lines or Parquet
+REFRESH_FAILURE_EXPORT_PATH = os.getenv('REFRESH_FAILURE_EXPORT_PATH', '')
 
 # File Paths (if using file-based data sources)
 DATA_SOURCE_PATH = os.getenv('DATA_SOURCE_PATH', './data')
@@ -37,9 +156,62 @@ PROVIDERS_FILE = os.path.join(DATA_SOURCE_PATH, 'providers.csv')
 CREDENTIALS_FILE = os.path.join(DATA_SOURCE_PATH, 'credentials.csv')
 ENTITIES_FILE = os.path.join(DATA_SOURCE_PATH, 'entities.csv')
 
+# Rows read, staged and merged per chunk by the CSV loaders; bounds ingestion memory
+# independently of the file size
+INGESTION_CHUNK_SIZE = int(os.getenv('INGESTION_CHUNK_SIZE', '50000'))
+
+# Files loaded by DataIngestion.run_daily_refresh for each target table (missing
+# files are skipped) and the number of files loaded concurrently
+INGESTION_SOURCES = {
+    'Entities': [ENTITIES_FILE],
+    'Providers': [PROVIDERS_FILE],
+    'Credentials': [CREDENTIALS_FILE]
+}
+INGESTION_MAX_WORKERS = int(os.getenv('INGESTION_MAX_WORKERS', '3'))
+
+# Source Database Extracts (DataIngestion.load_from_source_database)
+# Each extract reads the rows of a source table whose watermark column has moved
+# past the position stored in cred.SourceExtractWatermark, ordered by watermark and
+# key, through a server-side cursor in batches of SOURCE_EXTRACT_BATCH_SIZE rows.
+# Each batch is merged into its target with the new position in one transaction.
+#   url       - SQLAlchemy URL of the source database (default SOURCE_DATABASE_URL)
+#   table     - source table or view
+#   watermark - column that increases whenever a row changes (modified date, rowversion)
+#   key       - unique column ordering rows that share a watermark value
+#   columns   - target column -> source column (default: the target's columns by name)
+SOURCE_DATABASE_URL = os.getenv('SOURCE_DATABASE_URL', '')
+SOURCE_EXTRACT_BATCH_SIZE = int(os.getenv('SOURCE_EXTRACT_BATCH_SIZE', '50000'))
+SOURCE_EXTRACTS = {
+    # 'hr_providers': {
+    #     'target': 'Providers',
+    #     'table': 'dbo.Provider',
+    #     'watermark': 'LastUpdated',
+    #     'key': 'ProviderKey',
+    #     'columns': {'NPI': 'NPI', 'FirstName': 'GivenName', 'LastName': 'FamilyName'}
+    # }
+}
+
+# Validation Result Retention (result_archive.py)
+# The latest RESULT_RETENTION_HOT_RUNS completed runs keep their ValidationResults rows;
+# older runs are written to Parquet files under RESULT_ARCHIVE_PATH, partitioned
+# by run date, and then deleted in batches small enough to avoid lock escalation
+RESULT_ARCHIVE_ENABLED = os.getenv('RESULT_ARCHIVE_ENABLED', 'False').lower() == 'true'
+RESULT_RETENTION_HOT_RUNS = int(os.getenv('RESULT_RETENTION_HOT_RUNS', '30'))
+RESULT_ARCHIVE_PATH = os.getenv('RESULT_ARCHIVE_PATH', './archive/validation_results')
+RESULT_ARCHIVE_COMPRESSION = os.getenv('RESULT_ARCHIVE_COMPRESSION', 'zstd')
+RESULT_ARCHIVE_DELETE_BATCH_SIZE = int(os.getenv('RESULT_ARCHIVE_DELETE_BATCH_SIZE', '4000'))  # SQL Server escalates at 5000 locks
+
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = os.getenv('LOG_FILE', 'credentialing_validation.log')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # text, or json for one JSON object per line
+
+# Metrics (telemetry.py)
+# Each script writes its metrics in the OpenMetrics text format to
+# METRICS_FILE_DIR/<script>.prom (empty = no file) and, when METRICS_HTTP_PORT
+# is set, serves them on http://127.0.0.1:<port>/metrics while it runs
+METRICS_FILE_DIR = os.getenv('METRICS_FILE_DIR', './metrics')
+METRICS_HTTP_PORT = int(os.getenv('METRICS_HTTP_PORT', '0'))
 
 # Email Configuration (for alerts - optional)
 EMAIL_ENABLED = os.getenv('EMAIL_ENABLED', 'False').lower() == 'true'
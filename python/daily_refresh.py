@@ -2,27 +2,181 @@
 Daily Refresh Script
 Automated daily refresh of data and validation execution
 Designed to run as a scheduled task (Windows Task Scheduler, cron, etc.)
+
+The refresh runs as a dependency graph of steps (refresh_orchestrator.py):
+one load per ingestion target and per source database extract, the data
+snapshot and the validation run split into one step per rule category, then
+the summary, failure export and archive steps. The credential expiration index
+is refreshed by the validation run, or by its own step with the Python engine. Independent steps
+run concurrently and each step's timing is logged to cred.RefreshStepLog.
 """
 
 import sys
 import logging
 from datetime import datetime
 from validation_runner import ValidationRunner
-from data_ingestion import DataIngestion
-from config import VALIDATION_RUN_TYPE_SCHEDULED
+from data_ingestion import DataIngestion, LOAD_DEPENDENCIES
+from rule_engine import ValidationEngine
+from refresh_orchestrator import RefreshOrchestrator, RefreshStep, STEP_SUCCEEDED
+from db import dispose_engine
+from telemetry import configure_logging, start_metrics_export
+from config import (
+    DAILY_VALIDATION_RUN_TYPE, DAILY_VALIDATION_SCHEDULE_RULES, VALIDATION_RESULT_MODE, VALIDATION_ENGINE,
+    VALIDATION_ENGINE_PYTHON, VALIDATION_EXECUTION_MODE, VALIDATION_EXECUTION_PARALLEL,
+    RESULT_ARCHIVE_ENABLED, INGESTION_SOURCES, DATA_REFRESH_WINDOW_END_HOUR,
+    REFRESH_FAILURE_EXPORT_PATH, SNAPSHOT_ENABLED, SOURCE_EXTRACTS
+)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'daily_refresh_{datetime.now().strftime("%Y%m%d")}.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging(f'daily_refresh_{datetime.now().strftime("%Y%m%d")}.log')
 logger = logging.getLogger(__name__)
 
 
+def build_refresh_steps(ingestion, validation_categories):
+    """Dependency graph of the daily refresh
+    
+    Returns the steps and the name of the step whose result is the validation
+    run summary.
+    """
+    steps = []
+    
+    # Step 1: Data Ingestion - one step per target, after the targets it references
+    load_steps = []
+    for target, paths in INGESTION_SOURCES.items():
+        name = f"load_{target.lower()}"
+        steps.append(RefreshStep(
+            name,
+            lambda results, target=target, paths=paths: ingestion.load_target(target, paths),
+            depends_on=[f"load_{dependency.lower()}" for dependency in LOAD_DEPENDENCIES[target]
+                        if dependency in INGESTION_SOURCES]
+        ))
+        load_steps.append(name)
+    
+    # Incremental source database extracts, after their target's file load and
+    # the loads and extracts of the targets they reference
+    extract_steps = {}
+    targets = list(LOAD_DEPENDENCIES)
+    for source_name, extract in sorted(SOURCE_EXTRACTS.items(), key=lambda item: targets.index(item[1]['target'])):
+        target = extract['target']
+        depends_on = [f"load_{target.lower()}"] if target in INGESTION_SOURCES else []
+        for dependency in LOAD_DEPENDENCIES[target]:
+            if dependency in INGESTION_SOURCES:
+                depends_on.append(f"load_{dependency.lower()}")
+            depends_on.extend(name for name, other in extract_steps.items() if other == dependency)
+        name = f"extract_{source_name.lower()}"
+        steps.append(RefreshStep(
+            name,
+            lambda results, source_name=source_name: ingestion.load_from_source_database(source_name),
+            depends_on=depends_on
+        ))
+        extract_steps[name] = target
+    load_steps.extend(extract_steps)
+    
+    # Publish the loaded tables for Python readers; runs alongside validation
+    if SNAPSHOT_ENABLED:
+        def publish_snapshot(results):
+            from data_snapshot import DataSnapshot
+            return DataSnapshot().publish()
+        
+        steps.append(RefreshStep('data_snapshot', publish_snapshot, depends_on=load_steps))
+    
+    # Step 2: Run Validations
+    if VALIDATION_ENGINE == VALIDATION_ENGINE_PYTHON:
+        def run_python_engine(results):
+            engine = ValidationEngine()
+            try:
+                return engine.run(run_type=DAILY_VALIDATION_RUN_TYPE, result_mode=VALIDATION_RESULT_MODE,
+                                  schedule_rules=DAILY_VALIDATION_SCHEDULE_RULES)
+            finally:
+                engine.close()
+        
+        # cred.sp_BeginValidationRun refreshes the index on the SQL path
+        def refresh_expiration(results):
+            from expiration_index import refresh_expiration_index
+            refresh_expiration_index()
+        
+        steps.append(RefreshStep('expiration_index', refresh_expiration, depends_on=load_steps))
+        steps.append(RefreshStep('validation', run_python_engine, depends_on=load_steps, retries=0))
+        validation_step = 'validation'
+    else:
+        def begin_validation(results):
+            with ValidationRunner() as runner:
+                return runner.begin_validation_run(DAILY_VALIDATION_RUN_TYPE, VALIDATION_RESULT_MODE,
+                                                   schedule_rules=DAILY_VALIDATION_SCHEDULE_RULES)
+        
+        def complete_validation(results):
+            with ValidationRunner() as runner:
+                return runner.complete_validation_run(results['validation_begin'])
+        
+        steps.append(RefreshStep('validation_begin', begin_validation, depends_on=load_steps, retries=0))
+        
+        # Categories run concurrently in Parallel mode and one after another in Serial
+        # mode; either way each unit commits with its checkpoint, so retries only
+        # rerun the units that had not committed
+        category_steps = []
+        for category in validation_categories:
+            name = f"validate_{category.lower().replace('-', '_')}"
+            previous = category_steps[-1:] if VALIDATION_EXECUTION_MODE != VALIDATION_EXECUTION_PARALLEL else []
+            steps.append(RefreshStep(
+                name,
+                lambda results, category=category: _run_category(results['validation_begin'], category),
+                depends_on=['validation_begin'] + previous
+            ))
+            category_steps.append(name)
+        
+        steps.append(RefreshStep('validation_complete', complete_validation,
+                                 depends_on=category_steps or ['validation_begin'], retries=0))
+        validation_step = 'validation_complete'
+    
+    # Step 3: Generate Summary Report
+    def summary_report(results):
+        validation_results = results[validation_step]
+        with ValidationRunner() as runner:
+            runner.get_validation_summary(validation_results['validation_run_id'])
+            failures = runner.get_failure_details(validation_results['validation_run_id'], limit=100)
+        
+        logger.info("Summary Report Generated:")
+        logger.info(f"  Validation Run ID: {validation_results['validation_run_id']}")
+        logger.info(f"  Total Rules: {validation_results['total_rules']}")
+        logger.info(f"  Total Failures: {validation_results['failures']}")
+        logger.info(f"  Total Warnings: {validation_results['warnings']}")
+        logger.info(f"  Passes: {validation_results['passes']}")
+        logger.info(f"  Unresolved Issues: {len(failures)}")
+        delta = validation_results.get('delta')
+        if delta:
+            logger.info(f"  New Issues: {delta['new']} (vs run {delta['base_run_id']})")
+            logger.info(f"  Persisting Issues: {delta['persisting']}")
+            logger.info(f"  Cleared Issues: {delta['cleared']} ({delta['auto_resolved']} auto-resolved)")
+        return len(failures)
+    
+    steps.append(RefreshStep('summary_report', summary_report, depends_on=[validation_step]))
+    
+    # Step 4: Export the run's failures for remediation
+    if REFRESH_FAILURE_EXPORT_PATH:
+        def export_failures(results):
+            path = REFRESH_FAILURE_EXPORT_PATH.replace('{date}', datetime.now().strftime('%Y%m%d'))
+            with ValidationRunner() as runner:
+                return runner.export_failures(results[validation_step]['validation_run_id'], path)
+        
+        steps.append(RefreshStep('failure_export', export_failures, depends_on=[validation_step]))
+    
+    # Step 5: Archive validation runs outside the retention window
+    if RESULT_ARCHIVE_ENABLED:
+        def archive_results(results):
+            from result_archive import ResultArchive
+            return ResultArchive().archive_runs()
+        
+        steps.append(RefreshStep('result_archive', archive_results, depends_on=[validation_step]))
+    
+    return steps
+
+
+def _run_category(validation_run_id, category):
+    """Run one rule category's units of the refresh's validation run"""
+    with ValidationRunner() as runner:
+        return runner.run_validation_units(validation_run_id, category)
+
+
 def run_daily_refresh():
     """Execute daily refresh process"""
     logger.info("=" * 80)
@@ -30,55 +184,47 @@ def run_daily_refresh():
     logger.info("=" * 80)
     
     overall_start_time = datetime.now()
-    validation_runner = None
-    data_ingestion = None
     
     try:
-        # Step 1: Data Ingestion
-        logger.info("Step 1: Starting data ingestion...")
-        data_ingestion = DataIngestion()
-        data_ingestion.run_daily_refresh()
-        logger.info("Step 1: Data ingestion completed")
-        
-        # Step 2: Run Validations
-        logger.info("Step 2: Starting validation execution...")
-        validation_runner = ValidationRunner()
-        validation_results = validation_runner.run_all_validations(
-            run_type=VALIDATION_RUN_TYPE_SCHEDULED
-        )
-        
-        if validation_results:
-            logger.info("Step 2: Validation execution completed")
-            logger.info(f"  Validation Run ID: {validation_results['validation_run_id']}")
-            logger.info(f"  Total Rules: {validation_results['total_rules']}")
-            logger.info(f"  Failures: {validation_results['failures']}")
-            logger.info(f"  Warnings: {validation_results['warnings']}")
-            logger.info(f"  Passes: {validation_results['passes']}")
+        if VALIDATION_ENGINE == VALIDATION_ENGINE_PYTHON:
+            validation_categories = []
         else:
-            logger.warning("Step 2: Validation execution returned no results")
-        
-        # Step 3: Generate Summary Report
-        logger.info("Step 3: Generating summary report...")
-        if validation_results:
-            summary = validation_runner.get_validation_summary(
-                validation_results['validation_run_id']
-            )
-            failures = validation_runner.get_failure_details(
-                validation_results['validation_run_id'], 
-                limit=100
-            )
-            
-            logger.info(f"Summary Report Generated:")
-            logger.info(f"  Total Failures: {validation_results['failures']}")
-            logger.info(f"  Total Warnings: {validation_results['warnings']}")
-            logger.info(f"  Unresolved Issues: {len(failures)}")
+            with ValidationRunner() as runner:
+                validation_categories = runner.get_rule_categories()
+        
+        with DataIngestion() as ingestion:
+            orchestrator = RefreshOrchestrator(build_refresh_steps(ingestion, validation_categories))
+            orchestrator.run()
+        
+        # A validation run left Running by a failed step is marked Failed; its
+        # completed units are kept, so it can be resumed with --resume
+        records = {record['step']: record for record in orchestrator.timings()}
+        if (records.get('validation_begin', {}).get('status') == STEP_SUCCEEDED
+                and records['validation_complete']['status'] != STEP_SUCCEEDED):
+            validation_run_id = orchestrator.results['validation_begin']
+            errors = '; '.join(f"{record['step']}: {record['error']}"
+                               for record in records.values() if record['error'])
+            with ValidationRunner() as runner:
+                runner.fail_validation_run(validation_run_id, errors or 'Refresh step failed')
+            logger.error(f"Validation run {validation_run_id} marked Failed; "
+                         f"resume it with validation_runner.py --resume {validation_run_id}")
+        
+        orchestrator.log_timings()
         
         # Calculate total execution time
         overall_end_time = datetime.now()
         total_execution_time = (overall_end_time - overall_start_time).total_seconds()
         
+        window_end = overall_start_time.replace(hour=DATA_REFRESH_WINDOW_END_HOUR, minute=0,
+                                                second=0, microsecond=0)
+        if overall_start_time < window_end < overall_end_time:
+            logger.warning(f"Daily refresh overran its window (ends {window_end:%H:%M})")
+        
+        if not orchestrator.succeeded():
+            raise RuntimeError("One or more refresh steps failed")
+        
         logger.info("=" * 80)
-        logger.info(f"Daily Refresh Process Completed Successfully")
+        logger.info("Daily Refresh Process Completed Successfully")
         logger.info(f"Total Execution Time: {total_execution_time:.2f} seconds")
         logger.info("=" * 80)
         
@@ -92,20 +238,16 @@ def run_daily_refresh():
         return 1  # Failure
         
     finally:
-        # Cleanup
-        if validation_runner:
-            validation_runner.close()
-        if data_ingestion:
-            # Close any open connections if needed
-            pass
+        # Every script shares one connection pool; close it once all steps are done
+        dispose_engine()
 
 
 def main():
     """Main entry point for scheduled execution"""
+    start_metrics_export('daily_refresh')
     exit_code = run_daily_refresh()
     sys.exit(exit_code)
 
 
 if __name__ == "__main__":
     main()
-
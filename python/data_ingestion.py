@@ -4,53 +4,203 @@ Loads data from source systems into the CredentialingDB database
 Supports CSV files, database connections, and API integrations
 """
 
-import pyodbc
+import json
+import os
+import threading
+import time
 import pandas as pd
 import logging
-from datetime import datetime
-from config import CONNECTION_STRING, SQL_SERVER, SQL_DATABASE
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, datetime
+from decimal import Decimal
+from config import (
+    INGESTION_CHUNK_SIZE, INGESTION_SOURCES, INGESTION_MAX_WORKERS,
+    SOURCE_DATABASE_URL, SOURCE_EXTRACT_BATCH_SIZE, SOURCE_EXTRACTS
+)
+from db import connection, dispose_engine, get_engine
+from telemetry import (
+    configure_logging, start_metrics_export, INGESTION_CHUNK_SECONDS, INGESTION_ROWS_PER_SECOND,
+    INGESTION_ROWS_READ
+)
+from sqlalchemy import create_engine, text
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data_ingestion.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging('data_ingestion.log')
 logger = logging.getLogger(__name__)
 
+# Columns accepted from source files and the dtypes they are read with. Low-cardinality
+# text columns are read as categories so large extracts stay small in memory;
+# 'date' and 'datetime' columns are parsed after reading (unparseable values load as NULL).
+PROVIDER_COLUMNS = {
+    'NPI': 'string', 'FirstName': 'string', 'LastName': 'string', 'MiddleName': 'string',
+    'DateOfBirth': 'date', 'SSN': 'string', 'Specialty': 'category', 'SubSpecialty': 'category',
+    'PhoneNumber': 'string', 'EmailAddress': 'string', 'AddressLine1': 'string',
+    'AddressLine2': 'string', 'City': 'category', 'State': 'category', 'ZipCode': 'string',
+    'EntityID': 'Int64', 'EntityNPI': 'string', 'EntityTaxID': 'string',
+    'Status': 'category', 'IsActive': 'boolean'
+}
+
+CREDENTIAL_COLUMNS = {
+    'ProviderID': 'Int64', 'NPI': 'string', 'CredentialType': 'category',
+    'CredentialNumber': 'string', 'IssuingOrganization': 'category', 'IssueDate': 'date',
+    'ExpirationDate': 'date', 'StateIssued': 'category', 'Status': 'category',
+    'IsPrimary': 'boolean', 'VerificationDate': 'datetime', 'VerifiedBy': 'category'
+}
+
+ENTITY_COLUMNS = {
+    'EntityName': 'string', 'EntityType': 'category', 'TaxID': 'string', 'NPI': 'string',
+    'AddressLine1': 'string', 'AddressLine2': 'string', 'City': 'category',
+    'State': 'category', 'ZipCode': 'string', 'PhoneNumber': 'string',
+    'EmailAddress': 'string', 'Status': 'category', 'AccreditationStatus': 'category',
+    'IsActive': 'boolean'
+}
+
+# How each file load is staged and merged:
+#   required   - groups of columns of which the file must contain at least one
+#   key        - target columns not updated on a match
+#   dedupe     - staged rows sharing this key keep only the last row of the chunk
+#   match      - MERGE condition pairing a staged row with its target row
+#   fallback   - optional (filter, match): staged rows passing the filter are merged
+#                in a second MERGE on the other match, so no row matches on both keys
+#   references - foreign keys resolved in memory before staging: the ID column is
+#                filled from natural-key columns through KEY_INDEXES, and rows whose
+#                reference does not resolve are quarantined instead of loaded
+LOAD_TARGETS = {
+    'Providers': {
+        'table': 'cred.Providers',
+        'staging_table': 'cred.ProviderStaging',
+        'columns': PROVIDER_COLUMNS,
+        'required': [('NPI',)],
+        'key': ['NPI'],
+        'dedupe': 's.NPI',
+        'match': 'target.NPI = source.NPI',
+        'references': [
+            {'column': 'EntityID', 'ids': 'entity_ids', 'required': False,
+             'keys': [('EntityNPI', 'entity_npi'), ('EntityTaxID', 'entity_taxid')]}
+        ]
+    },
+    'Credentials': {
+        'table': 'cred.Credentials',
+        'staging_table': 'cred.CredentialStaging',
+        'columns': CREDENTIAL_COLUMNS,
+        'required': [('ProviderID', 'NPI'), ('CredentialType',), ('CredentialNumber',)],
+        'key': ['ProviderID', 'CredentialType', 'CredentialNumber'],
+        'dedupe': 's.ProviderID, s.CredentialType, s.CredentialNumber',
+        'match': ('target.ProviderID = source.ProviderID AND target.CredentialType = source.CredentialType '
+                  'AND target.CredentialNumber = source.CredentialNumber'),
+        'references': [
+            {'column': 'ProviderID', 'ids': 'provider_ids', 'required': True,
+             'keys': [('NPI', 'provider_npi')]}
+        ]
+    },
+    'Entities': {
+        'table': 'cred.Entities',
+        'staging_table': 'cred.EntityStaging',
+        'columns': ENTITY_COLUMNS,
+        'required': [('EntityName',)],
+        'key': ['NPI'],
+        'dedupe': 'COALESCE(s.NPI, s.TaxID, CAST(s.StagingRowID AS NVARCHAR(20)))',
+        'match': 'target.NPI = source.NPI',
+        'fallback': ('source.NPI IS NULL AND source.TaxID IS NOT NULL', 'target.TaxID = source.TaxID')
+    }
+}
+
+# Natural key -> ID hash indexes used to resolve references, keyed by name with
+# the table they are built from. Each is read once per load of its table and
+# rebuilt after that table is merged again.
+KEY_INDEXES = {
+    'provider_npi': ('Providers', "SELECT NPI AS KeyValue, ProviderID FROM cred.Providers"),
+    'provider_ids': ('Providers', "SELECT ProviderID AS KeyValue, ProviderID FROM cred.Providers"),
+    'entity_npi': ('Entities', "SELECT NPI AS KeyValue, EntityID FROM cred.Entities WHERE NPI IS NOT NULL"),
+    'entity_taxid': ('Entities', "SELECT TaxID AS KeyValue, EntityID FROM cred.Entities WHERE TaxID IS NOT NULL"),
+    'entity_ids': ('Entities', "SELECT EntityID AS KeyValue, EntityID FROM cred.Entities")
+}
+
+# Targets that must finish loading before a target starts, so its references resolve
+LOAD_DEPENDENCIES = {
+    'Entities': [],
+    'Providers': ['Entities'],
+    'Credentials': ['Providers']
+}
+
+
+def _encode_position(value):
+    """Type name and text of a watermark or key value, as stored in SourceExtractWatermark"""
+    if value is None:
+        return None, None
+    if isinstance(value, datetime):
+        return 'datetime', value.isoformat()
+    if isinstance(value, date):
+        return 'date', value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return 'binary', bytes(value).hex()  # rowversion
+    if isinstance(value, int):
+        return 'int', str(value)
+    if isinstance(value, (Decimal, float)):
+        return 'decimal', str(value)
+    return 'str', str(value)
+
+
+def _decode_position(value_type, text_value):
+    """Inverse of _encode_position"""
+    if text_value is None:
+        return None
+    decoders = {
+        'datetime': datetime.fromisoformat,
+        'date': date.fromisoformat,
+        'binary': bytes.fromhex,
+        'int': int,
+        'decimal': Decimal
+    }
+    return decoders.get(value_type, str)(text_value)
+
 
 class DataIngestion:
     """Handles data ingestion into CredentialingDB"""
     
     def __init__(self):
-        """Initialize database connection"""
+        """Initialize database connection pool"""
         try:
-            self.connection_string = CONNECTION_STRING
-            self.engine = create_engine(
-                f"mssql+pyodbc:///?odbc_connect={CONNECTION_STRING.replace(' ', '')}",
-                fast_executemany=True
-            )
-            logger.info("Database connection established")
+            self.engine = get_engine()
+            self._key_indexes = {}
+            self._key_index_lock = threading.Lock()
+            self._source_engines = {}
+            self._source_engine_lock = threading.Lock()
+            logger.info("Database connection pool ready")
         except Exception as e:
             logger.error(f"Failed to establish database connection: {str(e)}")
             raise
     
-    def log_refresh_start(self, source_system):
-        """Log the start of a data refresh operation"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release the ingestion's hold on the shared pool and close the source pools"""
+        self.engine = None
+        with self._source_engine_lock:
+            for source_engine in self._source_engines.values():
+                source_engine.dispose()
+            self._source_engines.clear()
+        logger.info("Data ingestion closed")
+    
+    def log_refresh_start(self, source_system, target_table=None):
+        """Log the start of a data refresh operation
+        
+        target_table (e.g. cred.Providers) tells the rule scheduler which base
+        table the refresh wrote to.
+        """
         try:
-            with pyodbc.connect(self.connection_string) as conn:
+            with connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO cred.DataRefreshLog 
-                    (RefreshStartTime, RefreshStatus, SourceSystem)
-                    VALUES (?, ?, ?)
+                    (RefreshStartTime, RefreshStatus, SourceSystem, TargetTable)
+                    VALUES (?, ?, ?, ?)
                     SELECT SCOPE_IDENTITY()
-                """, datetime.now(), 'Running', source_system)
+                """, datetime.now(), 'Running', source_system, target_table)
                 refresh_id = cursor.fetchone()[0]
                 conn.commit()
                 return refresh_id
@@ -60,10 +210,10 @@ class DataIngestion:
     
     def log_refresh_end(self, refresh_id, status, records_processed=0, 
                        records_inserted=0, records_updated=0, records_deleted=0,
-                       error_message=None):
+                       error_message=None, records_unchanged=0, records_quarantined=0):
         """Log the end of a data refresh operation"""
         try:
-            with pyodbc.connect(self.connection_string) as conn:
+            with connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE cred.DataRefreshLog
@@ -73,154 +223,587 @@ class DataIngestion:
                         RecordsInserted = ?,
                         RecordsUpdated = ?,
                         RecordsDeleted = ?,
+                        RecordsUnchanged = ?,
+                        RecordsQuarantined = ?,
                         ExecutionTimeSeconds = DATEDIFF(SECOND, RefreshStartTime, ?),
                         ErrorMessage = ?
                     WHERE RefreshID = ?
                 """, datetime.now(), status, records_processed, records_inserted,
-                    records_updated, records_deleted, datetime.now(), error_message, refresh_id)
+                    records_updated, records_deleted, records_unchanged, records_quarantined, datetime.now(),
+                    error_message, refresh_id)
                 conn.commit()
         except Exception as e:
             logger.error(f"Failed to log refresh end: {str(e)}")
     
-    def load_providers_from_csv(self, file_path):
+    def load_providers_from_csv(self, file_path, chunk_size=INGESTION_CHUNK_SIZE):
         """Load provider data from CSV file"""
-        refresh_id = self.log_refresh_start('CSV - Providers')
+        return self._load_csv(file_path, 'CSV - Providers', 'Providers', chunk_size)
+    
+    def load_credentials_from_csv(self, file_path, chunk_size=INGESTION_CHUNK_SIZE):
+        """Load credential data from CSV file"""
+        return self._load_csv(file_path, 'CSV - Credentials', 'Credentials', chunk_size)
+    
+    def load_entities_from_csv(self, file_path, chunk_size=INGESTION_CHUNK_SIZE):
+        """Load entity data from CSV file"""
+        return self._load_csv(file_path, 'CSV - Entities', 'Entities', chunk_size)
+    
+    def _load_csv(self, file_path, source_system, target, chunk_size):
+        """Stream a CSV file into a base table in fixed-size chunks"""
+        spec = LOAD_TARGETS[target]
+        
+        def open_source():
+            columns = self._read_csv_header(file_path, spec)
+            dtypes = {c: spec['columns'][c] for c in columns if spec['columns'][c] not in ('date', 'datetime')}
+            chunks = pd.read_csv(file_path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+            return columns, ((self._parse_dates(chunk, spec), None) for chunk in chunks)
+        
+        return self._load_chunks(source_system, target, file_path, open_source)
+    
+    def _load_chunks(self, source_system, target, source, open_source, checkpoint=None):
+        """Stage and merge a stream of chunks into a base table
+        
+        open_source returns the mapped columns of the source and an iterator of
+        (chunk, position) pairs. Each chunk is bulk-copied into the target's staging
+        table and merged on its business key in one transaction, so memory use is
+        bounded by the chunk size rather than by the source size. Rows whose content
+        hash matches the RowHash stored for their key are counted as unchanged and
+        not written; rows whose references do not resolve are written to
+        cred.IngestionQuarantine. checkpoint(cursor, refresh_id, position, rows) runs
+        in each chunk's transaction, before it commits.
+        """
+        spec = LOAD_TARGETS[target]
+        refresh_id = self.log_refresh_start(source_system, spec['table'])
+        records_processed = 0
         records_inserted = 0
         records_updated = 0
+        records_unchanged = 0
+        records_quarantined = 0
         
         try:
-            # Read CSV file
-            df = pd.read_csv(file_path)
-            logger.info(f"Loaded {len(df)} provider records from {file_path}")
-            
-            # Data transformation and validation
-            df['CreatedDate'] = datetime.now()
-            df['ModifiedDate'] = datetime.now()
-            df['IsActive'] = df.get('IsActive', 1)
-            
-            # Use merge to handle inserts and updates
-            # This is a simplified version - in production, you'd use MERGE SQL statement
-            df.to_sql('Providers_temp', self.engine, schema='cred', 
-                     if_exists='replace', index=False, method='multi')
-            
-            # Execute merge statement (upsert logic)
-            with self.engine.connect() as conn:
-                # Use stored procedure or MERGE statement for upsert
-                # For simplicity, using INSERT with conflict handling
-                conn.execute("""
-                    MERGE cred.Providers AS target
-                    USING cred.Providers_temp AS source
-                    ON target.NPI = source.NPI
-                    WHEN MATCHED THEN
-                        UPDATE SET 
-                            FirstName = source.FirstName,
-                            LastName = source.LastName,
-                            ModifiedDate = GETDATE()
-                    WHEN NOT MATCHED THEN
-                        INSERT (NPI, FirstName, LastName, CreatedDate, ModifiedDate, IsActive)
-                        VALUES (source.NPI, source.FirstName, source.LastName, 
-                                source.CreatedDate, source.ModifiedDate, source.IsActive);
+            columns, chunks = open_source()
+            staged_columns = self._staged_columns(spec, columns)
+            staging_sql = (f"INSERT INTO {spec['staging_table']} (RefreshID, {', '.join(staged_columns)}) "
+                           f"VALUES ({', '.join('?' * (len(staged_columns) + 1))})")
+            merge_sql = self._build_merge_sql(spec, staged_columns)
+            
+            load_started = time.perf_counter()
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.fast_executemany = True
+                
+                chunk_started = time.perf_counter()
+                for chunk, position in chunks:
+                    chunk_rows = len(chunk)
+                    chunk, quarantined = self._resolve_references(chunk, spec)
+                    
+                    chunk = chunk[staged_columns].astype(object)
+                    chunk = chunk.where(chunk.notna(), None)
+                    rows = [(refresh_id,) + row for row in chunk.itertuples(index=False, name=None)]
                     
-                    DROP TABLE cred.Providers_temp;
-                """)
+                    try:
+                        inserted = updated = unchanged = 0
+                        if rows:
+                            cursor.executemany(staging_sql, rows)
+                            cursor.execute(merge_sql, refresh_id, refresh_id)
+                            inserted, updated, unchanged = cursor.fetchone()
+                        if len(quarantined):
+                            self._quarantine(cursor, refresh_id, target, source, quarantined)
+                        if checkpoint is not None:
+                            checkpoint(cursor, refresh_id, position, chunk_rows)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    
+                    records_processed += chunk_rows
+                    records_inserted += inserted
+                    records_updated += updated
+                    records_unchanged += unchanged
+                    records_quarantined += len(quarantined)
+                    
+                    chunk_seconds = time.perf_counter() - chunk_started
+                    INGESTION_ROWS_READ.inc(chunk_rows, target=target)
+                    INGESTION_CHUNK_SECONDS.observe(chunk_seconds, target=target)
+                    logger.info(f"{target}: merged {records_processed} records "
+                                f"({records_inserted} inserted, {records_updated} updated, "
+                                f"{records_unchanged} unchanged, {records_quarantined} quarantined)",
+                                extra={'target': target, 'records_processed': records_processed,
+                                       'chunk_seconds': round(chunk_seconds, 3)})
+                    chunk_started = time.perf_counter()
+            
+            load_seconds = time.perf_counter() - load_started
+            INGESTION_ROWS_PER_SECOND.set(records_processed / load_seconds if load_seconds else 0, target=target)
             
-            records_inserted = len(df)
-            self.log_refresh_end(refresh_id, 'Completed', len(df), 
-                               records_inserted, records_updated, 0)
-            logger.info(f"Successfully loaded {records_inserted} provider records")
+            self.log_refresh_end(refresh_id, 'Completed', records_processed,
+                               records_inserted, records_updated, 0,
+                               records_unchanged=records_unchanged,
+                               records_quarantined=records_quarantined)
+            logger.info(f"Successfully loaded {records_processed} {target.lower()} records from {source}")
+            if records_quarantined:
+                logger.warning(f"{records_quarantined} {target.lower()} records from {source} "
+                               f"were quarantined (RefreshID {refresh_id})")
+            
+            return {
+                'records_processed': records_processed,
+                'records_inserted': records_inserted,
+                'records_updated': records_updated,
+                'records_unchanged': records_unchanged,
+                'records_quarantined': records_quarantined
+            }
             
         except Exception as e:
             error_msg = str(e)
-            logger.error(f"Error loading providers: {error_msg}")
-            self.log_refresh_end(refresh_id, 'Failed', 0, 0, 0, 0, error_msg)
+            logger.error(f"Error loading {target.lower()}: {error_msg}")
+            self.log_refresh_end(refresh_id, 'Failed', records_processed, records_inserted,
+                               records_updated, 0, error_msg, records_unchanged, records_quarantined)
             raise
     
-    def load_credentials_from_csv(self, file_path):
-        """Load credential data from CSV file"""
-        refresh_id = self.log_refresh_start('CSV - Credentials')
-        records_inserted = 0
+    def _parse_dates(self, chunk, spec):
+        """Parse the chunk's date and datetime columns (unparseable values become NULL)"""
+        for column in chunk.columns:
+            kind = spec['columns'].get(column)
+            if kind in ('date', 'datetime'):
+                values = pd.to_datetime(chunk[column], errors='coerce', format='mixed')
+                chunk[column] = values.dt.date if kind == 'date' else values
+        return chunk
+    
+    def _staged_columns(self, spec, columns):
+        """Return the target columns staged for a file: mapped columns plus resolved IDs"""
+        lookup_columns = {key for ref in spec.get('references', []) for key, _ in ref['keys']}
+        staged = [c for c in columns if c not in lookup_columns]
+        for ref in spec.get('references', []):
+            if ref['column'] not in staged and any(key in columns for key, _ in ref['keys']):
+                staged.append(ref['column'])
+        return staged
+    
+    def _key_index(self, name):
+        """Return a natural key -> ID index, reading it from the database on first use"""
+        with self._key_index_lock:
+            if name not in self._key_indexes:
+                table, query = KEY_INDEXES[name]
+                frame = pd.read_sql(query, self.engine)
+                self._key_indexes[name] = pd.Series(
+                    frame.iloc[:, 1].astype('Int64').to_numpy(), index=frame['KeyValue']
+                )
+                logger.info(f"Built key index {name} ({len(frame)} keys)")
+            return self._key_indexes[name]
+    
+    def _invalidate_key_indexes(self, target):
+        """Drop the key indexes built from a table that has just been reloaded"""
+        with self._key_index_lock:
+            for name, (table, _) in KEY_INDEXES.items():
+                if table == target:
+                    self._key_indexes.pop(name, None)
+    
+    def _resolve_references(self, chunk, spec):
+        """Fill foreign key IDs from natural keys and split off rows that do not resolve
         
-        try:
-            df = pd.read_csv(file_path)
-            logger.info(f"Loaded {len(df)} credential records from {file_path}")
+        Returns the rows to load and the quarantined rows with a QuarantineReason.
+        """
+        reasons = pd.Series(None, index=chunk.index, dtype=object)
+        
+        for ref in spec.get('references', []):
+            column = ref['column']
+            keys = [(key, index) for key, index in ref['keys'] if key in chunk.columns]
+            if column not in chunk.columns and not keys:
+                continue
             
-            # Data transformation
-            df['CreatedDate'] = datetime.now()
-            df['ModifiedDate'] = datetime.now()
+            given = pd.Series(False, index=chunk.index)
+            if column in chunk.columns:
+                resolved = chunk[column].astype('Int64')
+                unknown = resolved.notna() & ~resolved.isin(self._key_index(ref['ids']).index)
+                reasons = reasons.mask(unknown & reasons.isna(), f"{column} does not exist")
+                given |= resolved.notna()
+            else:
+                resolved = pd.Series(pd.NA, index=chunk.index, dtype='Int64')
             
-            # Insert credentials (assuming ProviderID mapping is handled)
-            df.to_sql('Credentials', self.engine, schema='cred', 
-                     if_exists='append', index=False, method='multi')
+            for key, index in keys:
+                given |= chunk[key].notna()
+                resolved = resolved.fillna(chunk[key].map(self._key_index(index)).astype('Int64'))
             
-            records_inserted = len(df)
-            self.log_refresh_end(refresh_id, 'Completed', len(df), 
-                               records_inserted, 0, 0)
-            logger.info(f"Successfully loaded {records_inserted} credential records")
+            missing = resolved.isna() & (given | ref['required'])
+            reasons = reasons.mask(
+                missing & reasons.isna(),
+                f"{column} could not be resolved from {' or '.join([column] + [key for key, _ in keys])}"
+            )
+            chunk[column] = resolved
+        
+        quarantined = reasons.notna()
+        return chunk[~quarantined], chunk[quarantined].assign(QuarantineReason=reasons[quarantined])
+    
+    def _quarantine(self, cursor, refresh_id, target, file_path, rows):
+        """Write rows that could not be loaded to cred.IngestionQuarantine"""
+        data = rows.drop(columns='QuarantineReason').astype(object)
+        data = data.where(data.notna(), None)
+        cursor.executemany("""
+            INSERT INTO cred.IngestionQuarantine
+            (RefreshID, TargetTable, SourceFile, SourceRowNumber, Reason, RowData)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (refresh_id, target, file_path, int(row_number) + 1, reason,
+             json.dumps(values, default=str))
+            for row_number, reason, values in zip(
+                rows.index, rows['QuarantineReason'], data.to_dict(orient='records')
+            )
+        ])
+    
+    def _read_csv_header(self, file_path, spec):
+        """Return the mapped columns present in a CSV file, checking the merge keys"""
+        header = pd.read_csv(file_path, nrows=0).columns
+        return self._mapped_columns(file_path, header, spec)
+    
+    def _mapped_columns(self, source, names, spec):
+        """Return the mapped columns among a source's column names, checking the merge keys"""
+        columns = [c for c in spec['columns'] if c in names]
+        
+        unmapped = [c for c in names if c not in spec['columns']]
+        if unmapped:
+            logger.warning(f"Ignoring unmapped columns in {source}: {', '.join(unmapped)}")
+        
+        for alternatives in spec['required']:
+            if not any(c in columns for c in alternatives):
+                raise ValueError(f"{source} must contain {' or '.join(alternatives)}")
+        
+        return columns
+    
+    def _build_merge_sql(self, spec, columns):
+        """Build the MERGE of one staged chunk into the target table
+        
+        Each staged row is fingerprinted with a SHA-256 hash of its mapped columns.
+        Rows whose hash matches the RowHash stored for their key are dropped before
+        the MERGE. The remaining rows insert or update every mapped column present in
+        the file; matched rows whose values are equal only have their RowHash
+        refreshed and keep their ModifiedDate. The batch returns the inserted,
+        updated and unchanged counts.
+        
+        The files of one target load concurrently, so the MERGE holds its key-range
+        locks (HOLDLOCK) until commit; without them two files inserting the same
+        natural key could both miss the match and violate its UNIQUE constraint.
+        Targets with a fallback key merge the rows it covers in a second MERGE, so
+        each MERGE matches on one indexed key and a target row at most once.
+        """
+        target_columns = columns
+        update_columns = [c for c in target_columns if c not in spec['key']]
+        
+        select_list = ',\n                       '.join(f"s.{c}" for c in target_columns)
+        # Non-NULL values are prefixed so NULL and empty strings hash differently;
+        # the column list is hashed too, so files with other columns never match
+        hash_list = ',\n                           '.join(
+            [f"N'{','.join(target_columns)}'"]
+            + [f"ISNULL(N'=' + CONVERT(NVARCHAR(4000), s.{c}), N'')" for c in target_columns]
+        )
+        source_list = ', '.join(f"source.{c}" for c in update_columns)
+        target_list = ', '.join(f"target.{c}" for c in update_columns)
+        update_list = ',\n                    '.join(f"{c} = source.{c}" for c in update_columns)
+        changed = (f"\n            WHEN MATCHED AND EXISTS (SELECT {source_list} EXCEPT SELECT {target_list}) THEN"
+                   f"\n                UPDATE SET\n                    {update_list},"
+                   f"\n                    RowHash = source.RowHash,"
+                   f"\n                    ModifiedDate = GETDATE()") if update_columns else ""
+        
+        if 'fallback' in spec:
+            fallback_filter, fallback_match = spec['fallback']
+            passes = [(f"NOT ({fallback_filter})", spec['match']), (fallback_filter, fallback_match)]
+        else:
+            passes = [(None, spec['match'])]
+        merges = "\n".join(f"""
+            -- Unchanged rows: same content hash as the last load of their key
+            DELETE source
+            FROM #Staged AS source
+            WHERE {f"{where} AND " if where else ""}EXISTS (SELECT 1 FROM {spec['table']} AS target
+                          WHERE {match} AND target.RowHash = source.RowHash);
             
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Error loading credentials: {error_msg}")
-            self.log_refresh_end(refresh_id, 'Failed', 0, 0, 0, 0, error_msg)
-            raise
+            MERGE {spec['table']} WITH (HOLDLOCK) AS target
+            USING {f"(SELECT * FROM #Staged AS source WHERE {where})" if where else "#Staged"} AS source
+            ON {match}{changed}
+            WHEN MATCHED THEN
+                UPDATE SET RowHash = source.RowHash
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT ({', '.join(target_columns)}, RowHash, CreatedDate, ModifiedDate)
+                VALUES ({', '.join(f"source.{c}" for c in target_columns)}, source.RowHash, GETDATE(), GETDATE())
+            OUTPUT $action,
+                   CASE WHEN $action = 'UPDATE'
+                             AND (deleted.ModifiedDate = inserted.ModifiedDate
+                                  OR (deleted.ModifiedDate IS NULL AND inserted.ModifiedDate IS NULL))
+                        THEN 0 ELSE 1 END
+                INTO @Actions;""" for where, match in passes)
+        
+        return f"""
+            SET NOCOUNT ON;
+            DECLARE @Actions TABLE (MergeAction NVARCHAR(10), ValuesChanged BIT);
+            DECLARE @StagedCount INT;
+            
+            DROP TABLE IF EXISTS #Staged;
+            
+            WITH staged AS (
+                SELECT {select_list},
+                       HASHBYTES('SHA2_256', CONCAT_WS(NCHAR(31),
+                           {hash_list})) AS RowHash,
+                       ROW_NUMBER() OVER (PARTITION BY {spec['dedupe']} ORDER BY s.StagingRowID DESC) AS RowNumber
+                FROM {spec['staging_table']} s
+                WHERE s.RefreshID = ?
+            )
+            SELECT * INTO #Staged FROM staged WHERE RowNumber = 1;
+            SET @StagedCount = @@ROWCOUNT;
+            {merges}
+            
+            DELETE FROM {spec['staging_table']} WHERE RefreshID = ?;
+            DROP TABLE #Staged;
+            
+            SELECT
+                ISNULL(SUM(CASE WHEN MergeAction = 'INSERT' THEN 1 ELSE 0 END), 0) AS Inserted,
+                ISNULL(SUM(CASE WHEN MergeAction = 'UPDATE' AND ValuesChanged = 1 THEN 1 ELSE 0 END), 0) AS Updated,
+                @StagedCount - ISNULL(SUM(CAST(ValuesChanged AS INT)), 0) AS Unchanged
+            FROM @Actions;
+        """
     
-    def load_entities_from_csv(self, file_path):
-        """Load entity data from CSV file"""
-        refresh_id = self.log_refresh_start('CSV - Entities')
-        records_inserted = 0
+    def load_from_source_database(self, source_name, batch_size=SOURCE_EXTRACT_BATCH_SIZE, full=False):
+        """Extract the rows of a source table changed since its watermark into its target
+        
+        source_name names an extract in SOURCE_EXTRACTS. Rows after the position
+        stored in cred.SourceExtractWatermark, up to the highest watermark at the
+        start of the extract, are read in (watermark, key) order through a
+        server-side cursor, batch_size rows at a time. Each batch is staged and
+        merged like a CSV chunk and the position moves to its last row in the same
+        transaction, so an extract that fails resumes after its last merged batch.
+        full=True discards the stored position and extracts every row. Returns the
+        load results.
+        """
+        extract = SOURCE_EXTRACTS[source_name]
+        target = extract['target']
+        spec = LOAD_TARGETS[target]
+        table, watermark, key = extract['table'], extract['watermark'], extract['key']
+        mapping = extract.get('columns') or {c: c for c in spec['columns']}
+        source = f"{source_name} ({table})"
+        
+        def open_source():
+            columns = self._mapped_columns(source, list(mapping), spec)
+            position = self._begin_extract(source_name, extract, full)
+            return columns, self._read_source_batches(extract, columns, mapping, position, batch_size)
+        
+        def checkpoint(cursor, refresh_id, position, rows):
+            watermark_type, watermark_value = _encode_position(position[0])
+            key_type, key_value = _encode_position(position[1])
+            cursor.execute("""
+                UPDATE cred.SourceExtractWatermark
+                SET WatermarkType = ?, WatermarkValue = ?, KeyType = ?, KeyValue = ?,
+                    LastRefreshID = ?, RowsExtracted = RowsExtracted + ?, ModifiedDate = GETDATE()
+                WHERE SourceName = ?
+            """, watermark_type, watermark_value, key_type, key_value, refresh_id, rows, source_name)
         
+        logger.info(f"Extracting {target} from {source} "
+                    f"({'full' if full else 'incremental'} on {watermark}, {key})")
         try:
-            df = pd.read_csv(file_path)
-            logger.info(f"Loaded {len(df)} entity records from {file_path}")
+            results = self._load_chunks(f"Database - {source_name}", target, source, open_source, checkpoint)
+        except Exception:
+            self._end_extract(source_name, 'Failed')
+            raise
+        self._end_extract(source_name, 'Completed')
+        self._invalidate_key_indexes(target)
+        return results
+    
+    def _read_source_batches(self, extract, columns, mapping, position, batch_size):
+        """Yield (batch, position) pairs of an extract read through a server-side cursor
+        
+        The position of a batch is the watermark and key of its last row. Rows whose
+        watermark is NULL are never read.
+        """
+        spec = LOAD_TARGETS[extract['target']]
+        table, watermark, key = extract['table'], extract['watermark'], extract['key']
+        select_list = ', '.join(f"{mapping[c]} AS {c}" for c in columns)
+        
+        engine = self._source_engine(extract.get('url') or SOURCE_DATABASE_URL)
+        with engine.connect() as source:
+            # Rows changed while the extract runs are left for the next one
+            high = source.execute(text(f"SELECT MAX({watermark}) FROM {table}")).scalar()
+            if high is None:
+                return
             
-            # Data transformation
-            df['CreatedDate'] = datetime.now()
-            df['ModifiedDate'] = datetime.now()
-            df['IsActive'] = df.get('IsActive', 1)
+            query = (f"SELECT {select_list}, {watermark} AS ExtractWatermark, {key} AS ExtractKey "
+                     f"FROM {table} WHERE {watermark} <= :high")
+            params = {'high': high}
+            if position is not None:
+                query += (f" AND ({watermark} > :watermark"
+                          f" OR ({watermark} = :watermark AND {key} > :key))")
+                params.update(watermark=position[0], key=position[1])
+            query += f" ORDER BY {watermark}, {key}"
             
-            df.to_sql('Entities', self.engine, schema='cred', 
-                     if_exists='append', index=False, method='multi')
+            result = source.execution_options(stream_results=True, max_row_buffer=batch_size).execute(
+                text(query), params
+            )
+            offset = 0
+            for rows in result.partitions(batch_size):
+                batch = pd.DataFrame([tuple(row[:len(columns)]) for row in rows], columns=columns,
+                                     index=pd.RangeIndex(offset, offset + len(rows)))
+                offset += len(rows)
+                for column in columns:
+                    if spec['columns'][column] not in ('date', 'datetime'):
+                        batch[column] = batch[column].astype(spec['columns'][column])
+                yield self._parse_dates(batch, spec), (rows[-1][-2], rows[-1][-1])
+    
+    def _source_engine(self, url):
+        """Return the pooled engine of a source database, creating it on first use"""
+        if not url:
+            raise ValueError("No source database URL: set SOURCE_DATABASE_URL or the extract's url")
+        with self._source_engine_lock:
+            if url not in self._source_engines:
+                self._source_engines[url] = create_engine(url, pool_pre_ping=True)
+            return self._source_engines[url]
+    
+    def _begin_extract(self, source_name, extract, full):
+        """Mark an extract Running and return its stored (watermark, key) position
+        
+        The position is discarded, and the extract starts from the first row, when
+        full is set or the extract's table, watermark or key column has changed.
+        """
+        definition = (extract['target'], extract['table'], extract['watermark'], extract['key'])
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TargetTable, SourceTable, WatermarkColumn, KeyColumn,
+                       WatermarkType, WatermarkValue, KeyType, KeyValue
+                FROM cred.SourceExtractWatermark
+                WHERE SourceName = ?
+            """, source_name)
+            row = cursor.fetchone()
             
-            records_inserted = len(df)
-            self.log_refresh_end(refresh_id, 'Completed', len(df), 
-                               records_inserted, 0, 0)
-            logger.info(f"Successfully loaded {records_inserted} entity records")
+            position = None
+            if row is None:
+                cursor.execute("""
+                    INSERT INTO cred.SourceExtractWatermark
+                    (SourceName, TargetTable, SourceTable, WatermarkColumn, KeyColumn)
+                    VALUES (?, ?, ?, ?, ?)
+                """, source_name, *definition)
+            elif full or tuple(row[:4]) != definition:
+                if not full:
+                    logger.warning(f"Extract {source_name} has changed; extracting every row")
+            elif row[5] is not None:
+                position = (_decode_position(row[4], row[5]), _decode_position(row[6], row[7]))
             
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Error loading entities: {error_msg}")
-            self.log_refresh_end(refresh_id, 'Failed', 0, 0, 0, 0, error_msg)
-            raise
+            cursor.execute("""
+                UPDATE cred.SourceExtractWatermark
+                SET TargetTable = ?, SourceTable = ?, WatermarkColumn = ?, KeyColumn = ?,
+                    WatermarkType = ?, WatermarkValue = ?, KeyType = ?, KeyValue = ?,
+                    ExtractStatus = 'Running', RowsExtracted = 0,
+                    LastExtractStart = GETDATE(), LastExtractEnd = NULL, ModifiedDate = GETDATE()
+                WHERE SourceName = ?
+            """, *definition,
+                *(_encode_position(position[0]) if position else (None, None)),
+                *(_encode_position(position[1]) if position else (None, None)),
+                source_name)
+            conn.commit()
+        
+        if position is not None:
+            logger.info(f"Resuming extract {source_name} after {extract['watermark']} = {position[0]}, "
+                        f"{extract['key']} = {position[1]}")
+        return position
     
-    def load_from_source_database(self, source_connection_string, query):
-        """Load data from another database source"""
+    def _end_extract(self, source_name, status):
+        """Record the outcome of an extract; its position is already committed"""
         try:
-            source_engine = create_engine(source_connection_string)
-            df = pd.read_sql(query, source_engine)
-            logger.info(f"Loaded {len(df)} records from source database")
-            return df
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE cred.SourceExtractWatermark
+                    SET ExtractStatus = ?, LastExtractEnd = GETDATE(), ModifiedDate = GETDATE()
+                    WHERE SourceName = ?
+                """, status, source_name)
+                conn.commit()
         except Exception as e:
-            logger.error(f"Error loading from source database: {str(e)}")
-            raise
+            logger.error(f"Failed to log end of extract {source_name}: {str(e)}")
+    
+    def _loaders(self):
+        """CSV loader of each target"""
+        return {
+            'Entities': self.load_entities_from_csv,
+            'Providers': self.load_providers_from_csv,
+            'Credentials': self.load_credentials_from_csv
+        }
     
-    def run_daily_refresh(self):
-        """Execute daily data refresh process"""
+    def load_target(self, target, paths):
+        """Load every file of one target and refresh the key indexes built from it
+        
+        Used by the refresh orchestrator, which runs each target as its own step
+        once the targets in LOAD_DEPENDENCIES have loaded. Missing files are
+        skipped. Returns the load results keyed by file path.
+        """
+        loaders = self._loaders()
+        results = {}
+        for path in paths:
+            if not os.path.exists(path):
+                logger.warning(f"Source file not found, skipping: {path}")
+                continue
+            logger.info(f"Loading {target} from {path}")
+            results[path] = loaders[target](path)
+        self._invalidate_key_indexes(target)
+        return results
+    
+    def run_daily_refresh(self, sources=None, max_workers=INGESTION_MAX_WORKERS):
+        """Execute daily data refresh process
+        
+        Loads every source file in dependency order (LOAD_DEPENDENCIES): a target
+        starts once the targets it references have finished, and files whose
+        dependencies are met load concurrently. Targets that depend on a failed
+        load are skipped. Returns the load results keyed by file path.
+        """
         logger.info("Starting daily data refresh...")
-        refresh_start = datetime.now()
+        sources = sources if sources is not None else INGESTION_SOURCES
+        with self._key_index_lock:
+            self._key_indexes.clear()
+        loaders = self._loaders()
+        
+        files = {}
+        for target, paths in sources.items():
+            existing = [path for path in paths if os.path.exists(path)]
+            for path in set(paths) - set(existing):
+                logger.warning(f"Source file not found, skipping: {path}")
+            if existing:
+                files[target] = existing
+        
+        results = {}
+        failed = set()
+        done = {target for target in LOAD_DEPENDENCIES if target not in files}
+        remaining = {target: len(paths) for target, paths in files.items()}
+        pending = set(files)
         
         try:
-            # In production, this would connect to your source systems
-            # For demonstration, showing the structure
-            
-            # Example: Load from source database
-            # source_query = "SELECT * FROM SourceProviders WHERE LastModifiedDate >= DATEADD(DAY, -1, GETDATE())"
-            # providers_df = self.load_from_source_database(source_conn, source_query)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                running = {}
+                
+                def submit_ready():
+                    for target in sorted(pending):
+                        dependencies = LOAD_DEPENDENCIES[target]
+                        if any(dep in failed for dep in dependencies):
+                            logger.error(f"Skipping {target}: a dependency failed to load")
+                            pending.discard(target)
+                            failed.add(target)
+                        elif all(dep in done for dep in dependencies):
+                            pending.discard(target)
+                            for path in files[target]:
+                                logger.info(f"Loading {target} from {path}")
+                                running[executor.submit(loaders[target], path)] = (target, path)
+                
+                submit_ready()
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        target, path = running.pop(future)
+                        try:
+                            results[path] = future.result()
+                        except Exception as e:
+                            logger.error(f"Load of {path} failed: {str(e)}")
+                            failed.add(target)
+                            continue
+                        remaining[target] -= 1
+                        if remaining[target] == 0 and target not in failed:
+                            self._invalidate_key_indexes(target)
+                            done.add(target)
+                    submit_ready()
             
-            # Example: Load from CSV files
-            # self.load_providers_from_csv('data/providers.csv')
-            # self.load_credentials_from_csv('data/credentials.csv')
-            # self.load_entities_from_csv('data/entities.csv')
+            if failed:
+                raise RuntimeError(f"Data refresh failed for: {', '.join(sorted(failed))}")
             
             logger.info("Daily data refresh completed successfully")
+            return results
             
         except Exception as e:
             logger.error(f"Daily data refresh failed: {str(e)}")
@@ -229,22 +812,28 @@ class DataIngestion:
 
 def main():
     """Main execution function"""
+    start_metrics_export('data_ingestion')
     try:
-        ingestion = DataIngestion()
-        
-        # Example usage - uncomment and modify as needed
-        # ingestion.load_providers_from_csv('data/providers.csv')
-        # ingestion.load_credentials_from_csv('data/credentials.csv')
-        # ingestion.load_entities_from_csv('data/entities.csv')
-        
-        # Or run daily refresh
-        # ingestion.run_daily_refresh()
-        
-        logger.info("Data ingestion process completed")
+        with DataIngestion():
+            
+            # Example usage - bind the ingestion ("as ingestion"), then uncomment and modify as needed
+            # ingestion.load_providers_from_csv('data/providers.csv')
+            # ingestion.load_credentials_from_csv('data/credentials.csv')
+            # ingestion.load_entities_from_csv('data/entities.csv')
+            
+            # Or extract the rows changed since the last extract of a source table
+            # ingestion.load_from_source_database('hr_providers')
+            
+            # Or run daily refresh
+            # ingestion.run_daily_refresh()
+            
+            logger.info("Data ingestion process completed")
         
     except Exception as e:
         logger.error(f"Data ingestion process failed: {str(e)}")
         raise
+    finally:
+        dispose_engine()
 
 
 if __name__ == "__main__":
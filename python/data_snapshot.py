@@ -0,0 +1,374 @@
+"""
+Data Snapshot
+Versioned Arrow snapshot of Providers, Credentials and Entities
+After each refresh the three core tables are published as Arrow IPC files under
+SNAPSHOT_PATH/v<version>/, with low-cardinality columns dictionary-encoded, and
+the CURRENT file is switched to the new version. Readers memory-map the files
+of the current version, so loading a table takes milliseconds and, when
+SNAPSHOT_COMPRESSION is empty, copies none of its buffers.
+
+Each version after the first is built from the previous one: only rows whose
+ModifiedDate (or CreatedDate) is at or after the previous version's watermark
+are read from SQL Server, and rows whose key no longer exists are dropped.
+
+SSN is not written to the snapshot; it stays in SQL Server.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import text
+
+from db import dispose_engine, get_engine
+from telemetry import configure_logging, start_metrics_export, SNAPSHOT_CHANGED_ROWS, SNAPSHOT_ROWS
+from config import SNAPSHOT_PATH, SNAPSHOT_KEEP_VERSIONS, SNAPSHOT_COMPRESSION
+
+# Configure logging
+configure_logging('data_snapshot.log')
+logger = logging.getLogger(__name__)
+
+# Rows read from SQL Server per chunk when a table is read in full
+SNAPSHOT_READ_CHUNK_SIZE = 100000
+
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+
+# Explicit schemas so every version has the same column types, whatever the rows hold
+SNAPSHOT_SCHEMAS = {
+    'Providers': pa.schema([
+        ('ProviderID', pa.int32()),
+        ('NPI', pa.string()),
+        ('FirstName', pa.string()),
+        ('LastName', pa.string()),
+        ('MiddleName', pa.string()),
+        ('DateOfBirth', pa.date32()),
+        ('Specialty', pa.string()),
+        ('SubSpecialty', pa.string()),
+        ('PhoneNumber', pa.string()),
+        ('EmailAddress', pa.string()),
+        ('AddressLine1', pa.string()),
+        ('AddressLine2', pa.string()),
+        ('City', pa.string()),
+        ('State', pa.string()),
+        ('ZipCode', pa.string()),
+        ('EntityID', pa.int32()),
+        ('Status', pa.string()),
+        ('CreatedDate', pa.timestamp('us')),
+        ('ModifiedDate', pa.timestamp('us')),
+        ('LastValidatedDate', pa.timestamp('us')),
+        ('IsActive', pa.bool_()),
+    ]),
+    'Credentials': pa.schema([
+        ('CredentialID', pa.int32()),
+        ('ProviderID', pa.int32()),
+        ('CredentialType', pa.string()),
+        ('CredentialNumber', pa.string()),
+        ('IssuingOrganization', pa.string()),
+        ('IssueDate', pa.date32()),
+        ('ExpirationDate', pa.date32()),
+        ('StateIssued', pa.string()),
+        ('Status', pa.string()),
+        ('IsPrimary', pa.bool_()),
+        ('VerificationDate', pa.timestamp('us')),
+        ('VerifiedBy', pa.string()),
+        ('CreatedDate', pa.timestamp('us')),
+        ('ModifiedDate', pa.timestamp('us')),
+    ]),
+    'Entities': pa.schema([
+        ('EntityID', pa.int32()),
+        ('EntityName', pa.string()),
+        ('EntityType', pa.string()),
+        ('TaxID', pa.string()),
+        ('NPI', pa.string()),
+        ('AddressLine1', pa.string()),
+        ('AddressLine2', pa.string()),
+        ('City', pa.string()),
+        ('State', pa.string()),
+        ('ZipCode', pa.string()),
+        ('PhoneNumber', pa.string()),
+        ('EmailAddress', pa.string()),
+        ('Status', pa.string()),
+        ('AccreditationStatus', pa.string()),
+        ('CreatedDate', pa.timestamp('us')),
+        ('ModifiedDate', pa.timestamp('us')),
+        ('IsActive', pa.bool_()),
+    ]),
+}
+
+SNAPSHOT_KEYS = {'Providers': 'ProviderID', 'Credentials': 'CredentialID', 'Entities': 'EntityID'}
+
+# Columns with few distinct values, stored once per file and referenced by index
+DICTIONARY_COLUMNS = {
+    'Providers': ['Specialty', 'SubSpecialty', 'City', 'State', 'Status'],
+    'Credentials': ['CredentialType', 'IssuingOrganization', 'StateIssued', 'Status', 'VerifiedBy'],
+    'Entities': ['EntityType', 'City', 'State', 'Status', 'AccreditationStatus'],
+}
+
+
+class DataSnapshot:
+    """Publishes and prunes versions of the snapshot under one directory"""
+
+    def __init__(self, path=SNAPSHOT_PATH, compression=SNAPSHOT_COMPRESSION, engine=None):
+        self.path = path
+        self.compression = compression or None
+        self.engine = engine or get_engine()
+
+    def publish(self, full=False, keep_versions=SNAPSHOT_KEEP_VERSIONS):
+        """Write a new version of the snapshot and make it current
+
+        The new version is built from the current one unless full is set, the
+        snapshot is empty, or the current version cannot be read. Returns the
+        new version's manifest.
+        """
+        try:
+            start_time = time.perf_counter()
+            previous = None if full else self._previous_manifest()
+            version = max(list_versions(self.path), default=0) + 1
+            version_dir = os.path.join(self.path, version_name(version))
+            temp_dir = version_dir + '.tmp'
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+
+            manifest = {
+                'version': version,
+                'created': datetime.now().isoformat(),
+                'base_version': previous['version'] if previous else None,
+                'compression': self.compression,
+                'tables': {}
+            }
+            for table_name in SNAPSHOT_SCHEMAS:
+                if previous and table_name in previous['tables']:
+                    table, changed = self._update_table(table_name, previous)
+                else:
+                    table = self._read_table(table_name)
+                    changed = table.num_rows
+                manifest['tables'][table_name] = self._write_table(temp_dir, table_name, table)
+                manifest['tables'][table_name]['changed_rows'] = changed
+                SNAPSHOT_ROWS.set(table.num_rows, table=table_name)
+                SNAPSHOT_CHANGED_ROWS.set(changed, table=table_name)
+                logger.info(f"  {table_name}: {table.num_rows} rows ({changed} read from SQL Server)")
+
+            manifest['build_seconds'] = round(time.perf_counter() - start_time, 3)
+            with open(os.path.join(temp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+
+            # A version directory is complete before CURRENT points to it
+            os.replace(temp_dir, version_dir)
+            self._set_current(version)
+            logger.info(f"Published snapshot version {version} in {manifest['build_seconds']:.2f} seconds"
+                        f" ({'incremental from version ' + str(previous['version']) if previous else 'full'})")
+
+            self.prune(keep_versions)
+            return manifest
+
+        except Exception as e:
+            logger.error(f"Failed to publish data snapshot: {str(e)}")
+            raise
+
+    def _previous_manifest(self):
+        """Manifest of the current version, or None when a full build is needed"""
+        version = current_version(self.path)
+        if version is None:
+            return None
+        try:
+            return read_manifest(version, self.path)
+        except Exception as e:
+            logger.warning(f"Rebuilding the snapshot in full; version {version} is unreadable: {str(e)}")
+            return None
+
+    def _read_table(self, table_name, since=None):
+        """Rows of a table as an Arrow table, optionally only those changed since a watermark"""
+        schema = SNAPSHOT_SCHEMAS[table_name]
+        query = f"SELECT {', '.join(schema.names)} FROM cred.{table_name}"
+        params = {}
+        if since is not None:
+            query += " WHERE COALESCE(ModifiedDate, CreatedDate) >= :since"
+            params['since'] = datetime.fromisoformat(since)
+        query += f" ORDER BY {SNAPSHOT_KEYS[table_name]}"
+
+        chunks = [to_arrow(chunk, table_name)
+                  for chunk in pd.read_sql(text(query), self.engine, params=params,
+                                           chunksize=SNAPSHOT_READ_CHUNK_SIZE)]
+        return pa.concat_tables(chunks) if chunks else schema.empty_table()
+
+    def _update_table(self, table_name, previous):
+        """The previous version of a table with changed rows replaced and deleted rows dropped
+
+        The MERGE that loads each table sets ModifiedDate on every insert and
+        changed update, so rows at or after the previous watermark cover every
+        change since. Rows are read with >=, so a row written in the same tick
+        as the watermark is read again rather than missed.
+        """
+        key = SNAPSHOT_KEYS[table_name]
+        schema = SNAPSHOT_SCHEMAS[table_name]
+        changed = self._read_table(table_name, since=previous['tables'][table_name]['watermark'])
+
+        with self.engine.connect() as conn:
+            current_keys = pa.array(
+                pd.read_sql(text(f"SELECT {key} FROM cred.{table_name}"), conn)[key].astype('int64'),
+                type=pa.int32()
+            )
+
+        # Dictionaries differ between versions; decode before combining
+        base = load_table(table_name, previous['version'], self.path).cast(schema)
+        keep = pc.and_(pc.invert(pc.is_in(base[key], value_set=changed[key].combine_chunks())),
+                       pc.is_in(base[key], value_set=current_keys))
+        table = pa.concat_tables([base.filter(keep), changed])
+        table = table.take(pc.sort_indices(table, sort_keys=[(key, 'ascending')]))
+        return table, changed.num_rows
+
+    def _write_table(self, directory, table_name, table):
+        """Write one table as an Arrow IPC file and return its manifest entry"""
+        table = encode_dictionaries(table.combine_chunks(), table_name)
+        path = os.path.join(directory, table_file_name(table_name))
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+
+        # Watermark: the latest change this version holds
+        modified = pc.coalesce(table['ModifiedDate'], table['CreatedDate'])
+        watermark = pc.max(modified).as_py() if table.num_rows else None
+        return {
+            'file': table_file_name(table_name),
+            'rows': table.num_rows,
+            'bytes': os.path.getsize(path),
+            'watermark': watermark.isoformat() if watermark else None
+        }
+
+    def _set_current(self, version):
+        temp_path = os.path.join(self.path, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as current_file:
+            current_file.write(version_name(version))
+        os.replace(temp_path, os.path.join(self.path, CURRENT_FILE))
+
+    def prune(self, keep_versions=SNAPSHOT_KEEP_VERSIONS):
+        """Delete all but the latest keep_versions versions
+
+        A reader that mapped a deleted version keeps its data on POSIX systems;
+        on Windows the files are in use and the version is left for the next
+        prune.
+        """
+        current = current_version(self.path)
+        versions = sorted(list_versions(self.path))
+        for version in versions[:-keep_versions] if keep_versions > 0 else []:
+            if version == current:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.path, version_name(version)))
+                logger.info(f"Deleted snapshot version {version}")
+            except OSError as e:
+                logger.warning(f"Failed to delete snapshot version {version}: {str(e)}")
+
+
+def to_arrow(df, table_name):
+    """Convert rows read from SQL Server to the snapshot schema of a table"""
+    schema = SNAPSHOT_SCHEMAS[table_name]
+    df = df.copy()
+    for field in schema:
+        if field.name not in df.columns:
+            df[field.name] = None
+        if pa.types.is_date(field.type):
+            df[field.name] = pd.to_datetime(df[field.name], errors='coerce').dt.date
+        elif pa.types.is_timestamp(field.type):
+            df[field.name] = pd.to_datetime(df[field.name], errors='coerce')
+        elif pa.types.is_integer(field.type):
+            df[field.name] = pd.to_numeric(df[field.name], errors='coerce').astype('Int64')
+        elif pa.types.is_boolean(field.type):
+            df[field.name] = df[field.name].astype('boolean')
+    # Without pandas metadata every version reads back with the same dtypes
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False).replace_schema_metadata()
+
+
+def encode_dictionaries(table, table_name):
+    """Dictionary-encode a table's low-cardinality columns"""
+    for column in DICTIONARY_COLUMNS[table_name]:
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, pc.dictionary_encode(table[column]))
+    return table
+
+
+def version_name(version):
+    return f"v{version:06d}"
+
+
+def table_file_name(table_name):
+    return f"{table_name.lower()}.arrow"
+
+
+def list_versions(path=SNAPSHOT_PATH):
+    """Numbers of the complete versions under a snapshot directory"""
+    if not os.path.isdir(path):
+        return []
+    return [int(name[1:]) for name in os.listdir(path)
+            if name.startswith('v') and name[1:].isdigit()
+            and os.path.isdir(os.path.join(path, name))]
+
+
+def current_version(path=SNAPSHOT_PATH):
+    """Number of the current version, or None before the first is published"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding='utf-8') as current_file:
+            return int(current_file.read().strip()[1:])
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(version=None, path=SNAPSHOT_PATH):
+    """Manifest of a version (default: the current one)"""
+    version = current_version(path) if version is None else version
+    if version is None:
+        raise FileNotFoundError(f"No data snapshot has been published under {path}")
+    with open(os.path.join(path, version_name(version), MANIFEST_FILE), encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def load_table(table_name, version=None, path=SNAPSHOT_PATH, columns=None):
+    """Memory-map one table of a version (default: the current one) as an Arrow table
+
+    The table's buffers point into the mapped file, so nothing is read until a
+    column is used. Dictionary-encoded columns stay encoded.
+    """
+    if table_name not in SNAPSHOT_SCHEMAS:
+        raise ValueError(f"Unknown snapshot table {table_name}; expected one of {', '.join(SNAPSHOT_SCHEMAS)}")
+    version = current_version(path) if version is None else version
+    if version is None:
+        raise FileNotFoundError(f"No data snapshot has been published under {path}")
+
+    source = pa.memory_map(os.path.join(path, version_name(version), table_file_name(table_name)), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_frame(table_name, version=None, path=SNAPSHOT_PATH, columns=None):
+    """One table of a version as a DataFrame; dictionary columns become categoricals"""
+    return load_table(table_name, version, path, columns).to_pandas()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Publish an Arrow snapshot of the core tables')
+    parser.add_argument('--full', action='store_true',
+                        help='Rebuild every table from SQL Server instead of the current version')
+    parser.add_argument('--keep', type=int, default=SNAPSHOT_KEEP_VERSIONS,
+                        help='Versions kept after publishing')
+    args = parser.parse_args()
+    start_metrics_export('data_snapshot')
+
+    try:
+        manifest = DataSnapshot().publish(full=args.full, keep_versions=args.keep)
+        logger.info(f"Current snapshot version: {manifest['version']}")
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
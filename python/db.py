@@ -0,0 +1,172 @@
+"""
+Database Connection Pool
+Shared SQLAlchemy engine and pooled pyodbc connections for all scripts
+One pool per process, built from config.CONNECTION_STRING
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
+
+from telemetry import DB_CONNECTION_WAIT_SECONDS, DB_ROUND_TRIPS, DB_ROUND_TRIP_SECONDS
+from config import (
+    CONNECTION_STRING, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_LOGIN_TIMEOUT, DB_QUERY_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide pooled engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _create_engine()
+    return _engine
+
+
+def _create_engine():
+    """Build the pooled engine with pre-ping, recycling and timeouts"""
+    try:
+        engine = create_engine(
+            URL.create("mssql+pyodbc", query={"odbc_connect": CONNECTION_STRING}),
+            fast_executemany=True,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_POOL_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+            connect_args={'timeout': DB_LOGIN_TIMEOUT}
+        )
+
+        @event.listens_for(engine, 'connect')
+        def set_query_timeout(dbapi_connection, connection_record):
+            dbapi_connection.timeout = DB_QUERY_TIMEOUT
+
+        # Statements run through SQLAlchemy (pandas reads, the rule engine); raw
+        # connections are timed by InstrumentedCursor. The start time lives on the
+        # statement's execution context, so a failed statement leaves nothing behind
+        @event.listens_for(engine, 'before_cursor_execute')
+        def start_round_trip(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context.round_trip_started = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def end_round_trip(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, 'round_trip_started', None)
+            if started is not None:
+                _record_round_trip('executemany' if executemany else 'execute', started)
+
+        # after_cursor_execute does not fire when the statement raises
+        @event.listens_for(engine, 'handle_error')
+        def end_failed_round_trip(exception_context):
+            context = exception_context.execution_context
+            started = getattr(context, 'round_trip_started', None)
+            if started is not None:
+                _record_round_trip('executemany' if context.executemany else 'execute', started)
+
+        logger.info(f"Database connection pool created (size {DB_POOL_SIZE}, overflow {DB_POOL_MAX_OVERFLOW})")
+        return engine
+    except Exception as e:
+        logger.error(f"Failed to create database connection pool: {str(e)}")
+        raise
+
+
+def raw_connection():
+    """Borrow a pooled pyodbc connection whose cursors record their round trips
+
+    The caller closes it to return it to the pool.
+    """
+    started = time.perf_counter()
+    conn = get_engine().raw_connection()
+    DB_CONNECTION_WAIT_SECONDS.observe(time.perf_counter() - started)
+    return InstrumentedConnection(conn)
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled pyodbc connection
+
+    Callers commit their own work; anything left uncommitted is rolled back when
+    the connection is returned to the pool.
+    """
+    conn = raw_connection()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _record_round_trip(operation, started):
+    DB_ROUND_TRIPS.inc(operation=operation)
+    DB_ROUND_TRIP_SECONDS.observe(time.perf_counter() - started, operation=operation)
+
+
+class InstrumentedConnection:
+    """Pooled connection proxy handing out InstrumentedCursors"""
+
+    def __init__(self, conn):
+        object.__setattr__(self, '_conn', conn)
+
+    def cursor(self):
+        return InstrumentedCursor(self._conn.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class InstrumentedCursor:
+    """pyodbc cursor proxy counting and timing execute and executemany"""
+
+    def __init__(self, cursor):
+        object.__setattr__(self, '_cursor', cursor)
+
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(*args)
+        finally:
+            _record_round_trip('execute', started)
+        return self
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(*args)
+        finally:
+            _record_round_trip('executemany', started)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+
+def dispose_engine():
+    """Close every pooled connection; the next use builds a new pool"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            logger.info("Database connection pool disposed")
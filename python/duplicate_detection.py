@@ -0,0 +1,255 @@
+"""
+Duplicate Detection
+Finds providers and entities that are probably the same real-world record
+loaded under different identifiers
+The pandas counterpart of cred.sp_RefreshDuplicateCandidates, used by the
+in-process rule engine (DUP001 - DUP004). Active records are grouped by
+blocking keys and only records sharing a key are compared, so the work
+follows the block sizes rather than the square of the table size. Each pair
+is scored 0-100 from the fields that agree. The keys, weights and exclusions
+must stay in step with the procedure.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import DUPLICATE_MAX_BLOCK_SIZE, DUPLICATE_MIN_SCORE
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_COLUMNS = ['EntityID', 'CandidateEntityID', 'MatchScore', 'MatchedOn']
+
+# Block keys are NVARCHAR(400) in the procedure
+MAX_BLOCK_KEY_LENGTH = 400
+
+# SQL Server SOUNDEX digits. H and W are left out: they do not separate two
+# letters with the same code, while vowels (code 0) do
+_SOUNDEX_CODES = {
+    letter: str(digit)
+    for digit, letters in enumerate(['AEIOUY', 'BFPV', 'CGJKQSXZ', 'DT', 'L', 'MN', 'R'])
+    for letter in letters
+}
+
+# (label, key column, points, phonetic column, phonetic points): a field scores
+# its points when the keys agree, otherwise its phonetic points when the
+# SOUNDEX codes agree
+PROVIDER_WEIGHTS = [
+    ('LastName', 'LastKey', 30, 'LastSound', 20),
+    ('FirstName', 'FirstKey', 20, 'FirstSound', 10),
+    ('DateOfBirth', 'DateOfBirth', 30, None, 0),
+    ('SSN', 'SSNKey', 40, None, 0),
+    ('ZipCode', 'Zip5', 10, None, 0),
+    ('PhoneNumber', 'PhoneKey', 10, None, 0),
+    ('EmailAddress', 'EmailKey', 15, None, 0),
+]
+
+ENTITY_WEIGHTS = [
+    ('EntityName', 'NameKey', 40, 'NameSound', 20),
+    ('ZipCode', 'Zip5', 15, None, 0),
+    ('AddressLine1', 'AddressKey', 25, None, 0),
+    ('PhoneNumber', 'PhoneKey', 20, None, 0),
+    ('EmailAddress', 'EmailKey', 10, None, 0),
+]
+
+
+def soundex(value):
+    """SQL Server SOUNDEX code of value; None when it has no letters"""
+    letters = [c for c in str(value).upper() if 'A' <= c <= 'Z']
+    if not letters:
+        return None
+    code = letters[0]
+    last = _SOUNDEX_CODES.get(letters[0])
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter)
+        if digit is None:
+            continue
+        if digit != '0' and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        last = digit
+    return code.ljust(4, '0')
+
+
+def _text(s):
+    return s.astype('string')
+
+
+def _nonblank(s):
+    return s.mask(s == '')
+
+
+def _compact(s):
+    """Upper-cased without spaces or punctuation, as the procedure's TRANSLATE/REPLACE"""
+    return _nonblank(_text(s).str.upper().str.replace(r"[.,'\-&/# ]", '', regex=True))
+
+
+def _digits_key(s, characters):
+    return _nonblank(_text(s).str.replace(f"[{characters} ]", '', regex=True))
+
+
+def _zip5(s):
+    return _nonblank(_text(s).str.replace('-', '', regex=False).str[:5])
+
+
+def _email_key(s):
+    return _nonblank(_text(s).str.strip().str.lower())
+
+
+def _sound(s):
+    values = s.dropna().unique()
+    codes = pd.Series([soundex(v) for v in values], index=values, dtype='string')
+    return pd.Series(codes.reindex(s).array, index=s.index, dtype='string')
+
+
+def _is_active(df):
+    return (df['IsActive'] == 1).fillna(False).astype(bool)
+
+
+def provider_keys(providers):
+    """Normalized comparison keys of the active providers, indexed by ProviderID"""
+    p = providers[_is_active(providers)]
+    ssn = _nonblank(_text(p['SSN']).str.replace('-', '', regex=False))
+    keys = pd.DataFrame({
+        'NPI': _nonblank(_text(p['NPI']).str.strip().str.upper()),
+        'LastKey': _compact(p['LastName']),
+        'FirstKey': _compact(p['FirstName']),
+        'DateOfBirth': pd.to_datetime(p['DateOfBirth']).dt.normalize(),
+        'SSNKey': ssn.mask(ssn == '000000000'),
+        'Zip5': _zip5(p['ZipCode']),
+        'PhoneKey': _digits_key(p['PhoneNumber'], r'()\-.+'),
+        'EmailKey': _email_key(p['EmailAddress']),
+    })
+    keys['LastSound'] = _sound(keys['LastKey'])
+    keys['FirstSound'] = _sound(keys['FirstKey'])
+    keys.index = p['ProviderID'].to_numpy()
+    return keys
+
+
+def entity_keys(entities):
+    """Normalized comparison keys of the active entities, indexed by EntityID"""
+    e = entities[_is_active(entities)]
+    keys = pd.DataFrame({
+        'NPI': _nonblank(_text(e['NPI']).str.strip().str.upper()),
+        'TaxID': _nonblank(_text(e['TaxID']).str.strip().str.upper()),
+        'NameKey': _compact(e['EntityName']),
+        'Zip5': _zip5(e['ZipCode']),
+        'AddressKey': _compact(e['AddressLine1']),
+        'PhoneKey': _digits_key(e['PhoneNumber'], r'()\-.+'),
+        'EmailKey': _email_key(e['EmailAddress']),
+    })
+    keys['NameSound'] = _sound(keys['NameKey'])
+    keys.index = e['EntityID'].to_numpy()
+    return keys
+
+
+def _provider_blocks(keys):
+    dob = _text(keys['DateOfBirth'].dt.strftime('%Y%m%d'))
+    return [
+        'S|' + keys['LastSound'] + '|' + dob,
+        'Z|' + keys['Zip5'] + '|' + keys['LastKey'] + '|' + keys['FirstKey'].str[:1],
+        'D|' + dob + '|' + keys['FirstKey'],
+        'N|' + keys['SSNKey'],
+    ]
+
+
+def _entity_blocks(keys):
+    return [
+        'Z|' + keys['Zip5'] + '|' + keys['NameSound'],
+        'N|' + keys['NameKey'],
+        'A|' + keys['Zip5'] + '|' + keys['AddressKey'],
+        'P|' + keys['PhoneKey'],
+    ]
+
+
+def candidate_pairs(blocks, max_block_size=DUPLICATE_MAX_BLOCK_SIZE):
+    """
+    Pairs of record IDs sharing a block key, lower ID first, each pair once.
+    blocks is a list of Series of block keys indexed by record ID (NULL = no
+    block); blocks of one record or of more than max_block_size are skipped.
+    """
+    members = pd.concat([
+        pd.DataFrame({'BlockKey': block.str[:MAX_BLOCK_KEY_LENGTH].to_numpy(), 'EntityID': block.index})
+        for block in blocks
+    ], ignore_index=True).dropna(subset=['BlockKey'])
+    sizes = members.groupby('BlockKey')['EntityID'].transform('size')
+    skipped = members.loc[sizes > max_block_size, 'BlockKey'].nunique()
+    if skipped:
+        logger.info(f"Skipped {skipped} duplicate blocks of more than {max_block_size} records")
+    members = members[(sizes > 1) & (sizes <= max_block_size)]
+
+    pairs = members.merge(members, on='BlockKey', suffixes=('1', '2'))
+    pairs = pairs.loc[pairs['EntityID1'] < pairs['EntityID2'], ['EntityID1', 'EntityID2']]
+    return pairs.drop_duplicates().reset_index(drop=True)
+
+
+def _agree(a, b):
+    """Equality that is False when either side is NULL, as in SQL"""
+    return (a == b).fillna(False).to_numpy(dtype=bool)
+
+
+def score_pairs(keys, pairs, weights):
+    """MatchScore (capped at 100) and MatchedOn for each pair"""
+    a = keys.loc[pairs['EntityID1']].reset_index(drop=True)
+    b = keys.loc[pairs['EntityID2']].reset_index(drop=True)
+    points = np.zeros(len(pairs), dtype=int)
+    matched_on = pd.Series('', index=range(len(pairs)), dtype=object)
+
+    for label, column, exact_points, sound_column, sound_points in weights:
+        exact = _agree(a[column], b[column])
+        points += np.where(exact, exact_points, 0)
+        matched_on += np.where(exact, ', ' + label, '')
+        if sound_column:
+            sound = ~exact & _agree(a[sound_column], b[sound_column])
+            points += np.where(sound, sound_points, 0)
+            matched_on += np.where(sound, f', {label} (phonetic)', '')
+
+    scored = pairs.reset_index(drop=True).copy()
+    scored['MatchScore'] = np.minimum(points, 100)
+    scored['MatchedOn'] = matched_on.str[2:]
+    return scored, a, b
+
+
+def _candidates(keys, blocks, weights, exclude, max_block_size, min_score):
+    if keys.empty:
+        return pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    pairs = candidate_pairs(blocks, max_block_size)
+    scored, a, b = score_pairs(keys, pairs, weights)
+    # Pairs the exact uniqueness rules already report are left out
+    keep = scored['MatchScore'].to_numpy() >= min_score
+    for column in exclude:
+        keep &= ~_agree(a[column], b[column])
+    scored = scored[keep]
+
+    forward = scored.rename(columns={'EntityID1': 'EntityID', 'EntityID2': 'CandidateEntityID'})
+    backward = scored.rename(columns={'EntityID2': 'EntityID', 'EntityID1': 'CandidateEntityID'})
+    return pd.concat([forward, backward], ignore_index=True)[CANDIDATE_COLUMNS]
+
+
+def find_provider_duplicates(providers, max_block_size=DUPLICATE_MAX_BLOCK_SIZE, min_score=DUPLICATE_MIN_SCORE):
+    """
+    Scored duplicate candidates among the active providers, one row per
+    direction of each pair. Providers sharing an NPI (PRV013) are left out.
+    """
+    keys = provider_keys(providers)
+    return _candidates(keys, _provider_blocks(keys), PROVIDER_WEIGHTS, ['NPI'], max_block_size, min_score)
+
+
+def find_entity_duplicates(entities, max_block_size=DUPLICATE_MAX_BLOCK_SIZE, min_score=DUPLICATE_MIN_SCORE):
+    """
+    Scored duplicate candidates among the active entities, one row per
+    direction of each pair. Entities sharing a Tax ID or NPI (ENT002, ENT004)
+    are left out.
+    """
+    keys = entity_keys(entities)
+    return _candidates(keys, _entity_blocks(keys), ENTITY_WEIGHTS, ['TaxID', 'NPI'], max_block_size, min_score)
+
+
+def best_candidates(candidates):
+    """Each record's highest-scoring candidate (lowest candidate ID on ties), indexed by EntityID"""
+    best = candidates.sort_values(['EntityID', 'MatchScore', 'CandidateEntityID'], ascending=[True, False, True])
+    best = best.drop_duplicates('EntityID').set_index('EntityID')
+    best['CandidateCount'] = candidates.groupby('EntityID').size()
+    return best
@@ -0,0 +1,256 @@
+"""
+Credential Expiration Index
+Answers "what expires between two dates" from an in-memory copy of
+cred.CredentialExpirationIndex
+The copy is kept sorted by expiration date, so a date range is found with two
+binary searches and costs O(log n) plus the rows in it, and is brought up to
+date from the rows the database index changed since the last read rather than
+reloaded. The database index and cred.CredentialExpiryCalendar are maintained
+by cred.sp_RefreshCredentialExpirationIndex (refresh_expiration_index).
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Boolean, Column, Date, DateTime, Integer, MetaData, String, Table, select
+
+from db import connection, dispose_engine, get_engine
+from telemetry import configure_logging
+from config import (
+    EXPIRATION_INDEX_REFRESH_SECONDS, EXPIRATION_INDEX_RETAIN_REMOVED_DAYS, EXPIRATION_CALENDAR_DAYS
+)
+
+# Configure logging
+configure_logging('expiration_index.log')
+logger = logging.getLogger(__name__)
+
+# Filter arguments of expiring() and calendar() and the columns they match
+FILTER_COLUMNS = {
+    'entity_id': 'EntityID',
+    'provider_id': 'ProviderID',
+    'state': 'StateIssued',
+    'credential_type': 'CredentialType',
+    'status': 'Status',
+}
+
+metadata = MetaData()
+
+expiration_index_table = Table(
+    'CredentialExpirationIndex', metadata,
+    Column('ExpirationDate', Date, primary_key=True),
+    Column('CredentialID', Integer, primary_key=True),
+    Column('ProviderID', Integer),
+    Column('EntityID', Integer),
+    Column('StateIssued', String(2)),
+    Column('CredentialType', String(100)),
+    Column('Status', String(50)),
+    Column('IsPrimary', Boolean),
+    Column('IsRemoved', Boolean),
+    Column('IndexedDate', DateTime),
+    schema='cred'
+)
+
+
+def refresh_expiration_index(full=False):
+    """
+    Run cred.sp_RefreshCredentialExpirationIndex: bring the database index up
+    to date with the credentials changed since its last refresh (every
+    credential with full) and rebuild the expiry calendar
+    """
+    try:
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                EXEC cred.sp_RefreshCredentialExpirationIndex
+                    @Full = ?, @CalendarDays = ?, @RetainRemovedDays = ?
+            """, 1 if full else 0, EXPIRATION_CALENDAR_DAYS, EXPIRATION_INDEX_RETAIN_REMOVED_DAYS)
+            conn.commit()
+        logger.info(f"Credential expiration index refreshed{' in full' if full else ''}")
+    except Exception as e:
+        logger.error(f"Failed to refresh credential expiration index: {str(e)}")
+        raise
+
+
+class IndexSnapshot:
+    """One immutable version of the in-memory index"""
+
+    def __init__(self, rows, watermark, refreshed):
+        self.rows = rows
+        self.dates = rows['ExpirationDate'].to_numpy(dtype='datetime64[D]')
+        self.watermark = watermark
+        self.refreshed = refreshed
+        self.loaded = time.monotonic()
+
+    def age(self):
+        return time.monotonic() - self.loaded
+
+    def between(self, start, end):
+        """Rows expiring from start to end, inclusive"""
+        low = np.searchsorted(self.dates, np.datetime64(start, 'D'), side='left')
+        high = np.searchsorted(self.dates, np.datetime64(end, 'D'), side='right')
+        return self.rows.iloc[low:high]
+
+
+class CredentialExpirationIndex:
+    """In-memory credential expiration index
+
+    Safe to share between threads: a refresh builds a new snapshot and queries
+    read whichever snapshot was current when they started. The copy is brought
+    up to date once it is older than refresh_interval seconds.
+    """
+
+    def __init__(self, engine=None, refresh_interval=EXPIRATION_INDEX_REFRESH_SECONDS):
+        self.engine = engine or get_engine()
+        self.refresh_interval = refresh_interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        """Current snapshot, refreshed when it has expired"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.age() > self.refresh_interval:
+            with self._lock:
+                if self._snapshot is None or self._snapshot.age() > self.refresh_interval:
+                    self._refresh()
+                snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self, full=False):
+        """Bring the copy up to date now (e.g. after refresh_expiration_index)"""
+        with self._lock:
+            self._refresh(full)
+
+    def _refresh(self, full=False):
+        started = time.perf_counter()
+        previous = self._snapshot
+        # Removed rows older than the retention window are gone from the
+        # database, so an older copy cannot learn of them incrementally
+        full = (full or previous is None
+                or datetime.now() - previous.refreshed > timedelta(days=EXPIRATION_INDEX_RETAIN_REMOVED_DAYS))
+        refreshed = datetime.now()
+
+        t = expiration_index_table
+        query = select(t)
+        if full:
+            query = query.where(t.c.IsRemoved == False)  # noqa: E712
+        elif previous.watermark is not None:
+            # Rows of one refresh share their IndexedDate; rereading them is harmless
+            query = query.where(t.c.IndexedDate >= previous.watermark)
+        with self.engine.connect() as conn:
+            changes = pd.read_sql(query, conn)
+        changes['ExpirationDate'] = pd.to_datetime(changes['ExpirationDate'])
+        changes['IsRemoved'] = changes['IsRemoved'].astype(bool)
+
+        if full:
+            rows = changes
+        else:
+            rows = previous.rows[~previous.rows['CredentialID'].isin(changes['CredentialID'])]
+            rows = pd.concat([rows, changes[~changes['IsRemoved']]], ignore_index=True)
+        rows = rows.sort_values(['ExpirationDate', 'CredentialID'], kind='stable').reset_index(drop=True)
+
+        watermark = changes['IndexedDate'].max() if not changes.empty else None
+        if not full and watermark is None:
+            watermark = previous.watermark
+        self._snapshot = IndexSnapshot(rows.drop(columns=['IsRemoved']), watermark, refreshed)
+        logger.info(f"Credential expiration index {'loaded' if full else 'refreshed'}: "
+                    f"{len(changes)} rows read, {len(rows)} indexed, "
+                    f"{time.perf_counter() - started:.2f} seconds")
+
+    def _select(self, start, end, filters):
+        """Rows expiring from start to end whose FILTER_COLUMNS match the filters"""
+        rows = self.snapshot.between(start, end)
+        for name, values in filters.items():
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown expiration index filter: {name}")
+            if values is None:
+                continue
+            column = rows[FILTER_COLUMNS[name]]
+            if isinstance(values, (list, tuple, set)):
+                rows = rows[column.isin(list(values))]
+            else:
+                rows = rows[column == values]
+        return rows
+
+    def expiring(self, start, end, by=None, **filters):
+        """
+        Credentials expiring from start to end (inclusive).
+        filters are FILTER_COLUMNS arguments with a value or a list of values,
+        e.g. status='Active', state=['TX', 'OK']. Returns the rows, or with by
+        (a column or list of columns, e.g. 'EntityID', 'StateIssued',
+        'CredentialType') the CredentialCount of each group.
+        """
+        rows = self._select(start, end, filters)
+        if by is None:
+            return rows
+        return rows.groupby(by, dropna=False).size().rename('CredentialCount').reset_index()
+
+    def calendar(self, start=None, days=EXPIRATION_CALENDAR_DAYS, by=None, **filters):
+        """
+        Forward expiry calendar: credentials expiring on each day from start
+        (today by default) for days days. Every day is listed, with a zero
+        count when nothing expires; with by the counts are per day and group
+        and only non-zero groups are listed.
+        """
+        start = pd.Timestamp(start or date.today()).normalize()
+        rows = self._select(start, start + pd.Timedelta(days=days - 1), filters)
+
+        if by is not None:
+            by = [by] if isinstance(by, str) else list(by)
+            return (rows.groupby(['ExpirationDate'] + by, dropna=False).size()
+                    .rename('CredentialCount').reset_index())
+
+        offsets = (rows['ExpirationDate'] - start).dt.days.to_numpy()
+        return pd.DataFrame({
+            'ExpirationDate': pd.date_range(start, periods=days, freq='D'),
+            'CredentialCount': np.bincount(offsets, minlength=days),
+        })
+
+    def close(self):
+        """Release the cached index"""
+        self._snapshot = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Query the credential expiration index')
+    parser.add_argument('--from', dest='start', type=date.fromisoformat, help='First expiration date (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end', type=date.fromisoformat, help='Last expiration date (YYYY-MM-DD)')
+    parser.add_argument('--by', choices=list(FILTER_COLUMNS.values()), help='Count per entity, state, type, etc.')
+    parser.add_argument('--status', help='Only credentials with this Status, e.g. Active')
+    parser.add_argument('--calendar', action='store_true', help='Daily expiry counts from --from (default today)')
+    parser.add_argument('--days', type=int, default=EXPIRATION_CALENDAR_DAYS, help='Days in the calendar')
+    parser.add_argument('--refresh-database', action='store_true',
+                        help='Refresh the database index and calendar first')
+    parser.add_argument('--full', action='store_true', help='With --refresh-database, recheck every credential')
+    args = parser.parse_args()
+
+    try:
+        if args.refresh_database:
+            refresh_expiration_index(full=args.full)
+
+        with CredentialExpirationIndex() as index:
+            if args.calendar:
+                result = index.calendar(args.start, args.days, by=args.by, status=args.status)
+            elif args.start and args.end:
+                result = index.expiring(args.start, args.end, by=args.by, status=args.status)
+            else:
+                return
+        logger.info(f"\n{result.to_string(index=False)}")
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
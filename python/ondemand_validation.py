@@ -0,0 +1,334 @@
+"""
+On-Demand Validation
+Validates single records or small batches in-process while they are edited
+Evaluates the rule engine's vectorized rules for the given providers,
+credentials and entities (and, by default, the credentials and entity of each
+provider) against a cached copy of the reference data. Only the slice of that
+copy the uniqueness and cross-entity rules need is used per call, found through
+lookups built when the copy is loaded, so a call costs milliseconds rather
+than a validation run.
+
+Results can be persisted under an OnDemand validation run. OnDemand runs are
+left out of the dashboard rollups, incremental runs and run summaries.
+"""
+
+import argparse
+import logging
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text, update
+
+from db import dispose_engine
+from telemetry import configure_logging
+from rule_engine import (
+    SOURCE_COLUMNS, SOURCE_KEYS, SOURCE_TABLES, RULES, DuplicateRule, RuleContext, ValidationEngine,
+    prepare_frame, rule_run_stats_table, validation_results_table, validation_run_log_table, _ci
+)
+from config import (
+    VALIDATION_RUN_TYPE_ONDEMAND, VALIDATION_RESULT_MODE_FULL, VALIDATION_RESULT_MODE_EXCEPTIONS_ONLY,
+    ONDEMAND_REFERENCE_TTL_SECONDS, ONDEMAND_MAX_BATCH_SIZE
+)
+
+# Configure logging
+configure_logging('ondemand_validation.log')
+logger = logging.getLogger(__name__)
+
+P, C, E = 'Provider', 'Credential', 'Entity'
+
+# Columns of each cached source with a lookup from value to row positions;
+# True marks collation-normalized (case-insensitive) lookups
+REFERENCE_LOOKUPS = {
+    P: {'ProviderID': False, 'NPI': True, 'EntityID': False},
+    C: {'CredentialID': False, 'ProviderID': False},
+    E: {'EntityID': False, 'NPI': True, 'TaxID': True},
+}
+
+
+class ReferenceData:
+    """Cached Providers, Credentials and Entities with lookups for slicing"""
+
+    def __init__(self, frames, catalog):
+        self.frames = frames
+        self.catalog = catalog
+        self.loaded = time.monotonic()
+        self.lookups = {
+            source: {column: self._lookup(frames[source][column], normalize)
+                     for column, normalize in columns.items()}
+            for source, columns in REFERENCE_LOOKUPS.items()
+        }
+
+    @staticmethod
+    def _lookup(values, normalize):
+        keys = _ci(values) if normalize else values
+        return keys.reset_index(drop=True).groupby(keys.to_numpy(), sort=False).indices
+
+    def age(self):
+        return time.monotonic() - self.loaded
+
+    def rows(self, source, matches):
+        """Rows of a source whose value in any (column, values) pair of matches is among values"""
+        positions = []
+        for column, values in matches:
+            lookup = self.lookups[source][column]
+            if REFERENCE_LOOKUPS[source][column]:
+                values = _ci(pd.Series(values, dtype='string'))
+            positions.extend(lookup[value] for value in pd.unique(pd.Series(values).dropna())
+                             if value in lookup)
+        if not positions:
+            return self.frames[source].iloc[0:0]
+        return self.frames[source].iloc[np.unique(np.concatenate(positions))]
+
+
+class OnDemandValidator:
+    """Validates individual records in-process against cached reference data
+
+    A validator is safe to share between threads. The reference data is
+    reloaded once it is older than reference_ttl seconds; records passed by ID
+    are always read fresh.
+    """
+
+    def __init__(self, engine=None, reference_ttl=ONDEMAND_REFERENCE_TTL_SECONDS,
+                 max_batch_size=ONDEMAND_MAX_BATCH_SIZE):
+        self.validation_engine = ValidationEngine(engine=engine)
+        self.engine = self.validation_engine.engine
+        self.reference_ttl = reference_ttl
+        self.max_batch_size = max_batch_size
+        self._reference = None
+        self._reference_lock = threading.Lock()
+        # Rules grouped by the source they validate, so a call skips the sources it has no rows for.
+        # Duplicate rules score a record against the whole table and are left to full runs
+        self.rules_by_source = {source: [rule for rule in RULES
+                                         if rule.source == source and not isinstance(rule, DuplicateRule)]
+                                for source in SOURCE_COLUMNS}
+        self._empty_frames = {source: prepare_frame(pd.DataFrame(columns=columns), source)
+                              for source, columns in SOURCE_COLUMNS.items()}
+
+    @property
+    def reference(self):
+        """Cached reference data, reloaded when it has expired"""
+        reference = self._reference
+        if reference is None or reference.age() > self.reference_ttl:
+            with self._reference_lock:
+                if self._reference is None or self._reference.age() > self.reference_ttl:
+                    self._reference = self._load_reference()
+                reference = self._reference
+        return reference
+
+    def refresh_reference(self):
+        """Reload the cached reference data now (e.g. after a data refresh)"""
+        with self._reference_lock:
+            self._reference = self._load_reference()
+
+    def _load_reference(self):
+        started = time.perf_counter()
+        reference = ReferenceData(self.validation_engine.load_frames(), self.validation_engine.load_catalog())
+        logger.info(f"On-demand reference data loaded in {time.perf_counter() - started:.2f} seconds")
+        return reference
+
+    def validate(self, providers=None, credentials=None, entities=None, include_related=True,
+                 include_passes=False, persist=False):
+        """
+        Validate providers, credentials and entities.
+        Each argument is a list of record IDs (validated as stored) and/or dicts
+        of column values. A dict with the record's ID is applied over the stored
+        record, so an edit can be validated before it is saved; a dict without
+        one is validated as a new record. include_related also validates the
+        stored credentials and entity of each provider. Returns the results
+        DataFrame (Fail and Warning rows unless include_passes), with the
+        ValidationRunID of the OnDemand run when persist is set.
+        """
+        started = time.perf_counter()
+        try:
+            reference = self.reference
+            validated = {
+                P: self._records(P, providers or []),
+                C: self._records(C, credentials or []),
+                E: self._records(E, entities or []),
+            }
+            if sum(len(records) for records in validated.values()) > self.max_batch_size:
+                raise ValueError(f"On-demand validation is limited to {self.max_batch_size} records; "
+                                 f"run a validation run instead")
+
+            if include_related:
+                provider_ids = validated[P]['ProviderID']
+                validated[C] = self._overlay(reference.rows(C, [('ProviderID', provider_ids)]), validated[C], C)
+                validated[E] = self._overlay(reference.rows(E, [('EntityID', validated[P]['EntityID'])]),
+                                             validated[E], E)
+
+            ctx = self._context(reference, validated)
+            rules = [rule for source, records in validated.items() if not records.empty
+                     for rule in self.rules_by_source[source]]
+            results, stats = self.validation_engine.evaluate(
+                ctx, reference.catalog, frames=validated, include_passes=include_passes, rules=rules
+            )
+            results['ValidationRunID'] = None
+            if persist:
+                results['ValidationRunID'] = self._persist(results, stats, validated, include_passes, ctx.now)
+
+            logger.debug(f"On-demand validation of {sum(len(r) for r in validated.values())} records "
+                         f"took {(time.perf_counter() - started) * 1000:.1f} ms")
+            return results
+
+        except Exception as e:
+            logger.error(f"On-demand validation failed: {str(e)}")
+            raise
+
+    def validate_provider(self, provider, **options):
+        """Validate one provider (an ID or a dict of values) with its credentials and entity"""
+        return self.validate(providers=[provider], **options)
+
+    def validate_credential(self, credential, **options):
+        """Validate one credential (an ID or a dict of values)"""
+        return self.validate(credentials=[credential], **options)
+
+    def _records(self, source, records):
+        """Frame of the records to validate, with stored values under any given edits"""
+        id_column = SOURCE_KEYS[source][0]
+        edits = []
+        for record in records:
+            if isinstance(record, dict):
+                unknown = set(record) - set(SOURCE_COLUMNS[source])
+                if unknown:
+                    raise ValueError(f"Unknown {source} columns: {', '.join(sorted(unknown))}")
+                edits.append(record)
+            else:
+                edits.append({id_column: record})
+
+        if not edits:
+            return self._empty_frames[source]
+
+        stored = self._fetch(source, [edit[id_column] for edit in edits if edit.get(id_column) is not None])
+        stored_rows = {row[id_column]: row for row in stored.to_dict('records')}
+        rows = []
+        for edit in edits:
+            row = dict(stored_rows.get(edit.get(id_column), {}))
+            if not row and set(edit) == {id_column}:
+                raise ValueError(f"{source} {edit[id_column]} not found")
+            row.update(edit)
+            rows.append(row)
+        return prepare_frame(pd.DataFrame(rows, columns=SOURCE_COLUMNS[source]), source)
+
+    def _fetch(self, source, ids):
+        """Current stored rows of a source by ID, as read"""
+        if not ids:
+            return pd.DataFrame(columns=SOURCE_COLUMNS[source])
+        id_column = SOURCE_KEYS[source][0]
+        query = text(f"SELECT {', '.join(SOURCE_COLUMNS[source])} FROM cred.{SOURCE_TABLES[source]} "
+                     f"WHERE {id_column} IN :ids").bindparams(bindparam('ids', expanding=True))
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn, params={'ids': [int(i) for i in ids]})
+
+    @staticmethod
+    def _overlay(reference_rows, records, source):
+        """records plus the reference rows they do not replace"""
+        id_column = SOURCE_KEYS[source][0]
+        reference_rows = reference_rows[~reference_rows[id_column].isin(records[id_column].dropna())]
+        if reference_rows.empty:
+            return records
+        if records.empty:
+            return reference_rows.reset_index(drop=True)
+        return pd.concat([records, reference_rows], ignore_index=True)
+
+    def _context(self, reference, validated):
+        """RuleContext over the slice of the reference data the validated records need
+
+        Holds the records each validated record references, the records that
+        could duplicate it, and the records whose existence a cross-entity rule
+        checks; validated records replace their stored versions.
+        """
+        providers, credentials, entities = validated[P], validated[C], validated[E]
+        provider_slice = reference.rows(P, [
+            ('ProviderID', credentials['ProviderID']),  # Credential rules read their provider
+            ('NPI', providers['NPI']),                  # Duplicate provider NPIs
+            ('EntityID', entities['EntityID']),         # Entities with (active) providers
+        ])
+        credential_slice = reference.rows(C, [
+            ('ProviderID', pd.concat([providers['ProviderID'], credentials['ProviderID']])),
+        ])
+        entity_slice = reference.rows(E, [
+            ('EntityID', providers['EntityID']),        # Provider rules read their entity
+            ('NPI', pd.concat([providers['NPI'], entities['NPI']])),
+            ('TaxID', entities['TaxID']),
+        ])
+        return RuleContext(
+            self._overlay(provider_slice, providers, P),
+            self._overlay(credential_slice, credentials, C),
+            self._overlay(entity_slice, entities, E),
+            now=datetime.now()
+        )
+
+    def _persist(self, results, stats, validated, include_passes, run_time):
+        """Store the results under a completed OnDemand validation run"""
+        result_mode = VALIDATION_RESULT_MODE_FULL if include_passes else VALIDATION_RESULT_MODE_EXCEPTIONS_ONLY
+        run_time = run_time.to_pydatetime()
+        with self.engine.begin() as conn:
+            run_id = conn.execute(validation_run_log_table.insert().values(
+                RunStartTime=run_time, RunStatus='Running', RunType=VALIDATION_RUN_TYPE_ONDEMAND,
+                ResultMode=result_mode
+            )).inserted_primary_key[0]
+
+            rows = results.drop(columns=['ValidationRunID'])
+            rows['ValidationRunID'] = run_id
+            rows['ValidationDate'] = run_time
+            stats = stats.drop(columns=['ElapsedMs', 'RowsScanned', 'RowsEmitted'], errors='ignore')
+            stats['ValidationRunID'] = run_id
+            ValidationEngine._write(conn, validation_results_table, rows)
+            ValidationEngine._write(conn, rule_run_stats_table, stats)
+
+            end_time = datetime.now()
+            conn.execute(update(validation_run_log_table)
+                         .where(validation_run_log_table.c.RunID == run_id)
+                         .values(RunEndTime=end_time,
+                                 RunStatus='Completed',
+                                 TotalRulesRun=len(stats),
+                                 TotalRecordsValidated=sum(len(records) for records in validated.values()),
+                                 TotalFailures=int(stats['FailCount'].sum()) if not stats.empty else 0,
+                                 TotalWarnings=int(stats['WarningCount'].sum()) if not stats.empty else 0,
+                                 TotalPasses=int(stats['PassCount'].sum()) if not stats.empty else 0,
+                                 ExecutionTimeSeconds=int((end_time - run_time).total_seconds())))
+        return run_id
+
+    def close(self):
+        """Release the engine and the cached reference data"""
+        self.validation_engine.close()
+        self.engine = None
+        self._reference = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Validate individual records on demand')
+    parser.add_argument('--provider', type=int, action='append', default=[], help='ProviderID to validate')
+    parser.add_argument('--credential', type=int, action='append', default=[], help='CredentialID to validate')
+    parser.add_argument('--entity', type=int, action='append', default=[], help='EntityID to validate')
+    parser.add_argument('--no-related', action='store_true',
+                        help="Do not validate each provider's credentials and entity")
+    parser.add_argument('--persist', action='store_true', help='Store the results under an OnDemand run')
+    args = parser.parse_args()
+
+    try:
+        with OnDemandValidator() as validator:
+            results = validator.validate(providers=args.provider, credentials=args.credential,
+                                         entities=args.entity, include_related=not args.no_related,
+                                         persist=args.persist)
+        if results.empty:
+            logger.info("No validation issues found")
+        for row in results.itertuples():
+            logger.info(f"{row.ValidationStatus:<8} {row.RuleCode:<10} {row.EntityType} {row.RecordID}: "
+                        f"{row.ErrorMessage}")
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Refresh Orchestrator
+Runs a refresh as a dependency graph of steps with asyncio
+A step starts as soon as every step it depends on has succeeded, up to
+max_concurrency steps at a time. Each step runs its (blocking) action on a
+worker thread with a timeout and a retry policy, and its state and timing are
+persisted to cred.RefreshStepLog under one cred.RefreshRunLog row.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db import connection
+from telemetry import (
+    write_metrics, REFRESH_COMPLETED, REFRESH_STARTED, REFRESH_STEP_FAILURES, REFRESH_STEP_SECONDS
+)
+from config import (
+    REFRESH_MAX_CONCURRENT_STEPS, REFRESH_STEP_TIMEOUT_SECONDS, REFRESH_STEP_RETRIES,
+    REFRESH_RETRY_BACKOFF_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+STEP_PENDING = 'Pending'
+STEP_RUNNING = 'Running'
+STEP_SUCCEEDED = 'Succeeded'
+STEP_FAILED = 'Failed'
+STEP_SKIPPED = 'Skipped'
+
+
+class RefreshStep:
+    """One step of a refresh graph
+
+    action is called with the results of the steps that have succeeded so far,
+    keyed by step name, and its return value becomes this step's result. A
+    timeout of 0 or None disables it. A step that times out is not retried: its
+    thread cannot be stopped and may still be working.
+    """
+
+    def __init__(self, name, action, depends_on=(), timeout=REFRESH_STEP_TIMEOUT_SECONDS,
+                 retries=REFRESH_STEP_RETRIES):
+        self.name = name
+        self.action = action
+        self.depends_on = list(depends_on)
+        self.timeout = timeout or None
+        self.retries = retries
+
+
+class RefreshOrchestrator:
+    """Runs RefreshSteps concurrently in dependency order"""
+
+    def __init__(self, steps, max_concurrency=REFRESH_MAX_CONCURRENT_STEPS,
+                 retry_backoff=REFRESH_RETRY_BACKOFF_SECONDS, persist=True):
+        self.steps = self._order_steps(steps)
+        self.max_concurrency = max_concurrency
+        self.retry_backoff = retry_backoff
+        self.persist = persist
+        self.results = {}
+        self.records = {}
+        self.refresh_run_id = None
+
+    @staticmethod
+    def _order_steps(steps):
+        """Steps in dependency order; rejects unknown dependencies and cycles"""
+        by_name = {step.name: step for step in steps}
+        if len(by_name) != len(steps):
+            raise ValueError("Refresh step names must be unique")
+        for step in steps:
+            unknown = [name for name in step.depends_on if name not in by_name]
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps: {', '.join(unknown)}")
+
+        ordered = []
+        visiting = set()
+        visited = set()
+
+        def visit(step):
+            if step.name in visited:
+                return
+            if step.name in visiting:
+                raise ValueError(f"Refresh steps form a cycle through {step.name}")
+            visiting.add(step.name)
+            for name in step.depends_on:
+                visit(by_name[name])
+            visiting.discard(step.name)
+            visited.add(step.name)
+            ordered.append(step)
+
+        for step in steps:
+            visit(step)
+        return ordered
+
+    def run(self):
+        """Run every step and return the per-step timing breakdown"""
+        return asyncio.run(self._run())
+
+    async def _run(self):
+        self.started = time.perf_counter()
+        REFRESH_STARTED.set(time.time())
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.records = {
+            step.name: {
+                'step': step.name,
+                'status': STEP_PENDING,
+                'attempts': 0,
+                'ready_offset': None,
+                'start_offset': None,
+                'end_offset': None,
+                'duration': None,
+                'error': None
+            }
+            for step in self.steps
+        }
+        # Own pool rather than the loop's default one: a timed-out step keeps its
+        # thread, and the loop must not wait for it on shutdown
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency * 2 + 1,
+                                           thread_name_prefix='refresh')
+        try:
+            await self._in_thread(self._save_run_start)
+
+            tasks = {}
+            for step in self.steps:
+                dependencies = [tasks[name] for name in step.depends_on]
+                tasks[step.name] = asyncio.create_task(self._run_step(step, dependencies))
+            await asyncio.gather(*tasks.values())
+
+            await self._in_thread(self._save_run_end)
+            if self.succeeded():
+                REFRESH_COMPLETED.set(time.time())
+            await self._in_thread(write_metrics)
+        finally:
+            self.executor.shutdown(wait=False)
+        return self.timings()
+
+    def _in_thread(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _run_step(self, step, dependencies):
+        """Wait for the step's dependencies, then run it with retries"""
+        record = self.records[step.name]
+        statuses = await asyncio.gather(*dependencies)
+        record['ready_offset'] = self._offset()
+
+        if any(status != STEP_SUCCEEDED for status in statuses):
+            logger.warning(f"Skipping step {step.name}: a dependency did not succeed")
+            record['status'] = STEP_SKIPPED
+            await self._in_thread(self._save_step, record)
+            return STEP_SKIPPED
+
+        async with self.semaphore:
+            record['start_offset'] = self._offset()
+            for attempt in range(1, step.retries + 2):
+                record['attempts'] = attempt
+                record['status'] = STEP_RUNNING
+                await self._in_thread(self._save_step, record)
+                logger.info(f"Step {step.name} started (attempt {attempt})")
+                try:
+                    self.results[step.name] = await asyncio.wait_for(
+                        self._in_thread(step.action, self.results), step.timeout
+                    )
+                    record['status'] = STEP_SUCCEEDED
+                    record['error'] = None
+                    break
+                except asyncio.TimeoutError:
+                    record['status'] = STEP_FAILED
+                    record['error'] = f"Timed out after {step.timeout} seconds"
+                    break
+                except Exception as e:
+                    record['status'] = STEP_FAILED
+                    record['error'] = str(e)
+                    if attempt <= step.retries:
+                        delay = self.retry_backoff * 2 ** (attempt - 1)
+                        logger.warning(f"Step {step.name} failed (attempt {attempt}), "
+                                       f"retrying in {delay} seconds: {str(e)}")
+                        await asyncio.sleep(delay)
+
+            record['end_offset'] = self._offset()
+            record['duration'] = record['end_offset'] - record['start_offset']
+
+        REFRESH_STEP_SECONDS.set(record['duration'], step=step.name)
+        if record['status'] == STEP_SUCCEEDED:
+            logger.info(f"Step {step.name} succeeded in {record['duration']:.2f} seconds",
+                        extra={'step': step.name, 'attempts': record['attempts'],
+                               'duration_seconds': round(record['duration'], 3)})
+        else:
+            REFRESH_STEP_FAILURES.inc(step=step.name)
+            logger.error(f"Step {step.name} failed after {record['attempts']} attempts: {record['error']}",
+                         extra={'step': step.name, 'attempts': record['attempts'],
+                                'duration_seconds': round(record['duration'], 3)})
+        await self._in_thread(self._save_step, record)
+        # Progress is visible to a file scraper before the refresh ends
+        await self._in_thread(write_metrics)
+        return record['status']
+
+    def _offset(self):
+        return time.perf_counter() - self.started
+
+    def succeeded(self):
+        """Whether every step succeeded"""
+        return all(record['status'] == STEP_SUCCEEDED for record in self.records.values())
+
+    def timings(self):
+        """Per-step status, attempts and offsets from the refresh start, in seconds"""
+        return [dict(self.records[step.name]) for step in self.steps]
+
+    def log_timings(self):
+        """Log the timing breakdown as a table ordered by start time"""
+        logger.info(f"{'Step':<28} {'Status':<10} {'Tries':>5} {'Ready':>9} {'Start':>9} {'Seconds':>9}")
+        for record in sorted(self.timings(), key=lambda r: (r['start_offset'] is None, r['start_offset'] or 0)):
+            logger.info(f"{record['step']:<28} {record['status']:<10} {record['attempts']:>5} "
+                        f"{self._format(record['ready_offset'])} {self._format(record['start_offset'])} "
+                        f"{self._format(record['duration'])}")
+
+    @staticmethod
+    def _format(seconds):
+        return f"{seconds:>9.2f}" if seconds is not None else f"{'-':>9}"
+
+    def _save_run_start(self):
+        """Log the refresh and its steps as Pending"""
+        if not self.persist:
+            return
+        try:
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SET NOCOUNT ON;
+                    INSERT INTO cred.RefreshRunLog (RunStatus) VALUES ('Running');
+                    SELECT CAST(SCOPE_IDENTITY() AS INT);
+                """)
+                self.refresh_run_id = cursor.fetchone()[0]
+                cursor.executemany("""
+                    INSERT INTO cred.RefreshStepLog (RefreshRunID, StepName, DependsOn)
+                    VALUES (?, ?, ?)
+                """, [(self.refresh_run_id, step.name, ', '.join(step.depends_on) or None)
+                      for step in self.steps])
+                conn.commit()
+        except Exception as e:
+            # The refresh itself does not depend on its log
+            logger.warning(f"Failed to log refresh start: {str(e)}")
+
+    def _save_step(self, record):
+        if self.refresh_run_id is None:
+            return
+        try:
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE cred.RefreshStepLog
+                    SET StepStatus = ?, Attempts = ?, ReadyOffsetSeconds = ?, StartOffsetSeconds = ?,
+                        EndOffsetSeconds = ?, DurationSeconds = ?, ErrorMessage = ?
+                    WHERE RefreshRunID = ? AND StepName = ?
+                """, record['status'], record['attempts'], record['ready_offset'], record['start_offset'],
+                    record['end_offset'], record['duration'], record['error'],
+                    self.refresh_run_id, record['step'])
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to log state of step {record['step']}: {str(e)}")
+
+    def _save_run_end(self):
+        if self.refresh_run_id is None:
+            return
+        statuses = [record['status'] for record in self.records.values()]
+        errors = [f"{record['step']}: {record['error']}" for record in self.records.values() if record['error']]
+        try:
+            with connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE cred.RefreshRunLog
+                    SET RunEndTime = GETDATE(), RunStatus = ?, StepsSucceeded = ?, StepsFailed = ?,
+                        StepsSkipped = ?, ExecutionTimeSeconds = ?, ErrorMessage = ?
+                    WHERE RefreshRunID = ?
+                """, 'Completed' if self.succeeded() else 'Failed',
+                    statuses.count(STEP_SUCCEEDED), statuses.count(STEP_FAILED),
+                    statuses.count(STEP_SKIPPED), self._offset(),
+                    '; '.join(errors) or None, self.refresh_run_id)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to log refresh end: {str(e)}")
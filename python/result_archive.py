@@ -0,0 +1,292 @@
+"""
+Result Archive
+Tiered retention for cred.ValidationResults
+The latest completed runs stay in SQL Server; older runs are written to
+compressed Parquet files partitioned by run date and then deleted from
+ValidationResults in small batches. cred.ValidationResultArchive records where
+each archived run lives so ValidationRunner can read it back transparently.
+
+Only ValidationResults rows move. The per-rule tallies (ValidationRuleRunStats),
+rule timings and the daily rollups stay in SQL Server, so summaries and the
+Power BI model cover archived runs unchanged.
+"""
+
+import argparse
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+from db import connection, dispose_engine, get_engine
+from telemetry import configure_logging, start_metrics_export
+from config import (
+    RESULT_RETENTION_HOT_RUNS, RESULT_ARCHIVE_PATH, RESULT_ARCHIVE_COMPRESSION,
+    RESULT_ARCHIVE_DELETE_BATCH_SIZE
+)
+
+# Configure logging
+configure_logging('result_archive.log')
+logger = logging.getLogger(__name__)
+
+# Rows read from ValidationResults and written as one Parquet row group
+ARCHIVE_READ_CHUNK_SIZE = 100000
+
+ARCHIVE_STATUS_ARCHIVING = 'Archiving'
+ARCHIVE_STATUS_ARCHIVED = 'Archived'
+ARCHIVE_STATUS_PURGED = 'Purged'
+
+# Explicit schema so every file has the same column types, whatever the chunk holds
+ARCHIVE_SCHEMA = pa.schema([
+    ('ValidationResultID', pa.int64()),
+    ('RuleID', pa.int32()),
+    ('RuleCode', pa.string()),
+    ('ValidationDate', pa.timestamp('us')),
+    ('ValidationRunID', pa.int32()),
+    ('EntityType', pa.string()),
+    ('EntityID', pa.int32()),
+    ('RecordID', pa.string()),
+    ('ValidationStatus', pa.string()),
+    ('ErrorMessage', pa.string()),
+    ('ErrorDetails', pa.string()),
+    ('FieldName', pa.string()),
+    ('FieldValue', pa.string()),
+    ('Severity', pa.string()),
+    ('Resolved', pa.bool_()),
+    ('ResolvedDate', pa.timestamp('us')),
+    ('ResolvedBy', pa.string()),
+    ('ResolutionNotes', pa.string()),
+])
+
+
+class ResultArchive:
+    """Moves old validation runs between ValidationResults and the Parquet archive"""
+
+    def __init__(self, archive_path=RESULT_ARCHIVE_PATH, compression=RESULT_ARCHIVE_COMPRESSION):
+        self.archive_path = archive_path
+        self.compression = compression
+        self.engine = get_engine()
+
+    def archive_runs(self, hot_runs=RESULT_RETENTION_HOT_RUNS,
+                     batch_size=RESULT_ARCHIVE_DELETE_BATCH_SIZE):
+        """Archive and purge every completed run older than the latest hot_runs"""
+        try:
+            candidates = self._archive_candidates(hot_runs)
+            if not candidates:
+                logger.info(f"No validation runs to archive (keeping the latest {hot_runs})")
+                return []
+
+            logger.info(f"Archiving {len(candidates)} validation runs (keeping the latest {hot_runs})")
+            archived = []
+            for run_id, run_date, status, archive_path in candidates:
+                if status != ARCHIVE_STATUS_ARCHIVED:
+                    # New run, or a write interrupted before the file was recorded
+                    archive_path = self._write_run(run_id, run_date)
+                deleted = self._purge_run(run_id, batch_size)
+                logger.info(f"  Run {run_id} ({run_date}): archived to {archive_path}, "
+                            f"purged {deleted} rows")
+                archived.append(run_id)
+
+            return archived
+
+        except Exception as e:
+            logger.error(f"Failed to archive validation results: {str(e)}")
+            raise
+
+    def _archive_candidates(self, hot_runs):
+        """Completed runs outside the hot window that still have rows in ValidationResults
+
+        The latest completed run of each result mode is always kept: the next
+        incremental run carries its outcomes forward. So is any run a running
+        validation is carrying forward from. OnDemand runs hold a few records
+        each and are not archived.
+        """
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                WITH ranked AS (
+                    SELECT
+                        RunID,
+                        CAST(RunStartTime AS DATE) AS RunDate,
+                        ROW_NUMBER() OVER (ORDER BY RunID DESC) AS RunRank,
+                        ROW_NUMBER() OVER (PARTITION BY ResultMode ORDER BY RunID DESC) AS ModeRank
+                    FROM cred.ValidationRunLog
+                    WHERE RunStatus = 'Completed' AND RunType <> 'OnDemand'
+                )
+                SELECT ranked.RunID, ranked.RunDate, archive.ArchiveStatus, archive.ArchivePath
+                FROM ranked
+                LEFT JOIN cred.ValidationResultArchive archive ON archive.ValidationRunID = ranked.RunID
+                WHERE ranked.RunRank > ?
+                    AND ranked.ModeRank > 1
+                    AND ISNULL(archive.ArchiveStatus, '') <> ?
+                    AND NOT EXISTS (SELECT 1 FROM cred.ValidationRunLog active
+                                    WHERE active.RunStatus = 'Running'
+                                        AND active.PreviousRunID = ranked.RunID)
+                ORDER BY ranked.RunID
+            """, hot_runs, ARCHIVE_STATUS_PURGED)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def _write_run(self, run_id, run_date):
+        """Stream one run's rows into its Parquet file and record it as Archived"""
+        relative_path = os.path.join(f"RunDate={run_date.isoformat()}", f"run_{run_id}.parquet")
+        full_path = os.path.join(self.archive_path, relative_path)
+        temp_path = full_path + '.tmp'
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                MERGE cred.ValidationResultArchive AS target
+                USING (SELECT ? AS ValidationRunID, ? AS RunDate) AS source
+                ON target.ValidationRunID = source.ValidationRunID
+                WHEN MATCHED THEN
+                    UPDATE SET ArchiveStatus = ?, ArchivePath = NULL, ArchivedRowCount = NULL
+                WHEN NOT MATCHED THEN
+                    INSERT (ValidationRunID, RunDate, ArchiveStatus)
+                    VALUES (source.ValidationRunID, source.RunDate, ?);
+            """, run_id, run_date, ARCHIVE_STATUS_ARCHIVING, ARCHIVE_STATUS_ARCHIVING)
+            conn.commit()
+
+        # Results are never written to an archived run, so the rows are stable
+        # while they are copied
+        columns = ', '.join(ARCHIVE_SCHEMA.names)
+        query = text(f"SELECT {columns} FROM cred.ValidationResults "
+                     f"WHERE ValidationRunID = :run_id ORDER BY ValidationResultID")
+        row_count = 0
+        with pq.ParquetWriter(temp_path, ARCHIVE_SCHEMA, compression=self.compression) as writer:
+            for chunk in pd.read_sql(query, self.engine, params={'run_id': run_id},
+                                     chunksize=ARCHIVE_READ_CHUNK_SIZE):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=ARCHIVE_SCHEMA,
+                                                        preserve_index=False))
+                row_count += len(chunk)
+
+        written = pq.ParquetFile(temp_path).metadata.num_rows
+        if written != row_count:
+            raise RuntimeError(f"Archive of run {run_id} holds {written} rows, expected {row_count}")
+        os.replace(temp_path, full_path)
+
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE cred.ValidationResultArchive
+                SET ArchiveStatus = ?, ArchivePath = ?, ArchivedRowCount = ?, ArchivedDate = GETDATE()
+                WHERE ValidationRunID = ?
+            """, ARCHIVE_STATUS_ARCHIVED, relative_path, row_count, run_id)
+            conn.commit()
+
+        return relative_path
+
+    def _purge_run(self, run_id, batch_size):
+        """Delete an archived run's rows in batches below the lock escalation threshold
+
+        Each batch commits on its own, so locks are released between batches and
+        concurrent readers of other runs are not blocked by one large delete.
+        """
+        deleted = 0
+        with connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                cursor.execute("""
+                    DELETE TOP (?) FROM cred.ValidationResults
+                    WHERE ValidationRunID = ?
+                """, batch_size, run_id)
+                batch_deleted = cursor.rowcount
+                conn.commit()
+                deleted += batch_deleted
+                if batch_deleted < batch_size:
+                    break
+
+            cursor.execute("""
+                UPDATE cred.ValidationResultArchive
+                SET ArchiveStatus = ?, PurgedDate = GETDATE()
+                WHERE ValidationRunID = ?
+            """, ARCHIVE_STATUS_PURGED, run_id)
+            conn.commit()
+
+        return deleted
+
+    def get_archive_path(self, validation_run_id):
+        """Full path of an archived run's Parquet file, or None while its rows are hot"""
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT ArchivePath
+                FROM cred.ValidationResultArchive
+                WHERE ValidationRunID = ? AND ArchiveStatus IN (?, ?)
+            """, validation_run_id, ARCHIVE_STATUS_ARCHIVED, ARCHIVE_STATUS_PURGED)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+        return os.path.join(self.archive_path, row[0])
+
+    def read_run_results(self, validation_run_id, statuses=None, unresolved_only=False):
+        """Read an archived run's results as a DataFrame (None when the run is not archived)"""
+        try:
+            path = self.get_archive_path(validation_run_id)
+            if path is None:
+                return None
+
+            condition = archive_filter(statuses=statuses, unresolved_only=unresolved_only)
+            return ds.dataset(path, format='parquet').to_table(filter=condition).to_pandas()
+
+        except Exception as e:
+            logger.error(f"Failed to read archived results for run {validation_run_id}: {str(e)}")
+            raise
+
+    def iter_run_batches(self, validation_run_id, batch_size=ARCHIVE_READ_CHUNK_SIZE, **filters):
+        """Yield an archived run's matching results as pyarrow record batches
+
+        Rows come back in ValidationResultID order and only one batch is held
+        in memory at a time. filters are the keyword arguments of archive_filter.
+        """
+        path = self.get_archive_path(validation_run_id)
+        if path is None:
+            raise ValueError(f"Validation run {validation_run_id} is not archived")
+
+        dataset = ds.dataset(path, format='parquet')
+        for batch in dataset.to_batches(filter=archive_filter(**filters), batch_size=batch_size):
+            if batch.num_rows:
+                yield batch
+
+
+def archive_filter(statuses=None, unresolved_only=False, rule_ids=None, rule_codes=None,
+                   severities=None, entity_types=None):
+    """pyarrow filter expression for archived results, or None to read every row"""
+    conditions = []
+    for column, values in (('ValidationStatus', statuses), ('RuleID', rule_ids),
+                           ('RuleCode', rule_codes), ('Severity', severities),
+                           ('EntityType', entity_types)):
+        if values is not None:
+            conditions.append(ds.field(column).isin(list(values)))
+    if unresolved_only:
+        conditions.append(~ds.field('Resolved'))
+
+    condition = None
+    for expression in conditions:
+        condition = expression if condition is None else condition & expression
+    return condition
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Archive old validation runs to Parquet')
+    parser.add_argument('--hot-runs', type=int, default=RESULT_RETENTION_HOT_RUNS,
+                        help='Latest completed runs kept in ValidationResults')
+    parser.add_argument('--batch-size', type=int, default=RESULT_ARCHIVE_DELETE_BATCH_SIZE,
+                        help='Rows deleted per batch when purging an archived run')
+    args = parser.parse_args()
+    start_metrics_export('result_archive')
+
+    try:
+        archived = ResultArchive().archive_runs(hot_runs=args.hot_runs, batch_size=args.batch_size)
+        logger.info(f"Archived {len(archived)} validation runs")
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1083 @@
+"""
+Rule Engine
+Evaluates the validation rule catalog in-process with pandas
+Loads Providers, Credentials and Entities once, evaluates every rule as a
+vectorized predicate and bulk-writes the exceptions to ValidationResults
+
+The engine only needs a SQLAlchemy engine, so the rules can be run off-box or
+against a SQLite stand-in (attach a database named "cred") for testing.
+Each rule produces one outcome per record, matching the compiled SQL procedures.
+"""
+
+import logging
+import time
+from datetime import datetime
+from functools import cached_property
+
+import pandas as pd
+from sqlalchemy import (
+    BigInteger, Boolean, Column, DateTime, Integer, MetaData, String, Table,
+    select, text, update
+)
+
+from db import dispose_engine, get_engine
+from duplicate_detection import best_candidates, find_entity_duplicates, find_provider_duplicates
+from summary_cache import get_summary_cache
+from telemetry import configure_logging, VALIDATION_RUN_SECONDS
+from config import (
+    VALIDATION_RUN_TYPE_MANUAL, VALIDATION_RUN_TYPE_SCHEDULED, VALIDATION_RUN_TYPE_INCREMENTAL,
+    VALIDATION_RESULT_MODE, VALIDATION_RESULT_MODE_FULL
+)
+
+# Configure logging
+configure_logging('rule_engine.log')
+logger = logging.getLogger(__name__)
+
+# Rows written per INSERT batch
+WRITE_BATCH_SIZE = 10000
+
+# Columns read for each source table
+SOURCE_COLUMNS = {
+    'Provider': [
+        'ProviderID', 'NPI', 'FirstName', 'LastName', 'DateOfBirth', 'SSN', 'Specialty',
+        'PhoneNumber', 'EmailAddress', 'AddressLine1', 'City', 'State', 'ZipCode',
+        'EntityID', 'Status', 'CreatedDate', 'ModifiedDate', 'LastValidatedDate', 'IsActive'
+    ],
+    'Credential': [
+        'CredentialID', 'ProviderID', 'CredentialType', 'CredentialNumber',
+        'IssuingOrganization', 'IssueDate', 'ExpirationDate', 'StateIssued', 'Status',
+        'IsPrimary', 'VerificationDate', 'VerifiedBy', 'CreatedDate', 'ModifiedDate'
+    ],
+    'Entity': [
+        'EntityID', 'EntityName', 'EntityType', 'TaxID', 'NPI', 'AddressLine1', 'City',
+        'State', 'ZipCode', 'PhoneNumber', 'EmailAddress', 'Status', 'AccreditationStatus',
+        'CreatedDate', 'ModifiedDate', 'IsActive'
+    ],
+}
+
+SOURCE_TABLES = {'Provider': 'Providers', 'Credential': 'Credentials', 'Entity': 'Entities'}
+
+# (EntityID column, RecordID column) written for each source
+SOURCE_KEYS = {
+    'Provider': ('ProviderID', 'NPI'),
+    'Credential': ('CredentialID', 'CredentialNumber'),
+    'Entity': ('EntityID', 'NPI'),
+}
+
+DATE_COLUMNS = {
+    'DateOfBirth', 'IssueDate', 'ExpirationDate', 'VerificationDate',
+    'CreatedDate', 'ModifiedDate', 'LastValidatedDate'
+}
+
+metadata = MetaData()
+
+validation_rules_table = Table(
+    'ValidationRules', metadata,
+    Column('RuleID', Integer, primary_key=True),
+    Column('RuleCode', String(50)),
+    Column('IsActive', Boolean),
+    schema='cred'
+)
+
+validation_results_table = Table(
+    'ValidationResults', metadata,
+    Column('ValidationResultID', BigInteger, primary_key=True),
+    Column('RuleID', Integer),
+    Column('RuleCode', String(50)),
+    Column('ValidationDate', DateTime),
+    Column('ValidationRunID', Integer),
+    Column('EntityType', String(50)),
+    Column('EntityID', Integer),
+    Column('RecordID', String(100)),
+    Column('ValidationStatus', String(20)),
+    Column('ErrorMessage', String),
+    Column('FieldName', String(100)),
+    Column('FieldValue', String(500)),
+    Column('Severity', String(20)),
+    schema='cred'
+)
+
+rule_run_stats_table = Table(
+    'ValidationRuleRunStats', metadata,
+    Column('RuleRunStatID', BigInteger, primary_key=True),
+    Column('ValidationRunID', Integer),
+    Column('RuleID', Integer),
+    Column('RuleCode', String(50)),
+    Column('EntityType', String(50)),
+    Column('PassCount', Integer),
+    Column('FailCount', Integer),
+    Column('WarningCount', Integer),
+    schema='cred'
+)
+
+rule_timing_table = Table(
+    'ValidationRuleTiming', metadata,
+    Column('RuleTimingID', BigInteger, primary_key=True),
+    Column('ValidationRunID', Integer),
+    Column('RuleID', Integer),
+    Column('RuleCode', String(50)),
+    Column('SourceName', String(50)),
+    Column('ElapsedMs', Integer),
+    Column('RowsScanned', Integer),
+    Column('RowsEmitted', Integer),
+    Column('IsolatedTiming', Boolean),
+    schema='cred'
+)
+
+# Stats columns that are written to cred.ValidationRuleTiming instead
+TIMING_COLUMNS = ['ElapsedMs', 'RowsScanned', 'RowsEmitted']
+
+validation_run_log_table = Table(
+    'ValidationRunLog', metadata,
+    Column('RunID', Integer, primary_key=True),
+    Column('RunStartTime', DateTime),
+    Column('RunEndTime', DateTime),
+    Column('RunStatus', String(50)),
+    Column('TotalRulesRun', Integer),
+    Column('TotalRecordsValidated', Integer),
+    Column('TotalFailures', Integer),
+    Column('TotalWarnings', Integer),
+    Column('TotalPasses', Integer),
+    Column('ExecutionTimeSeconds', Integer),
+    Column('ErrorMessage', String),
+    Column('RunType', String(50)),
+    Column('ResultMode', String(20)),
+    Column('DeltaBaseRunID', Integer),
+    Column('NewIssues', Integer),
+    Column('PersistingIssues', Integer),
+    Column('ClearedIssues', Integer),
+    Column('AutoResolvedIssues', Integer),
+    schema='cred'
+)
+
+
+# ---------------------------------------------------------------------------
+# Predicate helpers
+# String comparisons follow SQL Server's default collation: case-insensitive
+# and ignoring trailing spaces. The case rules (uppercase states, lowercase
+# emails) compare with COLLATE Latin1_General_CS_AS in SQL and _case_differs
+# here. A NULL operand never fails a rule.
+# ---------------------------------------------------------------------------
+
+def _ci(s):
+    """Normalize strings for collation-style comparison"""
+    return s.str.rstrip(' ').str.lower()
+
+
+def _eq(s, value):
+    return (_ci(s) == value.lower()).fillna(False)
+
+
+def _ne(s, value):
+    return s.notna() & (_ci(s) != value.lower()).fillna(False)
+
+
+def _in(s, values):
+    return _ci(s).isin([v.lower() for v in values])
+
+
+def _not_in(s, values):
+    return s.notna() & ~_in(s, values)
+
+
+def _differs(a, b):
+    return a.notna() & b.notna() & (_ci(a) != _ci(b)).fillna(False)
+
+
+def _case_differs(a, b):
+    """Case-sensitive inequality (COLLATE Latin1_General_CS_AS), ignoring trailing spaces"""
+    return a.notna() & b.notna() & (a.str.rstrip(' ') != b.str.rstrip(' ')).fillna(False)
+
+
+def _blank(s):
+    return s.isna() | (s.str.strip(' ') == '').fillna(False)
+
+
+def _whitespace_only(s):
+    return s.notna() & (s.str.strip(' ') == '').fillna(False)
+
+
+def _len(s):
+    """LEN(): character count ignoring trailing spaces"""
+    return s.str.rstrip(' ').str.len()
+
+
+def _trim_len(s):
+    return s.str.strip(' ').str.len()
+
+
+def _matches(s, pattern, case=True):
+    return s.str.contains(pattern, regex=True, case=case, na=False)
+
+
+def _flag(s, value):
+    """BIT column comparison (NULL matches neither 0 nor 1)"""
+    return (s == value).fillna(False)
+
+
+def _active(df, ctx=None):
+    return _flag(df['IsActive'], 1)
+
+
+def _npi_invalid(s):
+    return s.notna() & ((_trim_len(s) != 10).fillna(False) | _matches(s, r'[^0-9]'))
+
+
+def _email_invalid(s):
+    return s.notna() & (~_matches(s, r'@.*\.') | _matches(s, r'^@') | _matches(s, r'@$') | _matches(s, r'\.\.'))
+
+
+def _email_domain(s):
+    """Text after the first '@' (the whole value when there is none)"""
+    return s.str.split('@', n=1).str[-1]
+
+
+def _phone_too_short(s):
+    return s.notna() & (_len(s.str.replace(r'[()\- ]', '', regex=True)) < 10).fillna(False)
+
+
+def _zip_invalid(s):
+    digits = s.str.replace('-', '', regex=False)
+    return s.notna() & (~_len(digits).isin([5, 9]) | _matches(digits, r'[^0-9]'))
+
+
+def _address_incomplete(df, required, others):
+    return df[others].notna().any(axis=1) & _blank(df[required])
+
+
+def _years_since(s, now):
+    """DATEDIFF(YEAR, s, now): calendar year boundaries crossed"""
+    return now.year - s.dt.year
+
+
+def _days_since(s, now):
+    """DATEDIFF(DAY, s, now): calendar day boundaries crossed"""
+    return (now.normalize() - s.dt.normalize()).dt.days
+
+
+def _between(s, low, high):
+    return s.notna() & (s >= low) & (s <= high)
+
+
+def _date_text(s):
+    return s.dt.strftime('%Y-%m-%d')
+
+
+def _id_text(s):
+    return s.astype('Int64').astype('string')
+
+
+def _key(df, columns):
+    """Composite key of collation-normalized values; NULL when any part is NULL"""
+    parts = [_ci(df[c].astype('string')) for c in columns]
+    key = parts[0]
+    for part in parts[1:]:
+        key = key + '\x1f' + part
+    return key
+
+
+class Rule:
+    """Vectorized definition of one validation rule"""
+
+    def __init__(self, code, source, status, message, severity, fails,
+                 applies=None, field_name=None, field_value=None, entity_type=None):
+        self.code = code
+        self.source = source
+        self.status = status
+        self.message = message
+        self.severity = severity
+        self.fails = fails
+        self.applies = applies
+        self.field_name = field_name
+        self.field_value = field_value
+        self.entity_type = entity_type or source
+
+    def evaluate(self, df, ctx):
+        """Return (in-scope mask, exception mask) for the rows of df"""
+        scope = self.applies(df, ctx) if self.applies else pd.Series(True, index=df.index)
+        scope = scope.fillna(False).astype(bool)
+        failed = self.fails(df, ctx).fillna(False).astype(bool) & scope
+        return scope, failed
+
+    def field_values(self, df, ctx=None):
+        """FieldValue for the rows of df, or None"""
+        if self.field_value is None:
+            return None
+        if callable(self.field_value):
+            return self.field_value(df)
+        return df[self.field_value]
+
+
+class DuplicateRule(Rule):
+    """Fuzzy duplicate rule reporting each record's best candidate and its score
+
+    Scores are only meaningful against the whole table, so these rules are left
+    out of on-demand validation.
+    """
+
+    def __init__(self, code, source, status, message, severity, min_score, max_score=100):
+        super().__init__(code, source, status, message, severity,
+                         lambda df, ctx: ctx.duplicate_attr(df, source, 'MatchScore').between(min_score, max_score),
+                         _active, SOURCE_KEYS[source][0])
+
+    def field_values(self, df, ctx=None):
+        """Best candidate's ID, score and matched fields, as the SQL rules report them"""
+        candidate = _id_text(ctx.duplicate_attr(df, self.source, 'CandidateEntityID'))
+        score = _id_text(ctx.duplicate_attr(df, self.source, 'MatchScore'))
+        matched_on = ctx.duplicate_attr(df, self.source, 'MatchedOn').astype('string')
+        return candidate + ' (score ' + score + ': ' + matched_on + ')'
+
+
+class RuleContext:
+    """Reference data shared by the rules of one evaluation"""
+
+    def __init__(self, providers, credentials, entities, now=None):
+        self.providers = providers
+        self.credentials = credentials
+        self.entities = entities
+        self.now = pd.Timestamp(now or datetime.now())
+
+    def frame(self, source):
+        return {'Provider': self.providers, 'Credential': self.credentials, 'Entity': self.entities}[source]
+
+    @cached_property
+    def providers_by_id(self):
+        return self.providers.drop_duplicates('ProviderID').set_index('ProviderID')
+
+    @cached_property
+    def entities_by_id(self):
+        return self.entities.drop_duplicates('EntityID').set_index('EntityID')
+
+    def provider_attr(self, df, column):
+        """Column of each row's provider (NULL when the provider does not exist)"""
+        return self._lookup(self.providers_by_id[column], df['ProviderID'])
+
+    def entity_attr(self, df, column):
+        """Column of each row's entity (NULL when the entity does not exist)"""
+        return self._lookup(self.entities_by_id[column], df['EntityID'])
+
+    @staticmethod
+    def _lookup(values, keys):
+        """values by keys, keeping the column's type when no key matches"""
+        return pd.Series(values.reindex(keys).array, index=keys.index)
+
+    def has_provider(self, df):
+        return df['ProviderID'].isin(self.providers_by_id.index)
+
+    def has_entity(self, df):
+        return df['EntityID'].isin(self.entities_by_id.index)
+
+    @cached_property
+    def active_credential_provider_ids(self):
+        c = self.credentials
+        return pd.Index(c.loc[_eq(c['Status'], 'Active'), 'ProviderID'].dropna().unique())
+
+    @cached_property
+    def primary_credential_provider_ids(self):
+        c = self.credentials
+        return pd.Index(c.loc[_flag(c['IsPrimary'], 1), 'ProviderID'].dropna().unique())
+
+    @cached_property
+    def long_valid_credential_provider_ids(self):
+        c = self.credentials
+        valid = _eq(c['Status'], 'Active') & (c['ExpirationDate'] > self.now + pd.Timedelta(days=30)).fillna(False)
+        return pd.Index(c.loc[valid, 'ProviderID'].dropna().unique())
+
+    @cached_property
+    def active_provider_entity_ids(self):
+        p = self.providers
+        return pd.Index(p.loc[_active(p), 'EntityID'].dropna().unique())
+
+    @cached_property
+    def working_provider_entity_ids(self):
+        p = self.providers
+        return pd.Index(p.loc[_active(p) & _eq(p['Status'], 'Active'), 'EntityID'].dropna().unique())
+
+    @cached_property
+    def entity_npis(self):
+        return pd.Index(_ci(self.entities['NPI']).dropna().unique())
+
+    @staticmethod
+    def _duplicates(values):
+        values = values.dropna()
+        counts = values.value_counts()
+        return pd.Index(counts[counts > 1].index)
+
+    @cached_property
+    def duplicate_provider_npis(self):
+        return self._duplicates(_ci(self.providers['NPI']))
+
+    @cached_property
+    def duplicate_entity_tax_ids(self):
+        return self._duplicates(_ci(self.entities['TaxID']))
+
+    @cached_property
+    def duplicate_entity_npis(self):
+        return self._duplicates(_ci(self.entities['NPI']))
+
+    @cached_property
+    def duplicate_primary_credential_keys(self):
+        c = self.credentials
+        return self._duplicates(_key(c.loc[_flag(c['IsPrimary'], 1)], ['ProviderID', 'CredentialType']))
+
+    @cached_property
+    def duplicate_credential_number_keys(self):
+        return self._duplicates(_key(self.credentials, ['ProviderID', 'CredentialType', 'CredentialNumber']))
+
+    @cached_property
+    def provider_duplicates(self):
+        """Best fuzzy duplicate candidate of each active provider, by ProviderID"""
+        return best_candidates(find_provider_duplicates(self.providers))
+
+    @cached_property
+    def entity_duplicates(self):
+        """Best fuzzy duplicate candidate of each active entity, by EntityID"""
+        return best_candidates(find_entity_duplicates(self.entities))
+
+    def duplicate_attr(self, df, source, column):
+        """Column of each row's best duplicate candidate (NULL when it has none)"""
+        candidates = self.provider_duplicates if source == 'Provider' else self.entity_duplicates
+        return self._lookup(candidates[column], df[SOURCE_KEYS[source][0]])
+
+
+P, C, E = 'Provider', 'Credential', 'Entity'
+PROVIDER_STATUSES = ['Active', 'Inactive', 'Pending', 'Suspended', 'Terminated']
+CREDENTIAL_STATUSES = ['Active', 'Inactive', 'Expired', 'Suspended', 'Revoked', 'Pending']
+STANDARD_CREDENTIAL_TYPES = ['License', 'Medical License', 'DEA License', 'State License', 'Certification',
+                             'Board Certification', 'Specialty Certification', 'Other']
+ISSUER_REQUIRED_TYPES = ['License', 'Certification', 'Board Certification']
+STANDARD_ENTITY_TYPES = ['Hospital', 'Clinic', 'Group Practice', 'Individual Practice', 'Urgent Care',
+                         'Surgery Center', 'Other']
+INACTIVE_ENTITY_STATUSES = ['Inactive', 'Suspended', 'Terminated']
+
+
+def _is_license(s):
+    return _matches(s, 'license', case=False)
+
+
+RULES = [
+    # Provider Validations
+    Rule('PRV001', P, 'Fail', 'NPI must be exactly 10 digits', 'High',
+         lambda df, ctx: _npi_invalid(df['NPI']), _active, 'NPI', 'NPI'),
+    Rule('PRV002', P, 'Fail', 'NPI is required', 'Critical',
+         lambda df, ctx: df['NPI'].isna(), _active, 'NPI'),
+    Rule('PRV003', P, 'Fail', 'First Name is required', 'High',
+         lambda df, ctx: _blank(df['FirstName']), _active, 'FirstName', 'FirstName'),
+    Rule('PRV004', P, 'Fail', 'Last Name is required', 'High',
+         lambda df, ctx: _blank(df['LastName']), _active, 'LastName', 'LastName'),
+    Rule('PRV005', P, 'Fail', 'Date of Birth cannot be in the future', 'High',
+         lambda df, ctx: df['DateOfBirth'] > ctx.now,
+         lambda df, ctx: _active(df) & df['DateOfBirth'].notna(),
+         'DateOfBirth', lambda df: _date_text(df['DateOfBirth'])),
+    Rule('PRV006', P, 'Fail', 'Date of Birth indicates invalid age (must be 18-100 years)', 'Medium',
+         lambda df, ctx: ~_years_since(df['DateOfBirth'], ctx.now).between(18, 100),
+         lambda df, ctx: _active(df) & df['DateOfBirth'].notna(),
+         'DateOfBirth', lambda df: _date_text(df['DateOfBirth'])),
+    Rule('PRV007', P, 'Fail', 'SSN must be in format XXX-XX-XXXX', 'High',
+         lambda df, ctx: (_len(df['SSN']) != 11) | ~_matches(df['SSN'], r'^[0-9]{3}-[0-9]{2}-[0-9]{4}$'),
+         lambda df, ctx: _active(df) & df['SSN'].notna(),
+         'SSN', lambda df: df['SSN'].str[:3] + '-XX-XXXX'),
+    Rule('PRV008', P, 'Fail', 'Email address format is invalid', 'Medium',
+         lambda df, ctx: _email_invalid(df['EmailAddress']),
+         lambda df, ctx: _active(df) & df['EmailAddress'].notna(), 'EmailAddress', 'EmailAddress'),
+    Rule('PRV009', P, 'Fail', 'Phone number must contain at least 10 digits', 'Medium',
+         lambda df, ctx: _phone_too_short(df['PhoneNumber']),
+         lambda df, ctx: _active(df) & df['PhoneNumber'].notna(), 'PhoneNumber', 'PhoneNumber'),
+    Rule('PRV010', P, 'Fail', 'State must be 2 characters', 'Medium',
+         lambda df, ctx: _len(df['State']) != 2,
+         lambda df, ctx: _active(df) & df['State'].notna(), 'State', 'State'),
+    Rule('PRV011', P, 'Fail', 'ZIP code must be 5 or 9 digits', 'Medium',
+         lambda df, ctx: _zip_invalid(df['ZipCode']),
+         lambda df, ctx: _active(df) & df['ZipCode'].notna(), 'ZipCode', 'ZipCode'),
+    Rule('PRV012', P, 'Fail', 'Status must be one of: Active, Inactive, Pending, Suspended, Terminated', 'High',
+         lambda df, ctx: _not_in(df['Status'], PROVIDER_STATUSES), _active, 'Status', 'Status'),
+    Rule('PRV013', P, 'Fail', 'Duplicate NPI found', 'Critical',
+         lambda df, ctx: pd.Series(True, index=df.index),
+         lambda df, ctx: _active(df) & _ci(df['NPI']).isin(ctx.duplicate_provider_npis), 'NPI', 'NPI'),
+    Rule('PRV014', P, 'Fail', 'Specialty is required for active providers', 'Medium',
+         lambda df, ctx: _eq(df['Status'], 'Active') & _blank(df['Specialty']), _active, 'Specialty', 'Specialty'),
+    Rule('PRV015', P, 'Fail', 'First Name should not contain numbers', 'Low',
+         lambda df, ctx: _matches(df['FirstName'], r'[0-9]'),
+         lambda df, ctx: _active(df) & df['FirstName'].notna(), 'FirstName', 'FirstName'),
+    Rule('PRV016', P, 'Fail', 'Last Name should not contain numbers', 'Low',
+         lambda df, ctx: _matches(df['LastName'], r'[0-9]'),
+         lambda df, ctx: _active(df) & df['LastName'].notna(), 'LastName', 'LastName'),
+    Rule('PRV017', P, 'Fail', 'Address Line 1 is required when other address fields are present', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'AddressLine1', ['City', 'State', 'ZipCode']), _active, 'AddressLine1'),
+    Rule('PRV018', P, 'Fail', 'City is required when State or ZipCode is provided', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'City', ['State', 'ZipCode']), _active, 'City'),
+    Rule('PRV019', P, 'Fail', 'State is required when City or ZipCode is provided', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'State', ['City', 'ZipCode']), _active, 'State'),
+    Rule('PRV020', P, 'Fail', 'ModifiedDate cannot be before CreatedDate', 'Low',
+         lambda df, ctx: df['ModifiedDate'] < df['CreatedDate'], _active),
+    Rule('PRV021', P, 'Warning', 'Active provider should be associated with an Entity', 'Low',
+         lambda df, ctx: _eq(df['Status'], 'Active') & df['EntityID'].isna(), _active, 'EntityID'),
+    Rule('PRV022', P, 'Fail', 'EntityID does not reference a valid Entity', 'High',
+         lambda df, ctx: ~ctx.has_entity(df),
+         lambda df, ctx: _active(df) & df['EntityID'].notna(),
+         'EntityID', lambda df: _id_text(df['EntityID'])),
+    Rule('PRV023', P, 'Fail', 'Email domain must contain at least one dot', 'Medium',
+         lambda df, ctx: ~_matches(_email_domain(df['EmailAddress']), r'\.'),
+         lambda df, ctx: _active(df) & _matches(df['EmailAddress'], '@'), 'EmailAddress', 'EmailAddress'),
+    Rule('PRV024', P, 'Fail', 'Phone number should not contain letters', 'Low',
+         lambda df, ctx: _matches(df['PhoneNumber'], r'[A-Za-z]'),
+         lambda df, ctx: _active(df) & df['PhoneNumber'].notna(), 'PhoneNumber', 'PhoneNumber'),
+    Rule('PRV025', P, 'Warning', 'State code should be uppercase', 'Low',
+         lambda df, ctx: _case_differs(df['State'], df['State'].str.upper()),
+         lambda df, ctx: _active(df) & df['State'].notna(), 'State', 'State'),
+    Rule('PRV026', P, 'Warning', 'Name fields contain excessive whitespace', 'Low',
+         lambda df, ctx: _matches(df['FirstName'], '  ') | _matches(df['LastName'], '  '), _active, 'FirstName/LastName'),
+    Rule('PRV027', P, 'Warning', 'First Name length should be between 2 and 50 characters', 'Low',
+         lambda df, ctx: ~_trim_len(df['FirstName']).between(2, 50),
+         lambda df, ctx: _active(df) & df['FirstName'].notna(), 'FirstName', 'FirstName'),
+    Rule('PRV028', P, 'Warning', 'Last Name length should be between 2 and 50 characters', 'Low',
+         lambda df, ctx: ~_trim_len(df['LastName']).between(2, 50),
+         lambda df, ctx: _active(df) & df['LastName'].notna(), 'LastName', 'LastName'),
+    Rule('PRV029', P, 'Warning', 'Email address should be lowercase', 'Low',
+         lambda df, ctx: _case_differs(df['EmailAddress'], df['EmailAddress'].str.lower()),
+         lambda df, ctx: _active(df) & df['EmailAddress'].notna(), 'EmailAddress'),
+    Rule('PRV030', P, 'Fail', 'SSN should not start with 000', 'High',
+         lambda df, ctx: df['SSN'].str.replace('-', '', regex=False).str[:3] == '000',
+         lambda df, ctx: _active(df) & df['SSN'].notna(), 'SSN'),
+    Rule('PRV031', P, 'Fail', 'SSN should not be all zeros', 'High',
+         lambda df, ctx: _ci(df['SSN'].str.replace('-', '', regex=False)) == '000000000',
+         lambda df, ctx: _active(df) & df['SSN'].notna(), 'SSN'),
+    Rule('PRV032', P, 'Warning', 'Active provider should be validated within last 90 days', 'Medium',
+         lambda df, ctx: _eq(df['Status'], 'Active') & (df['LastValidatedDate'].isna()
+                                                        | (_days_since(df['LastValidatedDate'], ctx.now) > 90)),
+         _active),
+    Rule('PRV033', P, 'Fail', 'CreatedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['CreatedDate'] > ctx.now, _active),
+    Rule('PRV034', P, 'Fail', 'ModifiedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['ModifiedDate'] > ctx.now, _active),
+    Rule('PRV035', P, 'Warning', 'Active provider should have at least one credential', 'Medium',
+         lambda df, ctx: _eq(df['Status'], 'Active') & ~df['ProviderID'].isin(ctx.active_credential_provider_ids),
+         _active),
+
+    # Credential Validations
+    Rule('CRED001', C, 'Fail', 'ProviderID is required', 'Critical',
+         lambda df, ctx: df['ProviderID'].isna(), field_name='ProviderID'),
+    Rule('CRED002', C, 'Fail', 'CredentialType is required', 'High',
+         lambda df, ctx: _blank(df['CredentialType']), field_name='CredentialType', field_value='CredentialType'),
+    Rule('CRED003', C, 'Fail', 'CredentialNumber is required', 'High',
+         lambda df, ctx: _blank(df['CredentialNumber']), field_name='CredentialNumber', field_value='CredentialNumber'),
+    Rule('CRED004', C, 'Fail', 'ProviderID does not reference a valid Provider', 'High',
+         lambda df, ctx: ~ctx.has_provider(df),
+         lambda df, ctx: df['ProviderID'].notna(),
+         'ProviderID', lambda df: _id_text(df['ProviderID'])),
+    Rule('CRED005', C, 'Fail', 'ExpirationDate must be after IssueDate', 'High',
+         lambda df, ctx: df['ExpirationDate'] <= df['IssueDate'],
+         lambda df, ctx: df['IssueDate'].notna() & df['ExpirationDate'].notna()),
+    Rule('CRED006', C, 'Fail', 'Expired credentials should have Status = Expired', 'High',
+         lambda df, ctx: (df['ExpirationDate'] < ctx.now) & _ne(df['Status'], 'Expired'),
+         lambda df, ctx: df['ExpirationDate'].notna(), 'Status', 'Status'),
+    Rule('CRED007', C, 'Fail', 'ExpirationDate cannot be more than 20 years in the future', 'Medium',
+         lambda df, ctx: df['ExpirationDate'] > ctx.now + pd.DateOffset(years=20),
+         lambda df, ctx: df['ExpirationDate'].notna(), 'ExpirationDate'),
+    Rule('CRED008', C, 'Fail', 'IssueDate cannot be in the future', 'High',
+         lambda df, ctx: df['IssueDate'] > ctx.now,
+         lambda df, ctx: df['IssueDate'].notna(), 'IssueDate'),
+    Rule('CRED009', C, 'Fail', 'IssueDate cannot be more than 50 years in the past', 'Medium',
+         lambda df, ctx: df['IssueDate'] < ctx.now - pd.DateOffset(years=50),
+         lambda df, ctx: df['IssueDate'].notna(), 'IssueDate'),
+    Rule('CRED010', C, 'Fail', 'Status must be one of: Active, Inactive, Expired, Suspended, Revoked, Pending', 'High',
+         lambda df, ctx: _not_in(df['Status'], CREDENTIAL_STATUSES), field_name='Status', field_value='Status'),
+    Rule('CRED011', C, 'Fail', 'Only one credential per Provider can be Primary for the same CredentialType', 'High',
+         lambda df, ctx: pd.Series(True, index=df.index),
+         lambda df, ctx: _flag(df['IsPrimary'], 1)
+         & _key(df, ['ProviderID', 'CredentialType']).isin(ctx.duplicate_primary_credential_keys)),
+    Rule('CRED012', C, 'Warning', 'Credential expires within 30 days', 'Medium',
+         lambda df, ctx: _between(df['ExpirationDate'], ctx.now, ctx.now + pd.Timedelta(days=30)),
+         lambda df, ctx: df['ExpirationDate'].notna() & _eq(df['Status'], 'Active')),
+    Rule('CRED013', C, 'Warning', 'Credential expires within 90 days', 'Low',
+         lambda df, ctx: _between(df['ExpirationDate'], ctx.now + pd.Timedelta(days=30), ctx.now + pd.Timedelta(days=90)),
+         lambda df, ctx: df['ExpirationDate'].notna() & _eq(df['Status'], 'Active')),
+    Rule('CRED014', C, 'Warning', 'IssuingOrganization should be provided for this CredentialType', 'Medium',
+         lambda df, ctx: _in(df['CredentialType'], ISSUER_REQUIRED_TYPES) & _blank(df['IssuingOrganization']),
+         field_name='IssuingOrganization'),
+    Rule('CRED015', C, 'Fail', 'StateIssued must be 2 characters', 'Medium',
+         lambda df, ctx: _len(df['StateIssued']) != 2,
+         lambda df, ctx: df['StateIssued'].notna(), 'StateIssued', 'StateIssued'),
+    Rule('CRED016', C, 'Warning', 'StateIssued should be uppercase', 'Low',
+         lambda df, ctx: _case_differs(df['StateIssued'], df['StateIssued'].str.upper()),
+         lambda df, ctx: df['StateIssued'].notna(), 'StateIssued', 'StateIssued'),
+    Rule('CRED017', C, 'Fail', 'VerificationDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['VerificationDate'] > ctx.now,
+         lambda df, ctx: df['VerificationDate'].notna(), 'VerificationDate'),
+    Rule('CRED018', C, 'Warning', 'VerifiedBy should be provided when VerificationDate is present', 'Low',
+         lambda df, ctx: _blank(df['VerifiedBy']),
+         lambda df, ctx: df['VerificationDate'].notna(), 'VerifiedBy'),
+    Rule('CRED019', C, 'Fail', 'ModifiedDate cannot be before CreatedDate', 'Low',
+         lambda df, ctx: df['ModifiedDate'] < df['CreatedDate']),
+    Rule('CRED020', C, 'Fail', 'CreatedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['CreatedDate'] > ctx.now),
+    Rule('CRED021', C, 'Fail', 'ModifiedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['ModifiedDate'] > ctx.now),
+    Rule('CRED022', C, 'Fail', 'CredentialNumber should be unique per Provider and CredentialType', 'High',
+         lambda df, ctx: pd.Series(True, index=df.index),
+         lambda df, ctx: _key(df, ['ProviderID', 'CredentialType', 'CredentialNumber'])
+         .isin(ctx.duplicate_credential_number_keys)),
+    Rule('CRED023', C, 'Warning', 'Active credentials should have an ExpirationDate', 'Medium',
+         lambda df, ctx: df['ExpirationDate'].isna(),
+         lambda df, ctx: _eq(df['Status'], 'Active')),
+    Rule('CRED024', C, 'Fail', 'CredentialNumber cannot contain only spaces', 'High',
+         lambda df, ctx: _whitespace_only(df['CredentialNumber']), field_name='CredentialNumber'),
+    Rule('CRED025', C, 'Fail', 'CredentialType cannot contain only spaces', 'High',
+         lambda df, ctx: _whitespace_only(df['CredentialType']), field_name='CredentialType'),
+    Rule('CRED026', C, 'Fail', 'License credentials should have StateIssued', 'High',
+         lambda df, ctx: _is_license(df['CredentialType']) & _blank(df['StateIssued']), field_name='StateIssued'),
+    Rule('CRED027', C, 'Fail', 'ExpirationDate must be at least 1 day after IssueDate', 'High',
+         lambda df, ctx: (df['ExpirationDate'] - df['IssueDate']).dt.days < 1,
+         lambda df, ctx: df['IssueDate'].notna() & df['ExpirationDate'].notna()),
+    Rule('CRED028', C, 'Warning', 'CredentialNumber length should be between 1 and 50 characters', 'Low',
+         lambda df, ctx: ~_trim_len(df['CredentialNumber']).between(1, 50),
+         lambda df, ctx: df['CredentialNumber'].notna(), 'CredentialNumber'),
+    Rule('CRED029', C, 'Warning', 'IssuingOrganization length exceeds maximum (200 characters)', 'Low',
+         lambda df, ctx: _trim_len(df['IssuingOrganization']) > 200,
+         lambda df, ctx: df['IssuingOrganization'].notna(), 'IssuingOrganization'),
+    Rule('CRED030', C, 'Warning', 'VerificationDate should be after IssueDate', 'Low',
+         lambda df, ctx: df['VerificationDate'] < df['IssueDate'],
+         lambda df, ctx: df['IssueDate'].notna() & df['VerificationDate'].notna()),
+    Rule('CRED031', C, 'Fail', 'Active credentials cannot be expired', 'Critical',
+         lambda df, ctx: df['ExpirationDate'] < ctx.now,
+         lambda df, ctx: _eq(df['Status'], 'Active') & df['ExpirationDate'].notna()),
+    Rule('CRED032', C, 'Warning', 'Suspended credentials may need review', 'Low',
+         lambda df, ctx: df['ExpirationDate'] > ctx.now,
+         lambda df, ctx: _eq(df['Status'], 'Suspended') & df['ExpirationDate'].notna()),
+    Rule('CRED033', C, 'Warning', 'Credential appears to be revoked but Status is not Revoked', 'Medium',
+         lambda df, ctx: _ne(df['Status'], 'Revoked') & _matches(df['VerifiedBy'], 'revoked', case=False),
+         lambda df, ctx: df['VerifiedBy'].notna()),
+    Rule('CRED034', C, 'Warning', 'CredentialType should be from standard list', 'Low',
+         lambda df, ctx: _not_in(df['CredentialType'], STANDARD_CREDENTIAL_TYPES),
+         field_name='CredentialType', field_value='CredentialType'),
+    Rule('CRED035', P, 'Warning', 'Active provider should have at least one Active credential', 'Medium',
+         lambda df, ctx: ~df['ProviderID'].isin(ctx.active_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Active'), entity_type=C),
+    Rule('CRED036', C, 'Warning', 'CredentialNumber contains unexpected special characters', 'Low',
+         lambda df, ctx: _matches(df['CredentialNumber'], r'[^A-Za-z0-9\\\-]'),
+         lambda df, ctx: df['CredentialNumber'].notna(), 'CredentialNumber'),
+    Rule('CRED037', C, 'Fail', 'ExpirationDate cannot be before record CreatedDate', 'Medium',
+         lambda df, ctx: df['ExpirationDate'] < df['CreatedDate'].dt.normalize(),
+         lambda df, ctx: df['ExpirationDate'].notna()),
+    Rule('CRED038', C, 'Warning', 'IssueDate is more than 10 years before record creation date', 'Low',
+         lambda df, ctx: (df['CreatedDate'].dt.year - df['IssueDate'].dt.year) > 10,
+         lambda df, ctx: df['IssueDate'].notna()),
+    Rule('CRED039', C, 'Warning', 'Primary credential should typically be Active', 'Low',
+         lambda df, ctx: _ne(df['Status'], 'Active'),
+         lambda df, ctx: _flag(df['IsPrimary'], 1)),
+    Rule('CRED040', C, 'Warning', 'Active credentials should be verified within last 5 years', 'Medium',
+         lambda df, ctx: df['VerificationDate'].isna() | (_years_since(df['VerificationDate'], ctx.now) > 5),
+         lambda df, ctx: _eq(df['Status'], 'Active')),
+
+    # Entity Validations
+    Rule('ENT001', E, 'Fail', 'EntityName is required', 'High',
+         lambda df, ctx: _blank(df['EntityName']), _active, 'EntityName', 'EntityName'),
+    Rule('ENT002', E, 'Fail', 'TaxID must be unique', 'High',
+         lambda df, ctx: pd.Series(True, index=df.index),
+         lambda df, ctx: _active(df) & _ci(df['TaxID']).isin(ctx.duplicate_entity_tax_ids), 'TaxID', 'TaxID'),
+    Rule('ENT003', E, 'Fail', 'NPI must be exactly 10 digits', 'High',
+         lambda df, ctx: _npi_invalid(df['NPI']),
+         lambda df, ctx: _active(df) & df['NPI'].notna(), 'NPI', 'NPI'),
+    Rule('ENT004', E, 'Fail', 'NPI must be unique', 'High',
+         lambda df, ctx: pd.Series(True, index=df.index),
+         lambda df, ctx: _active(df) & _ci(df['NPI']).isin(ctx.duplicate_entity_npis), 'NPI', 'NPI'),
+    Rule('ENT005', E, 'Fail', 'Email address format is invalid', 'Medium',
+         lambda df, ctx: _email_invalid(df['EmailAddress']),
+         lambda df, ctx: _active(df) & df['EmailAddress'].notna(), 'EmailAddress', 'EmailAddress'),
+    Rule('ENT006', E, 'Fail', 'Phone number must contain at least 10 digits', 'Medium',
+         lambda df, ctx: _phone_too_short(df['PhoneNumber']),
+         lambda df, ctx: _active(df) & df['PhoneNumber'].notna(), 'PhoneNumber', 'PhoneNumber'),
+    Rule('ENT007', E, 'Fail', 'State must be 2 characters', 'Medium',
+         lambda df, ctx: _len(df['State']) != 2,
+         lambda df, ctx: _active(df) & df['State'].notna(), 'State', 'State'),
+    Rule('ENT008', E, 'Fail', 'ZIP code must be 5 or 9 digits', 'Medium',
+         lambda df, ctx: _zip_invalid(df['ZipCode']),
+         lambda df, ctx: _active(df) & df['ZipCode'].notna(), 'ZipCode', 'ZipCode'),
+    Rule('ENT009', E, 'Fail', 'Status must be one of: Active, Inactive, Pending, Suspended, Terminated', 'High',
+         lambda df, ctx: _not_in(df['Status'], PROVIDER_STATUSES), _active, 'Status', 'Status'),
+    Rule('ENT010', E, 'Fail', 'Address Line 1 is required when other address fields are present', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'AddressLine1', ['City', 'State', 'ZipCode']), _active, 'AddressLine1'),
+    Rule('ENT011', E, 'Fail', 'City is required when State or ZipCode is provided', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'City', ['State', 'ZipCode']), _active, 'City'),
+    Rule('ENT012', E, 'Fail', 'State is required when City or ZipCode is provided', 'Medium',
+         lambda df, ctx: _address_incomplete(df, 'State', ['City', 'ZipCode']), _active, 'State'),
+    Rule('ENT013', E, 'Fail', 'ModifiedDate cannot be before CreatedDate', 'Low',
+         lambda df, ctx: df['ModifiedDate'] < df['CreatedDate'], _active),
+    Rule('ENT014', E, 'Fail', 'CreatedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['CreatedDate'] > ctx.now, _active),
+    Rule('ENT015', E, 'Fail', 'ModifiedDate cannot be in the future', 'Medium',
+         lambda df, ctx: df['ModifiedDate'] > ctx.now, _active),
+    Rule('ENT016', E, 'Warning', 'EntityName length should be between 2 and 255 characters', 'Low',
+         lambda df, ctx: ~_trim_len(df['EntityName']).between(2, 255),
+         lambda df, ctx: _active(df) & df['EntityName'].notna(), 'EntityName', 'EntityName'),
+    Rule('ENT017', E, 'Fail', 'TaxID must be 9 digits (format: XX-XXXXXXX or XXXXXXXXX)', 'High',
+         lambda df, ctx: _len(df['TaxID'].str.replace('-', '', regex=False)) != 9,
+         lambda df, ctx: _active(df) & df['TaxID'].notna(), 'TaxID', 'TaxID'),
+    Rule('ENT018', E, 'Warning', 'EntityType should be from standard list', 'Low',
+         lambda df, ctx: _not_in(df['EntityType'], STANDARD_ENTITY_TYPES),
+         lambda df, ctx: _active(df) & df['EntityType'].notna(), 'EntityType', 'EntityType'),
+    Rule('ENT019', E, 'Warning', 'State code should be uppercase', 'Low',
+         lambda df, ctx: _case_differs(df['State'], df['State'].str.upper()),
+         lambda df, ctx: _active(df) & df['State'].notna(), 'State', 'State'),
+    Rule('ENT020', E, 'Fail', 'Email domain must contain at least one dot', 'Medium',
+         lambda df, ctx: ~_matches(_email_domain(df['EmailAddress']), r'\.'),
+         lambda df, ctx: _active(df) & _matches(df['EmailAddress'], '@'), 'EmailAddress', 'EmailAddress'),
+    Rule('ENT021', E, 'Fail', 'Phone number should not contain letters', 'Low',
+         lambda df, ctx: _matches(df['PhoneNumber'], r'[A-Za-z]'),
+         lambda df, ctx: _active(df) & df['PhoneNumber'].notna(), 'PhoneNumber', 'PhoneNumber'),
+    Rule('ENT022', E, 'Warning', 'Email address should be lowercase', 'Low',
+         lambda df, ctx: _case_differs(df['EmailAddress'], df['EmailAddress'].str.lower()),
+         lambda df, ctx: _active(df) & df['EmailAddress'].notna(), 'EmailAddress'),
+    Rule('ENT023', E, 'Warning', 'Active entities should have complete address information', 'Medium',
+         lambda df, ctx: _eq(df['Status'], 'Active') & df[['AddressLine1', 'City', 'State', 'ZipCode']].isna().any(axis=1),
+         _active),
+    Rule('ENT024', E, 'Warning', 'Hospitals should have AccreditationStatus', 'Low',
+         lambda df, ctx: _blank(df['AccreditationStatus']),
+         lambda df, ctx: _active(df) & _eq(df['EntityType'], 'Hospital')),
+    Rule('ENT025', E, 'Warning', 'EntityName should contain at least one letter', 'Low',
+         lambda df, ctx: ~_matches(df['EntityName'], r'[A-Za-z]'),
+         lambda df, ctx: _active(df) & df['EntityName'].notna(), 'EntityName', 'EntityName'),
+
+    # Cross-Entity Validations
+    Rule('CROSS001', P, 'Fail', 'Provider NPI should not match an Entity NPI', 'High',
+         lambda df, ctx: _ci(df['NPI']).isin(ctx.entity_npis),
+         lambda df, ctx: _active(df) & df['NPI'].notna()),
+    Rule('CROSS002', P, 'Fail', 'Provider EntityID must reference an Active Entity', 'High',
+         lambda df, ctx: ~ctx.has_entity(df) | _flag(ctx.entity_attr(df, 'IsActive'), 0)
+         | _ne(ctx.entity_attr(df, 'Status'), 'Active'),
+         lambda df, ctx: _active(df) & df['EntityID'].notna(), 'EntityID'),
+    Rule('CROSS003', P, 'Warning', 'Provider State does not match Entity State', 'Low',
+         lambda df, ctx: _differs(df['State'], ctx.entity_attr(df, 'State')),
+         lambda df, ctx: _active(df) & df['State'].notna() & ctx.entity_attr(df, 'State').notna()),
+    Rule('CROSS004', P, 'Fail', 'Active Provider must have at least one Active credential', 'High',
+         lambda df, ctx: ~df['ProviderID'].isin(ctx.active_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Active')),
+    Rule('CROSS005', C, 'Warning', 'Credential StateIssued does not match Provider State for License type', 'Medium',
+         lambda df, ctx: _differs(df['StateIssued'], ctx.provider_attr(df, 'State')),
+         lambda df, ctx: _is_license(df['CredentialType']) & df['StateIssued'].notna()
+         & ctx.provider_attr(df, 'State').notna()),
+    Rule('CROSS006', P, 'Warning', 'Active Provider should have at least one Primary credential', 'Medium',
+         lambda df, ctx: ~df['ProviderID'].isin(ctx.primary_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Active')),
+    Rule('CROSS007', C, 'Fail', 'Expired credentials associated with Active providers should have Status = Expired', 'High',
+         lambda df, ctx: (df['ExpirationDate'] < ctx.now) & _ne(df['Status'], 'Expired'),
+         lambda df, ctx: _eq(ctx.provider_attr(df, 'Status'), 'Active') & df['ExpirationDate'].notna()),
+    Rule('CROSS008', E, 'Warning', 'Active Entity should have at least one associated Provider', 'Low',
+         lambda df, ctx: ~df['EntityID'].isin(ctx.active_provider_entity_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Active')),
+    Rule('CROSS009', P, 'Warning', 'Provider CreatedDate should not be before Entity CreatedDate', 'Low',
+         lambda df, ctx: df['CreatedDate'] < ctx.entity_attr(df, 'CreatedDate'),
+         lambda df, ctx: _active(df) & df['EntityID'].notna() & ctx.has_entity(df)),
+    Rule('CROSS010', C, 'Warning', 'Credential IssueDate should not be before Provider CreatedDate', 'Low',
+         lambda df, ctx: df['IssueDate'] < ctx.provider_attr(df, 'CreatedDate').dt.normalize(),
+         lambda df, ctx: df['IssueDate'].notna() & ctx.has_provider(df)),
+    Rule('CROSS011', P, 'Warning', 'Suspended Provider should not have Active credentials', 'Medium',
+         lambda df, ctx: df['ProviderID'].isin(ctx.active_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Suspended')),
+    Rule('CROSS012', P, 'Fail', 'Terminated Provider should not have Active credentials', 'High',
+         lambda df, ctx: df['ProviderID'].isin(ctx.active_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Terminated')),
+    Rule('CROSS013', C, 'Warning', 'Active Provider has credential expiring within 60 days', 'Medium',
+         lambda df, ctx: _between(df['ExpirationDate'], ctx.now, ctx.now + pd.Timedelta(days=60)),
+         lambda df, ctx: _eq(ctx.provider_attr(df, 'Status'), 'Active') & _eq(df['Status'], 'Active')
+         & df['ExpirationDate'].notna()),
+    Rule('CROSS014', P, 'Warning', 'Provider Email domain does not match Entity Email domain', 'Low',
+         lambda df, ctx: _differs(_email_domain(df['EmailAddress']), _email_domain(ctx.entity_attr(df, 'EmailAddress'))),
+         lambda df, ctx: _active(df) & df['EmailAddress'].notna() & ctx.entity_attr(df, 'EmailAddress').notna()),
+    Rule('CROSS015', P, 'Warning', 'Provider ZipCode does not match Entity ZipCode', 'Low',
+         lambda df, ctx: _differs(df['ZipCode'].str.replace('-', '', regex=False),
+                                  ctx.entity_attr(df, 'ZipCode').str.replace('-', '', regex=False)),
+         lambda df, ctx: _active(df) & df['ZipCode'].notna() & ctx.entity_attr(df, 'ZipCode').notna()),
+    Rule('CROSS016', P, 'Warning', 'Active Provider should have at least one credential valid for more than 30 days', 'Medium',
+         lambda df, ctx: ~df['ProviderID'].isin(ctx.long_valid_credential_provider_ids),
+         lambda df, ctx: _active(df) & _eq(df['Status'], 'Active')),
+    Rule('CROSS017', E, 'Warning', 'Inactive Entity should not have Active providers', 'Medium',
+         lambda df, ctx: df['EntityID'].isin(ctx.working_provider_entity_ids),
+         lambda df, ctx: _active(df) & _in(df['Status'], INACTIVE_ENTITY_STATUSES)),
+
+    # Duplicate Detection
+    DuplicateRule('DUP001', P, 'Fail', 'Provider is a probable duplicate of another provider', 'High', 80),
+    DuplicateRule('DUP002', P, 'Warning', 'Provider is a possible duplicate of another provider', 'Medium', 65, 79),
+    DuplicateRule('DUP003', E, 'Fail', 'Entity is a probable duplicate of another entity', 'High', 80),
+    DuplicateRule('DUP004', E, 'Warning', 'Entity is a possible duplicate of another entity', 'Medium', 65, 79),
+]
+
+
+class ValidationEngine:
+    """Evaluates the validation rule catalog in-process over pandas frames"""
+
+    def __init__(self, engine=None, rules=None):
+        """Initialize database engine (the shared pool unless one is given)"""
+        try:
+            self.engine = engine or get_engine()
+            self.rules = rules if rules is not None else RULES
+            logger.info("Validation engine initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize validation engine: {str(e)}")
+            raise
+
+    def load_frames(self):
+        """Load Providers, Credentials and Entities into frames"""
+        try:
+            frames = {}
+            with self.engine.connect() as conn:
+                for source, columns in SOURCE_COLUMNS.items():
+                    query = f"SELECT {', '.join(columns)} FROM cred.{SOURCE_TABLES[source]}"
+                    frames[source] = prepare_frame(pd.read_sql(query, conn), source)
+                    logger.info(f"Loaded {len(frames[source])} {SOURCE_TABLES[source]}")
+            return frames
+        except Exception as e:
+            logger.error(f"Failed to load validation data: {str(e)}")
+            raise
+
+    def load_catalog(self):
+        """Load RuleCode -> RuleID for the active rules in cred.ValidationRules"""
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(validation_rules_table.c.RuleCode, validation_rules_table.c.RuleID)
+                    .where(validation_rules_table.c.IsActive == True)  # noqa: E712
+                ).fetchall()
+            return {rule_code: rule_id for rule_code, rule_id in rows}
+        except Exception as e:
+            logger.error(f"Failed to load validation rule catalog: {str(e)}")
+            raise
+
+    def evaluate(self, ctx, catalog, frames=None, include_passes=False, rules=None):
+        """
+        Evaluate every catalog rule.
+        frames limits the rows validated per source (defaults to the context's
+        frames) and rules the rules evaluated (defaults to the engine's rules);
+        returns (results, stats) DataFrames without run IDs.
+        Each stats row also carries the rule's ElapsedMs, RowsScanned and RowsEmitted.
+        """
+        results = []
+        stats = []
+        frames = frames or {}
+
+        for rule in (rules if rules is not None else self.rules):
+            rule_id = catalog.get(rule.code)
+            if rule_id is None:
+                continue
+
+            started = time.perf_counter()
+            df = frames.get(rule.source, ctx.frame(rule.source))
+            scope, failed = rule.evaluate(df, ctx)
+            in_scope = int(scope.sum())
+            exceptions = int(failed.sum())
+            emitted = in_scope if include_passes else exceptions
+
+            stats.append({
+                'RuleID': rule_id,
+                'RuleCode': rule.code,
+                'EntityType': rule.entity_type,
+                'PassCount': in_scope - exceptions,
+                'FailCount': exceptions if rule.status == 'Fail' else 0,
+                'WarningCount': exceptions if rule.status == 'Warning' else 0,
+                'RowsScanned': len(df),
+                'RowsEmitted': emitted,
+            })
+
+            if not emitted:
+                stats[-1]['ElapsedMs'] = int((time.perf_counter() - started) * 1000)
+                continue
+
+            rows = df[scope] if include_passes else df[failed]
+            entity_key, record_key = SOURCE_KEYS[rule.source]
+            row_failed = failed[rows.index]
+            field_values = rule.field_values(rows, ctx)
+            results.append(pd.DataFrame({
+                'RuleID': rule_id,
+                'RuleCode': rule.code,
+                'EntityType': rule.entity_type,
+                'EntityID': rows[entity_key] if rule.entity_type == rule.source else None,
+                'RecordID': rows[record_key],
+                'ValidationStatus': row_failed.map({True: rule.status, False: 'Pass'}),
+                'ErrorMessage': row_failed.map({True: rule.message, False: None}),
+                'FieldName': rule.field_name,
+                'FieldValue': field_values if field_values is not None else None,
+                'Severity': rule.severity,
+            }, index=rows.index))
+            stats[-1]['ElapsedMs'] = int((time.perf_counter() - started) * 1000)
+
+        columns = ['RuleID', 'RuleCode', 'EntityType', 'EntityID', 'RecordID', 'ValidationStatus',
+                   'ErrorMessage', 'FieldName', 'FieldValue', 'Severity']
+        results = pd.concat(results, ignore_index=True) if results else pd.DataFrame(columns=columns)
+        return results, pd.DataFrame(stats)
+
+    def run(self, run_type=VALIDATION_RUN_TYPE_MANUAL, result_mode=VALIDATION_RESULT_MODE, schedule_rules=False):
+        """Run every catalog rule and store the outcomes under a new validation run
+        
+        The engine always evaluates every rule over every record: Incremental runs
+        are run and logged as Scheduled runs, and schedule_rules (rule scheduling of
+        the SQL runs) is ignored.
+        """
+        if run_type == VALIDATION_RUN_TYPE_INCREMENTAL:
+            logger.info("The in-process engine validates every record; running the Incremental run as Scheduled")
+            run_type = VALIDATION_RUN_TYPE_SCHEDULED
+        if schedule_rules:
+            logger.info("Rule scheduling only applies to SQL validation runs; evaluating every rule")
+        logger.info(f"Starting in-process validation run (Type: {run_type}, Result Mode: {result_mode})...")
+        start_time = datetime.now()
+        run_id = None
+
+        try:
+            with self.engine.begin() as conn:
+                run_id = conn.execute(validation_run_log_table.insert().values(
+                    RunStartTime=start_time, RunStatus='Running', RunType=run_type, ResultMode=result_mode
+                )).inserted_primary_key[0]
+
+            frames = self.load_frames()
+            catalog = self.load_catalog()
+            ctx = RuleContext(frames['Provider'], frames['Credential'], frames['Entity'], now=start_time)
+            results, stats = self.evaluate(
+                ctx, catalog, include_passes=result_mode == VALIDATION_RESULT_MODE_FULL
+            )
+            results['ValidationRunID'] = run_id
+            results['ValidationDate'] = start_time
+            stats['ValidationRunID'] = run_id
+            timings = self._rule_timings(stats)
+            stats = stats.drop(columns=TIMING_COLUMNS, errors='ignore')
+
+            providers, entities = frames['Provider'], frames['Entity']
+            summary = {
+                'validation_run_id': run_id,
+                'status': 'Completed',
+                'total_rules': len(stats),
+                'failures': int(stats['FailCount'].sum()) if not stats.empty else 0,
+                'warnings': int(stats['WarningCount'].sum()) if not stats.empty else 0,
+                'passes': int(stats['PassCount'].sum()) if not stats.empty else 0,
+                'delta': None
+            }
+            records_validated = int(_active(providers).sum()) + len(frames['Credential']) + int(_active(entities).sum())
+
+            with self.engine.begin() as conn:
+                self._write(conn, validation_results_table, results)
+                self._write(conn, rule_run_stats_table, stats)
+                self._write(conn, rule_timing_table, timings)
+                end_time = datetime.now()
+                summary['execution_time'] = int((end_time - start_time).total_seconds())
+                VALIDATION_RUN_SECONDS.set(summary['execution_time'], engine='Python')
+                conn.execute(update(validation_run_log_table)
+                             .where(validation_run_log_table.c.RunID == run_id)
+                             .values(RunEndTime=end_time,
+                                     RunStatus='Completed',
+                                     TotalRulesRun=summary['total_rules'],
+                                     TotalRecordsValidated=records_validated,
+                                     TotalFailures=summary['failures'],
+                                     TotalWarnings=summary['warnings'],
+                                     TotalPasses=summary['passes'],
+                                     ExecutionTimeSeconds=summary['execution_time']))
+                # The diff and rollup procedures only exist on SQL Server, not on test stand-ins
+                if conn.dialect.name == 'mssql':
+                    conn.execute(text("EXEC cred.sp_DiffValidationRun @ValidationRunID = :run_id"),
+                                 {'run_id': run_id})
+                    conn.execute(text("EXEC cred.sp_RefreshValidationRollups @ValidationRunID = :run_id"),
+                                 {'run_id': run_id})
+                    summary['delta'] = self._run_delta(conn, run_id)
+
+            logger.info("In-process validation run completed:")
+            logger.info(f"  Run ID: {run_id}")
+            logger.info(f"  Total Rules Run: {summary['total_rules']}")
+            logger.info(f"  Failures: {summary['failures']}")
+            logger.info(f"  Warnings: {summary['warnings']}")
+            logger.info(f"  Passes: {summary['passes']}")
+            logger.info(f"  Execution Time: {summary['execution_time']} seconds")
+            delta = summary['delta']
+            if delta:
+                logger.info(f"  Issues vs run {delta['base_run_id']}: {delta['new']} new, "
+                            f"{delta['persisting']} persisting, {delta['cleared']} cleared "
+                            f"({delta['auto_resolved']} auto-resolved)")
+                # The base run's cleared issues were resolved
+                cache = get_summary_cache()
+                if cache is not None and delta['base_run_id'] is not None and delta['auto_resolved']:
+                    cache.invalidate(delta['base_run_id'])
+            return summary
+
+        except Exception as e:
+            logger.error(f"In-process validation run failed: {str(e)}")
+            if run_id is not None:
+                with self.engine.begin() as conn:
+                    conn.execute(update(validation_run_log_table)
+                                 .where(validation_run_log_table.c.RunID == run_id)
+                                 .values(RunEndTime=datetime.now(), RunStatus='Failed', ErrorMessage=str(e)))
+            raise
+
+    @staticmethod
+    def _run_delta(conn, run_id):
+        """Delta counts written by cred.sp_DiffValidationRun, or None"""
+        row = conn.execute(
+            select(validation_run_log_table.c.DeltaBaseRunID, validation_run_log_table.c.NewIssues,
+                   validation_run_log_table.c.PersistingIssues, validation_run_log_table.c.ClearedIssues,
+                   validation_run_log_table.c.AutoResolvedIssues)
+            .where(validation_run_log_table.c.RunID == run_id)
+        ).fetchone()
+        if row is None or row[1] is None:
+            return None
+        return {'validation_run_id': run_id, 'base_run_id': row[0], 'new': row[1],
+                'persisting': row[2], 'cleared': row[3], 'auto_resolved': row[4] or 0}
+
+    def _rule_timings(self, stats):
+        """Build cred.ValidationRuleTiming rows from the evaluated stats
+
+        Every rule is evaluated on its own, so the timings are always isolated.
+        """
+        if stats.empty:
+            return pd.DataFrame()
+        sources = {rule.code: rule.source for rule in self.rules}
+        timings = stats[['ValidationRunID', 'RuleID', 'RuleCode'] + TIMING_COLUMNS].copy()
+        timings['SourceName'] = timings['RuleCode'].map(sources)
+        timings['IsolatedTiming'] = True
+        return timings
+
+    @staticmethod
+    def _write(conn, table, df):
+        """Bulk insert a DataFrame in batches"""
+        if df.empty:
+            return
+        df = df.astype(object).where(df.notna(), None)
+        for start in range(0, len(df), WRITE_BATCH_SIZE):
+            conn.execute(table.insert(), df.iloc[start:start + WRITE_BATCH_SIZE].to_dict('records'))
+        logger.info(f"Wrote {len(df)} rows to cred.{table.name}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the engine; its owner (or db.dispose_engine) disposes of it"""
+        self.engine = None
+        logger.info("Validation engine closed")
+
+
+def prepare_frame(df, source):
+    """Coerce a source frame to the column types the rules expect"""
+    df = df.copy()
+    for column in SOURCE_COLUMNS[source]:
+        if column not in df.columns:
+            df[column] = None
+        if column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+        elif column.endswith('ID') and column != 'TaxID':
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+        elif column not in ('IsActive', 'IsPrimary'):
+            df[column] = df[column].astype(object).where(df[column].notna(), None).astype('string')
+    return df
+
+
+def main():
+    """Main execution function"""
+    try:
+        with ValidationEngine() as validation_engine:
+            validation_engine.run(run_type=VALIDATION_RUN_TYPE_MANUAL)
+    except Exception as e:
+        logger.error(f"In-process validation failed: {str(e)}")
+        raise
+    finally:
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    main()
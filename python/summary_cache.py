@@ -0,0 +1,173 @@
+"""
+Run Summary Cache
+Caches the summaries and failure details of completed validation runs
+A completed run's results only change when they are resolved, so its summaries
+are kept in a process-wide LRU backed by JSON files under SUMMARY_CACHE_PATH,
+shared by every script on the machine. Every entry is stamped with the run's
+ValidationRunLog.ResultsVersion, which is bumped whenever the run's results are
+resolved, and is only served for that version, so entries cached by another
+process or before a resolution are never stale.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from config import SUMMARY_CACHE_ENABLED, SUMMARY_CACHE_PATH, SUMMARY_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class RunSummaryCache:
+    """In-process LRU of completed-run summaries over an on-disk store
+
+    Entries are keyed by (validation run ID, kind, arguments) and stamped with
+    the run's results version. Cached values are shared between callers and
+    must not be modified.
+    """
+
+    def __init__(self, path=SUMMARY_CACHE_PATH, max_entries=SUMMARY_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, validation_run_id, kind, *args, version):
+        """Cached value for the run's current results version, or None on a miss"""
+        key = (validation_run_id, kind) + args
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+
+        entry = self._read(key)
+        with self._lock:
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, validation_run_id, kind, *args, version, value):
+        """Cache a value of a completed run, read at a results version, in memory and on disk"""
+        key = (validation_run_id, kind) + args
+        with self._lock:
+            self._remember(key, (version, value))
+        self._write(key, (version, value))
+
+    def invalidate(self, validation_run_id):
+        """Drop every cached value of a run
+
+        Entries of older versions are never served; this only frees them early.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == validation_run_id]:
+                del self._entries[key]
+            self.invalidations += 1
+        shutil.rmtree(self._run_dir(validation_run_id), ignore_errors=True)
+
+    def clear(self):
+        """Drop every cached value"""
+        with self._lock:
+            self._entries.clear()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def stats(self):
+        """Hit and miss counters of this process"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else None,
+                'entries': len(self._entries)
+            }
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _run_dir(self, validation_run_id):
+        return os.path.join(self.path, f"run_{validation_run_id}")
+
+    def _file_path(self, key):
+        name = '_'.join(str(part) for part in key[1:])
+        return os.path.join(self._run_dir(key[0]), f"{name}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._file_path(key), 'r', encoding='utf-8') as cache_file:
+                stored = json.load(cache_file, object_hook=_decode)
+            return stored['version'], stored['value']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A corrupt or incompatible file is only a miss
+            logger.warning(f"Ignoring unreadable summary cache entry {key}: {str(e)}")
+            return None
+
+    def _write(self, key, entry):
+        file_path = self._file_path(key)
+        temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'version': entry[0], 'value': entry[1]}, cache_file, default=_encode)
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            # The in-memory entry still serves this process
+            logger.warning(f"Failed to write summary cache entry {key}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def _encode(value):
+    """JSON form of the values json cannot store (dates and NumPy scalars)"""
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} values cannot be cached")
+
+
+def _decode(obj):
+    """Inverse of _encode for the tagged date objects"""
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def get_summary_cache():
+    """Return the process-wide run summary cache, or None when it is disabled"""
+    global _cache
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RunSummaryCache()
+    return _cache
@@ -0,0 +1,332 @@
+"""
+Telemetry
+Metrics and structured logging shared by every script
+Counters, gauges and histograms are kept in one process-wide registry and
+exported in the OpenMetrics text format, as a file under METRICS_FILE_DIR (for
+a node_exporter textfile collector or any scraper that reads files) and/or on
+a local HTTP endpoint on METRICS_HTTP_PORT. configure_logging sets up each
+script's log file and console output; LOG_FORMAT=json writes one JSON object
+per line for log shippers.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import LOG_LEVEL, LOG_FORMAT, METRICS_FILE_DIR, METRICS_HTTP_PORT
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+TEXT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Attributes every LogRecord has; anything else was passed with extra= and is
+# written as a field of the JSON line
+_LOG_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per log record, with any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _LOG_RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(log_file):
+    """Log to log_file and the console, as text or JSON lines (LOG_FORMAT)
+
+    Like logging.basicConfig, only the first script to configure logging in a
+    process sets the handlers.
+    """
+    formatter = JsonFormatter() if LOG_FORMAT.lower() == 'json' else logging.Formatter(TEXT_LOG_FORMAT)
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    logging.basicConfig(level=LOG_LEVEL, handlers=handlers)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """A named family of samples, one per combination of label values"""
+
+    metric_type = None
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labels) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_text(self, key, extra=()):
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self):
+        lines = [f"# TYPE {self.name} {self.metric_type}", f"# HELP {self.name} {_escape(self.description)}"]
+        with self._lock:
+            samples = sorted(self._values.items())
+        for key, value in samples:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing total"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}_total{self._label_text(key)} {_format_value(value)}"]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; function gauges are read when rendered"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, description, labels=(), function=None):
+        super().__init__(name, description, labels)
+        self.function = function
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        if self.function is not None:
+            value = self.function()
+            if value is not None:
+                self.set(value)
+        return super().render()
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=()):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def _render_sample(self, key, value):
+        counts, total = value
+        lines = [f"{self.name}_bucket{self._label_text(key, [('le', _format_value(float(bound)))])} {count}"
+                 for bound, count in zip(self.buckets, counts)]
+        lines.append(f"{self.name}_count{self._label_text(key)} {counts[-1]}")
+        lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every metric of the process, rendered together"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """All metrics in the OpenMetrics text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+# Buckets in seconds
+_CHUNK_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_ROUND_TRIP_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120, 600)
+_WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1, 5, 30)
+_UNIT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+# Ingestion (data_ingestion.py)
+INGESTION_ROWS_READ = REGISTRY.register(Counter(
+    'cred_ingestion_rows_read', 'Source rows read by the CSV loaders', ['target']))
+INGESTION_ROWS_PER_SECOND = REGISTRY.register(Gauge(
+    'cred_ingestion_rows_per_second', 'Rows read per second by the latest file load of a target', ['target']))
+INGESTION_CHUNK_SECONDS = REGISTRY.register(Histogram(
+    'cred_ingestion_chunk_seconds', 'Time to read, stage and merge one chunk', ['target'], _CHUNK_BUCKETS))
+
+# Database (db.py)
+DB_ROUND_TRIPS = REGISTRY.register(Counter(
+    'cred_db_round_trips', 'Statements sent to SQL Server', ['operation']))
+DB_ROUND_TRIP_SECONDS = REGISTRY.register(Histogram(
+    'cred_db_round_trip_seconds', 'Duration of statements sent to SQL Server', ['operation'],
+    _ROUND_TRIP_BUCKETS))
+DB_CONNECTION_WAIT_SECONDS = REGISTRY.register(Histogram(
+    'cred_db_connection_wait_seconds', 'Time to borrow a connection from the pool', (), _WAIT_BUCKETS))
+
+# Validation (validation_runner.py, rule_engine.py)
+VALIDATION_UNIT_SECONDS = REGISTRY.register(Histogram(
+    'cred_validation_unit_seconds', 'Duration of validation units by rule category', ['category'],
+    _UNIT_BUCKETS))
+VALIDATION_CATEGORY_SECONDS = REGISTRY.register(Gauge(
+    'cred_validation_category_seconds', 'Unit time of each rule category in the latest validation run',
+    ['category']))
+VALIDATION_RUN_SECONDS = REGISTRY.register(Gauge(
+    'cred_validation_run_seconds', 'Duration of the latest validation run', ['engine']))
+
+# Daily refresh (refresh_orchestrator.py)
+REFRESH_STEP_SECONDS = REGISTRY.register(Gauge(
+    'cred_refresh_step_seconds', 'Duration of the latest run of each refresh step', ['step']))
+REFRESH_STEP_FAILURES = REGISTRY.register(Counter(
+    'cred_refresh_step_failures', 'Refresh steps that failed after their retries', ['step']))
+REFRESH_STARTED = REGISTRY.register(Gauge(
+    'cred_refresh_started_timestamp_seconds', 'Start time of the latest refresh'))
+REFRESH_COMPLETED = REGISTRY.register(Gauge(
+    'cred_refresh_completed_timestamp_seconds', 'End time of the latest refresh whose steps all succeeded'))
+
+# Data snapshot (data_snapshot.py)
+SNAPSHOT_ROWS = REGISTRY.register(Gauge(
+    'cred_snapshot_rows', 'Rows of each table in the latest published snapshot', ['table']))
+SNAPSHOT_CHANGED_ROWS = REGISTRY.register(Gauge(
+    'cred_snapshot_changed_rows', 'Rows read from SQL Server for the latest snapshot', ['table']))
+
+# Process
+PROCESS_PEAK_RSS = REGISTRY.register(Gauge(
+    'cred_process_peak_rss_bytes', 'Peak resident set size of the process', function=_peak_rss_bytes))
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+_script_name = None
+_server = None
+_export_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request: {format % args}")
+
+
+def start_metrics_export(script_name):
+    """Export this process's metrics as configured
+
+    Writes <METRICS_FILE_DIR>/<script_name>.prom at exit (and whenever
+    write_metrics is called) and serves /metrics on METRICS_HTTP_PORT.
+    """
+    global _script_name, _server
+    with _export_lock:
+        if _script_name is None and METRICS_FILE_DIR:
+            atexit.register(write_metrics)
+        _script_name = script_name
+
+        if METRICS_HTTP_PORT and _server is None:
+            try:
+                _server = ThreadingHTTPServer(('127.0.0.1', METRICS_HTTP_PORT), _MetricsHandler)
+                threading.Thread(target=_server.serve_forever, name='metrics-http', daemon=True).start()
+                logger.info(f"Serving metrics on http://127.0.0.1:{METRICS_HTTP_PORT}/metrics")
+            except OSError as e:
+                # Metrics never stop a script
+                logger.warning(f"Failed to serve metrics on port {METRICS_HTTP_PORT}: {str(e)}")
+
+
+def write_metrics():
+    """Write the metrics file of this script, if file export is configured"""
+    if not METRICS_FILE_DIR or _script_name is None:
+        return
+    path = os.path.join(METRICS_FILE_DIR, f"{_script_name}.prom")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(METRICS_FILE_DIR, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(REGISTRY.render())
+        os.replace(temp_path, path)
+    except Exception as e:
+        logger.warning(f"Failed to write metrics to {path}: {str(e)}")
+
@@ -0,0 +1,9 @@
+"""
+Test configuration
+The scripts import each other as top-level modules from python/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
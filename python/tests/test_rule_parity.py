@@ -0,0 +1,231 @@
+"""
+Rule Parity Tests
+Evaluates rules with the in-process engine and with their SQL definitions
+(populate_validation_rules.sql and the rule sources in rule_compiler.sql)
+against the same SQLite stand-in, and checks both flag the same records
+
+SQLite gets the T-SQL pieces the tested rules use: a case-insensitive default
+collation that ignores trailing spaces, Latin1_General_CS_AS, LEN, GETDATE and
+DATEADD. The OUTER APPLY picking each record's best duplicate candidate is
+rewritten as a ranked join.
+"""
+
+import os
+import re
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from duplicate_detection import best_candidates
+from rule_engine import (
+    DATE_COLUMNS, RULES, SOURCE_COLUMNS, SOURCE_KEYS, SOURCE_TABLES, RuleContext, ValidationEngine
+)
+
+RULES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'validation_rules')
+
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+RUN_ID = 1
+
+ENTITIES = [
+    {'EntityID': 1, 'EntityName': 'North Clinic', 'State': 'CA', 'EmailAddress': 'info@north.org'},
+    {'EntityID': 2, 'EntityName': 'South Clinic', 'State': 'ca', 'EmailAddress': 'Info@South.org'},
+    {'EntityID': 3, 'EntityName': 'East Clinic', 'State': 'TX ', 'EmailAddress': None},
+    {'EntityID': 4, 'EntityName': 'West Clinic', 'State': 'ny', 'EmailAddress': 'WEST@west.org', 'IsActive': 0},
+]
+
+PROVIDERS = [
+    {'ProviderID': 1, 'NPI': '1000000001', 'State': 'CA', 'EmailAddress': 'a@x.com', 'EntityID': 1},
+    {'ProviderID': 2, 'NPI': '1000000002', 'State': 'ca', 'EmailAddress': 'B@x.com', 'EntityID': 1},
+    {'ProviderID': 3, 'NPI': '1000000003', 'State': 'NY', 'EmailAddress': None, 'EntityID': 2},
+    {'ProviderID': 4, 'NPI': '1000000004', 'State': 'Tx', 'EmailAddress': 'd@X.com', 'EntityID': 3},
+    {'ProviderID': 5, 'NPI': '1000000005', 'State': 'TX', 'EmailAddress': 'e@x.com', 'EntityID': 3},
+    {'ProviderID': 6, 'NPI': '1000000006', 'State': 'nv', 'EmailAddress': 'F@x.com', 'EntityID': 1, 'IsActive': 0},
+]
+
+CREDENTIALS = [
+    {'CredentialID': 1, 'ProviderID': 1, 'CredentialNumber': 'L-1', 'StateIssued': 'CA'},
+    {'CredentialID': 2, 'ProviderID': 2, 'CredentialNumber': 'L-2', 'StateIssued': 'ca'},
+    {'CredentialID': 3, 'ProviderID': 3, 'CredentialNumber': 'L-3', 'StateIssued': 'Ny '},
+    {'CredentialID': 4, 'ProviderID': 4, 'CredentialNumber': 'L-4', 'StateIssued': 'TX '},
+    {'CredentialID': 5, 'ProviderID': 5, 'CredentialNumber': 'L-5', 'StateIssued': None},
+]
+
+# (EntityType, EntityID, CandidateEntityID, MatchScore), one row per direction of each pair
+DUPLICATE_CANDIDATES = [
+    ('Provider', 1, 2, 85), ('Provider', 2, 1, 85),
+    ('Provider', 3, 4, 70), ('Provider', 4, 3, 70),
+    ('Provider', 4, 5, 90), ('Provider', 5, 4, 90),
+    ('Provider', 6, 1, 95), ('Provider', 1, 6, 95),
+    ('Entity', 1, 2, 80), ('Entity', 2, 1, 80),
+    ('Entity', 1, 3, 79), ('Entity', 3, 1, 79),
+    ('Entity', 2, 4, 65), ('Entity', 4, 2, 65),
+]
+
+# At least one rule of each category: Provider, Credential, Entity, Cross-Entity, Duplicate
+PARITY_RULES = ['PRV025', 'PRV029', 'CRED016', 'ENT019', 'ENT022', 'CROSS003',
+                'DUP001', 'DUP002', 'DUP003', 'DUP004']
+
+BEST_CANDIDATE_JOIN = """LEFT JOIN (SELECT dc.EntityID, dc.CandidateEntityID, dc.MatchScore, dc.MatchedOn,
+                  ROW_NUMBER() OVER (PARTITION BY dc.EntityID
+                                     ORDER BY dc.MatchScore DESC, dc.CandidateEntityID) AS CandidateRank
+           FROM cred.DuplicateCandidates dc
+           WHERE dc.ValidationRunID = @ValidationRunID AND dc.EntityType = '{entity_type}') dup
+    ON dup.EntityID = {key} AND dup.CandidateRank = 1"""
+
+
+def _sql_string(literal):
+    return literal[1:-1].replace("''", "'")
+
+
+def _read_sources():
+    """SourceName -> (EntityIDExpression, FromClause) from rule_compiler.sql"""
+    with open(os.path.join(RULES_DIR, 'rule_compiler.sql')) as f:
+        sql = f.read()
+    pattern = r"^\('(\w+)', '\w+', '([^']*)', '[^']*',\n('(?:[^']|'')*'),"
+    return {name: (key, _sql_string(from_clause))
+            for name, key, from_clause in re.findall(pattern, sql, flags=re.M)}
+
+
+def _read_rules(source_names):
+    """RuleCode -> (SourceName, AppliesWhen, FailWhen) from populate_validation_rules.sql"""
+    with open(os.path.join(RULES_DIR, 'populate_validation_rules.sql')) as f:
+        sql = f.read()
+    pattern = (rf"^\s*\('(\w+)', '({'|'.join(source_names)})', "
+               r"(NULL|'(?:[^']|'')*'), ('(?:[^']|'')*'),")
+    return {code: (source, None if applies == 'NULL' else _sql_string(applies), _sql_string(fails))
+            for code, source, applies, fails in re.findall(pattern, sql, flags=re.M)}
+
+
+SQL_SOURCES = _read_sources()
+SQL_RULES = _read_rules(SQL_SOURCES)
+PYTHON_RULES = {rule.code: rule for rule in RULES}
+
+
+def _sqlite_from(from_clause):
+    """Translate a rule source's FromClause to SQLite"""
+    from_clause = re.sub(r"cred\.fn_Scoped(\w+)\(@ValidationRunID\) (\w+)", r"cred.\1 \2", from_clause)
+
+    def best_candidate(match):
+        entity_type, key = re.search(r"dc\.EntityType = '(\w+)' AND dc\.EntityID = (\w+\.\w+)",
+                                     match.group(0)).groups()
+        return BEST_CANDIDATE_JOIN.format(entity_type=entity_type, key=key)
+
+    from_clause = re.sub(r"OUTER APPLY \(SELECT TOP 1 .*?\) dup", best_candidate, from_clause, flags=re.S)
+    from_clause = re.sub(r"DATEADD\((\w+),", r"DATEADD('\1',", from_clause)
+    return from_clause.replace('@ValidationRunID', str(RUN_ID))
+
+
+def _compare(a, b, fold):
+    a, b = fold(a.rstrip(' ')), fold(b.rstrip(' '))
+    return (a > b) - (a < b)
+
+
+def _dateadd(part, number, value):
+    if value is None:
+        return None
+    assert part == 'DAY', f"DATEADD({part}) is not supported by the stand-in"
+    return (datetime.fromisoformat(value) + timedelta(days=number)).isoformat(' ')
+
+
+def _column_type(column):
+    if column in ('IsActive', 'IsPrimary') or (column.endswith('ID') and column != 'TaxID'):
+        return 'INTEGER'
+    if column in DATE_COLUMNS:
+        return 'TEXT'
+    return 'TEXT COLLATE CI_AS'
+
+
+def _insert(conn, table, columns, rows, defaults):
+    statement = text(f"INSERT INTO cred.{table} ({', '.join(columns)}) "
+                     f"VALUES ({', '.join(':' + c for c in columns)})")
+    conn.execute(statement, [{c: row.get(c, defaults.get(c)) for c in columns} for row in rows])
+
+
+@pytest.fixture(scope='module')
+def engine():
+    """SQLite stand-in with a "cred" database holding the test records"""
+    engine = create_engine('sqlite://', poolclass=StaticPool)
+
+    @event.listens_for(engine, 'connect')
+    def register_tsql(dbapi_connection, connection_record):
+        dbapi_connection.create_collation('CI_AS', lambda a, b: _compare(a, b, str.lower))
+        dbapi_connection.create_collation('Latin1_General_CS_AS', lambda a, b: _compare(a, b, str))
+        dbapi_connection.create_function('LEN', 1, lambda v: None if v is None else len(str(v).rstrip(' ')))
+        dbapi_connection.create_function('GETDATE', 0, lambda: NOW.isoformat(' '))
+        dbapi_connection.create_function('DATEADD', 3, _dateadd)
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS cred")
+
+    defaults = {'IsActive': 1, 'IsPrimary': 1, 'Status': 'Active', 'CredentialType': 'License'}
+    with engine.begin() as conn:
+        for source, rows in (('Entity', ENTITIES), ('Provider', PROVIDERS), ('Credential', CREDENTIALS)):
+            columns = SOURCE_COLUMNS[source]
+            conn.execute(text(f"CREATE TABLE cred.{SOURCE_TABLES[source]} "
+                              f"({', '.join(f'{c} {_column_type(c)}' for c in columns)})"))
+            _insert(conn, SOURCE_TABLES[source], columns, rows, defaults)
+        conn.execute(text("CREATE TABLE cred.DuplicateCandidates (ValidationRunID INTEGER, EntityType TEXT, "
+                          "EntityID INTEGER, CandidateEntityID INTEGER, MatchScore INTEGER, MatchedOn TEXT)"))
+        conn.execute(text("INSERT INTO cred.DuplicateCandidates VALUES (:run, :type, :id, :candidate, :score, 'Name')"),
+                     [{'run': RUN_ID, 'type': t, 'id': i, 'candidate': c, 'score': s}
+                      for t, i, c, s in DUPLICATE_CANDIDATES])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def context(engine):
+    """Rule context over the stand-in, with the duplicate candidates scored above"""
+    frames = ValidationEngine(engine).load_frames()
+    ctx = RuleContext(frames['Provider'], frames['Credential'], frames['Entity'], now=NOW)
+    with engine.connect() as conn:
+        candidates = pd.read_sql(text("SELECT EntityType, EntityID, CandidateEntityID, MatchScore, MatchedOn "
+                                      "FROM cred.DuplicateCandidates"), conn)
+    ctx.provider_duplicates = best_candidates(candidates[candidates['EntityType'] == 'Provider'])
+    ctx.entity_duplicates = best_candidates(candidates[candidates['EntityType'] == 'Entity'])
+    return ctx
+
+
+def _python_failures(ctx, code):
+    rule = PYTHON_RULES[code]
+    frame = ctx.frame(rule.source)
+    _, failed = rule.evaluate(frame, ctx)
+    return set(frame.loc[failed, SOURCE_KEYS[rule.source][0]].astype(int))
+
+
+def _sql_failures(engine, code):
+    source, applies, fails = SQL_RULES[code]
+    key, from_clause = SQL_SOURCES[source]
+    where = f"({applies}) AND ({fails})" if applies else f"({fails})"
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT {key} FROM {_sqlite_from(from_clause)} WHERE {where}"))
+        return {row[0] for row in rows}
+
+
+@pytest.mark.parametrize('code', PARITY_RULES)
+def test_python_and_sql_flag_the_same_records(engine, context, code):
+    assert _python_failures(context, code) == _sql_failures(engine, code)
+
+
+@pytest.mark.parametrize('code, expected', [
+    ('PRV025', {2, 4}),
+    ('PRV029', {2, 4}),
+    ('CRED016', {2, 3}),
+    ('ENT019', {2}),
+    ('ENT022', {2}),
+])
+def test_case_rules_flag_mixed_case_values(engine, context, code, expected):
+    assert _python_failures(context, code) == expected
+    assert _sql_failures(engine, code) == expected
+
+
+def test_cross_entity_states_compare_case_insensitively(context):
+    assert _python_failures(context, 'CROSS003') == {3}
+
+
+def test_duplicate_rules_report_each_records_best_candidate(context):
+    assert _python_failures(context, 'DUP001') == {1, 2, 4, 5}
+    assert _python_failures(context, 'DUP002') == {3}
+    assert _python_failures(context, 'DUP003') == {1, 2}
+    assert _python_failures(context, 'DUP004') == {3}
@@ -0,0 +1,49 @@
+"""
+Run Summary Cache Tests
+Two caches over the same directory stand in for two processes on one machine
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from summary_cache import RunSummaryCache
+
+
+FAILURES = [{
+    'validation_result_id': np.int64(7),
+    'rule_code': 'PRV025',
+    'validation_date': datetime(2026, 1, 15, 12, 30),
+    'rule_name': None
+}]
+
+
+def test_round_trips_through_json(tmp_path):
+    RunSummaryCache(path=str(tmp_path)).put(1, 'failures', 100, version=0, value=FAILURES)
+
+    other = RunSummaryCache(path=str(tmp_path))
+    value = other.get(1, 'failures', 100, version=0)
+
+    assert value == [{
+        'validation_result_id': 7,
+        'rule_code': 'PRV025',
+        'validation_date': datetime(2026, 1, 15, 12, 30),
+        'rule_name': None
+    }]
+    assert other.stats()['disk_hits'] == 1
+    assert list(tmp_path.glob('run_1/*.json'))
+
+
+def test_memory_entry_of_older_version_is_not_served(tmp_path):
+    first = RunSummaryCache(path=str(tmp_path))
+    second = RunSummaryCache(path=str(tmp_path))
+    first.put(1, 'summary', version=0, value={'Provider_Fail': [{'rule_code': 'PRV025', 'count': 2}]})
+    assert first.get(1, 'summary', version=0) is not None
+
+    # Another process resolves results and caches the new summary
+    second.invalidate(1)
+    second.put(1, 'summary', version=1, value={})
+
+    assert first.get(1, 'summary', version=1) == {}
+    assert first.get(1, 'summary', version=2) is None
+    assert first.stats()['memory_hits'] == 1
@@ -4,116 +4,470 @@ Executes SQL validation rules and logs results
 Can be run manually or scheduled
 """
 
-import pyodbc
+import argparse
+import csv
+import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from config import CONNECTION_STRING, VALIDATION_RUN_TYPE_MANUAL, VALIDATION_RUN_TYPE_SCHEDULED
+import pandas as pd
+from db import connection, dispose_engine, raw_connection
+from summary_cache import get_summary_cache
+from telemetry import (
+    configure_logging, start_metrics_export, VALIDATION_CATEGORY_SECONDS, VALIDATION_RUN_SECONDS,
+    VALIDATION_UNIT_SECONDS
+)
+from config import (
+    VALIDATION_RUN_TYPE_MANUAL,
+    VALIDATION_RESULT_MODE, VALIDATION_PARALLEL_WORKERS, VALIDATION_SHARD_COUNT,
+    VALIDATION_SHARDED_SOURCES, VALIDATION_PROFILE_RULES, VALIDATION_PROFILE_BASELINE_RUNS,
+    VALIDATION_RULE_MAX_SKIP_DAYS, VALIDATION_RULE_COST_BUDGET_MS, FAILURE_EXPORT_PAGE_SIZE
+)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('validation_runner.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging('validation_runner.log')
 logger = logging.getLogger(__name__)
 
+# Columns of the rows yielded by iter_failure_pages and written by export_failures
+FAILURE_EXPORT_COLUMNS = [
+    'ValidationResultID', 'ValidationRunID', 'RuleCode', 'RuleName', 'RuleCategory',
+    'EntityType', 'EntityID', 'RecordID', 'ValidationStatus', 'Severity',
+    'FieldName', 'FieldValue', 'ErrorMessage', 'ValidationDate', 'Resolved'
+]
+FAILURE_EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Sets of cred.ValidationRunDelta
+DELTA_NEW = 'New'
+DELTA_PERSISTING = 'Persisting'
+DELTA_CLEARED = 'Cleared'
+
 
 class ValidationRunner:
     """Handles execution of validation rules"""
     
     def __init__(self):
-        """Initialize database connection"""
+        """Borrow a database connection from the shared pool"""
+        self.cache = get_summary_cache()
         try:
-            self.connection_string = CONNECTION_STRING
-            self.conn = pyodbc.connect(CONNECTION_STRING)
+            self.conn = raw_connection()
             logger.info("Database connection established")
         except Exception as e:
             logger.error(f"Failed to establish database connection: {str(e)}")
             raise
     
-    def run_all_validations(self, run_type=VALIDATION_RUN_TYPE_MANUAL):
-        """Execute all validation rules"""
-        logger.info(f"Starting validation run (Type: {run_type})...")
-        start_time = datetime.now()
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def run_all_validations(self, run_type=VALIDATION_RUN_TYPE_MANUAL,
+                            result_mode=VALIDATION_RESULT_MODE,
+                            profile_rules=VALIDATION_PROFILE_RULES, schedule_rules=False):
+        """Execute all validation rules
+        
+        The procedure commits each rule category/source unit with its checkpoint,
+        so a failed run keeps its completed units and can be resumed with
+        resume_validation_run. With schedule_rules only the rules whose outcome
+        can have changed are evaluated (see get_rule_schedule).
+        """
+        logger.info(f"Starting validation run (Type: {run_type}, Result Mode: {result_mode}, "
+                    f"Profiling: {profile_rules}, Scheduled Rules: {schedule_rules})...")
         
         try:
-            cursor = self.conn.cursor()
-            
-            # Execute the master validation stored procedure
-            cursor.execute("EXEC cred.sp_RunAllValidations ?", run_type)
-            
-            # Fetch results
-            results = cursor.fetchone()
+            results = self._execute_committing(
+                "EXEC cred.sp_RunAllValidations ?, ?, ?, ?, ?, ?", run_type, result_mode, profile_rules,
+                schedule_rules, VALIDATION_RULE_MAX_SKIP_DAYS, VALIDATION_RULE_COST_BUDGET_MS or None
+            )
             
             if results:
-                validation_run_id, run_start, run_end, total_rules, failures, warnings, passes, exec_time, status = results
-                
-                logger.info(f"Validation run completed:")
-                logger.info(f"  Run ID: {validation_run_id}")
-                logger.info(f"  Status: {status}")
-                logger.info(f"  Total Rules Run: {total_rules}")
-                logger.info(f"  Failures: {failures}")
-                logger.info(f"  Warnings: {warnings}")
-                logger.info(f"  Passes: {passes}")
-                logger.info(f"  Execution Time: {exec_time} seconds")
-                
-                # Commit transaction
-                self.conn.commit()
-                
-                return {
-                    'validation_run_id': validation_run_id,
-                    'status': status,
-                    'total_rules': total_rules,
-                    'failures': failures,
-                    'warnings': warnings,
-                    'passes': passes,
-                    'execution_time': exec_time
-                }
+                return self._summarize_run(results)
             else:
                 logger.warning("No results returned from validation run")
                 return None
                 
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Validation run failed: {str(e)}")
             raise
     
+    def resume_validation_run(self, validation_run_id, parallel=False,
+                              max_workers=VALIDATION_PARALLEL_WORKERS,
+                              profile_rules=VALIDATION_PROFILE_RULES):
+        """Resume a failed run from its checkpoints
+        
+        Only the units that had not committed are run; the run keeps its ID and
+        start time and is completed as if it had never failed.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT
+                SUM(CASE WHEN CheckpointStatus = 'Pending' THEN 1 ELSE 0 END),
+                COUNT(*)
+            FROM cred.ValidationRunCheckpoint
+            WHERE ValidationRunID = ?
+        """, validation_run_id)
+        pending, total = cursor.fetchone()
+        logger.info(f"Resuming validation run {validation_run_id}: "
+                    f"{pending or 0} of {total} units pending")
+        
+        if not parallel:
+            try:
+                results = self._execute_committing(
+                    "EXEC cred.sp_ResumeValidationRun ?, ?", validation_run_id, profile_rules
+                )
+                return self._summarize_run(results)
+            except Exception as e:
+                logger.error(f"Resumed validation run failed: {str(e)}")
+                raise
+        
+        try:
+            cursor.execute("EXEC cred.sp_ReopenValidationRun ?", validation_run_id)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to reopen validation run {validation_run_id}: {str(e)}")
+            raise
+        
+        return self._run_pending_units(validation_run_id, max_workers, profile_rules)
+    
+    def _execute_committing(self, sql, *params):
+        """Run a procedure that manages its own transactions and return its first row
+        
+        The pooled connection normally runs every statement inside one implicit
+        transaction, which would hold the procedure's per-unit commits open until
+        the end. Autocommit lets each COMMIT inside the procedure take effect.
+        """
+        dbapi_connection = self.conn.dbapi_connection
+        dbapi_connection.autocommit = True
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(sql, *params)
+            return cursor.fetchone()
+        finally:
+            dbapi_connection.autocommit = False
+    
+    def run_parallel_validations(self, run_type=VALIDATION_RUN_TYPE_MANUAL,
+                                 result_mode=VALIDATION_RESULT_MODE,
+                                 max_workers=VALIDATION_PARALLEL_WORKERS,
+                                 shard_count=VALIDATION_SHARD_COUNT,
+                                 profile_rules=VALIDATION_PROFILE_RULES, schedule_rules=False):
+        """Execute all validation rules across a bounded pool of worker threads
+        
+        Each rule category/source pair, split into key-range shards for the sources in
+        VALIDATION_SHARDED_SOURCES, runs and commits on a pooled connection under one
+        shared ValidationRunID. The totals are then reconciled into ValidationRunLog.
+        The units are checkpointed, so a failed run can be resumed.
+        """
+        logger.info(f"Starting parallel validation run (Type: {run_type}, Result Mode: {result_mode}, "
+                    f"Workers: {max_workers}, Shards: {shard_count})...")
+        validation_run_id = self.begin_validation_run(run_type, result_mode, shard_count, schedule_rules)
+        return self._run_pending_units(validation_run_id, max_workers, profile_rules)
+    
+    def begin_validation_run(self, run_type=VALIDATION_RUN_TYPE_MANUAL,
+                             result_mode=VALIDATION_RESULT_MODE, shard_count=1, schedule_rules=False):
+        """Log a Running validation run and record its units as Pending checkpoints
+        
+        The units are then run with run_validation_units or the worker pool and the
+        run finished with complete_validation_run. With schedule_rules the run
+        evaluates only the rules cred.sp_ScheduleValidationRules picks and carries
+        forward the others. Returns the ValidationRunID.
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            # Log the run, schedule its rules and build the incremental scope before any unit starts
+            cursor.execute("""
+                SET NOCOUNT ON;
+                DECLARE @ValidationRunID INT;
+                EXEC cred.sp_BeginValidationRun
+                    @RunType = ?,
+                    @ResultMode = ?,
+                    @ScheduleRules = ?,
+                    @MaxSkipDays = ?,
+                    @CostBudgetMs = ?,
+                    @ValidationRunID = @ValidationRunID OUTPUT;
+                SELECT @ValidationRunID;
+            """, run_type, result_mode, schedule_rules, VALIDATION_RULE_MAX_SKIP_DAYS,
+                VALIDATION_RULE_COST_BUDGET_MS or None)
+            validation_run_id = cursor.fetchone()[0]
+            
+            # Record the units as Pending checkpoints in the same transaction as the run,
+            # so a resume runs exactly the shards planned here
+            units = self._plan_validation_units(validation_run_id, shard_count)
+            cursor.executemany("""
+                INSERT INTO cred.ValidationRunCheckpoint (ValidationRunID, RuleCategory, SourceName, LowKey, HighKey)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(validation_run_id,) + unit for unit in units])
+            self.conn.commit()
+            logger.info(f"Validation run {validation_run_id} started with {len(units)} units")
+            return validation_run_id
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Validation run failed to start: {str(e)}")
+            raise
+    
+    def run_validation_units(self, validation_run_id, category=None,
+                             profile_rules=VALIDATION_PROFILE_RULES):
+        """Run a run's Pending units (optionally one rule category's) on this connection
+        
+        Each unit commits with its checkpoint; units already completed are skipped,
+        so the call can be retried. Returns the number of units run.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT CheckpointID
+                FROM cred.ValidationRunCheckpoint
+                WHERE ValidationRunID = ? AND CheckpointStatus = 'Pending'
+                    AND (? IS NULL OR RuleCategory = ?)
+                ORDER BY CheckpointID
+            """, validation_run_id, category, category)
+            checkpoint_ids = [row[0] for row in cursor.fetchall()]
+            self.conn.commit()
+            
+            for checkpoint_id in checkpoint_ids:
+                cursor.execute("EXEC cred.sp_RunValidationUnit ?, ?", checkpoint_id, profile_rules)
+                self.conn.commit()
+            
+            return len(checkpoint_ids)
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Validation units of run {validation_run_id} failed: {str(e)}")
+            raise
+    
+    def complete_validation_run(self, validation_run_id):
+        """Reconcile a run whose units have all completed and return its summary"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("EXEC cred.sp_CompleteValidationRun ?", validation_run_id)
+            results = cursor.fetchone()
+            self.conn.commit()
+            return self._summarize_run(results)
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to complete validation run {validation_run_id}: {str(e)}")
+            raise
+    
+    def fail_validation_run(self, validation_run_id, error_message):
+        """Mark a run Failed, keeping its completed units for a resume"""
+        cursor = self.conn.cursor()
+        cursor.execute("EXEC cred.sp_FailValidationRun ?, ?", validation_run_id, error_message)
+        self.conn.commit()
+    
+    def _run_pending_units(self, validation_run_id, max_workers, profile_rules):
+        """Run a run's Pending units across the worker pool and complete the run
+        
+        Each unit commits with its checkpoint on its own pooled connection. On
+        failure the run is marked Failed with its completed units kept.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT CheckpointID, RuleCategory, SourceName, LowKey, HighKey
+                FROM cred.ValidationRunCheckpoint
+                WHERE ValidationRunID = ? AND CheckpointStatus = 'Pending'
+                ORDER BY CheckpointID
+            """, validation_run_id)
+            units = [tuple(row) for row in cursor.fetchall()]
+            self.conn.commit()
+            logger.info(f"Validation run {validation_run_id}: dispatching {len(units)} units")
+            
+            def run_unit(unit):
+                with connection() as conn:
+                    conn.cursor().execute("EXEC cred.sp_RunValidationUnit ?, ?", unit[0], profile_rules)
+                    conn.commit()
+                return unit
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(run_unit, unit) for unit in units]
+                try:
+                    for future in as_completed(futures):
+                        _, category, source_name, low_key, high_key = future.result()
+                        logger.info(f"  Completed {category} rules on {source_name}"
+                                    + (f" keys {low_key}-{high_key}" if low_key is not None else ""))
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Parallel validation run failed: {str(e)}")
+            self.fail_validation_run(validation_run_id, str(e))
+            raise
+        
+        # Reconcile the per-rule tallies written by every worker
+        try:
+            return self.complete_validation_run(validation_run_id)
+        except Exception as e:
+            self.fail_validation_run(validation_run_id, str(e))
+            raise
+    
+    def get_rule_categories(self):
+        """Rule categories with active compiled rules, in run order"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT RuleCategory
+            FROM cred.ValidationRules
+            WHERE IsActive = 1 AND SourceName IS NOT NULL
+        """)
+        order = {'Provider': 1, 'Credential': 2, 'Entity': 3}
+        return sorted((row[0] for row in cursor.fetchall()), key=lambda category: (order.get(category, 4), category))
+    
+    def _plan_validation_units(self, validation_run_id, shard_count):
+        """List (category, source, low key, high key) work units of a run's scheduled rules"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT RuleCategory, SourceName, COUNT(*) AS RuleCount
+            FROM cred.fn_ScheduledRules(?)
+            GROUP BY RuleCategory, SourceName
+            ORDER BY COUNT(*) DESC
+        """, validation_run_id)
+        pairs = cursor.fetchall()
+        
+        shards = {}
+        units = []
+        for category, source_name, rule_count in pairs:
+            if shard_count > 1 and source_name in VALIDATION_SHARDED_SOURCES:
+                if source_name not in shards:
+                    cursor.execute("EXEC cred.sp_GetValidationShards ?, ?", source_name, shard_count)
+                    shards[source_name] = [(row[1], row[2]) for row in cursor.fetchall()]
+                for low_key, high_key in shards[source_name]:
+                    units.append((category, source_name, low_key, high_key))
+            else:
+                units.append((category, source_name, None, None))
+        
+        return units
+    
+    def _summarize_run(self, results):
+        """Log a run summary row and return it as a dictionary"""
+        (validation_run_id, run_start, run_end, total_rules, failures, warnings, passes, exec_time, status,
+         rules_skipped) = results
+        
+        logger.info("Validation run completed:")
+        logger.info(f"  Run ID: {validation_run_id}")
+        logger.info(f"  Status: {status}")
+        logger.info(f"  Total Rules Run: {total_rules}")
+        if rules_skipped:
+            logger.info(f"  Rules Skipped (carried forward): {rules_skipped}")
+        logger.info(f"  Failures: {failures}")
+        logger.info(f"  Warnings: {warnings}")
+        logger.info(f"  Passes: {passes}")
+        logger.info(f"  Execution Time: {exec_time} seconds")
+        self._record_run_metrics(validation_run_id, exec_time)
+        delta = self._apply_run_delta(validation_run_id)
+        
+        return {
+            'validation_run_id': validation_run_id,
+            'status': status,
+            'total_rules': total_rules,
+            'rules_skipped': rules_skipped,
+            'failures': failures,
+            'warnings': warnings,
+            'passes': passes,
+            'execution_time': exec_time,
+            'delta': delta
+        }
+    
+    def _apply_run_delta(self, validation_run_id):
+        """Log a completed run's delta and drop the cached summaries of its base run
+        
+        cred.sp_CompleteValidationRun resolves the base run's cleared issues, so
+        the base run's cached failure details are stale.
+        """
+        try:
+            delta = self.get_run_delta(validation_run_id)
+        except Exception as e:
+            logger.warning(f"Failed to read the delta of validation run {validation_run_id}: {str(e)}")
+            return None
+        if delta is None:
+            return None
+        
+        logger.info(f"  Issues vs run {delta['base_run_id']}: {delta['new']} new, "
+                    f"{delta['persisting']} persisting, {delta['cleared']} cleared "
+                    f"({delta['auto_resolved']} auto-resolved)")
+        if self.cache is not None and delta['base_run_id'] is not None and delta['auto_resolved']:
+            self.cache.invalidate(delta['base_run_id'])
+        return delta
+    
+    def _record_run_metrics(self, validation_run_id, exec_time):
+        """Export the run's duration and the unit timings of its checkpoints"""
+        VALIDATION_RUN_SECONDS.set(exec_time or 0, engine='SQL')
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT RuleCategory, ElapsedMs
+                FROM cred.ValidationRunCheckpoint
+                WHERE ValidationRunID = ? AND ElapsedMs IS NOT NULL
+            """, validation_run_id)
+            category_seconds = {}
+            for category, elapsed_ms in cursor.fetchall():
+                VALIDATION_UNIT_SECONDS.observe(elapsed_ms / 1000, category=category)
+                category_seconds[category] = category_seconds.get(category, 0) + elapsed_ms / 1000
+            self.conn.commit()
+            for category, seconds in category_seconds.items():
+                VALIDATION_CATEGORY_SECONDS.set(seconds, category=category)
+        except Exception as e:
+            # Metrics never fail a run
+            logger.warning(f"Failed to record metrics of validation run {validation_run_id}: {str(e)}")
+    
     def get_validation_summary(self, validation_run_id=None):
-        """Get summary of validation results"""
+        """Get summary of validation results from the per-rule run tallies
+        
+        Summaries of completed runs are cached (see summary_cache.py)
+        """
+        if validation_run_id:
+            version = self._cache_version(validation_run_id)
+            cached = self._cached(validation_run_id, version, 'summary')
+            if cached is not None:
+                return cached
+        
         try:
             cursor = self.conn.cursor()
             
             if validation_run_id:
                 query = """
                     SELECT 
-                        RuleCode,
-                        RuleCategory,
-                        ValidationStatus,
-                        COUNT(*) as Count,
-                        Severity
-                    FROM cred.ValidationResults vr
-                    INNER JOIN cred.ValidationRules vrules ON vr.RuleID = vrules.RuleID
-                    WHERE vr.ValidationRunID = ?
-                    GROUP BY RuleCode, RuleCategory, ValidationStatus, Severity
-                    ORDER BY RuleCategory, ValidationStatus, Severity
+                        vrules.RuleCode,
+                        vrules.RuleCategory,
+                        counts.ValidationStatus,
+                        SUM(counts.StatusCount) as Count,
+                        vrules.Severity
+                    FROM cred.ValidationRuleRunStats stats
+                    INNER JOIN cred.ValidationRules vrules ON stats.RuleID = vrules.RuleID
+                    CROSS APPLY (VALUES ('Pass', stats.PassCount),
+                                        ('Fail', stats.FailCount),
+                                        ('Warning', stats.WarningCount)) counts(ValidationStatus, StatusCount)
+                    WHERE stats.ValidationRunID = ?
+                    GROUP BY vrules.RuleCode, vrules.RuleCategory, counts.ValidationStatus, vrules.Severity
+                    HAVING SUM(counts.StatusCount) > 0
+                    ORDER BY vrules.RuleCategory, counts.ValidationStatus, vrules.Severity
                 """
                 cursor.execute(query, validation_run_id)
             else:
                 query = """
                     SELECT TOP 100
-                        RuleCode,
-                        RuleCategory,
-                        ValidationStatus,
-                        COUNT(*) as Count,
-                        Severity
-                    FROM cred.ValidationResults vr
-                    INNER JOIN cred.ValidationRules vrules ON vr.RuleID = vrules.RuleID
-                    WHERE vr.ValidationDate >= DATEADD(DAY, -7, GETDATE())
-                    GROUP BY RuleCode, RuleCategory, ValidationStatus, Severity
-                    ORDER BY ValidationDate DESC, RuleCategory, ValidationStatus
+                        vrules.RuleCode,
+                        vrules.RuleCategory,
+                        counts.ValidationStatus,
+                        SUM(counts.StatusCount) as Count,
+                        vrules.Severity
+                    FROM cred.ValidationRuleRunStats stats
+                    INNER JOIN cred.ValidationRunLog runs ON stats.ValidationRunID = runs.RunID
+                    INNER JOIN cred.ValidationRules vrules ON stats.RuleID = vrules.RuleID
+                    CROSS APPLY (VALUES ('Pass', stats.PassCount),
+                                        ('Fail', stats.FailCount),
+                                        ('Warning', stats.WarningCount)) counts(ValidationStatus, StatusCount)
+                    WHERE runs.RunStartTime >= DATEADD(DAY, -7, GETDATE())
+                        AND runs.RunStatus = 'Completed'
+                        AND runs.RunType <> 'OnDemand'
+                    GROUP BY vrules.RuleCode, vrules.RuleCategory, counts.ValidationStatus, vrules.Severity
+                    HAVING SUM(counts.StatusCount) > 0
+                    ORDER BY MAX(runs.RunStartTime) DESC, vrules.RuleCategory, counts.ValidationStatus
                 """
                 cursor.execute(query)
             
@@ -131,6 +485,8 @@ class ValidationRunner:
                     'severity': severity
                 })
             
+            if validation_run_id:
+                self._cache_put(validation_run_id, version, 'summary', value=summary)
             return summary
             
         except Exception as e:
@@ -138,11 +494,27 @@ class ValidationRunner:
             raise
     
     def get_failure_details(self, validation_run_id=None, limit=100):
-        """Get detailed failure information"""
+        """Get detailed failure information (read from the archive for archived runs)
+        
+        Details of completed runs are cached until their results are resolved
+        """
+        if validation_run_id:
+            version = self._cache_version(validation_run_id)
+            cached = self._cached(validation_run_id, version, 'failures', limit)
+            if cached is not None:
+                return cached
+        
         try:
             cursor = self.conn.cursor()
             
             if validation_run_id:
+                archived = self._read_archived_results(validation_run_id, ('Fail', 'Warning'),
+                                                       unresolved_only=True)
+                if archived is not None:
+                    failures = self._archived_failure_details(archived, limit)
+                    self._cache_put(validation_run_id, version, 'failures', limit, value=failures)
+                    return failures
+                
                 query = """
                     SELECT TOP (?)
                         vr.ValidationResultID,
@@ -177,6 +549,9 @@ class ValidationRunner:
                     WHERE vr.ValidationStatus IN ('Fail', 'Warning')
                         AND vr.Resolved = 0
                         AND vr.ValidationDate >= DATEADD(DAY, -7, GETDATE())
+                        AND EXISTS (SELECT 1 FROM cred.ValidationRunLog runs
+                                    WHERE runs.RunID = vr.ValidationRunID AND runs.RunStatus = 'Completed'
+                                        AND runs.RunType <> 'OnDemand')
                     ORDER BY vr.Severity DESC, vr.ValidationDate DESC
                 """
                 cursor.execute(query, limit)
@@ -196,48 +571,765 @@ class ValidationRunner:
                     'rule_name': row[7]
                 })
             
+            if validation_run_id:
+                self._cache_put(validation_run_id, version, 'failures', limit, value=failures)
             return failures
             
         except Exception as e:
             logger.error(f"Failed to get failure details: {str(e)}")
             raise
     
+    def resolve_results(self, validation_result_ids, resolved_by, resolution_notes=None):
+        """Mark validation results resolved
+        
+        Invalidates the cached summaries of the affected runs and refreshes their
+        dashboard rollups. Returns the number of results updated. Results of
+        archived runs are read from the Parquet archive and cannot be resolved;
+        they raise ValueError and nothing is updated.
+        """
+        try:
+            cursor = self.conn.cursor()
+            validation_result_ids = list(dict.fromkeys(validation_result_ids))
+            run_ids = set()
+            updated = 0
+            missing = 0
+            
+            # Stay well under the 2,100 parameter limit of one statement
+            for start in range(0, len(validation_result_ids), 1000):
+                batch = validation_result_ids[start:start + 1000]
+                cursor.execute(f"""
+                    SELECT r.ValidationRunID, a.ArchiveStatus
+                    FROM cred.ValidationResults r
+                    LEFT JOIN cred.ValidationResultArchive a
+                        ON a.ValidationRunID = r.ValidationRunID
+                        AND a.ArchiveStatus IN ('Archived', 'Purged')
+                    WHERE r.ValidationResultID IN ({', '.join('?' * len(batch))})
+                """, *batch)
+                rows = cursor.fetchall()
+                archived = sorted({row[0] for row in rows if row[1] is not None})
+                if archived:
+                    raise ValueError(f"Validation runs {', '.join(map(str, archived))} are archived; "
+                                     f"their results live in the Parquet archive and cannot be resolved")
+                missing += len(batch) - len(rows)
+                
+                cursor.execute(f"""
+                    UPDATE cred.ValidationResults
+                    SET Resolved = 1, ResolvedDate = GETDATE(), ResolvedBy = ?, ResolutionNotes = ?
+                    OUTPUT inserted.ValidationRunID
+                    WHERE Resolved = 0 AND ValidationResultID IN ({', '.join('?' * len(batch))})
+                """, resolved_by, resolution_notes, *batch)
+                rows = cursor.fetchall()
+                updated += len(rows)
+                run_ids.update(row[0] for row in rows if row[0] is not None)
+            
+            for run_id in sorted(run_ids):
+                cursor.execute("EXEC cred.sp_RefreshValidationRollups @ValidationRunID = ?", run_id)
+                # Cached summaries of the run, in every process, are now stale
+                cursor.execute("UPDATE cred.ValidationRunLog SET ResultsVersion = ResultsVersion + 1 WHERE RunID = ?",
+                               run_id)
+            self.conn.commit()
+            
+            if self.cache is not None:
+                for run_id in run_ids:
+                    self.cache.invalidate(run_id)
+            
+            if missing:
+                logger.warning(f"{missing} validation results were not found; results of purged "
+                               f"runs live only in the Parquet archive")
+            logger.info(f"Resolved {updated} validation results across {len(run_ids)} runs")
+            return updated
+            
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to resolve validation results: {str(e)}")
+            raise
+    
+    def get_run_delta(self, validation_run_id=None):
+        """New, persisting and cleared issue counts of a run against its base run
+        
+        Returns None for runs that were not diffed (OnDemand runs, runs completed
+        before diffs existed, or whose base run was archived).
+        """
+        validation_run_id = validation_run_id or self.get_latest_run_id()
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DeltaBaseRunID, NewIssues, PersistingIssues, ClearedIssues, AutoResolvedIssues
+            FROM cred.ValidationRunLog
+            WHERE RunID = ?
+        """, validation_run_id)
+        row = cursor.fetchone()
+        self.conn.commit()
+        if row is None or row[1] is None:
+            return None
+        return {
+            'validation_run_id': validation_run_id,
+            'base_run_id': row[0],
+            'new': row[1],
+            'persisting': row[2],
+            'cleared': row[3],
+            'auto_resolved': row[4] or 0
+        }
+    
+    def get_delta_details(self, validation_run_id=None, statuses=(DELTA_NEW, DELTA_CLEARED), limit=100):
+        """Issues of a run's delta sets (default: new and cleared), most severe first
+        
+        Reads only cred.ValidationRunDelta, so it stays cheap however long the
+        result history is, and works after the base run has been archived.
+        """
+        try:
+            validation_run_id = validation_run_id or self.get_latest_run_id()
+            statuses = list(statuses)
+            cursor = self.conn.cursor()
+            cursor.execute(f"""
+                SELECT TOP (?)
+                    delta.DeltaStatus,
+                    delta.RuleCode,
+                    vrules.RuleName,
+                    delta.EntityType,
+                    delta.EntityID,
+                    delta.RecordID,
+                    delta.ValidationStatus,
+                    delta.Severity,
+                    delta.ValidationResultID,
+                    delta.BaseResultID
+                FROM cred.ValidationRunDelta delta
+                INNER JOIN cred.ValidationRules vrules ON delta.RuleID = vrules.RuleID
+                WHERE delta.ValidationRunID = ?
+                    AND delta.DeltaStatus IN ({', '.join('?' * len(statuses))})
+                ORDER BY
+                    CASE delta.Severity WHEN 'Critical' THEN 1 WHEN 'High' THEN 2
+                                        WHEN 'Medium' THEN 3 ELSE 4 END,
+                    delta.DeltaStatus, delta.RuleCode, delta.ValidationRunDeltaID
+            """, limit, validation_run_id, *statuses)
+            
+            details = [{
+                'delta_status': row[0],
+                'rule_code': row[1],
+                'rule_name': row[2],
+                'entity_type': row[3],
+                'entity_id': row[4],
+                'record_id': row[5],
+                'validation_status': row[6],
+                'severity': row[7],
+                'validation_result_id': row[8],
+                'base_result_id': row[9]
+            } for row in cursor.fetchall()]
+            self.conn.commit()
+            return details
+            
+        except Exception as e:
+            logger.error(f"Failed to get delta details: {str(e)}")
+            raise
+    
+    def diff_validation_run(self, validation_run_id, auto_resolve=True):
+        """(Re)compute a completed run's delta against its base run
+        
+        Runs complete with their delta already computed; this backfills older
+        runs or recomputes one after its base run's results changed. Returns the
+        delta counts.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("EXEC cred.sp_DiffValidationRun @ValidationRunID = ?, @AutoResolve = ?",
+                           validation_run_id, auto_resolve)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to diff validation run {validation_run_id}: {str(e)}")
+            raise
+        return self._apply_run_delta(validation_run_id)
+    
+    def log_delta_report(self, validation_run_id=None, limit=10):
+        """Log a run's delta counts and its most severe new and cleared issues"""
+        validation_run_id = validation_run_id or self.get_latest_run_id()
+        delta = self.get_run_delta(validation_run_id)
+        if delta is None:
+            logger.warning(f"Validation run {validation_run_id} has no delta")
+            return
+        
+        logger.info(f"Delta of run {validation_run_id} against run {delta['base_run_id']}: "
+                    f"{delta['new']} new, {delta['persisting']} persisting, "
+                    f"{delta['cleared']} cleared ({delta['auto_resolved']} auto-resolved)")
+        for status in (DELTA_NEW, DELTA_CLEARED):
+            logger.info(f"{status} issues:")
+            details = self.get_delta_details(validation_run_id, statuses=[status], limit=limit)
+            if not details:
+                logger.info("  None")
+            for detail in details:
+                logger.info(f"  {detail['rule_code']:<10} {detail['severity'] or '':<9} "
+                            f"{detail['entity_type']} {detail['record_id']}")
+    
+    def get_rule_schedule(self, validation_run_id=None):
+        """Whether each active rule was evaluated or skipped by a run, and why
+        
+        Returns an empty list for runs started before rules were scheduled.
+        """
+        validation_run_id = validation_run_id or self.get_latest_run_id()
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT s.RuleCode, vrules.RuleCategory, s.IsScheduled, s.ScheduleReason,
+                   s.EstimatedCostMs, s.LastEvaluatedTime
+            FROM cred.ValidationRunRuleSchedule s
+            INNER JOIN cred.ValidationRules vrules ON s.RuleID = vrules.RuleID
+            WHERE s.ValidationRunID = ?
+            ORDER BY s.IsScheduled DESC, vrules.RuleCategory, s.RuleCode
+        """, validation_run_id)
+        schedule = [{
+            'rule_code': row[0],
+            'rule_category': row[1],
+            'scheduled': bool(row[2]),
+            'reason': row[3],
+            'estimated_cost_ms': row[4],
+            'last_evaluated': row[5]
+        } for row in cursor.fetchall()]
+        self.conn.commit()
+        return schedule
+    
+    def log_schedule_report(self, validation_run_id=None):
+        """Log how many of a run's rules were evaluated and skipped, by reason"""
+        validation_run_id = validation_run_id or self.get_latest_run_id()
+        schedule = self.get_rule_schedule(validation_run_id)
+        if not schedule:
+            logger.warning(f"Validation run {validation_run_id} has no rule schedule")
+            return
+        
+        evaluated = [rule for rule in schedule if rule['scheduled']]
+        logger.info(f"Rule schedule of run {validation_run_id}: {len(evaluated)} evaluated, "
+                    f"{len(schedule) - len(evaluated)} skipped, estimated "
+                    f"{sum(rule['estimated_cost_ms'] or 0 for rule in evaluated) / 1000:.1f} seconds")
+        reasons = pd.Series([rule['reason'] for rule in schedule]).value_counts()
+        for reason, count in reasons.items():
+            logger.info(f"  {reason:<40} {count}")
+    
+    def _cache_version(self, validation_run_id):
+        """Results version of a completed run, or None when its values cannot be cached
+        
+        Read before the values themselves, so a resolution in between leaves the
+        cached values on the older version (running runs still change).
+        """
+        if self.cache is None:
+            return None
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT RunStatus, ResultsVersion FROM cred.ValidationRunLog WHERE RunID = ?",
+                       validation_run_id)
+        row = cursor.fetchone()
+        return row[1] if row and row[0] == 'Completed' else None
+    
+    def _cached(self, validation_run_id, version, kind, *args):
+        """Cached value of a completed run at its results version, or None"""
+        if version is None:
+            return None
+        return self.cache.get(validation_run_id, kind, *args, version=version)
+    
+    def _cache_put(self, validation_run_id, version, kind, *args, value):
+        """Cache a value of a completed run read at its results version"""
+        if version is not None:
+            self.cache.put(validation_run_id, kind, *args, version=version, value=value)
+    
+    def get_run_results(self, validation_run_id, statuses=None):
+        """Get a run's ValidationResults rows as a DataFrame, hot or archived"""
+        try:
+            archived = self._read_archived_results(validation_run_id, statuses)
+            if archived is not None:
+                return archived
+            
+            query = "SELECT * FROM cred.ValidationResults WHERE ValidationRunID = ?"
+            params = [validation_run_id]
+            if statuses:
+                query += f" AND ValidationStatus IN ({', '.join('?' * len(statuses))})"
+                params.extend(statuses)
+            cursor = self.conn.cursor()
+            cursor.execute(query + " ORDER BY ValidationResultID", params)
+            columns = [column[0] for column in cursor.description]
+            return pd.DataFrame.from_records([tuple(row) for row in cursor.fetchall()], columns=columns)
+            
+        except Exception as e:
+            logger.error(f"Failed to get run results: {str(e)}")
+            raise
+    
+    def iter_failure_pages(self, validation_run_id, rule_codes=None, categories=None,
+                           severities=None, entity_types=None, unresolved_only=True,
+                           page_size=FAILURE_EXPORT_PAGE_SIZE):
+        """Yield a run's Fail and Warning rows as pages of tuples (FAILURE_EXPORT_COLUMNS)
+        
+        Pages are keyed on ValidationResultID (WHERE ValidationResultID > last ID)
+        rather than offsets, so every page is an index seek and only one page is
+        held in memory. Archived runs are paged from their Parquet file.
+        """
+        if self._is_archived(validation_run_id):
+            yield from self._iter_archived_failure_pages(
+                validation_run_id, rule_codes, categories, severities, entity_types,
+                unresolved_only, page_size
+            )
+            return
+        
+        conditions = [
+            "vr.ValidationRunID = ?",
+            "vr.ValidationResultID > ?",
+            "vr.ValidationStatus IN ('Fail', 'Warning')"
+        ]
+        filter_params = []
+        if unresolved_only:
+            conditions.append("vr.Resolved = 0")
+        for column, values in (('vr.RuleCode', rule_codes), ('vrules.RuleCategory', categories),
+                               ('vr.Severity', severities), ('vr.EntityType', entity_types)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                filter_params.extend(values)
+        
+        query = f"""
+            SELECT TOP (?)
+                vr.ValidationResultID,
+                vr.ValidationRunID,
+                vr.RuleCode,
+                vrules.RuleName,
+                vrules.RuleCategory,
+                vr.EntityType,
+                vr.EntityID,
+                vr.RecordID,
+                vr.ValidationStatus,
+                vr.Severity,
+                vr.FieldName,
+                vr.FieldValue,
+                vr.ErrorMessage,
+                vr.ValidationDate,
+                vr.Resolved
+            FROM cred.ValidationResults vr
+            INNER JOIN cred.ValidationRules vrules ON vr.RuleID = vrules.RuleID
+            WHERE {' AND '.join(conditions)}
+            ORDER BY vr.ValidationResultID
+        """
+        
+        try:
+            cursor = self.conn.cursor()
+            last_result_id = 0
+            while True:
+                cursor.execute(query, page_size, validation_run_id, last_result_id, *filter_params)
+                page = [tuple(row) for row in cursor.fetchall()]
+                if not page:
+                    return
+                yield page
+                if len(page) < page_size:
+                    return
+                last_result_id = page[-1][0]
+                
+        except Exception as e:
+            logger.error(f"Failed to page failures for run {validation_run_id}: {str(e)}")
+            raise
+    
+    def _iter_archived_failure_pages(self, validation_run_id, rule_codes, categories, severities,
+                                     entity_types, unresolved_only, page_size):
+        """Page an archived run's failures from its Parquet file, in the same row shape"""
+        from result_archive import ResultArchive
+        
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT RuleID, RuleName, RuleCategory FROM cred.ValidationRules")
+        rules = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        rule_ids = None
+        if categories:
+            rule_ids = [rule_id for rule_id, (_, category) in rules.items() if category in categories]
+        
+        batches = ResultArchive().iter_run_batches(
+            validation_run_id, batch_size=page_size, statuses=('Fail', 'Warning'),
+            unresolved_only=unresolved_only, rule_ids=rule_ids, rule_codes=rule_codes or None,
+            severities=severities or None, entity_types=entity_types or None
+        )
+        for batch in batches:
+            page = []
+            for row in batch.to_pylist():
+                rule_name, rule_category = rules.get(row['RuleID'], (None, None))
+                row['RuleName'] = rule_name
+                row['RuleCategory'] = rule_category
+                page.append(tuple(row[column] for column in FAILURE_EXPORT_COLUMNS))
+            yield page
+    
+    def iter_failures(self, validation_run_id, **filters):
+        """Yield a run's failures one dict at a time; filters as for iter_failure_pages"""
+        for page in self.iter_failure_pages(validation_run_id, **filters):
+            for row in page:
+                yield dict(zip(FAILURE_EXPORT_COLUMNS, row))
+    
+    def export_failures(self, validation_run_id, path, file_format=None, **filters):
+        """Stream a run's failures to a CSV, JSON-lines or Parquet file
+        
+        The format defaults to the file extension. filters are those of
+        iter_failure_pages. Returns the number of rows written.
+        """
+        file_format = (file_format or os.path.splitext(path)[1].lstrip('.')).lower()
+        if file_format not in FAILURE_EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}' "
+                             f"(expected one of {', '.join(FAILURE_EXPORT_FORMATS)})")
+        
+        logger.info(f"Exporting failures of run {validation_run_id} to {path} ({file_format})...")
+        start_time = datetime.now()
+        pages = self.iter_failure_pages(validation_run_id, **filters)
+        
+        try:
+            if file_format == 'csv':
+                row_count = self._write_failures_csv(pages, path)
+            elif file_format == 'jsonl':
+                row_count = self._write_failures_jsonl(pages, path)
+            else:
+                row_count = self._write_failures_parquet(pages, path)
+            
+        except Exception as e:
+            logger.error(f"Failed to export failures: {str(e)}")
+            raise
+        
+        exec_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Exported {row_count} failures in {exec_time:.2f} seconds")
+        return row_count
+    
+    def _write_failures_csv(self, pages, path):
+        row_count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as export_file:
+            writer = csv.writer(export_file)
+            writer.writerow(FAILURE_EXPORT_COLUMNS)
+            for page in pages:
+                writer.writerows(page)
+                row_count += len(page)
+        return row_count
+    
+    def _write_failures_jsonl(self, pages, path):
+        row_count = 0
+        with open(path, 'w', encoding='utf-8') as export_file:
+            for page in pages:
+                for row in page:
+                    export_file.write(json.dumps(dict(zip(FAILURE_EXPORT_COLUMNS, row)), default=str))
+                    export_file.write('\n')
+                row_count += len(page)
+        return row_count
+    
+    def _write_failures_parquet(self, pages, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        column_types = {
+            'ValidationResultID': pa.int64(),
+            'ValidationRunID': pa.int32(),
+            'EntityID': pa.int32(),
+            'ValidationDate': pa.timestamp('us'),
+            'Resolved': pa.bool_()
+        }
+        schema = pa.schema([(column, column_types.get(column, pa.string()))
+                            for column in FAILURE_EXPORT_COLUMNS])
+        row_count = 0
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            for page in pages:
+                columns = zip(*page)
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                row_count += len(page)
+        return row_count
+    
+    def _is_archived(self, validation_run_id):
+        """Whether a run's results have been moved to the Parquet archive"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM cred.ValidationResultArchive
+            WHERE ValidationRunID = ? AND ArchiveStatus IN ('Archived', 'Purged')
+        """, validation_run_id)
+        return cursor.fetchone() is not None
+    
+    def _read_archived_results(self, validation_run_id, statuses=None, unresolved_only=False):
+        """Results of an archived run from its Parquet file, or None while the run is hot"""
+        if not self._is_archived(validation_run_id):
+            return None
+        
+        # pyarrow is only needed once runs have been archived
+        from result_archive import ResultArchive
+        return ResultArchive().read_run_results(validation_run_id, statuses=statuses,
+                                                unresolved_only=unresolved_only)
+    
+    def _archived_failure_details(self, results, limit):
+        """Shape archived Fail/Warning rows like the rows read from ValidationResults"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT RuleID, RuleName FROM cred.ValidationRules")
+        rule_names = {row[0]: row[1] for row in cursor.fetchall()}
+        
+        results = results.sort_values(['Severity', 'ValidationDate'], ascending=False).head(limit)
+        return [{
+            'validation_result_id': row.ValidationResultID,
+            'rule_code': row.RuleCode,
+            'entity_type': row.EntityType,
+            'record_id': row.RecordID,
+            'error_message': row.ErrorMessage,
+            'severity': row.Severity,
+            'validation_date': row.ValidationDate,
+            'rule_name': rule_names.get(row.RuleID)
+        } for row in results.itertuples(index=False)]
+    
+    def get_rule_timings(self, validation_run_id):
+        """Get the per-rule timings recorded for a run, summed across shards"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT
+                    vrules.RuleCode,
+                    vrules.RuleCategory,
+                    SUM(t.ElapsedMs) AS ElapsedMs,
+                    SUM(t.RowsScanned) AS RowsScanned,
+                    SUM(t.RowsEmitted) AS RowsEmitted,
+                    MIN(CAST(t.IsolatedTiming AS INT)) AS IsolatedTiming
+                FROM cred.ValidationRuleTiming t
+                INNER JOIN cred.ValidationRules vrules ON t.RuleID = vrules.RuleID
+                WHERE t.ValidationRunID = ?
+                GROUP BY vrules.RuleCode, vrules.RuleCategory
+                ORDER BY SUM(t.ElapsedMs) DESC, vrules.RuleCode
+            """, validation_run_id)
+            
+            return [{
+                'rule_code': row[0],
+                'rule_category': row[1],
+                'elapsed_ms': row[2],
+                'rows_scanned': row[3],
+                'rows_emitted': row[4],
+                'isolated_timing': bool(row[5])
+            } for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Failed to get rule timings: {str(e)}")
+            raise
+    
+    def get_slowest_rules(self, validation_run_id=None, limit=10):
+        """Get the slowest rules of a run (defaults to the latest profiled run)"""
+        validation_run_id = validation_run_id or self._latest_timed_run_id()
+        if validation_run_id is None:
+            return []
+        return self.get_rule_timings(validation_run_id)[:limit]
+    
+    def get_rule_regressions(self, validation_run_id=None,
+                             baseline_runs=VALIDATION_PROFILE_BASELINE_RUNS, limit=10):
+        """Get the rules that slowed down most against a trailing baseline
+        
+        The baseline is each rule's average over the previous completed runs of the
+        same run type and result mode, timed the same way (fused or isolated).
+        """
+        validation_run_id = validation_run_id or self._latest_timed_run_id()
+        if validation_run_id is None:
+            return []
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                WITH run_timing AS (
+                    SELECT ValidationRunID, RuleID,
+                           MIN(CAST(IsolatedTiming AS INT)) AS IsolatedTiming,
+                           SUM(ElapsedMs) AS ElapsedMs,
+                           SUM(RowsScanned) AS RowsScanned
+                    FROM cred.ValidationRuleTiming
+                    GROUP BY ValidationRunID, RuleID
+                ),
+                target_run AS (
+                    SELECT RunID, RunType, ResultMode
+                    FROM cred.ValidationRunLog
+                    WHERE RunID = ?
+                ),
+                baseline_run AS (
+                    SELECT TOP (?) runs.RunID
+                    FROM cred.ValidationRunLog runs
+                    INNER JOIN target_run ON runs.RunType = target_run.RunType
+                        AND runs.ResultMode = target_run.ResultMode
+                        AND runs.RunID < target_run.RunID
+                    WHERE runs.RunStatus = 'Completed'
+                        AND EXISTS (SELECT 1 FROM cred.ValidationRuleTiming t WHERE t.ValidationRunID = runs.RunID)
+                    ORDER BY runs.RunID DESC
+                ),
+                baseline AS (
+                    SELECT rt.RuleID, rt.IsolatedTiming,
+                           AVG(CAST(rt.ElapsedMs AS FLOAT)) AS BaselineMs,
+                           AVG(CAST(rt.RowsScanned AS FLOAT)) AS BaselineRowsScanned,
+                           COUNT(*) AS BaselineRuns
+                    FROM run_timing rt
+                    INNER JOIN baseline_run ON rt.ValidationRunID = baseline_run.RunID
+                    GROUP BY rt.RuleID, rt.IsolatedTiming
+                )
+                SELECT TOP (?)
+                    vrules.RuleCode,
+                    vrules.RuleCategory,
+                    cur.ElapsedMs,
+                    baseline.BaselineMs,
+                    cur.ElapsedMs / NULLIF(baseline.BaselineMs, 0) AS SlowdownRatio,
+                    cur.RowsScanned,
+                    baseline.BaselineRowsScanned,
+                    baseline.BaselineRuns
+                FROM run_timing cur
+                INNER JOIN target_run ON cur.ValidationRunID = target_run.RunID
+                INNER JOIN baseline ON cur.RuleID = baseline.RuleID
+                    AND cur.IsolatedTiming = baseline.IsolatedTiming
+                INNER JOIN cred.ValidationRules vrules ON cur.RuleID = vrules.RuleID
+                WHERE cur.ElapsedMs > baseline.BaselineMs
+                ORDER BY cur.ElapsedMs - baseline.BaselineMs DESC, vrules.RuleCode
+            """, validation_run_id, baseline_runs, limit)
+            
+            return [{
+                'rule_code': row[0],
+                'rule_category': row[1],
+                'elapsed_ms': row[2],
+                'baseline_ms': row[3],
+                'slowdown_ratio': row[4],
+                'rows_scanned': row[5],
+                'baseline_rows_scanned': row[6],
+                'baseline_runs': row[7]
+            } for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Failed to get rule regressions: {str(e)}")
+            raise
+    
+    def get_latest_run_id(self):
+        """ID of the latest completed validation run (OnDemand runs excluded)"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT MAX(RunID) FROM cred.ValidationRunLog
+            WHERE RunStatus = 'Completed' AND RunType <> 'OnDemand'
+        """)
+        validation_run_id = cursor.fetchone()[0]
+        if validation_run_id is None:
+            raise ValueError("No completed validation run found")
+        return validation_run_id
+    
+    def _latest_timed_run_id(self):
+        """ID of the latest completed run with rule timings, or None"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT MAX(runs.RunID)
+            FROM cred.ValidationRunLog runs
+            WHERE runs.RunStatus = 'Completed'
+                AND EXISTS (SELECT 1 FROM cred.ValidationRuleTiming t WHERE t.ValidationRunID = runs.RunID)
+        """)
+        return cursor.fetchone()[0]
+    
+    def log_profile_report(self, validation_run_id=None, limit=10,
+                           baseline_runs=VALIDATION_PROFILE_BASELINE_RUNS):
+        """Log the slowest and most-regressed rules of a run"""
+        validation_run_id = validation_run_id or self._latest_timed_run_id()
+        if validation_run_id is None:
+            logger.warning("No validation run has recorded rule timings")
+            return
+        
+        logger.info(f"Slowest rules (Run ID: {validation_run_id}):")
+        for timing in self.get_slowest_rules(validation_run_id, limit=limit):
+            logger.info(f"  {timing['rule_code']:<10} {timing['elapsed_ms']:>8} ms  "
+                        f"scanned {timing['rows_scanned']:>9}  emitted {timing['rows_emitted']:>9}"
+                        + ("" if timing['isolated_timing'] else "  (shared statement time)"))
+        
+        logger.info(f"Most regressed rules against the previous {baseline_runs} runs:")
+        regressions = self.get_rule_regressions(validation_run_id, baseline_runs=baseline_runs, limit=limit)
+        if not regressions:
+            logger.info("  None")
+        for regression in regressions:
+            ratio = regression['slowdown_ratio']
+            logger.info(f"  {regression['rule_code']:<10} {regression['elapsed_ms']:>8} ms  "
+                        f"baseline {regression['baseline_ms']:>10.1f} ms"
+                        + (f"  x{ratio:.2f}" if ratio is not None else "")
+                        + f"  ({regression['baseline_runs']} runs)")
+    
     def close(self):
-        """Close database connection"""
+        """Return the database connection to the pool"""
         if self.conn:
             self.conn.close()
+            self.conn = None
             logger.info("Database connection closed")
 
 
 def main():
     """Main execution function"""
-    runner = None
+    parser = argparse.ArgumentParser(description='Run the validation rules or report rule timings')
+    parser.add_argument('--profile-report', action='store_true',
+                        help='Report the slowest and most-regressed rules instead of running validations')
+    parser.add_argument('--run-id', type=int, help='Validation run to report on (default: latest)')
+    parser.add_argument('--limit', type=int, default=10, help='Rules listed per section')
+    parser.add_argument('--baseline-runs', type=int, default=VALIDATION_PROFILE_BASELINE_RUNS,
+                        help='Previous runs averaged into the baseline')
+    parser.add_argument('--export-failures', metavar='PATH',
+                        help='Stream the failures of a run to a .csv, .jsonl or .parquet file')
+    parser.add_argument('--rule', action='append', dest='rule_codes', help='Export only this rule code (repeatable)')
+    parser.add_argument('--category', action='append', dest='categories', help='Export only this rule category (repeatable)')
+    parser.add_argument('--severity', action='append', dest='severities', help='Export only this severity (repeatable)')
+    parser.add_argument('--entity-type', action='append', dest='entity_types', help='Export only this entity type (repeatable)')
+    parser.add_argument('--include-resolved', action='store_true', help='Also export resolved failures')
+    parser.add_argument('--resume', type=int, metavar='RUN_ID',
+                        help='Resume a failed validation run from its checkpoints')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Run the pending units of a resumed run across the worker pool')
+    parser.add_argument('--delta', action='store_true',
+                        help='Report the new and cleared issues of a run instead of running validations')
+    parser.add_argument('--rediff', action='store_true',
+                        help='With --delta, recompute the run\'s delta first')
+    parser.add_argument('--schedule-rules', action='store_true',
+                        help='Evaluate only the rules whose outcome can have changed since the previous run')
+    parser.add_argument('--schedule-report', action='store_true',
+                        help='Report which rules a run evaluated and skipped instead of running validations')
+    parser.add_argument('--clear-summary-cache', action='store_true',
+                        help='Drop every cached run summary (after resolving results outside ValidationRunner)')
+    args = parser.parse_args()
+    start_metrics_export('validation_runner')
+    
+    if args.clear_summary_cache:
+        cache = get_summary_cache()
+        if cache is not None:
+            cache.clear()
+            logger.info("Run summary cache cleared")
+        return
+    
     try:
-        runner = ValidationRunner()
-        
-        # Run all validations
-        results = runner.run_all_validations(run_type=VALIDATION_RUN_TYPE_MANUAL)
-        
-        if results:
-            validation_run_id = results['validation_run_id']
+        with ValidationRunner() as runner:
+            
+            if args.profile_report:
+                runner.log_profile_report(args.run_id, limit=args.limit, baseline_runs=args.baseline_runs)
+                return
+            
+            if args.delta:
+                validation_run_id = args.run_id or runner.get_latest_run_id()
+                if args.rediff:
+                    runner.diff_validation_run(validation_run_id)
+                runner.log_delta_report(validation_run_id, limit=args.limit)
+                return
             
-            # Get summary
-            summary = runner.get_validation_summary(validation_run_id)
-            logger.info(f"Validation Summary: {summary}")
+            if args.schedule_report:
+                runner.log_schedule_report(args.run_id)
+                return
             
-            # Get failure details
-            if results['failures'] > 0 or results['warnings'] > 0:
-                failures = runner.get_failure_details(validation_run_id, limit=50)
-                logger.info(f"Found {len(failures)} failures/warnings")
-                for failure in failures[:10]:  # Log first 10
-                    logger.warning(f"  {failure['rule_code']}: {failure['error_message']}")
+            if args.resume:
+                runner.resume_validation_run(args.resume, parallel=args.parallel)
+                return
+            
+            if args.export_failures:
+                validation_run_id = args.run_id or runner.get_latest_run_id()
+                runner.export_failures(
+                    validation_run_id, args.export_failures,
+                    rule_codes=args.rule_codes, categories=args.categories,
+                    severities=args.severities, entity_types=args.entity_types,
+                    unresolved_only=not args.include_resolved
+                )
+                return
+            
+            # Run all validations
+            results = runner.run_all_validations(run_type=VALIDATION_RUN_TYPE_MANUAL,
+                                                 schedule_rules=args.schedule_rules)
+            
+            if results:
+                validation_run_id = results['validation_run_id']
+                
+                # Get summary
+                summary = runner.get_validation_summary(validation_run_id)
+                logger.info(f"Validation Summary: {summary}")
+                
+                # Get failure details
+                if results['failures'] > 0 or results['warnings'] > 0:
+                    failures = runner.get_failure_details(validation_run_id, limit=50)
+                    logger.info(f"Found {len(failures)} failures/warnings")
+                    for failure in failures[:10]:  # Log first 10
+                        logger.warning(f"  {failure['rule_code']}: {failure['error_message']}")
         
     except Exception as e:
         logger.error(f"Validation runner failed: {str(e)}")
         raise
     finally:
-        if runner:
-            runner.close()
+        dispose_engine()
 
 
 if __name__ == "__main__":